@@ -0,0 +1,91 @@
+"""
+ローカル環境のCosmos DB Emulatorに対する、Questionコンテナーのポイント読み取りのレイテンシーを計測するベンチマーク
+
+functionsディレクトリで以下のコマンドを実行する:
+    python -m benchmarks.cosmos_point_read [計測回数]
+"""
+
+import os
+import statistics
+import sys
+import time
+
+from azure.cosmos import CosmosClient
+from util.cosmos import get_read_write_container, reset_cosmos_clients
+from util.local import create_databases_and_containers
+
+# Azure Cosmos DB EmulatorのURIとキーを設定
+os.environ.setdefault("COSMOSDB_URI", "http://localhost:8081")
+os.environ.setdefault(
+    "COSMOSDB_KEY",
+    "C2y6yDjf5/R+ob0N8A7Cgv30VRDJIWEHLM+4QDU5DE2nQ9nDuVTqobD4b8mGGyPMbIZnqyMsEcaGQy67XIw/Jw==",
+)
+
+TEST_ID: str = "benchmark"
+ITEM_ID: str = f"{TEST_ID}_1"
+
+
+def read_with_new_client() -> float:
+    """
+    ポイント読み取りのたびにCosmosClientを生成した場合のレイテンシー(ミリ秒)を返す
+    """
+
+    start = time.perf_counter()
+    CosmosClient(
+        url=os.environ["COSMOSDB_URI"], credential=os.environ["COSMOSDB_KEY"]
+    ).get_database_client("Users").get_container_client("Question").read_item(
+        item=ITEM_ID, partition_key=TEST_ID
+    )
+    return (time.perf_counter() - start) * 1000
+
+
+def read_with_pooled_client() -> float:
+    """
+    ワーカープロセス内で共有するCosmosClientでポイント読み取りした場合のレイテンシー(ミリ秒)を返す
+    """
+
+    start = time.perf_counter()
+    get_read_write_container("Users", "Question").read_item(
+        item=ITEM_ID, partition_key=TEST_ID
+    )
+    return (time.perf_counter() - start) * 1000
+
+
+def summarize(label: str, latencies: list[float]) -> None:
+    """
+    レイテンシーの計測結果を出力する
+    """
+
+    print(
+        f"{label}: p50={statistics.median(latencies):.2f}ms "
+        f"p95={statistics.quantiles(latencies, n=20)[18]:.2f}ms "
+        f"max={max(latencies):.2f}ms (n={len(latencies)})"
+    )
+
+
+def main(count: int) -> None:
+    """
+    ベンチマークを実行する
+    """
+
+    create_databases_and_containers()
+    get_read_write_container("Users", "Question").upsert_item(
+        {
+            "id": ITEM_ID,
+            "number": 1,
+            "testId": TEST_ID,
+            "subjects": ["benchmark"],
+            "choices": ["A", "B"],
+            "answerNum": 1,
+        }
+    )
+
+    summarize("new client per read", [read_with_new_client() for _ in range(count)])
+
+    reset_cosmos_clients()
+    print(f"pooled client (cold): {read_with_pooled_client():.2f}ms")
+    summarize("pooled client (warm)", [read_with_pooled_client() for _ in range(count)])
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
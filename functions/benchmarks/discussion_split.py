@@ -0,0 +1,122 @@
+"""
+ローカル環境のCosmos DB Emulatorに対する、get_questionでのQuestionコンテナーのポイント読み取りの要求ユニット(RU)数・レイテンシーを、
+ディスカッションをQuestionコンテナーの項目に含める場合(変更前)・Discussionコンテナーの項目に分割する場合で比較するベンチマーク
+
+functionsディレクトリで以下のコマンドを実行する:
+    python -m benchmarks.discussion_split [計測回数] [ディスカッション数]
+"""
+
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Mapping
+
+from type.cosmos import Question
+from util.cosmos import get_read_write_container
+from util.discussion import split_discussion_items
+from util.local import create_databases_and_containers
+
+# Azure Cosmos DB EmulatorのURIとキーを設定
+os.environ.setdefault("COSMOSDB_URI", "http://localhost:8081")
+os.environ.setdefault(
+    "COSMOSDB_KEY",
+    "C2y6yDjf5/R+ob0N8A7Cgv30VRDJIWEHLM+4QDU5DE2nQ9nDuVTqobD4b8mGGyPMbIZnqyMsEcaGQy67XIw/Jw==",
+)
+
+TEST_ID: str = "benchmark-discussion"
+
+
+def generate_question_item(number: int, discussion_num: int) -> Question:
+    """
+    ディスカッションを含むQuestionコンテナーの項目を生成する
+    """
+
+    return {
+        "id": f"{TEST_ID}_{number}",
+        "number": number,
+        "subjects": [f"Question {number}: Which service should you use?"],
+        "choices": [f"Choice {number}-{j}" for j in range(5)],
+        "answerNum": 1,
+        "testId": TEST_ID,
+        "discussions": [
+            {
+                "comment": f"Comment {j}: " + "I think so because of the docs. " * 8,
+                "upvotedNum": j,
+                "selectedAnswer": "A",
+            }
+            for j in range(discussion_num)
+        ],
+    }
+
+
+def read_question_item(item_id: str) -> tuple[float, float]:
+    """
+    Questionコンテナーの項目をポイント読み取りし、レイテンシー(ミリ秒)・要求ユニット(RU)数を返す
+    """
+
+    request_charges: list[float] = []
+
+    def record_request_charge(headers: Mapping[str, Any], _: Any) -> None:
+        request_charges.append(float(headers.get("x-ms-request-charge", 0)))
+
+    start = time.perf_counter()
+    get_read_write_container("Users", "Question").read_item(
+        item=item_id, partition_key=TEST_ID, response_hook=record_request_charge
+    )
+    return (time.perf_counter() - start) * 1000, sum(request_charges)
+
+
+def summarize(label: str, item: Question, results: list[tuple[float, float]]) -> None:
+    """
+    ポイント読み取りの計測結果を出力する
+    """
+
+    latencies = [latency for latency, _ in results]
+    print(
+        f"{label}: size={len(json.dumps(item).encode('utf-8'))}B "
+        f"RU={statistics.mean(charge for _, charge in results):.2f} "
+        f"p50={statistics.median(latencies):.2f}ms "
+        f"p95={statistics.quantiles(latencies, n=20)[18]:.2f}ms (n={len(results)})"
+    )
+
+
+def main(count: int, discussion_num: int) -> None:
+    """
+    ベンチマークを実行する
+    """
+
+    create_databases_and_containers()
+    container = get_read_write_container("Users", "Question")
+
+    # 変更前: ディスカッションを含むQuestionコンテナーの項目
+    embedded_item = generate_question_item(1, discussion_num)
+    container.upsert_item(embedded_item)
+
+    # 変更後: ディスカッションをDiscussionコンテナーの項目に分割したQuestionコンテナーの項目
+    split_item = generate_question_item(2, discussion_num)
+    for discussion_item in split_discussion_items([split_item]):
+        get_read_write_container("Users", "Discussion").upsert_item(discussion_item)
+    container.upsert_item(split_item)
+
+    # 初回の接続を計測から除外
+    read_question_item(embedded_item["id"])
+
+    summarize(
+        "embedded discussions",
+        embedded_item,
+        [read_question_item(embedded_item["id"]) for _ in range(count)],
+    )
+    summarize(
+        "split discussions",
+        split_item,
+        [read_question_item(split_item["id"]) for _ in range(count)],
+    )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 300,
+    )
@@ -0,0 +1,105 @@
+"""
+ローカル環境のCosmos DB Emulatorに対する、ポイント読み取りの同期版・非同期版での
+1インスタンスあたりのスループット(requests/sec)を比較するベンチマーク
+
+functionsディレクトリで以下のコマンドを実行する:
+    python -m benchmarks.get_concurrency [リクエスト数] [同時実行数] [同期版のスレッド数]
+"""
+
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from util.cosmos import (
+    get_async_read_only_container,
+    get_read_write_container,
+    reset_cosmos_clients,
+)
+from util.local import create_databases_and_containers
+
+# Azure Cosmos DB EmulatorのURIとキーを設定
+os.environ.setdefault("COSMOSDB_URI", "http://localhost:8081")
+os.environ.setdefault(
+    "COSMOSDB_KEY",
+    "C2y6yDjf5/R+ob0N8A7Cgv30VRDJIWEHLM+4QDU5DE2nQ9nDuVTqobD4b8mGGyPMbIZnqyMsEcaGQy67XIw/Jw==",
+)
+os.environ.setdefault("COSMOSDB_READONLY_KEY", os.environ["COSMOSDB_KEY"])
+
+TEST_ID: str = "benchmark"
+ITEM_ID: str = f"{TEST_ID}_1"
+
+
+def run_sync(request_num: int, thread_num: int) -> float:
+    """
+    同期版のクライアントをスレッドプールで実行した場合のrequests/secを返す
+    """
+
+    container = get_read_write_container("Users", "Question")
+    container.read_item(item=ITEM_ID, partition_key=TEST_ID)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=thread_num) as executor:
+        list(
+            executor.map(
+                lambda _: container.read_item(item=ITEM_ID, partition_key=TEST_ID),
+                range(request_num),
+            )
+        )
+    return request_num / (time.perf_counter() - start)
+
+
+async def run_async(request_num: int, concurrency: int) -> float:
+    """
+    非同期版のクライアントを1つのイベントループで実行した場合のrequests/secを返す
+    """
+
+    container = get_async_read_only_container("Users", "Question")
+    await container.read_item(item=ITEM_ID, partition_key=TEST_ID)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def read() -> None:
+        async with semaphore:
+            await container.read_item(item=ITEM_ID, partition_key=TEST_ID)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(read() for _ in range(request_num)))
+    return request_num / (time.perf_counter() - start)
+
+
+def main(request_num: int, concurrency: int, thread_num: int) -> None:
+    """
+    ベンチマークを実行する
+    """
+
+    create_databases_and_containers()
+    get_read_write_container("Users", "Question").upsert_item(
+        {
+            "id": ITEM_ID,
+            "number": 1,
+            "testId": TEST_ID,
+            "subjects": ["benchmark"],
+            "choices": ["A", "B"],
+            "answerNum": 1,
+        }
+    )
+
+    print(
+        f"sync  ({thread_num} threads): "
+        f"{run_sync(request_num, thread_num):.1f} requests/sec"
+    )
+    print(
+        f"async ({concurrency} in flight): "
+        f"{asyncio.run(run_async(request_num, concurrency)):.1f} requests/sec"
+    )
+    reset_cosmos_clients()
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 2000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 200,
+        # Azure Functionsの同期関数のスレッドプールの既定のスレッド数
+        int(sys.argv[3]) if len(sys.argv) > 3 else min(32, (os.cpu_count() or 1) + 4),
+    )
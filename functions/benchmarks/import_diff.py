@@ -0,0 +1,153 @@
+"""
+2000問のインポートデータファイルの再インポートでの、Questionコンテナーの項目との差分の判定時間・クエリの結果のサイズを、
+インポートデータの要素をリストで比較する場合(変更前)・問題番号ごとのハッシュ値を比較する場合で比較するベンチマーク
+Questionコンテナーの項目はクエリの結果として与え、Cosmos DBへのアクセス時間は含めない
+
+functionsディレクトリで以下のコマンドを実行する:
+    python -m benchmarks.import_diff [試行回数] [問題数] [変更する問題数]
+"""
+
+import json
+import statistics
+import sys
+import time
+
+from type.cosmos import Question
+from type.importing import ImportItem
+from util.hashing import compute_import_item_hash
+
+
+def generate_import_items(question_num: int) -> list[ImportItem]:
+    """
+    ディスカッションを含むインポートデータを生成する
+    """
+
+    return [
+        {
+            "subjects": [
+                f"Question {i}: Which service should you use?",
+                "https://example.com/img.png",
+            ],
+            "choices": [f"Choice {i}-{j}" for j in range(5)],
+            "answerNum": 1,
+            "indicateSubjectImgIdxes": [1],
+            "indicateChoiceImgs": None,
+            "escapeTranslatedIdxes": None,
+            "discussions": [
+                {
+                    "comment": f"Comment {i}-{j}: " + "I think so. " * 10,
+                    "upvotedNum": j,
+                    "selectedAnswer": "A",
+                }
+                for j in range(5)
+            ],
+        }
+        for i in range(question_num)
+    ]
+
+
+def diff_by_list(
+    inserted_question_items: list[Question], json_data: list[ImportItem]
+) -> list[int]:
+    """
+    インポートデータの要素をリストで比較して、差分がある問題番号を返す(変更前の実装)
+    """
+
+    inserted_import_items: list[ImportItem] = [
+        {
+            key: inserted_question_item[key]
+            for key in ImportItem.__annotations__
+            if key in inserted_question_item
+        }
+        for inserted_question_item in inserted_question_items
+    ]
+    return [
+        idx + 1
+        for idx, json_import_item in enumerate(json_data)
+        if json_import_item not in inserted_import_items
+    ]
+
+
+def diff_by_hash(
+    inserted_question_hashes: list[dict], json_data: list[ImportItem]
+) -> list[int]:
+    """
+    問題番号ごとのハッシュ値を比較して、差分がある問題番号を返す
+    """
+
+    inserted_hashes = {
+        item["number"]: item.get("contentHash") for item in inserted_question_hashes
+    }
+    return [
+        idx + 1
+        for idx, json_import_item in enumerate(json_data)
+        if inserted_hashes.get(idx + 1) != compute_import_item_hash(json_import_item)
+    ]
+
+
+def measure(fn, trial_num: int) -> list[float]:
+    """
+    各試行の実行時間(ms)を返す
+    """
+
+    latencies = []
+    for _ in range(trial_num):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main(trial_num: int, question_num: int, changed_num: int) -> None:
+    """
+    ベンチマークを実行する
+    """
+
+    inserted_import_items = generate_import_items(question_num)
+    inserted_question_items: list[Question] = [
+        {
+            **item,
+            "id": f"test-id_{idx + 1}",
+            "number": idx + 1,
+            "testId": "test-id",
+        }
+        for idx, item in enumerate(inserted_import_items)
+    ]
+    inserted_question_hashes = [
+        {"number": idx + 1, "contentHash": compute_import_item_hash(item)}
+        for idx, item in enumerate(inserted_import_items)
+    ]
+
+    # 末尾の問題を変更したインポートデータ(変更前の実装では最も比較回数が多くなる)
+    json_data = generate_import_items(question_num)
+    for item in json_data[question_num - changed_num :]:
+        item["answerNum"] = 2
+
+    by_list = diff_by_list(inserted_question_items, json_data)
+    by_hash = diff_by_hash(inserted_question_hashes, json_data)
+    assert by_list == by_hash and len(by_hash) == changed_num
+    print(f"{question_num} questions, {changed_num} changed")
+    print(
+        "query result: "
+        f"list={len(json.dumps(inserted_question_items).encode('utf-8'))}bytes "
+        f"hash={len(json.dumps(inserted_question_hashes).encode('utf-8'))}bytes"
+    )
+
+    for label, fn in (
+        ("list", lambda: diff_by_list(inserted_question_items, json_data)),
+        ("hash", lambda: diff_by_hash(inserted_question_hashes, json_data)),
+    ):
+        latencies = measure(fn, trial_num)
+        print(
+            f"{label}: "
+            f"p50={statistics.median(latencies):.1f}ms "
+            f"max={max(latencies):.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 3,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 2000,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 10,
+    )
@@ -0,0 +1,124 @@
+"""
+長いディスカッションを含む合成したインポートデータファイル(既定値は500MB)の読込みでの、ピークメモリ使用量・所要時間を、
+ファイル全体を読み込んでjson.loadsする場合(変更前)・iter_json_arrayで1要素ずつ読み込む場合で比較するベンチマーク
+各要素はハッシュ値を算出して破棄し、差分判定・upsertのパイプラインを模擬する
+ピークメモリ使用量はtracemallocで計測したPythonのメモリ確保量とする
+
+functionsディレクトリで以下のコマンドを実行する:
+    python -m benchmarks.import_stream [ファイルサイズ(MB)]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Iterable
+
+from type.importing import ImportItem
+from util.hashing import compute_import_item_hash
+from util.json_stream import iter_json_array
+
+DISCUSSION_NUM: int = 50
+
+
+def generate_import_item(number: int) -> ImportItem:
+    """
+    長いディスカッションを含むインポートデータの要素を生成する
+    """
+
+    return {
+        "subjects": [f"Question {number}: Which service should you use?"],
+        "choices": [f"Choice {number}-{j}" for j in range(5)],
+        "answerNum": 1,
+        "discussions": [
+            {
+                "comment": f"Comment {number}-{j}: " + "I think the answer is A. " * 20,
+                "upvotedNum": j,
+                "selectedAnswer": "A",
+            }
+            for j in range(DISCUSSION_NUM)
+        ],
+    }
+
+
+def write_import_file(path: str, size_mb: int) -> int:
+    """
+    指定したサイズ以上のインポートデータファイルを1要素ずつ書き込み、要素数を返す
+    """
+
+    size = size_mb * 1024 * 1024
+    number = 0
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("[")
+        while file.tell() < size:
+            if number:
+                file.write(",")
+            number += 1
+            json.dump(generate_import_item(number), file)
+        file.write("]")
+    return number
+
+
+def consume(json_data: Iterable[ImportItem]) -> int:
+    """
+    各要素のハッシュ値を算出して破棄し、要素数を返す
+    """
+
+    number = 0
+    for number, json_import_item in enumerate(json_data, start=1):
+        compute_import_item_hash(json_import_item)
+    return number
+
+
+def load_all(path: str) -> int:
+    """
+    ファイル全体を読み込んでjson.loadsする(変更前の実装)
+    """
+
+    with open(path, "rb") as file:
+        return consume(json.loads(file.read()))
+
+
+def load_stream(path: str) -> int:
+    """
+    iter_json_arrayで1要素ずつ読み込む
+    """
+
+    with open(path, "rb") as file:
+        return consume(iter_json_array(file))
+
+
+def measure(fn: Callable[[str], int], path: str) -> tuple[int, float, float]:
+    """
+    要素数・ピークメモリ使用量(MB)・所要時間(秒)を返す
+    """
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    number = fn(path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return number, peak / 1024 / 1024, elapsed
+
+
+def main(size_mb: int) -> None:
+    """
+    ベンチマークを実行する
+    """
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "import.json")
+        item_num = write_import_file(path, size_mb)
+        print(f"{os.path.getsize(path) / 1024 / 1024:.1f}MB, {item_num} items")
+
+        for label, fn in (("stream", load_stream), ("json.loads", load_all)):
+            number, peak_mb, elapsed = measure(fn, path)
+            assert number == item_num
+            print(f"{label}: peak={peak_mb:.1f}MB elapsed={elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,139 @@
+"""
+Azure OpenAIの代替サーバーに対する、チャット補完1回あたりのレイテンシーを、
+呼び出しごとにクライアントを作成する場合・ワーカープロセス内で共有したクライアントを再利用する場合で比較するベンチマーク
+代替サーバーは、1リクエストあたり固定のレイテンシーを模擬し、固定の応答を返す
+
+functionsディレクトリで以下のコマンドを実行する:
+    python -m benchmarks.openai_client [試行回数] [代替サーバーのレイテンシー(ms)]
+"""
+
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from openai import AzureOpenAI
+from util.openai import get_openai_client, reset_openai_client
+
+RESPONSE_CONTENT: bytes = json.dumps(
+    {
+        "id": "chatcmpl-benchmark",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "benchmark",
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": "Summary"},
+            }
+        ],
+    }
+).encode("utf-8")
+
+
+class StandInOpenAIHandler(BaseHTTPRequestHandler):
+    """Azure OpenAIの[POST] /chat/completionsを模したリクエストハンドラー"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    # 1リクエストあたりの固定のレイテンシー(秒)
+    latency_seconds: float = 0.0
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """
+        レイテンシーを模擬した後、固定のチャット補完の応答を返す
+        """
+
+        self.rfile.read(int(self.headers["Content-Length"]))
+        time.sleep(self.latency_seconds)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(RESPONSE_CONTENT)))
+        self.end_headers()
+        self.wfile.write(RESPONSE_CONTENT)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+def create_chat_completion(client: AzureOpenAI) -> None:
+    """
+    指定したクライアントでチャット補完を1回実行する
+    """
+
+    client.chat.completions.create(
+        model=os.environ["OPENAI_MODEL_NAME"],
+        messages=[{"role": "user", "content": "Summarize the discussions."}],
+    )
+
+
+def create_client() -> AzureOpenAI:
+    """
+    共有せずにAzure OpenAIのクライアントを作成する(変更前の実装)
+    """
+
+    return AzureOpenAI(
+        api_key=os.environ["OPENAI_API_KEY"],
+        api_version=os.environ["OPENAI_API_VERSION"],
+        azure_deployment=os.environ["OPENAI_DEPLOYMENT_NAME"],
+        azure_endpoint=os.environ["OPENAI_ENDPOINT"],
+    )
+
+
+def measure(trial_num: int, shared: bool) -> list[float]:
+    """
+    チャット補完1回あたりのレイテンシー(ms)を返す
+    """
+
+    latencies = []
+    for _ in range(trial_num):
+        start = time.perf_counter()
+        if shared:
+            create_chat_completion(get_openai_client())
+        else:
+            with create_client() as client:
+                create_chat_completion(client)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main(trial_num: int, server_latency_ms: float) -> None:
+    """
+    ベンチマークを実行する
+    """
+
+    StandInOpenAIHandler.latency_seconds = server_latency_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInOpenAIHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["OPENAI_API_KEY"] = "benchmark"
+    os.environ["OPENAI_API_VERSION"] = "2024-10-21"
+    os.environ["OPENAI_DEPLOYMENT_NAME"] = "benchmark"
+    os.environ["OPENAI_ENDPOINT"] = f"http://127.0.0.1:{server.server_address[1]}"
+    os.environ["OPENAI_MODEL_NAME"] = "benchmark"
+
+    reset_openai_client()
+    for label, shared in (("per call", False), ("shared", True)):
+        latencies = measure(trial_num, shared)
+        print(
+            f"{label}: "
+            f"mean={statistics.mean(latencies):.2f}ms "
+            f"p50={statistics.median(latencies):.2f}ms "
+            f"max={max(latencies):.2f}ms"
+        )
+
+    reset_openai_client()
+    server.shutdown()
+    server.server_close()
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 0.0,
+    )
@@ -0,0 +1,155 @@
+"""
+ローカル環境のCosmos DB Emulatorに対する、1000問のテストの回答履歴の保存1回あたりの要求ユニット(RU)数・レイテンシーを、
+項目全体をupsertする場合(変更前)・ETagを指定して部分的に更新する場合で比較するベンチマーク
+いずれも項目のポイント読み取りを含み、項目の大きさを保つため最後の回答履歴を更新する
+
+functionsディレクトリで以下のコマンドを実行する:
+    python -m benchmarks.progress_patch [計測回数] [問題数]
+"""
+
+import os
+import statistics
+import sys
+import time
+from typing import Any, Callable, Mapping
+
+from azure.core import MatchConditions
+from type.cosmos import Progress, ProgressElement
+from util.cosmos import get_read_write_container
+from util.local import create_databases_and_containers
+
+# Azure Cosmos DB EmulatorのURIとキーを設定
+os.environ.setdefault("COSMOSDB_URI", "http://localhost:8081")
+os.environ.setdefault(
+    "COSMOSDB_KEY",
+    "C2y6yDjf5/R+ob0N8A7Cgv30VRDJIWEHLM+4QDU5DE2nQ9nDuVTqobD4b8mGGyPMbIZnqyMsEcaGQy67XIw/Jw==",
+)
+
+TEST_ID: str = "benchmark-progress"
+USER_ID: str = "benchmark-user"
+ITEM_ID: str = f"{USER_ID}_{TEST_ID}"
+
+
+def generate_progress_item(question_num: int) -> Progress:
+    """
+    最後の1問を除いて回答したProgressコンテナーの項目を生成する
+    """
+
+    return {
+        "id": ITEM_ID,
+        "userId": USER_ID,
+        "testId": TEST_ID,
+        "order": list(range(1, question_num + 1)),
+        "progresses": [
+            {"isCorrect": i % 2 == 0, "selectedIdxes": [0, 2], "correctIdxes": [0, 2]}
+            for i in range(question_num - 1)
+        ],
+    }
+
+
+def save_by_upsert(
+    progress: ProgressElement, response_hook: Callable[[Mapping[str, Any], Any], None]
+) -> None:
+    """
+    項目全体を読み取り、最後の回答履歴を更新した項目全体をupsertする(変更前の実装)
+    """
+
+    container = get_read_write_container("Users", "Progress")
+    item: Progress = container.read_item(
+        item=ITEM_ID, partition_key=TEST_ID, response_hook=response_hook
+    )
+    item["progresses"][-1] = progress
+    container.upsert_item(
+        {
+            "id": ITEM_ID,
+            "userId": USER_ID,
+            "testId": TEST_ID,
+            "order": item["order"],
+            "progresses": item["progresses"],
+        },
+        response_hook=response_hook,
+    )
+
+
+def save_by_patch(
+    progress: ProgressElement, response_hook: Callable[[Mapping[str, Any], Any], None]
+) -> None:
+    """
+    項目全体を読み取り、最後の回答履歴のみをETagを指定して部分的に更新する
+    """
+
+    container = get_read_write_container("Users", "Progress")
+    item: Progress = container.read_item(
+        item=ITEM_ID, partition_key=TEST_ID, response_hook=response_hook
+    )
+    container.patch_item(
+        item=ITEM_ID,
+        partition_key=TEST_ID,
+        patch_operations=[
+            {
+                "op": "set",
+                "path": f"/progresses/{len(item['progresses']) - 1}",
+                "value": progress,
+            }
+        ],
+        etag=item["_etag"],
+        match_condition=MatchConditions.IfNotModified,
+        response_hook=response_hook,
+    )
+
+
+def measure(
+    save: Callable[[ProgressElement, Callable[[Mapping[str, Any], Any], None]], None],
+) -> tuple[float, float]:
+    """
+    回答履歴を1回保存し、レイテンシー(ミリ秒)・要求ユニット(RU)数を返す
+    """
+
+    request_charges: list[float] = []
+
+    def record_request_charge(headers: Mapping[str, Any], _: Any) -> None:
+        request_charges.append(float(headers.get("x-ms-request-charge", 0)))
+
+    start = time.perf_counter()
+    save(
+        {"isCorrect": True, "selectedIdxes": [1], "correctIdxes": [1]},
+        record_request_charge,
+    )
+    return (time.perf_counter() - start) * 1000, sum(request_charges)
+
+
+def summarize(label: str, results: list[tuple[float, float]]) -> None:
+    """
+    回答履歴の保存の計測結果を出力する
+    """
+
+    latencies = [latency for latency, _ in results]
+    print(
+        f"{label}: RU={statistics.mean(charge for _, charge in results):.2f} "
+        f"p50={statistics.median(latencies):.2f}ms "
+        f"p95={statistics.quantiles(latencies, n=20)[18]:.2f}ms (n={len(results)})"
+    )
+
+
+def main(count: int, question_num: int) -> None:
+    """
+    ベンチマークを実行する
+    """
+
+    create_databases_and_containers()
+    get_read_write_container("Users", "Progress").upsert_item(
+        generate_progress_item(question_num)
+    )
+
+    # 初回の接続を計測から除外
+    measure(save_by_upsert)
+
+    summarize("read + upsert", [measure(save_by_upsert) for _ in range(count)])
+    summarize("read + patch", [measure(save_by_patch) for _ in range(count)])
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 1000,
+    )
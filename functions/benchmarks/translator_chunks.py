@@ -0,0 +1,112 @@
+"""
+Azure Translatorの代替サーバーに対する、200個の英語の文字列群の翻訳での
+チャンクの逐次送信・同時送信のレイテンシーを比較するベンチマーク
+翻訳結果のキャッシュの影響を除くため、キャッシュを用いずに翻訳する
+代替サーバーは、1リクエストあたり固定のレイテンシーと文字数に比例するレイテンシーを模擬する
+
+functionsディレクトリで以下のコマンドを実行する:
+    python -m benchmarks.translator_chunks [試行回数] [1文字列あたりの文字数] [同時送信数]
+"""
+
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from util.translator import _translate_uncached_texts, reset_translator_session
+
+TEXT_NUM: int = 200
+
+# 代替サーバーの1リクエストあたりの固定のレイテンシー(秒)と1文字あたりのレイテンシー(秒)
+BASE_LATENCY_SECONDS: float = 0.1
+LATENCY_SECONDS_PER_CHARACTER: float = 0.000005
+
+
+class StandInTranslatorHandler(BaseHTTPRequestHandler):
+    """Azure Translatorの[POST] /translateを模したリクエストハンドラー"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """
+        レイテンシーを模擬した後、英語の文字列群をそのまま返す
+        """
+
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(
+            BASE_LATENCY_SECONDS
+            + LATENCY_SECONDS_PER_CHARACTER * sum(len(item["Text"]) for item in body)
+        )
+        content = json.dumps(
+            [{"translations": [{"text": item["Text"], "to": "ja"}]} for item in body]
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+def measure(texts: list[str], trial_num: int, max_workers: int) -> list[float]:
+    """
+    指定した同時送信数で文字列群を翻訳した場合の各試行のレイテンシー(ms)を返す
+    """
+
+    os.environ["TRANSLATOR_MAX_WORKERS"] = str(max_workers)
+    reset_translator_session()
+    _translate_uncached_texts(texts[:1], os.environ["TRANSLATOR_KEY"])
+
+    latencies = []
+    for _ in range(trial_num):
+        start = time.perf_counter()
+        _translate_uncached_texts(texts, os.environ["TRANSLATOR_KEY"])
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main(trial_num: int, text_length: int, max_workers: int) -> None:
+    """
+    ベンチマークを実行する
+    """
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInTranslatorHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["TRANSLATOR_KEY"] = "benchmark"
+    os.environ["TRANSLATOR_ENDPOINT"] = f"http://127.0.0.1:{server.server_address[1]}"
+
+    texts = [
+        f"{i}: "
+        + ("The quick brown fox jumps over the lazy dog. " * text_length)[:text_length]
+        for i in range(TEXT_NUM)
+    ]
+    print(f"{TEXT_NUM} texts, {sum(len(text) for text in texts)} characters")
+
+    for label, workers in (
+        ("sequential", 1),
+        (f"concurrent ({max_workers})", max_workers),
+    ):
+        latencies = measure(texts, trial_num, workers)
+        print(
+            f"{label}: "
+            f"p50={statistics.median(latencies):.1f}ms "
+            f"max={max(latencies):.1f}ms"
+        )
+
+    reset_translator_session()
+    server.shutdown()
+    server.server_close()
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 2000,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 4,
+    )
@@ -1,5 +1,6 @@
 """ローカル環境でのインポート処理"""
 
+import argparse
 import os
 
 from util.local import (
@@ -10,8 +11,27 @@ from util.local import (
     generate_test_items,
     import_question_items,
     import_test_items,
+    load_import_manifest,
+    save_import_manifest,
 )
 
+# コマンドライン引数を解析
+parser = argparse.ArgumentParser(
+    description="ローカル環境へインポートデータをインポートする"
+)
+parser.add_argument(
+    "--course", action="append", dest="course_names", help="インポートするコース名"
+)
+parser.add_argument(
+    "--test", action="append", dest="test_names", help="インポートするテスト名"
+)
+parser.add_argument(
+    "--full",
+    action="store_true",
+    help="前回のインポートから変更されていないインポートデータファイルもインポートする",
+)
+args = parser.parse_args()
+
 # Azure Cosmos DB EmulatorのURIとキーを設定
 os.environ["COSMOSDB_URI"] = "http://localhost:8081"
 os.environ["COSMOSDB_KEY"] = (
@@ -26,9 +46,27 @@ print("create_queue_storages: OK")
 create_databases_and_containers()
 print("create_databases_and_containers: OK")
 
-# インポートデータ作成
-created_import_data = create_import_data()
+# インポートデータ作成(前回のインポートから変更されたインポートデータファイルのみ)
+# --full指定時は、抽出するコース名/テスト名のマニフェストを破棄してすべて読み込む
+import_manifest = {
+    key: entry
+    for key, entry in load_import_manifest().items()
+    if not args.full
+    or (args.course_names is not None and key.split("/")[0] not in args.course_names)
+    or (
+        args.test_names is not None
+        and key.split("/")[1].removesuffix(".json") not in args.test_names
+    )
+}
+created_import_data = create_import_data(
+    course_names=args.course_names,
+    test_names=args.test_names,
+    manifest=import_manifest,
+)
 print(f"create_import_data: OK(length: {len(created_import_data)})")
+if not created_import_data:
+    print("import_local: No Changed Import Data")
+    raise SystemExit(0)
 
 # Testコンテナーの項目を生成
 generated_test_items = generate_test_items(created_import_data)
@@ -47,3 +85,7 @@ print(f"generate_question_items: OK(length: {len(generated_question_items)})")
 # Questionコンテナーの項目をインポート
 import_question_items(generated_question_items)
 print("import_question_items: OK")
+
+# インポートしたインポートデータファイルのマニフェストを保存
+save_import_manifest(import_manifest)
+print("save_import_manifest: OK")
@@ -0,0 +1,29 @@
+"""Questionコンテナーの項目のディスカッションをDiscussionコンテナーに移行する処理"""
+
+import os
+
+from util.cosmos import get_read_write_container
+from util.discussion import migrate_question_discussions
+
+# 環境変数を設定しない場合は、ローカル環境のAzure Cosmos DB Emulatorを移行する
+os.environ.setdefault("COSMOSDB_URI", "http://localhost:8081")
+os.environ.setdefault(
+    "COSMOSDB_KEY",
+    "C2y6yDjf5/R+ob0N8A7Cgv30VRDJIWEHLM+4QDU5DE2nQ9nDuVTqobD4b8mGGyPMbIZnqyMsEcaGQy67XIw/Jw==",
+)
+
+
+def main() -> None:
+    """
+    discussionsフィールドを持つQuestionコンテナーの項目を、Discussionコンテナーの項目に分割する
+    """
+
+    migrated_num = migrate_question_discussions(
+        get_read_write_container("Users", "Question"),
+        get_read_write_container("Users", "Discussion"),
+    )
+    print(f"migrate_question_discussions: OK(length: {migrated_num})")
+
+
+if __name__ == "__main__":
+    main()
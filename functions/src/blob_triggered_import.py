@@ -1,30 +1,58 @@
 """インポートデータファイルの項目をインポートするBlobトリガーの関数アプリのモジュール"""
 
+import hashlib
 import json
 import logging
-import time
+import os
+import traceback
+from typing import Any, Iterable
 from uuid import uuid4
 
 import azure.functions as func
 from azure.cosmos import ContainerProxy
-from type.cosmos import Question, Test
+from type.cosmos import Discussion, ImportCheckpoint, ImportJob, Question, Test
 from type.importing import ImportItem
+from type.message import MessageImportChunk
+from util.batch import upsert_items_in_batches
+from util.catalog import refresh_tests_catalog
+from util.checkpoint import (
+    create_import_job,
+    delete_import_checkpoint,
+    get_import_checkpoint,
+    get_import_checkpoint_id,
+    get_import_job_id,
+    save_import_checkpoint,
+)
 from util.cosmos import get_read_write_container
+from util.discussion import split_discussion_items
+from util.hashing import compute_import_item_hash
+from util.json_stream import (
+    RetainingStream,
+    iter_json_array,
+    iter_json_array_with_offsets,
+)
+from util.question_cache import invalidate_cached_questions
+from util.queue import send_queue_message
+from util.throttle import AdaptiveThrottle
+from util.translator import translate_by_azure_translator
 
+# インポートデータの要素をまとめて翻訳・upsertする件数の既定値
+DEFAULT_IMPORT_BATCH_SIZE: int = 100
 
-def upsert_test_item(
-    course_name: str, test_name: str, json_data: list[ImportItem]
-) -> tuple[str, bool]:
+# 分割インポートで、1つのメッセージで処理する問題数の既定値
+DEFAULT_IMPORT_CHUNK_SIZE: int = 500
+
+
+def get_test_item(course_name: str, test_name: str) -> Test | None:
     """
-    Testコンテナーの項目をupsertする
+    コース名・テスト名が一致するTestコンテナーの項目を取得する
 
     Args:
         course_name (str): コース名
         test_name (str): テスト名
-        json_data (list[ImportItem]): インポートデータ
 
     Returns:
-        tuple[str, bool]: Testコンテナーの項目のIDと、その項目が既に存在するかどうか
+        Test | None: Testコンテナーの項目(存在しない場合はNone)
     """
 
     # Testコンテナーのインスタンスを取得
@@ -46,40 +74,247 @@ def upsert_test_item(
     logging.info({"inserted_test_items": inserted_test_items})
     if len(inserted_test_items) > 1:
         raise ValueError("Not Unique Test")
-    is_existed_test: bool = len(inserted_test_items) == 1
+
+    return inserted_test_items[0] if inserted_test_items else None
+
+
+def upsert_test_item(
+    course_name: str,
+    test_name: str,
+    test_id: str,
+    inserted_test_item: Test | None,
+    length: int,
+) -> None:
+    """
+    Testコンテナーの項目をupsertし、差分がある場合はテストの一覧のカタログを再生成する
+
+    Args:
+        course_name (str): コース名
+        test_name (str): テスト名
+        test_id (str): Testコンテナーの項目のID
+        inserted_test_item (Test | None): 取得したTestコンテナーの項目(存在しない場合はNone)
+        length (int): インポートデータの要素数
+    """
 
     # 取得したTestコンテナーの項目が存在し差分がない場合以外はupsert
-    test_id: str
-    if not is_existed_test or (
-        is_existed_test and inserted_test_items[0]["length"] != len(json_data)
-    ):
-        test_id = inserted_test_items[0]["id"] if is_existed_test else str(uuid4())
+    if inserted_test_item is None or inserted_test_item["length"] != length:
         test_item: Test = {
             "courseName": course_name,
             "testName": test_name,
             "id": test_id,
-            "length": len(json_data),
+            "length": length,
         }
         logging.info({"test_item": test_item})
-        container.upsert_item(test_item)
-    else:
-        test_id = inserted_test_items[0]["id"]
+        get_read_write_container(
+            database_name="Users",
+            container_name="Test",
+        ).upsert_item(test_item)
+
+        # [GET] /tests で返すテストの一覧を再生成
+        refresh_tests_catalog()
 
-    logging.info({"test_id": test_id, "is_existed_test": is_existed_test})
+    logging.info(
+        {"test_id": test_id, "is_existed_test": inserted_test_item is not None}
+    )
 
-    return test_id, is_existed_test
 
+def translate_question_items(question_items: list[Question]) -> None:
+    """
+    Questionコンテナーの各項目の問題文・選択肢をまとめて日本語に翻訳し、
+    translatedSubjects・translatedChoicesフィールドに格納する
+    画像URLである問題文・翻訳しない問題文/選択肢・画像URLのみの選択肢は、翻訳せずにそのまま格納する
 
-def upsert_question_items(
-    test_id: str, is_existed_test: bool, json_data: list[ImportItem]
+    Args:
+        question_items (list[Question]): Questionコンテナーの各項目
+    """
+
+    texts: list[str] = []
+    targets: list[tuple[list[str | None], int]] = []
+    for question_item in question_items:
+        escape_translated_idxes = question_item.get("escapeTranslatedIdxes") or {}
+        escape_subject_idxes = set(
+            (question_item.get("indicateSubjectImgIdxes") or [])
+            + (escape_translated_idxes.get("subjects") or [])
+        )
+        escape_choice_idxes = set(escape_translated_idxes.get("choices") or [])
+
+        translated_subjects: list[str | None] = list(question_item["subjects"])
+        for idx, subject in enumerate(question_item["subjects"]):
+            if idx not in escape_subject_idxes:
+                texts.append(subject)
+                targets.append((translated_subjects, idx))
+
+        translated_choices: list[str | None] = list(question_item["choices"])
+        for idx, choice in enumerate(question_item["choices"]):
+            if choice is not None and idx not in escape_choice_idxes:
+                texts.append(choice)
+                targets.append((translated_choices, idx))
+
+        question_item["translatedSubjects"] = translated_subjects
+        question_item["translatedChoices"] = translated_choices
+
+    for (translated, idx), text in zip(targets, translate_by_azure_translator(texts)):
+        translated[idx] = text
+
+
+def is_enabled_import_translation() -> bool:
+    """
+    インポート時の翻訳が有効かどうかを返す
+
+    Returns:
+        bool: 環境変数IMPORT_TRANSLATION_ENABLEDがtrueの場合はTrue
+    """
+
+    return os.getenv("IMPORT_TRANSLATION_ENABLED", "false").lower() == "true"
+
+
+def upsert_question_item_batch(
+    container: ContainerProxy,
+    throttle: AdaptiveThrottle,
+    test_id: str,
+    question_items: list[Question],
 ) -> None:
+    """
+    抽出したQuestionコンテナーの項目をまとめて翻訳し、ディスカッションをDiscussionコンテナーの項目に分割して、
+    それぞれトランザクションバッチにまとめてupsertする
+
+    Args:
+        container (ContainerProxy): Questionコンテナーのインスタンス
+        throttle (AdaptiveThrottle): upsertの流量を調整するインスタンス
+        test_id (str): Testコンテナーの項目のidフィールドの値(Questionコンテナーのパーティションキーの値)
+        question_items (list[Question]): Questionコンテナーの項目
+    """
+
+    # インポート時の翻訳が有効な場合は、抽出した項目の問題文・選択肢をまとめて翻訳
+    # 翻訳に失敗した場合は翻訳せずにupsertし、クライアントで翻訳させる
+    if is_enabled_import_translation():
+        try:
+            translate_question_items(question_items)
+        except Exception:
+            logging.warning(traceback.format_exc())
+            for question_item in question_items:
+                question_item.pop("translatedSubjects", None)
+                question_item.pop("translatedChoices", None)
+
+    # ディスカッションはpost_communityでのみ参照するため、Discussionコンテナーの項目に分割し、
+    # Questionコンテナーの項目を参照する際にディスカッションを読み込まないようにする
+    # Questionコンテナーの項目のディスカッション件数と対応させるため、Discussionコンテナーの項目を先にupsertする
+    discussion_items: list[Discussion] = split_discussion_items(question_items)
+    if discussion_items:
+        upsert_items_in_batches(
+            get_read_write_container(
+                database_name="Users",
+                container_name="Discussion",
+            ),
+            discussion_items,
+            test_id,
+            throttle,
+        )
+
+    # Questionコンテナーの各項目を、同一パーティションのトランザクションバッチにまとめてupsert
+    # 比較的要求ユニット(RU)数が多いDB操作を行うため、スロットリングに応じて流量を調整する
+    # https://docs.microsoft.com/ja-jp/azure/cosmos-db/sql/troubleshoot-request-rate-too-large
+    for question_item in question_items:
+        logging.info({"question_item": question_item})
+    upsert_items_in_batches(container, question_items, test_id, throttle)
+
+    # upsertした項目をワーカープロセス内のキャッシュから削除し、次の取得時にQuestionコンテナーから取得させる
+    # 他のインスタンスのキャッシュは、有効期間(QUESTION_CACHE_TTL_SECONDS)の経過後に取得し直す
+    invalidate_cached_questions(
+        [question_item["id"] for question_item in question_items]
+    )
+
+
+def get_inserted_question_hashes(
+    container: ContainerProxy,
+    test_id: str,
+    committed_number: int,
+    end_number: int | None = None,
+) -> dict[int, str | None]:
+    """
+    クエリを実行して、指定した問題番号より後のQuestionコンテナーの各項目の問題番号・ハッシュ値・翻訳済かどうかを全取得する
+    ハッシュ値を格納していない項目と、インポート時の翻訳が有効な場合は未翻訳の項目は、差分があるものとみなすためハッシュ値をNoneとする
+
+    Args:
+        container (ContainerProxy): Questionコンテナーのインスタンス
+        test_id (str): Testコンテナーの項目のidフィールドの値
+        committed_number (int): upsertが完了した最後の問題番号
+        end_number (int | None): 取得する最後の問題番号(指定しない場合は最後の項目まで)
+
+    Returns:
+        dict[int, str | None]: 問題番号をキー、ハッシュ値を値とした各項目のハッシュ値
+    """
+
+    query = (
+        "SELECT c.number, c.contentHash, "
+        "IS_DEFINED(c.translatedSubjects) AS isTranslated "
+        "FROM c WHERE c.testId = @testId AND c.number > @committedNumber"
+    )
+    parameters: list[dict] = [
+        {"name": "@testId", "value": test_id},
+        {"name": "@committedNumber", "value": committed_number},
+    ]
+    if end_number is not None:
+        query += " AND c.number <= @endNumber"
+        parameters.append({"name": "@endNumber", "value": end_number})
+    inserted_question_hashes: list[dict] = list(
+        container.query_items(query=query, parameters=parameters)
+    )
+
+    is_enabled_translation: bool = is_enabled_import_translation()
+    return {
+        inserted_question_hash["number"]: (
+            inserted_question_hash.get("contentHash")
+            if not is_enabled_translation or inserted_question_hash.get("isTranslated")
+            else None
+        )
+        for inserted_question_hash in inserted_question_hashes
+    }
+
+
+def save_import_progress(
+    checkpoint: ImportCheckpoint,
+    question_items: list[Question],
+    number: int,
+    batch_size: int,
+) -> None:
+    """
+    upsert済か差分がない要素の最後の問題番号が、前回の保存からbatch_size件以上進んだ場合にチェックポイントを保存する
+
+    Args:
+        checkpoint (ImportCheckpoint): チェックポイント
+        question_items (list[Question]): upsertしていないQuestionコンテナーの項目
+        number (int): 差分判定した最後の問題番号
+        batch_size (int): チェックポイントを保存する間隔の件数
+    """
+
+    committed_number = question_items[0]["number"] - 1 if question_items else number
+    if committed_number - checkpoint["committedNumber"] >= batch_size:
+        checkpoint["committedNumber"] = committed_number
+        save_import_checkpoint(checkpoint)
+
+
+def upsert_question_items(
+    test_id: str,
+    is_existed_test: bool,
+    json_data: Iterable[ImportItem],
+    checkpoint: ImportCheckpoint | None = None,
+    number_range: range | None = None,
+) -> int:
     """
     Questionコンテナーの項目をupsertする
+    インポートデータの要素を1つずつ差分判定し、IMPORT_BATCH_SIZE件ごとにまとめて翻訳・upsertする
+    チェックポイントを指定した場合は、その問題番号の次の要素から再開し、進捗をチェックポイントに保存する
 
     Args:
         test_id (str): Testコンテナーの項目のidフィールドの値
         is_existed_test (bool): Testコンテナーの項目が取得できた場合はTrue、取得できない場合はFalse
-        json_data (list[ImportItem]): インポートデータ
+        json_data (Iterable[ImportItem]): インポートデータ
+        checkpoint (ImportCheckpoint | None): チェックポイント
+        number_range (range | None): インポートデータの一部の場合は、その問題番号の範囲
+
+    Returns:
+        int: インポートデータの最後の要素の問題番号(インポートデータ全体の場合は要素数)
     """
 
     # Questionコンテナーのインスタンスを取得
@@ -88,65 +323,218 @@ def upsert_question_items(
         container_name="Question",
     )
 
-    # Testコンテナーの項目が取得できた場合のみ、クエリを実行して項目を全取得
-    inserted_question_items: list[Question] = (
-        list(
-            container.query_items(
-                query="SELECT * FROM c WHERE c.testId = @testId",
-                parameters=[{"name": "@testId", "value": test_id}],
-            )
+    # Testコンテナーの項目が取得できた場合のみ、チェックポイントより後の各項目のハッシュ値を取得
+    first_number: int = number_range.start if number_range else 1
+    inserted_hashes: dict[int, str | None] = (
+        get_inserted_question_hashes(
+            container,
+            test_id,
+            checkpoint["committedNumber"] if checkpoint else first_number - 1,
+            number_range[-1] if number_range else None,
         )
         if is_existed_test
-        else []
+        else {}
     )
+    logging.info({"inserted_hashes_count": len(inserted_hashes)})
 
-    # 読み込んだjsonファイルの各ImportItemにて、取得したQuestionコンテナーに存在して差分がない項目を抽出
-    inserted_import_items: list[ImportItem] = []
-    for inserted_question_item in inserted_question_items:
-        inserted_import_item: ImportItem = {
-            "subjects": inserted_question_item["subjects"],
-            "choices": inserted_question_item["choices"],
-            "answerNum": inserted_question_item["answerNum"],
-        }
+    # 同じ問題番号のQuestionコンテナーの項目とハッシュ値が異なる項目と、
+    # インポート時の翻訳が有効な場合は未翻訳の項目を抽出し、IMPORT_BATCH_SIZE件ごとに翻訳・upsert
+    batch_size: int = int(
+        os.getenv("IMPORT_BATCH_SIZE", str(DEFAULT_IMPORT_BATCH_SIZE))
+    )
+    throttle = AdaptiveThrottle()
+    question_items: list[Question] = []
+    changed_question_numbers: list[int] = []
+    number: int = 0
+    for number, json_import_item in enumerate(json_data, start=first_number):
+        # チェックポイントまでの要素はupsert済のため、差分判定しない
+        if checkpoint and number <= checkpoint["committedNumber"]:
+            continue
 
-        if "indicateSubjectImgIdxes" in inserted_question_item:
-            inserted_import_item["indicateSubjectImgIdxes"] = inserted_question_item[
-                "indicateSubjectImgIdxes"
-            ]
-        if "indicateChoiceImgs" in inserted_question_item:
-            inserted_import_item["indicateChoiceImgs"] = inserted_question_item[
-                "indicateChoiceImgs"
-            ]
-        if "escapeTranslatedIdxes" in inserted_question_item:
-            escape_translated_idxes = {}
-            if "subjects" in inserted_question_item["escapeTranslatedIdxes"]:
-                escape_translated_idxes["subjects"] = inserted_question_item[
-                    "escapeTranslatedIdxes"
-                ]["subjects"]
-            if "choices" in inserted_question_item["escapeTranslatedIdxes"]:
-                escape_translated_idxes["choices"] = inserted_question_item[
-                    "escapeTranslatedIdxes"
-                ]["choices"]
-            inserted_import_item["escapeTranslatedIdxes"] = escape_translated_idxes
-        if "discussions" in inserted_question_item:
-            inserted_import_item["discussions"] = inserted_question_item["discussions"]
-        inserted_import_items.append(inserted_import_item)
-    logging.info({"inserted_import_items": inserted_import_items})
-
-    # Questionコンテナーの各項目をupsert
-    # 比較的要求ユニット(RU)数が多いDB操作を行うため、upsertの合間に3秒間sleepする
-    # https://docs.microsoft.com/ja-jp/azure/cosmos-db/sql/troubleshoot-request-rate-too-large
-    for idx, json_import_item in enumerate(json_data):
-        if json_import_item not in inserted_import_items:
-            question_item: Question = {
-                **json_import_item,
-                "id": f"{test_id}_{idx + 1}",
-                "number": idx + 1,
-                "testId": test_id,
-            }
-            logging.info({"question_item": question_item})
-            container.upsert_item(question_item)
-            time.sleep(3)
+        content_hash = compute_import_item_hash(json_import_item)
+        if inserted_hashes.get(number) != content_hash:
+            question_items.append(
+                {
+                    **json_import_item,
+                    "id": f"{test_id}_{number}",
+                    "number": number,
+                    "testId": test_id,
+                    "contentHash": content_hash,
+                }
+            )
+            changed_question_numbers.append(number)
+        if len(question_items) >= batch_size:
+            upsert_question_item_batch(container, throttle, test_id, question_items)
+            question_items = []
+        if checkpoint:
+            save_import_progress(checkpoint, question_items, number, batch_size)
+    if question_items:
+        upsert_question_item_batch(container, throttle, test_id, question_items)
+
+    logging.info({"changed_question_numbers": changed_question_numbers})
+    logging.info({"upsert_question_items_stats": throttle.get_stats()})
+    return number
+
+
+def get_content_version(blob: func.InputStream) -> str | None:
+    """
+    インポートデータファイルのバージョンを取得する
+    BlobのETagを優先し、取得できない場合はContent-MD5を用いる
+    サイズでは同じサイズで内容を変更したファイルを判別できないため、いずれも取得できない場合はNoneとする
+
+    Args:
+        blob (func.InputStream): インポートデータファイル
+
+    Returns:
+        str | None: インポートデータファイルのバージョン(ETag・Content-MD5のいずれも取得できない場合はNone)
+    """
+
+    blob_properties: dict = getattr(blob, "blob_properties", None) or {}
+    content_version = blob_properties.get("ETag") or blob_properties.get("ContentMD5")
+    return str(content_version) if content_version else None
+
+
+def validate_import_item(number: int, json_import_item: Any) -> None:
+    """
+    インポートデータの要素の必須フィールドを検証する
+
+    Args:
+        number (int): 問題番号
+        json_import_item (Any): インポートデータの要素
+
+    Raises:
+        ValueError: 必須フィールドが存在しないか、型が不正な場合
+    """
+
+    if not (
+        isinstance(json_import_item, dict)
+        and isinstance(json_import_item.get("subjects"), list)
+        and isinstance(json_import_item.get("choices"), list)
+        and isinstance(json_import_item.get("answerNum"), int)
+    ):
+        raise ValueError(f"Invalid Import Item: {number}")
+
+
+def split_import_chunks(
+    blob: func.InputStream, chunk_size: int
+) -> tuple[list[dict[str, Any]], int]:
+    """
+    インポートデータファイルを先頭から1要素ずつ読み込んで検証し、chunk_size件ごとの問題番号の範囲に分割する
+
+    Args:
+        blob (func.InputStream): インポートデータファイル
+        chunk_size (int): 1つの範囲の問題数
+
+    Returns:
+        tuple[list[dict[str, Any]], int]: 各範囲の問題番号・バイト位置・バイト列のハッシュ値と、インポートデータの要素数
+
+    Raises:
+        json.JSONDecodeError: JSONの配列として不正な場合
+        ValueError: インポートデータの要素が不正な場合
+    """
+
+    stream = RetainingStream(blob)
+    chunks: list[dict[str, Any]] = []
+
+    def release_chunk() -> None:
+        # 最後の範囲のバイト列のハッシュ値を算出し、読み込んだバイト列を破棄
+        chunks[-1]["chunkHash"] = hashlib.sha256(
+            stream.release(chunks[-1]["startOffset"], chunks[-1]["endOffset"])
+        ).hexdigest()
+
+    number: int = 0
+    for number, (json_import_item, start_offset, end_offset) in enumerate(
+        iter_json_array_with_offsets(stream), start=1
+    ):
+        validate_import_item(number, json_import_item)
+        if not chunks or "chunkHash" in chunks[-1]:
+            chunks.append({"startNumber": number, "startOffset": start_offset})
+        chunks[-1].update({"endNumber": number, "endOffset": end_offset})
+        if number - chunks[-1]["startNumber"] + 1 >= chunk_size:
+            release_chunk()
+    if chunks and "chunkHash" not in chunks[-1]:
+        release_chunk()
+    return chunks, number
+
+
+def fan_out_import(
+    blob: func.InputStream,
+    course_name: str,
+    test_name: str,
+    inserted_test_item: Test | None,
+) -> None:
+    """
+    インポートデータファイルを検証し、問題番号の範囲ごとのメッセージを格納する
+    Questionコンテナーの項目は、メッセージごとにqueue_triggered_import関数が並列にupsertし、
+    Testコンテナーの項目は、最後の範囲のupsertが完了した後にupsertする
+
+    Args:
+        blob (func.InputStream): インポートデータファイル
+        course_name (str): コース名
+        test_name (str): テスト名
+        inserted_test_item (Test | None): 取得したTestコンテナーの項目(存在しない場合はNone)
+    """
+
+    # 不正なインポートデータファイルの場合は、何も書き込まずに例外を送出
+    chunks, length = split_import_chunks(
+        blob,
+        int(os.getenv("IMPORT_CHUNK_SIZE", str(DEFAULT_IMPORT_CHUNK_SIZE))),
+    )
+
+    # テストIDを確定し、要素がない場合はTestコンテナーの項目をupsert
+    test_id: str = (
+        inserted_test_item["id"] if inserted_test_item is not None else str(uuid4())
+    )
+    if not chunks:
+        upsert_test_item(
+            course_name=course_name,
+            test_name=test_name,
+            test_id=test_id,
+            inserted_test_item=inserted_test_item,
+            length=length,
+        )
+        return
+
+    # Testコンテナーの項目・テストの一覧のカタログは、すべての範囲のupsertが完了した後に更新する
+    # (新規のテストを問題数0のままテストの一覧に含めないよう、テストIDはインポートジョブで引き継ぐ)
+
+    # 範囲ごとのupsertの完了を記録するインポートジョブを作成し、範囲ごとのメッセージを格納
+    # バージョンを取得できない場合は、前回のインポートジョブと同じ内容とみなさないよう毎回異なるバージョンとする
+    content_version = get_content_version(blob) or str(uuid4())
+    import_job: ImportJob = {
+        "id": get_import_job_id(course_name, test_name, content_version),
+        "courseName": course_name,
+        "testName": test_name,
+        "contentVersion": content_version,
+        "testId": test_id,
+        "length": length,
+        "chunkCount": len(chunks),
+        "completedChunks": {},
+        "ttl": None,
+    }
+    create_import_job(import_job)
+    for chunk_index, chunk in enumerate(chunks):
+        message_import_chunk: MessageImportChunk = {
+            "jobId": import_job["id"],
+            "courseName": course_name,
+            "testName": test_name,
+            "testId": test_id,
+            "contentVersion": content_version,
+            "chunkIndex": chunk_index,
+            **chunk,
+        }
+        send_queue_message(
+            "import-chunks", json.dumps(message_import_chunk).encode("utf-8")
+        )
+    logging.info(
+        {
+            "import_job_id": import_job["id"],
+            "test_id": test_id,
+            "is_existed_test": inserted_test_item is not None,
+            "chunk_count": len(chunks),
+            "length": length,
+        }
+    )
 
 
 bp_blob_triggered_import = func.Blueprint()
@@ -168,19 +556,62 @@ def blob_triggered_import(blob: func.InputStream):
     test_name = split_path[2].split(".")[0]
     logging.info({"course_name": course_name, "test_name": test_name})
 
-    # インポートデータファイルの読込み
-    json_data: list[ImportItem] = json.loads(blob.read())
+    # Testコンテナーの項目を取得
+    inserted_test_item = get_test_item(course_name=course_name, test_name=test_name)
 
-    # Testコンテナーの項目をupsert
-    test_id, is_existed_test = upsert_test_item(
-        course_name=course_name,
-        test_name=test_name,
-        json_data=json_data,
+    # 分割インポートが有効な場合は、問題番号の範囲ごとのメッセージを格納し、各インスタンスに並列にupsertさせる
+    if os.getenv("IMPORT_FANOUT_ENABLED", "false").lower() == "true":
+        fan_out_import(blob, course_name, test_name, inserted_test_item)
+        return
+
+    # 前回のインポートのチェックポイントを取得
+    checkpoint_id = get_import_checkpoint_id(course_name, test_name)
+    saved_checkpoint = get_import_checkpoint(checkpoint_id)
+
+    # 新規のテストのインポートが中断していた場合は、upsert済のQuestionコンテナーの項目のテストIDを引き継ぐ
+    if inserted_test_item is not None:
+        test_id: str = inserted_test_item["id"]
+    elif saved_checkpoint is not None:
+        test_id = saved_checkpoint["testId"]
+    else:
+        test_id = str(uuid4())
+
+    # 同じバージョンのインポートデータファイルのインポートが中断していた場合は、upsert済の問題番号の次から再開
+    # バージョンを取得できない場合は、内容が同じであることを確かめられないため先頭からインポートする
+    content_version = get_content_version(blob)
+    is_resumed = (
+        saved_checkpoint is not None
+        and content_version is not None
+        and saved_checkpoint["contentVersion"] == content_version
+        and saved_checkpoint["testId"] == test_id
     )
+    checkpoint: ImportCheckpoint = {
+        "id": checkpoint_id,
+        "courseName": course_name,
+        "testName": test_name,
+        "contentVersion": content_version,
+        "testId": test_id,
+        "committedNumber": saved_checkpoint["committedNumber"] if is_resumed else 0,
+        "ttl": None,
+    }
+    logging.info({"checkpoint": checkpoint, "is_resumed": is_resumed})
 
-    # Questionコンテナーの項目をupsert
-    upsert_question_items(
+    # インポートデータファイルを先頭から1要素ずつ読み込み、Questionコンテナーの項目をupsert
+    length = upsert_question_items(
         test_id=test_id,
-        is_existed_test=is_existed_test,
-        json_data=json_data,
+        is_existed_test=inserted_test_item is not None or saved_checkpoint is not None,
+        json_data=iter_json_array(blob),
+        checkpoint=checkpoint,
     )
+
+    # Questionコンテナーの項目のupsert後に、Testコンテナーの項目をupsert
+    upsert_test_item(
+        course_name=course_name,
+        test_name=test_name,
+        test_id=test_id,
+        inserted_test_item=inserted_test_item,
+        length=length,
+    )
+
+    # インポートが完了したため、チェックポイントを削除
+    delete_import_checkpoint(checkpoint_id)
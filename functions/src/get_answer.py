@@ -1,15 +1,22 @@
 """[GET] /tests/{testId}/answers/{questionNumber} のモジュール"""
 
-import json
 import logging
 import traceback
 
 import azure.functions as func
-from azure.cosmos import ContainerProxy
+from azure.cosmos.aio import ContainerProxy
 from azure.cosmos.exceptions import CosmosResourceNotFoundError
 from type.cosmos import Answer
 from type.response import GetAnswerRes
-from util.cosmos import get_read_only_container
+from util.cosmos import get_async_read_only_container
+from util.http import (
+    NO_CACHE_CONTROL,
+    create_json_response,
+    create_not_modified_response,
+    get_cache_control,
+    is_not_modified,
+    make_etag,
+)
 
 bp_get_answer = func.Blueprint()
 
@@ -45,7 +52,7 @@ def validate_request(req: func.HttpRequest) -> str | None:
     methods=["GET"],
     auth_level=func.AuthLevel.FUNCTION,
 )
-def get_answer(req: func.HttpRequest) -> func.HttpResponse:
+async def get_answer(req: func.HttpRequest) -> func.HttpResponse:
     """
     指定したテストID・問題番号での正解の選択肢・正解/不正解の理由を取得します
     """
@@ -60,18 +67,24 @@ def get_answer(req: func.HttpRequest) -> func.HttpResponse:
         question_number = req.route_params.get("questionNumber")
 
         # Answerコンテナーの読み取り専用インスタンスを取得
-        answer_container: ContainerProxy = get_read_only_container(
+        answer_container: ContainerProxy = get_async_read_only_container(
             database_name="Users",
             container_name="Answer",
         )
 
         try:
             # Answerコンテナーから項目取得
-            answer_item: Answer = answer_container.read_item(
+            answer_item: Answer = await answer_container.read_item(
                 item=f"{test_id}_{question_number}", partition_key=test_id
             )
             logging.info({"answer_item": answer_item})
 
+            # 項目が変わっていない場合は、クライアントがキャッシュしたレスポンスを再利用させる
+            etag = make_etag(answer_item["_etag"])
+            cache_control = get_cache_control()
+            if is_not_modified(req, etag):
+                return create_not_modified_response(etag, cache_control)
+
             # レスポンス整形
             body: GetAnswerRes = {
                 "correctIdxes": answer_item["correctIdxes"],
@@ -81,22 +94,18 @@ def get_answer(req: func.HttpRequest) -> func.HttpResponse:
 
             logging.info({"body": body})
 
-            return func.HttpResponse(
-                body=json.dumps(body),
-                status_code=200,
-                mimetype="application/json",
-            )
+            return create_json_response(body, etag, cache_control)
         except CosmosResourceNotFoundError:
             # Answerコンテナーから項目を取得できない場合、
             # 正解の選択肢・正解/不正解の理由を除いてレスポンス
             body: GetAnswerRes = {
                 "isExisted": False,
             }
-            return func.HttpResponse(
-                body=json.dumps(body),
-                status_code=200,
-                mimetype="application/json",
-            )
+            # 後から項目が作成されうるため、毎回再検証させる
+            etag = make_etag(body)
+            if is_not_modified(req, etag):
+                return create_not_modified_response(etag, NO_CACHE_CONTROL)
+            return create_json_response(body, etag, NO_CACHE_CONTROL)
     except Exception:
         logging.error(traceback.format_exc())
         return func.HttpResponse(
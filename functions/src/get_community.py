@@ -1,15 +1,22 @@
 """[GET] /tests/{testId}/communities/{questionNumber} のモジュール"""
 
-import json
 import logging
 import traceback
 
 import azure.functions as func
-from azure.cosmos import ContainerProxy
+from azure.cosmos.aio import ContainerProxy
 from azure.cosmos.exceptions import CosmosResourceNotFoundError
 from type.cosmos import Community
 from type.response import GetCommunityRes
-from util.cosmos import get_read_only_container
+from util.cosmos import get_async_read_only_container
+from util.http import (
+    NO_CACHE_CONTROL,
+    create_json_response,
+    create_not_modified_response,
+    get_cache_control,
+    is_not_modified,
+    make_etag,
+)
 
 bp_get_community = func.Blueprint()
 
@@ -45,7 +52,7 @@ def validate_request(req: func.HttpRequest) -> str | None:
     methods=["GET"],
     auth_level=func.AuthLevel.FUNCTION,
 )
-def get_community(req: func.HttpRequest) -> func.HttpResponse:
+async def get_community(req: func.HttpRequest) -> func.HttpResponse:
     """
     指定したテストID・問題番号でのコミュニティディスカッションの要約を取得します
     """
@@ -60,18 +67,24 @@ def get_community(req: func.HttpRequest) -> func.HttpResponse:
         question_number = req.route_params.get("questionNumber")
 
         # Communityコンテナーの読み取り専用インスタンスを取得
-        container: ContainerProxy = get_read_only_container(
+        container: ContainerProxy = get_async_read_only_container(
             database_name="Users",
             container_name="Community",
         )
 
         try:
             # Communityコンテナーから項目取得
-            item: Community = container.read_item(
+            item: Community = await container.read_item(
                 item=f"{test_id}_{question_number}", partition_key=test_id
             )
             logging.info({"item": item})
 
+            # 項目が変わっていない場合は、クライアントがキャッシュしたレスポンスを再利用させる
+            etag = make_etag(item["_etag"])
+            cache_control = get_cache_control()
+            if is_not_modified(req, etag):
+                return create_not_modified_response(etag, cache_control)
+
             # レスポンス整形
             body: GetCommunityRes = {
                 "discussionsSummary": item["discussionsSummary"],
@@ -81,22 +94,18 @@ def get_community(req: func.HttpRequest) -> func.HttpResponse:
 
             logging.info({"body": body})
 
-            return func.HttpResponse(
-                body=json.dumps(body),
-                status_code=200,
-                mimetype="application/json",
-            )
+            return create_json_response(body, etag, cache_control)
         except CosmosResourceNotFoundError:
             # Communityコンテナーから項目を取得できない場合、
             # コミュニティでのディスカッションの要約を除いてレスポンス
             body: GetCommunityRes = {
                 "isExisted": False,
             }
-            return func.HttpResponse(
-                body=json.dumps(body),
-                status_code=200,
-                mimetype="application/json",
-            )
+            # 後から項目が作成されうるため、毎回再検証させる
+            etag = make_etag(body)
+            if is_not_modified(req, etag):
+                return create_not_modified_response(etag, NO_CACHE_CONTROL)
+            return create_json_response(body, etag, NO_CACHE_CONTROL)
     except Exception:
         logging.error(traceback.format_exc())
         return func.HttpResponse(
@@ -5,10 +5,10 @@ import logging
 import traceback
 
 import azure.functions as func
-from azure.cosmos import ContainerProxy
+from azure.cosmos.aio import ContainerProxy
 from azure.cosmos.exceptions import CosmosResourceNotFoundError
 from type.response import GetFavoriteRes
-from util.cosmos import get_read_only_container
+from util.cosmos import get_async_read_only_container
 
 
 def validate_request(req: func.HttpRequest) -> str | None:
@@ -49,7 +49,7 @@ bp_get_favorite = func.Blueprint()
     methods=["GET"],
     auth_level=func.AuthLevel.FUNCTION,
 )
-def get_favorite(req: func.HttpRequest) -> func.HttpResponse:
+async def get_favorite(req: func.HttpRequest) -> func.HttpResponse:
     """
     指定したテストID・問題番号・ユーザーIDでのお気に入り情報を取得します
     """
@@ -73,7 +73,7 @@ def get_favorite(req: func.HttpRequest) -> func.HttpResponse:
         )
 
         # Favoriteコンテナーのインスタンスを取得
-        container: ContainerProxy = get_read_only_container(
+        container: ContainerProxy = get_async_read_only_container(
             database_name="Users",
             container_name="Favorite",
         )
@@ -81,7 +81,7 @@ def get_favorite(req: func.HttpRequest) -> func.HttpResponse:
         # Favoriteコンテナーから項目取得してレスポンス整形
         # 項目が見つからない場合は、isFavoriteをfalseとみなす
         try:
-            item = container.read_item(
+            item = await container.read_item(
                 item=f"{user_id}_{test_id}_{question_number}", partition_key=test_id
             )
             logging.info({"item": item})
@@ -5,11 +5,11 @@ import logging
 import traceback
 
 import azure.functions as func
-from azure.cosmos import ContainerProxy
+from azure.cosmos.aio import ContainerProxy
 from azure.cosmos.exceptions import CosmosResourceNotFoundError
 from type.cosmos import Progress
 from type.response import GetProgressesRes
-from util.cosmos import get_read_only_container
+from util.cosmos import get_async_read_only_container
 
 
 def validate_request(req: func.HttpRequest) -> str | None:
@@ -46,7 +46,7 @@ bp_get_progresses = func.Blueprint()
     methods=["GET"],
     auth_level=func.AuthLevel.FUNCTION,
 )
-def get_progresses(req: func.HttpRequest) -> func.HttpResponse:
+async def get_progresses(req: func.HttpRequest) -> func.HttpResponse:
     """
     指定したテストID・ユーザーIDに対する、テストを解く問題番号の順番に対応する進捗項目を取得します
     """
@@ -68,14 +68,14 @@ def get_progresses(req: func.HttpRequest) -> func.HttpResponse:
         )
 
         # Progressコンテナーの読み取り専用インスタンスを取得
-        container: ContainerProxy = get_read_only_container(
+        container: ContainerProxy = get_async_read_only_container(
             database_name="Users",
             container_name="Progress",
         )
 
         try:
             # Progressコンテナーから項目取得
-            item: Progress = container.read_item(
+            item: Progress = await container.read_item(
                 item=f"{user_id}_{test_id}", partition_key=test_id
             )
             logging.info({"item": item})
@@ -1,15 +1,25 @@
 """[GET] /tests/{testId}/questions/{questionNumber} のモジュール"""
 
-import json
 import logging
 import traceback
 
 import azure.functions as func
-from azure.cosmos import ContainerProxy
+from azure.cosmos.aio import ContainerProxy
 from azure.cosmos.exceptions import CosmosResourceNotFoundError
 from type.cosmos import Question
 from type.response import GetQuestionRes
-from util.cosmos import get_read_only_container
+from util.cosmos import get_async_read_only_container
+from util.http import (
+    create_json_response,
+    create_not_modified_response,
+    get_cache_control,
+    is_not_modified,
+    make_etag,
+)
+from util.question_cache import get_cached_question, put_cached_question
+
+# 問題・選択肢の言語
+LANGS: tuple[str, ...] = ("en", "ja")
 
 bp_get_question = func.Blueprint()
 
@@ -37,6 +47,10 @@ def validate_request(req: func.HttpRequest) -> str | None:
     elif not question_number.isdigit():
         errors.append(f"Invalid questionNumber: {question_number}")
 
+    lang = req.params.get("lang")
+    if lang is not None and lang not in LANGS:
+        errors.append(f"Invalid lang: {lang}")
+
     return errors[0] if errors else None
 
 
@@ -45,9 +59,10 @@ def validate_request(req: func.HttpRequest) -> str | None:
     methods=["GET"],
     auth_level=func.AuthLevel.FUNCTION,
 )
-def get_question(req: func.HttpRequest) -> func.HttpResponse:
+async def get_question(req: func.HttpRequest) -> func.HttpResponse:
     """
     指定したテストID・問題番号での問題・選択肢を取得します
+    lang=jaの場合は、インポート時に日本語に翻訳した問題・選択肢を取得します
     """
 
     try:
@@ -58,21 +73,41 @@ def get_question(req: func.HttpRequest) -> func.HttpResponse:
 
         test_id = req.route_params.get("testId")
         question_number = req.route_params.get("questionNumber")
-
-        # Questionコンテナーから項目取得
-        container: ContainerProxy = get_read_only_container(
-            database_name="Users",
-            container_name="Question",
-        )
-        try:
-            item: Question = container.read_item(
-                item=f"{test_id}_{question_number}", partition_key=test_id
+        lang = req.params.get("lang", "en")
+
+        # Questionコンテナーの項目を、ワーカープロセス内のキャッシュ、Questionコンテナーの順に取得
+        # 同じ問題の画面表示ごとに問題・解答・コミュニティで同じ項目を読み込むため、キャッシュを共有する
+        item: Question | None = get_cached_question(test_id, question_number)
+        if item is None:
+            container: ContainerProxy = get_async_read_only_container(
+                database_name="Users",
+                container_name="Question",
             )
-            logging.info({"item": item})
-        except CosmosResourceNotFoundError:
-            return func.HttpResponse(body="Not Found Question", status_code=404)
+            try:
+                item = await container.read_item(
+                    item=f"{test_id}_{question_number}", partition_key=test_id
+                )
+            except CosmosResourceNotFoundError:
+                return func.HttpResponse(body="Not Found Question", status_code=404)
+            put_cached_question(test_id, question_number, item)
+        logging.info({"item": item})
+
+        # lang=jaでインポート時に翻訳済の場合は、翻訳した問題文・選択肢を翻訳不要として返す
+        is_translated: bool = (
+            lang == "ja"
+            and item.get("translatedSubjects") is not None
+            and item.get("translatedChoices") is not None
+        )
+
+        # 項目・翻訳有無が変わっていない場合は、クライアントがキャッシュしたレスポンスを再利用させる
+        etag = make_etag(item["_etag"], is_translated)
+        cache_control = get_cache_control()
+        if is_not_modified(req, etag):
+            return create_not_modified_response(etag, cache_control)
 
         # レスポンス整形
+        subjects = item["translatedSubjects"] if is_translated else item["subjects"]
+        choices = item["translatedChoices"] if is_translated else item["choices"]
         body: GetQuestionRes = {
             "subjects": [
                 {
@@ -81,13 +116,14 @@ def get_question(req: func.HttpRequest) -> func.HttpResponse:
                         item.get("indicateSubjectImgIdxes")
                         and idx in item["indicateSubjectImgIdxes"]
                     ),
-                    "isEscapedTranslation": bool(
+                    "isEscapedTranslation": is_translated
+                    or bool(
                         item.get("escapeTranslatedIdxes")
                         and item["escapeTranslatedIdxes"].get("subjects")
                         and idx in item["escapeTranslatedIdxes"]["subjects"]
                     ),
                 }
-                for idx, subject in enumerate(item["subjects"])
+                for idx, subject in enumerate(subjects)
             ],
             "choices": [
                 {
@@ -97,23 +133,20 @@ def get_question(req: func.HttpRequest) -> func.HttpResponse:
                         if item.get("indicateChoiceImgs")
                         else None
                     ),
-                    "isEscapedTranslation": bool(
+                    "isEscapedTranslation": is_translated
+                    or bool(
                         item.get("escapeTranslatedIdxes")
                         and item["escapeTranslatedIdxes"].get("choices")
                         and idx in item["escapeTranslatedIdxes"]["choices"]
                     ),
                 }
-                for idx, choice in enumerate(item["choices"])
+                for idx, choice in enumerate(choices)
             ],
             "isMultiplied": item["answerNum"] > 1,
         }
         logging.info({"body": body})
 
-        return func.HttpResponse(
-            body=json.dumps(body),
-            status_code=200,
-            mimetype="application/json",
-        )
+        return create_json_response(body, etag, cache_control)
     except Exception:
         logging.error(traceback.format_exc())
         return func.HttpResponse(body="Internal Server Error", status_code=500)
@@ -0,0 +1,201 @@
+"""[GET] /tests/{testId}/sync のモジュール"""
+
+import json
+import logging
+import os
+import time
+import traceback
+
+import azure.functions as func
+from azure.cosmos import ContainerProxy
+from azure.cosmos.exceptions import CosmosResourceNotFoundError
+from type.cosmos import Progress
+from type.response import Favorite, GetProgressesRes, GetSyncRes
+from util.cosmos import get_read_only_container
+
+# 1回のリクエストで返すお気に入り情報の最大個数の既定値
+DEFAULT_SYNC_PAGE_SIZE: int = 500
+
+
+def validate_request(req: func.HttpRequest) -> str | None:
+    """
+    リクエストのバリデーションチェックを行う
+
+    Args:
+        req (func.HttpRequest): HTTPリクエスト
+
+    Returns:
+        str | None: バリデーションチェックに成功した場合はNone、失敗した場合はエラーメッセージ
+    """
+
+    errors = []
+
+    # ルートパラメータのバリデーション
+    test_id = req.route_params.get("testId")
+    if not test_id:
+        errors.append("testId is Empty")
+
+    # クエリパラメータのバリデーション
+    since = req.params.get("since")
+    if since is not None and not since.isdigit():
+        errors.append(f"Invalid since: {since}")
+
+    # ヘッダーのバリデーション
+    user_id = req.headers.get("X-User-Id")
+    if not user_id:
+        errors.append("X-User-Id header is Empty")
+
+    return errors[0] if errors else None
+
+
+def get_changed_progress(
+    container: ContainerProxy, test_id: str, user_id: str, since: int
+) -> tuple[GetProgressesRes | None, int]:
+    """
+    ウォーターマークより後に変更したProgressコンテナーの項目をポイント読み取りで取得する
+
+    Args:
+        container (ContainerProxy): Progressコンテナーのインスタンス
+        test_id (str): テストID
+        user_id (str): ユーザーID
+        since (int): ウォーターマーク
+
+    Returns:
+        tuple[GetProgressesRes | None, int]: 変更した場合はテストを解く問題番号の順番・進捗項目、
+        変更していない場合はNoneと、項目の変更日時(項目が存在しない場合は0)
+    """
+
+    try:
+        item: Progress = container.read_item(
+            item=f"{user_id}_{test_id}", partition_key=test_id
+        )
+    except CosmosResourceNotFoundError:
+        # 初回の同期では、項目が存在しないことを同期できるよう空の問題番号の順番・進捗項目を返す
+        if since > 0:
+            return None, 0
+        return {"order": [], "progresses": []}, 0
+
+    if item["_ts"] <= since:
+        return None, item["_ts"]
+    return {
+        "order": item["order"],
+        "progresses": [
+            {
+                "isCorrect": progress["isCorrect"],
+                "selectedIdxes": progress["selectedIdxes"],
+                "correctIdxes": progress["correctIdxes"],
+            }
+            for progress in item["progresses"]
+        ],
+    }, item["_ts"]
+
+
+bp_get_sync = func.Blueprint()
+
+
+@bp_get_sync.route(
+    route="tests/{testId}/sync",
+    methods=["GET"],
+    auth_level=func.AuthLevel.FUNCTION,
+)
+def get_sync(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    指定したテストID・ユーザーIDでの、ウォーターマークより後に変更した進捗項目・お気に入り情報を取得します
+    """
+
+    try:
+        # バリデーションチェック
+        error_message = validate_request(req)
+        if error_message:
+            return func.HttpResponse(body=error_message, status_code=400)
+
+        test_id = req.route_params.get("testId")
+        user_id = req.headers.get("X-User-Id")
+        since = int(req.params.get("since", "0"))
+        continuation_token = req.params.get("continuationToken")
+
+        logging.info(
+            {
+                "continuation_token": continuation_token,
+                "since": since,
+                "test_id": test_id,
+                "user_id": user_id,
+            }
+        )
+
+        # Favoriteコンテナーから、変更日時(_ts)のインデックスを使ってウォーターマークより後に変更した項目のみ、
+        # 変更日時の昇順に1ページ分取得する
+        favorite_container: ContainerProxy = get_read_only_container(
+            database_name="Users",
+            container_name="Favorite",
+        )
+        pager = favorite_container.query_items(
+            query=(
+                "SELECT c.questionNumber, c.isFavorite, c._ts FROM c "
+                "WHERE c.userId = @userId AND c._ts > @since ORDER BY c._ts ASC"
+            ),
+            parameters=[
+                {"name": "@userId", "value": user_id},
+                {"name": "@since", "value": since},
+            ],
+            partition_key=test_id,
+            max_item_count=int(
+                os.getenv("SYNC_PAGE_SIZE", str(DEFAULT_SYNC_PAGE_SIZE))
+            ),
+        ).by_page(continuation_token)
+        favorite_items = list(next(pager, []))
+        next_continuation_token: str | None = pager.continuation_token
+        watermark = max([since] + [item["_ts"] for item in favorite_items])
+
+        # お気に入り情報の最後のページでのみ、Progressコンテナーの項目をポイント読み取りで取得する
+        # (続きのページより先にウォーターマークを進めないため)
+        progress: GetProgressesRes | None = None
+        if not next_continuation_token:
+            progress, progress_ts = get_changed_progress(
+                get_read_only_container(
+                    database_name="Users",
+                    container_name="Progress",
+                ),
+                test_id,
+                user_id,
+                since,
+            )
+            watermark = max(watermark, progress_ts)
+
+        # _tsは秒単位のため、同じ秒の後続の変更を取りこぼさないよう、
+        # ウォーターマークは経過済の秒までに留める(留めた秒の項目は次回の同期で再度返す)
+        watermark = max(since, min(watermark, int(time.time()) - 1))
+
+        # レスポンス整形
+        favorites: list[Favorite] = [
+            {
+                "questionNumber": item["questionNumber"],
+                "isFavorite": item["isFavorite"],
+            }
+            for item in favorite_items
+        ]
+        body: GetSyncRes = {
+            "progress": progress,
+            "favorites": favorites,
+            "watermark": watermark,
+            "continuationToken": next_continuation_token or None,
+        }
+        logging.info(
+            {
+                "favorite_num": len(favorites),
+                "has_progress": progress is not None,
+                "watermark": watermark,
+            }
+        )
+
+        return func.HttpResponse(
+            body=json.dumps(body),
+            status_code=200,
+            mimetype="application/json",
+        )
+    except Exception:
+        logging.error(traceback.format_exc())
+        return func.HttpResponse(
+            body="Internal Server Error",
+            status_code=500,
+        )
@@ -1,71 +1,119 @@
 """[GET] /tests のモジュール"""
 
-import json
 import logging
 import os
 import traceback
 
 import azure.functions as func
-from azure.cosmos import ContainerProxy
-from type.cosmos import Test
+from azure.cosmos.aio import ContainerProxy
+from azure.cosmos.exceptions import CosmosResourceNotFoundError
+from type.cosmos import Test, TestsCatalog
 from type.response import GetTestsRes
-from util.cosmos import get_read_only_container
+from util.catalog import CATALOG_TESTS_ID
+from util.cosmos import get_async_read_only_container
+from util.http import (
+    create_json_response,
+    create_not_modified_response,
+    get_cache_control,
+    is_not_modified,
+    make_etag,
+)
 
 bp_get_tests = func.Blueprint()
 
 
+async def get_tests_catalog() -> TestsCatalog | None:
+    """
+    Catalogコンテナーから、コース名・テスト名の昇順に並べたテストの一覧の項目を取得する
+
+    Returns:
+        TestsCatalog | None: テストの一覧の項目(存在しない場合はNone)
+    """
+
+    container: ContainerProxy = get_async_read_only_container(
+        database_name="Users",
+        container_name="Catalog",
+    )
+    try:
+        catalog: TestsCatalog = await container.read_item(
+            item=CATALOG_TESTS_ID, partition_key=CATALOG_TESTS_ID
+        )
+    except CosmosResourceNotFoundError:
+        logging.warning({"tests_catalog": None})
+        return None
+    return catalog
+
+
+async def query_tests() -> GetTestsRes:
+    """
+    Testコンテナーの全項目を取得し、コース名ごとにまとめる
+
+    Returns:
+        GetTestsRes: テストの一覧
+    """
+
+    # Testコンテナーの読み取り専用インスタンスを取得
+    container: ContainerProxy = get_async_read_only_container(
+        database_name="Users",
+        container_name="Test",
+    )
+
+    # Testコンテナーから全項目取得
+    # Azure Cosmos DBでは複合インデックスのインデックスポリシーをサポートするが
+    # 2024/11/24現在、Azure Cosmos DB Linux-based Emulator (preview)では未サポートのため、
+    # Azure環境の場合のみcourseNameとtestNameで昇順ソートするが、ローカル環境ではソートしない
+    if os.environ.get("COSMOSDB_URI") == "http://localhost:8081":
+        items: list[Test] = [item async for item in container.read_all_items()]
+    else:
+        query = "SELECT * FROM c ORDER BY c.courseName ASC, c.testName ASC"
+        items: list[Test] = [item async for item in container.query_items(query=query)]
+
+    logging.info({"items": items})
+
+    # 各項目をcourseName単位でまとめるようにレスポンス整形
+    body: GetTestsRes = {}
+    for item in items:
+        tmp_item = {
+            "id": item["id"],
+            "testName": item["testName"],
+            "length": item["length"],
+        }
+        if item["courseName"] in body:
+            body[item["courseName"]].append(tmp_item)
+        else:
+            body[item["courseName"]] = [tmp_item]
+    return body
+
+
 @bp_get_tests.route(
     route="tests",
     methods=["GET"],
     auth_level=func.AuthLevel.FUNCTION,
 )
-def get_tests(
-    req: func.HttpRequest,  # pylint: disable=unused-argument
-) -> func.HttpResponse:
+async def get_tests(req: func.HttpRequest) -> func.HttpResponse:
     """
     各コースに属するテストをすべて取得します
     """
 
     try:
-        # Testコンテナーの読み取り専用インスタンスを取得
-        container: ContainerProxy = get_read_only_container(
-            database_name="Users",
-            container_name="Test",
-        )
-
-        # Testコンテナーから全項目取得
-        # Azure Cosmos DBでは複合インデックスのインデックスポリシーをサポートするが
-        # 2024/11/24現在、Azure Cosmos DB Linux-based Emulator (preview)では未サポートのため、
-        # Azure環境の場合のみcourseNameとtestNameで昇順ソートするが、ローカル環境ではソートしない
-        if os.environ.get("COSMOSDB_URI") == "http://localhost:8081":
-            items: list[Test] = list(container.read_all_items())
+        # Catalogコンテナーから、インポート時に生成したテストの一覧を1回のポイント読取りで取得
+        # 存在しない場合は、Testコンテナーの全項目から生成する
+        cache_control = get_cache_control()
+        catalog = await get_tests_catalog()
+        if catalog is not None:
+            # テストの一覧が変わっていない場合は、クライアントがキャッシュしたレスポンスを再利用させる
+            etag = make_etag(catalog["_etag"])
+            if is_not_modified(req, etag):
+                return create_not_modified_response(etag, cache_control)
+            body: GetTestsRes = catalog["courses"]
         else:
-            query = "SELECT * FROM c ORDER BY c.courseName ASC, c.testName ASC"
-            items: list[Test] = list(
-                container.query_items(query=query, enable_cross_partition_query=True)
-            )
-
-        logging.info({"items": items})
-
-        # 各項目をcourseName単位でまとめるようにレスポンス整形
-        body: GetTestsRes = {}
-        for item in items:
-            tmp_item = {
-                "id": item["id"],
-                "testName": item["testName"],
-                "length": item["length"],
-            }
-            if item["courseName"] in body:
-                body[item["courseName"]].append(tmp_item)
-            else:
-                body[item["courseName"]] = [tmp_item]
+            body = await query_tests()
+            etag = make_etag(body)
+            if is_not_modified(req, etag):
+                return create_not_modified_response(etag, cache_control)
         logging.info({"body": body})
 
-        return func.HttpResponse(
-            body=json.dumps(body),
-            status_code=200,
-            mimetype="application/json",
-        )
+        return create_json_response(body, etag, cache_control)
     except Exception:
         logging.error(traceback.format_exc())
         return func.HttpResponse(body="Internal Server Error", status_code=500)
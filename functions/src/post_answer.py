@@ -9,24 +9,31 @@ from typing import Iterable
 import azure.functions as func
 from azure.cosmos import ContainerProxy
 from azure.cosmos.exceptions import CosmosResourceNotFoundError
-from openai import AzureOpenAI
 from openai.types.chat.chat_completion_content_part_param import (
     ChatCompletionContentPartParam,
 )
 from openai.types.chat.chat_completion_message_param import ChatCompletionMessageParam
-from type.cosmos import Question
+from type.cosmos import Answer, Question
 from type.message import MessageAnswer
 from type.openai import CorrectAnswers
 from type.response import PostAnswerRes
 from type.structured import AnswerFormat
 from util.cosmos import get_read_only_container
-from util.queue import get_queue_client
+from util.hashing import compute_question_hash
+from util.lease import acquire_or_wait_for_lease, complete_lease, release_lease
+from util.openai import get_openai_client
+from util.question_cache import get_cached_question, put_cached_question
+from util.queue import send_queue_message
+from util.singleflight import SingleFlight
 
 MAX_RETRY_NUMBER: int = 5
 SYSTEM_PROMPT: str = (
     "You are a professional who provides correct explanations for candidates of the exam."
 )
 
+# ワーカープロセス内で同一の問題の正解の選択肢・正解/不正解の理由の生成を1回にまとめる
+_single_flight: SingleFlight[PostAnswerRes] = SingleFlight()
+
 
 def validate_request(req: func.HttpRequest) -> str | None:
     """
@@ -51,9 +58,47 @@ def validate_request(req: func.HttpRequest) -> str | None:
     elif not question_number.isdigit():
         errors.append(f"Invalid questionNumber: {question_number}")
 
+    force = req.params.get("force")
+    if force is not None and force not in ("true", "false"):
+        errors.append(f"Invalid force: {force}")
+
     return errors[0] if errors else None
 
 
+def get_cached_answer(
+    test_id: str, question_number: str, item: Question
+) -> Answer | None:
+    """
+    Answerコンテナーに保存済の項目のうち、現在のQuestionコンテナーの項目から生成した項目を取得する
+
+    Args:
+        test_id (str): テストID
+        question_number (str): 問題番号
+        item (Question): 現在のQuestionコンテナーの項目
+
+    Returns:
+        Answer | None: 現在のQuestionコンテナーの項目から生成したAnswerコンテナーの項目(存在しない場合はNone)
+    """
+
+    container: ContainerProxy = get_read_only_container(
+        database_name="Users",
+        container_name="Answer",
+    )
+    try:
+        answer_item: Answer = container.read_item(
+            item=f"{test_id}_{question_number}", partition_key=test_id
+        )
+    except CosmosResourceNotFoundError:
+        return None
+
+    # 生成後に問題文・選択肢などが更新された場合や、ハッシュ値が未保存の場合は再生成させる
+    if answer_item.get("questionHash") != compute_question_hash(item):
+        logging.info({"stale_answer_item": answer_item})
+        return None
+
+    return answer_item
+
+
 def create_chat_completions_messages(
     subjects: list[str],
     choices: list[str | None],
@@ -249,12 +294,7 @@ def generate_correct_answers(
             logging.info({"retry_number": retry_number})
 
             # AnswerFormatのStructuredOutputでAzure OpenAIのチャット補完を実行
-            response = AzureOpenAI(
-                api_key=os.environ["OPENAI_API_KEY"],
-                api_version=os.environ["OPENAI_API_VERSION"],
-                azure_deployment=os.environ["OPENAI_DEPLOYMENT_NAME"],
-                azure_endpoint=os.environ["OPENAI_ENDPOINT"],
-            ).beta.chat.completions.parse(
+            response = get_openai_client().beta.chat.completions.parse(
                 model=os.environ["OPENAI_MODEL_NAME"],
                 messages=messages,
                 response_format=AnswerFormat,
@@ -282,9 +322,80 @@ def queue_message_answer(message_answer: MessageAnswer) -> None:
         message_answer (MessageAnswer): Answerコンテナーの項目用のメッセージ
     """
 
-    queue_client = get_queue_client("answers")
     logging.info({"message_answer": message_answer})
-    queue_client.send_message(json.dumps(message_answer).encode("utf-8"))
+    send_queue_message("answers", json.dumps(message_answer).encode("utf-8"))
+
+
+def generate_answer(
+    test_id: str, question_number: str, item: Question, force: bool = False
+) -> PostAnswerRes:
+    """
+    正解の選択肢・正解/不正解の理由を生成し、キューストレージにメッセージを格納する
+    他のインスタンスが同一の問題を生成中の場合は、生成せずにAnswerコンテナーへの保存を待って返す
+
+    Args:
+        test_id (str): テストID
+        question_number (str): 問題番号
+        item (Question): Questionコンテナーの項目
+        force (bool): 他のインスタンスが生成を終えたリースを上書きして強制的に再生成する場合はTrue
+
+    Returns:
+        PostAnswerRes: レスポンスボディ
+    """
+
+    # 他のインスタンスがリースを保持している場合は、その生成結果の保存を待つ
+    # 生成結果を取得できずにリースが解放・失効した場合は、リースを取得し直してから自身で生成する
+    lease_key = f"answers_{test_id}_{question_number}"
+
+    def fetch(since: int) -> Answer | None:
+        answer_item = get_cached_answer(test_id, question_number, item)
+        if answer_item is None or answer_item.get("_ts", 0) < since:
+            return None
+        return answer_item
+
+    lease_etag, answer_item = acquire_or_wait_for_lease(lease_key, fetch, force)
+    if answer_item is not None:
+        return {
+            "correctIdxes": answer_item["correctIdxes"],
+            "explanations": answer_item["explanations"],
+            "isCached": True,
+        }
+
+    # 正解の選択肢・正解/不正解の理由を生成
+    # 生成に失敗した場合はリースを解放し、成功した場合は完了済にして、
+    # Answerコンテナーへの保存まで有効期限内は他のインスタンスに待たせる
+    try:
+        correct_answers: CorrectAnswers | None = generate_correct_answers(
+            item.get("subjects"),
+            item.get("choices"),
+            item.get("answerNum"),
+            item.get("indicateSubjectImgIdxes"),
+            item.get("indicateChoiceImgs"),
+        )
+        if correct_answers is None:
+            raise ValueError("Failed to generate correct answers")
+    except Exception:
+        release_lease(lease_key, lease_etag)
+        raise
+    complete_lease(lease_key, lease_etag)
+
+    # キューストレージにメッセージを格納
+    message_answer: MessageAnswer = {
+        "testId": test_id,
+        "questionNumber": int(question_number),
+        "subjects": item.get("subjects"),
+        "choices": item.get("choices"),
+        "answerNum": item.get("answerNum"),
+        "correctIdxes": correct_answers["correct_indexes"],
+        "explanations": correct_answers["explanations"],
+    }
+    queue_message_answer(message_answer)
+
+    return {
+        "correctIdxes": correct_answers["correct_indexes"],
+        "explanations": correct_answers["explanations"],
+        "isCached": False,
+    }
 
 
 bp_post_answer = func.Blueprint()
@@ -298,6 +409,7 @@ bp_post_answer = func.Blueprint()
 def post_answer(req: func.HttpRequest) -> func.HttpResponse:
     """
     英語の正解の選択肢・正解/不正解の理由を生成します
+    Answerコンテナーに現在の問題から生成した項目が保存済の場合は、force=trueを指定しない限り生成せずに返します
     """
 
     try:
@@ -308,54 +420,56 @@ def post_answer(req: func.HttpRequest) -> func.HttpResponse:
 
         test_id = req.route_params.get("testId")
         question_number = req.route_params.get("questionNumber")
+        force = req.params.get("force") == "true"
 
         logging.info(
             {
                 "question_number": question_number,
                 "test_id": test_id,
+                "force": force,
             }
         )
 
-        # Questionコンテナーの項目を取得
-        container: ContainerProxy = get_read_only_container(
-            database_name="Users",
-            container_name="Question",
-        )
-        try:
-            item: Question = container.read_item(
-                item=f"{test_id}_{question_number}", partition_key=test_id
+        # Questionコンテナーの項目を、ワーカープロセス内のキャッシュ、Questionコンテナーの順に取得
+        # 同じ問題の画面表示ごとに問題・解答・コミュニティで同じ項目を読み込むため、キャッシュを共有する
+        item: Question | None = get_cached_question(test_id, question_number)
+        if item is None:
+            container: ContainerProxy = get_read_only_container(
+                database_name="Users",
+                container_name="Question",
             )
-            logging.info({"item": item})
-        except CosmosResourceNotFoundError:
-            return func.HttpResponse(body="Not Found Question", status_code=404)
+            try:
+                item = container.read_item(
+                    item=f"{test_id}_{question_number}", partition_key=test_id
+                )
+            except CosmosResourceNotFoundError:
+                return func.HttpResponse(body="Not Found Question", status_code=404)
+            put_cached_question(test_id, question_number, item)
+        logging.info({"item": item})
+
+        # 強制的に再生成しない場合、Answerコンテナーに保存済の項目があればそれを返す
+        if not force:
+            answer_item: Answer | None = get_cached_answer(
+                test_id, question_number, item
+            )
+            if answer_item is not None:
+                body: PostAnswerRes = {
+                    "correctIdxes": answer_item["correctIdxes"],
+                    "explanations": answer_item["explanations"],
+                    "isCached": True,
+                }
+                return func.HttpResponse(
+                    body=json.dumps(body),
+                    status_code=200,
+                )
 
         # 正解の選択肢・正解/不正解の理由を生成
-        correct_answers: CorrectAnswers | None = generate_correct_answers(
-            item.get("subjects"),
-            item.get("choices"),
-            item.get("answerNum"),
-            item.get("indicateSubjectImgIdxes"),
-            item.get("indicateChoiceImgs"),
+        # 同一の問題への同時リクエストは1回の生成にまとめる
+        # force=trueのリクエストは、実行中の再生成しないリクエストの結果を共有しないようキーを分ける
+        body = _single_flight.do(
+            f"{test_id}_{question_number}_{force}",
+            lambda: generate_answer(test_id, question_number, item, force),
         )
-        if correct_answers is None:
-            raise ValueError("Failed to generate correct answers")
-
-        # キューストレージにメッセージを格納
-        message_answer: MessageAnswer = {
-            "testId": test_id,
-            "questionNumber": int(question_number),
-            "subjects": item.get("subjects"),
-            "choices": item.get("choices"),
-            "answerNum": item.get("answerNum"),
-            "correctIdxes": correct_answers["correct_indexes"],
-            "explanations": correct_answers["explanations"],
-        }
-        queue_message_answer(message_answer)
-
-        body: PostAnswerRes = {
-            "correctIdxes": correct_answers["correct_indexes"],
-            "explanations": correct_answers["explanations"],
-        }
         return func.HttpResponse(
             body=json.dumps(body),
             status_code=200,
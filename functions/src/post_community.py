@@ -8,12 +8,15 @@ import traceback
 import azure.functions as func
 from azure.cosmos import ContainerProxy
 from azure.cosmos.exceptions import CosmosResourceNotFoundError
-from openai import AzureOpenAI
-from type.cosmos import Question, QuestionDiscussion
+from type.cosmos import Community, Discussion, Question, QuestionDiscussion
 from type.message import MessageCommunity
 from type.response import PostCommunityRes
 from util.cosmos import get_read_only_container
-from util.queue import get_queue_client
+from util.lease import acquire_or_wait_for_lease, complete_lease, release_lease
+from util.openai import get_openai_client
+from util.question_cache import get_cached_question, put_cached_question
+from util.queue import send_queue_message
+from util.singleflight import SingleFlight
 
 MAX_RETRY_NUMBER: int = 5
 SYSTEM_PROMPT: str = (
@@ -21,6 +24,9 @@ SYSTEM_PROMPT: str = (
     "of community discussions."
 )
 
+# ワーカープロセス内で同一の問題のディスカッション要約の生成を1回にまとめる
+_single_flight: SingleFlight[PostCommunityRes] = SingleFlight()
+
 
 def calculate_community_votes(discussions: list[QuestionDiscussion]) -> list[str]:
     """
@@ -151,12 +157,7 @@ def generate_discussion_summary(discussions: list[QuestionDiscussion]) -> str |
             logging.info({"retry_number": retry_number})
 
             # Azure OpenAIのチャット補完を実行
-            response = AzureOpenAI(
-                api_key=os.environ["OPENAI_API_KEY"],
-                api_version=os.environ["OPENAI_API_VERSION"],
-                azure_deployment=os.environ["OPENAI_DEPLOYMENT_NAME"],
-                azure_endpoint=os.environ["OPENAI_ENDPOINT"],
-            ).chat.completions.create(
+            response = get_openai_client().chat.completions.create(
                 model=os.environ["OPENAI_MODEL_NAME"],
                 messages=[
                     {
@@ -189,9 +190,133 @@ def queue_message_community(message_community: MessageCommunity) -> None:
         message_community (MessageCommunity): Communityコンテナーの項目用のメッセージ
     """
 
-    queue_client = get_queue_client("communities")
     logging.info({"message_community": message_community})
-    queue_client.send_message(json.dumps(message_community).encode("utf-8"))
+    send_queue_message("communities", json.dumps(message_community).encode("utf-8"))
+
+
+def get_community_item(
+    test_id: str, question_number: str, since: int
+) -> Community | None:
+    """
+    指定した時刻以降に保存したCommunityコンテナーの項目を取得する
+
+    Args:
+        test_id (str): テストID
+        question_number (str): 問題番号
+        since (int): UNIX時間(秒)
+
+    Returns:
+        Community | None: 指定した時刻以降に保存したCommunityコンテナーの項目(存在しない場合はNone)
+    """
+
+    container: ContainerProxy = get_read_only_container(
+        database_name="Users",
+        container_name="Community",
+    )
+    try:
+        community_item: Community = container.read_item(
+            item=f"{test_id}_{question_number}", partition_key=test_id
+        )
+    except CosmosResourceNotFoundError:
+        return None
+
+    return community_item if community_item.get("_ts", 0) >= since else None
+
+
+def get_discussions(
+    test_id: str, question_number: str, item: Question
+) -> list[QuestionDiscussion]:
+    """
+    Questionコンテナーの項目に対応する、コミュニティのディスカッションを取得する
+    Discussionコンテナーへの移行前の項目の場合は、そのdiscussionsフィールドを返す
+
+    Args:
+        test_id (str): テストID
+        question_number (str): 問題番号
+        item (Question): Questionコンテナーの項目
+
+    Returns:
+        list[QuestionDiscussion]: コミュニティのディスカッション(存在しない場合は空のリスト)
+    """
+
+    if "discussions" in item:
+        return item["discussions"] or []
+    if not item.get("discussionNum"):
+        return []
+
+    container: ContainerProxy = get_read_only_container(
+        database_name="Users",
+        container_name="Discussion",
+    )
+    try:
+        discussion_item: Discussion = container.read_item(
+            item=f"{test_id}_{question_number}", partition_key=test_id
+        )
+    except CosmosResourceNotFoundError:
+        return []
+
+    return discussion_item["discussions"]
+
+
+def generate_community(
+    test_id: str, question_number: str, discussions: list[QuestionDiscussion]
+) -> PostCommunityRes:
+    """
+    ディスカッション要約を生成し、キューストレージにメッセージを格納する
+    他のインスタンスが同一の問題を生成中の場合は、生成せずにCommunityコンテナーへの保存を待って返す
+
+    Args:
+        test_id (str): テストID
+        question_number (str): 問題番号
+        discussions (list[QuestionDiscussion]): コミュニティのディスカッション
+
+    Returns:
+        PostCommunityRes: レスポンスボディ
+    """
+
+    # 他のインスタンスがリースを保持している場合は、その生成結果の保存を待つ
+    # 生成結果を取得できずにリースが解放・失効した場合は、リースを取得し直してから自身で生成する
+    lease_key = f"communities_{test_id}_{question_number}"
+    lease_etag, community_item = acquire_or_wait_for_lease(
+        lease_key, lambda since: get_community_item(test_id, question_number, since)
+    )
+    if community_item is not None:
+        return {
+            "discussionsSummary": community_item["discussionsSummary"],
+            "votes": community_item["votes"],
+            "isExisted": True,
+        }
+
+    # ディスカッション要約を生成
+    # 生成に失敗した場合はリースを解放し、成功した場合は完了済にして、
+    # Communityコンテナーへの保存まで有効期限内は他のインスタンスに待たせる
+    try:
+        summary: str | None = generate_discussion_summary(discussions)
+        if summary is None:
+            raise ValueError("Failed to generate discussion summary")
+    except Exception:
+        release_lease(lease_key, lease_etag)
+        raise
+    complete_lease(lease_key, lease_etag)
+
+    # コミュニティでの回答の割合を動的算出
+    votes: list[str] = calculate_community_votes(discussions)
+
+    # キューストレージにメッセージを格納
+    queue_message_community(
+        {
+            "testId": test_id,
+            "questionNumber": int(question_number),
+            "discussionsSummary": summary,
+            "votes": votes,
+        }
+    )
+
+    return {
+        "discussionsSummary": summary,
+        "votes": votes,
+        "isExisted": True,
+    }
 
 
 bp_post_community = func.Blueprint()
@@ -223,44 +348,35 @@ def post_community(req: func.HttpRequest) -> func.HttpResponse:
             }
         )
 
-        # Questionコンテナーの項目を取得
-        container: ContainerProxy = get_read_only_container(
-            database_name="Users",
-            container_name="Question",
-        )
-        try:
-            item: Question = container.read_item(
-                item=f"{test_id}_{question_number}", partition_key=test_id
+        # Questionコンテナーの項目を、ワーカープロセス内のキャッシュ、Questionコンテナーの順に取得
+        # 同じ問題の画面表示ごとに問題・解答・コミュニティで同じ項目を読み込むため、キャッシュを共有する
+        item: Question | None = get_cached_question(test_id, question_number)
+        if item is None:
+            container: ContainerProxy = get_read_only_container(
+                database_name="Users",
+                container_name="Question",
             )
-            logging.info({"item": item})
-        except CosmosResourceNotFoundError:
-            return func.HttpResponse(body="Not Found Question", status_code=404)
-
-        # discussionsフィールドが存在する場合はディスカッション要約を生成(存在しない場合は空文字列)
-        discussions: list[QuestionDiscussion] | None = item.get("discussions")
+            try:
+                item = container.read_item(
+                    item=f"{test_id}_{question_number}", partition_key=test_id
+                )
+            except CosmosResourceNotFoundError:
+                return func.HttpResponse(body="Not Found Question", status_code=404)
+            put_cached_question(test_id, question_number, item)
+        logging.info({"item": item})
+
+        # ディスカッションが存在する場合はディスカッション要約を生成(存在しない場合は空文字列)
+        # 同一の問題への同時リクエストは1回の生成にまとめる
+        discussions: list[QuestionDiscussion] = get_discussions(
+            test_id, question_number, item
+        )
         body: PostCommunityRes = {
             "isExisted": False,
         }
-
         if discussions and len(discussions) > 0:
-            # ディスカッション要約を生成
-            summary: str | None = generate_discussion_summary(discussions)
-            # コミュニティでの回答の割合を動的算出
-            votes: list[str] = calculate_community_votes(discussions)
-            if summary is None:
-                raise ValueError("Failed to generate discussion summary")
-            body["discussionsSummary"] = summary
-            body["votes"] = votes
-            body["isExisted"] = True
-
-            # キューストレージにメッセージを格納
-            queue_message_community(
-                {
-                    "testId": test_id,
-                    "questionNumber": int(question_number),
-                    "discussionsSummary": summary,
-                    "votes": votes,
-                }
+            body = _single_flight.do(
+                f"{test_id}_{question_number}",
+                lambda: generate_community(test_id, question_number, discussions),
             )
 
         return func.HttpResponse(
@@ -3,15 +3,20 @@
 import json
 import logging
 import traceback
-from typing import List, Optional
+from typing import Any, Optional
 
 import azure.functions as func
+from azure.core import MatchConditions
 from azure.cosmos import ContainerProxy
-from azure.cosmos.exceptions import CosmosResourceNotFoundError
+from azure.cosmos.exceptions import (
+    CosmosAccessConditionFailedError,
+    CosmosResourceNotFoundError,
+)
 from type.cosmos import Progress, ProgressElement
 from type.request import PostProgressReq
 from type.response import PostProgressRes
 from util.cosmos import get_read_write_container
+from util.progress import MAX_CONFLICT_RETRY_NUMBER
 
 
 def _validate_list_field(field_name: str, field_value, expected_type=str) -> list:
@@ -122,6 +127,70 @@ def validate_headers(headers: dict) -> list:
     return errors
 
 
+def validate_question_number(item: Progress, question_number: int) -> str | None:
+    """
+    指定した問題番号が、テストを解く問題番号の順番における、
+    最後に保存した回答履歴の問題番号、またはその次の問題番号であるかのチェックを行う
+
+    Args:
+        item (Progress): Progressコンテナーの項目
+        question_number (int): 問題番号
+
+    Returns:
+        str | None: チェックに失敗した場合はエラーメッセージ、成功した場合はNone
+    """
+
+    current_question_number: Optional[int] = (
+        item["order"][len(item["progresses"]) - 1]
+        if len(item["progresses"]) > 0
+        else None
+    )
+    next_question_number: Optional[int] = (
+        item["order"][len(item["progresses"])]
+        if len(item["progresses"]) < len(item["order"])
+        else None
+    )
+    logging.info(
+        {
+            "current_question_number": current_question_number,
+            "next_question_number": next_question_number,
+        }
+    )
+    if question_number in (current_question_number, next_question_number):
+        return None
+
+    msg: str = "questionNumber must be "
+    if len(item["progresses"]) == 0:
+        msg += f"{next_question_number}"
+    elif next_question_number is None:
+        msg += f"{current_question_number}"
+    else:
+        msg += f"{current_question_number} or {next_question_number}"
+    return msg
+
+
+def create_patch_operation(
+    item: Progress, question_number: int, progress: ProgressElement
+) -> dict[str, Any]:
+    """
+    指定した問題番号が、最後に保存した問題番号と同じ場合は最後の回答履歴を更新し、
+    その次の問題番号の場合は回答履歴を末尾に追加する、部分的な更新の操作を生成する
+
+    Args:
+        item (Progress): Progressコンテナーの項目
+        question_number (int): 問題番号(validate_question_numberでチェック済)
+        progress (ProgressElement): 回答履歴
+
+    Returns:
+        dict[str, Any]: 部分的な更新の操作
+    """
+
+    last_idx = len(item["progresses"]) - 1
+    if last_idx >= 0 and item["order"][last_idx] == question_number:
+        return {"op": "set", "path": f"/progresses/{last_idx}", "value": progress}
+    return {"op": "add", "path": "/progresses/-", "value": progress}
+
+
 bp_post_progress = func.Blueprint()
 
 
@@ -164,72 +233,42 @@ def post_progress(req: func.HttpRequest) -> func.HttpResponse:
             container_name="Progress",
         )
 
-        # テストを解く問題番号の順番を保存しているかのチェック
-        try:
-            item: Progress = container.read_item(
-                item=f"{user_id}_{test_id}", partition_key=test_id
-            )
-        except CosmosResourceNotFoundError:
-            return func.HttpResponse(body="Progress Not exists", status_code=400)
-
-        # 指定した問題番号が、テストを解く問題番号の順番における、
-        # 最後に保存した回答履歴の問題番号、またはその次の問題番号であるかのチェック
-        current_question_number: Optional[int] = (
-            item["order"][len(item["progresses"]) - 1]
-            if len(item["progresses"]) > 0
-            else None
-        )
-        next_question_number: Optional[int] = (
-            item["order"][len(item["progresses"])]
-            if len(item["progresses"]) < len(item["order"])
-            else None
-        )
-        logging.info(
-            {
-                "current_question_number": current_question_number,
-                "next_question_number": next_question_number,
-            }
-        )
-        if question_number not in (current_question_number, next_question_number):
-            msg: str = "questionNumber must be "
-            if len(item["progresses"]) == 0:
-                msg += f"{next_question_number}"
-            elif next_question_number is None:
-                msg += f"{current_question_number}"
-            else:
-                msg += f"{current_question_number} or {next_question_number}"
-            return func.HttpResponse(body=msg, status_code=400)
-
+        # 回答履歴を、Progressコンテナーの項目の部分的な更新で追加・更新する
+        # 取得後に他のリクエストが更新した場合は、取得し直してから最大MAX_CONFLICT_RETRY_NUMBER回まで更新し直す
         req_body: PostProgressReq = json.loads(req_body_encoded.decode("utf-8"))
-
-        # 指定した問題番号が、最後に保存した問題番号と同じ場合はupdate、
-        # その次の問題番号の場合はinsertするように、Progressコンテナーの項目を生成
-        updated_progresses: List[ProgressElement] = item["progresses"]
-        if question_number == current_question_number:
-            updated_progresses[len(item["progresses"]) - 1] = {
-                "isCorrect": req_body.get("isCorrect"),
-                "selectedIdxes": req_body.get("selectedIdxes"),
-                "correctIdxes": req_body.get("correctIdxes"),
-            }
+        new_progress: ProgressElement = {
+            "isCorrect": req_body.get("isCorrect"),
+            "selectedIdxes": req_body.get("selectedIdxes"),
+            "correctIdxes": req_body.get("correctIdxes"),
+        }
+        for _ in range(MAX_CONFLICT_RETRY_NUMBER):
+            # テストを解く問題番号の順番を保存しているかのチェック
+            try:
+                item: Progress = container.read_item(
+                    item=f"{user_id}_{test_id}", partition_key=test_id
+                )
+            except CosmosResourceNotFoundError:
+                return func.HttpResponse(body="Progress Not exists", status_code=400)
+
+            error_message = validate_question_number(item, question_number)
+            if error_message:
+                return func.HttpResponse(body=error_message, status_code=400)
+
+            try:
+                updated_item: Progress = container.patch_item(
+                    item=f"{user_id}_{test_id}",
+                    partition_key=test_id,
+                    patch_operations=[
+                        create_patch_operation(item, question_number, new_progress)
+                    ],
+                    etag=item["_etag"],
+                    match_condition=MatchConditions.IfNotModified,
+                )
+                break
+            except CosmosAccessConditionFailedError:
+                logging.warning({"conflicted_progress_id": f"{user_id}_{test_id}"})
         else:
-            updated_progresses.append(
-                {
-                    "isCorrect": req_body.get("isCorrect"),
-                    "selectedIdxes": req_body.get("selectedIdxes"),
-                    "correctIdxes": req_body.get("correctIdxes"),
-                }
-            )
-
-        # Progressの項目をaupsert
-        container.upsert_item(
-            {
-                "id": f"{user_id}_{test_id}",
-                "userId": user_id,
-                "testId": test_id,
-                "order": item["order"],
-                "progresses": updated_progresses,
-            }
-        )
+            return func.HttpResponse(body="Progress Update Conflicted", status_code=409)
 
         # レスポンス整形
         res_body: PostProgressRes = [
@@ -238,7 +277,7 @@ def post_progress(req: func.HttpRequest) -> func.HttpResponse:
                 "selectedIdxes": progress["selectedIdxes"],
                 "correctIdxes": progress["correctIdxes"],
             }
-            for progress in updated_progresses
+            for progress in updated_item["progresses"]
         ]
         return func.HttpResponse(
             body=json.dumps(res_body),
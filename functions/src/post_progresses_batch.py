@@ -0,0 +1,265 @@
+"""[POST] /tests/{testId}/progresses/batch のモジュール"""
+
+import json
+import logging
+import traceback
+from typing import Optional
+
+import azure.functions as func
+from azure.core import MatchConditions
+from azure.cosmos import ContainerProxy
+from azure.cosmos.exceptions import (
+    CosmosAccessConditionFailedError,
+    CosmosResourceNotFoundError,
+)
+from type.cosmos import Progress
+from type.request import PostProgressesBatchElement
+from type.response import PostProgressesBatchRes
+from util.cosmos import get_read_write_container
+from util.progress import (
+    MAX_CONFLICT_RETRY_NUMBER,
+    create_progress_patch_operations,
+    merge_progress_entries,
+)
+
+
+def _validate_list_field(field_name: str, field_value, expected_type=str) -> list:
+    """リクエストボディ内のlist型のフィールドのバリデーションを行う
+
+    Args:
+        field_name (str): フィールド名
+        field_value: フィールド値
+        expected_type: 期待する型
+
+    Returns:
+        list: バリデーションチェックに成功した場合は空のリスト、失敗した場合はエラーメッセージのリスト
+    """
+
+    errors = []
+
+    if not isinstance(field_value, list):
+        errors.append(f"Invalid {field_name}: {field_value}")
+    else:
+        for i, item in enumerate(field_value):
+            if item is not None and not isinstance(item, expected_type):
+                errors.append(f"Invalid {field_name}[{i}]: {item}")
+
+    return errors
+
+
+def validate_body(req_body_encoded: bytes) -> list:
+    """
+    リクエストボディのバリデーションを行う
+
+    Args:
+        req_body_encoded (bytes): リクエストボディ
+
+    Returns:
+        list: バリデーションチェックに成功した場合は空のリスト、失敗した場合はエラーメッセージのリスト
+    """
+
+    errors = []
+
+    if not req_body_encoded:
+        errors.append("Request Body is Empty")
+        return errors
+
+    req_body = json.loads(req_body_encoded.decode("utf-8"))
+    if not isinstance(req_body, list):
+        errors.append(f"Invalid Request Body: {req_body}")
+        return errors
+    if len(req_body) == 0:
+        errors.append("Request Body is Empty")
+        return errors
+
+    for i, entry in enumerate(req_body):
+        if not isinstance(entry, dict):
+            errors.append(f"Invalid progresses[{i}]: {entry}")
+            continue
+
+        if "questionNumber" not in entry:
+            errors.append(f"progresses[{i}].questionNumber is required")
+        elif isinstance(entry["questionNumber"], bool) or not isinstance(
+            entry["questionNumber"], int
+        ):
+            errors.append(
+                f"Invalid progresses[{i}].questionNumber: {entry['questionNumber']}"
+            )
+
+        if "isCorrect" not in entry:
+            errors.append(f"progresses[{i}].isCorrect is required")
+        elif not isinstance(entry["isCorrect"], bool):
+            errors.append(f"Invalid progresses[{i}].isCorrect: {entry['isCorrect']}")
+
+        list_fields = {
+            "selectedIdxes": int,
+            "correctIdxes": int,
+        }
+        for field, expected_type in list_fields.items():
+            if field not in entry:
+                errors.append(f"progresses[{i}].{field} is required")
+            else:
+                errors.extend(
+                    _validate_list_field(
+                        f"progresses[{i}].{field}", entry[field], expected_type
+                    )
+                )
+
+    return errors
+
+
+def validate_route_params(route_params: dict) -> list:
+    """
+    ルートパラメータのバリデーションを行う
+
+    Args:
+        route_params (dict): ルートパラメータ
+
+    Returns:
+        list: バリデーションチェックに成功した場合は空のリスト、失敗した場合はエラーメッセージのリスト
+    """
+
+    errors = []
+
+    test_id = route_params.get("testId")
+    if not test_id:
+        errors.append("testId is Empty")
+
+    return errors
+
+
+def validate_headers(headers: dict) -> list:
+    """
+    ヘッダーのバリデーションを行う
+
+    Args:
+        headers (dict): ヘッダー
+
+    Returns:
+        list: バリデーションチェックに成功した場合は空のリスト、失敗した場合はエラーメッセージのリスト
+    """
+
+    errors = []
+
+    user_id = headers.get("X-User-Id")
+    if not user_id:
+        errors.append("X-User-Id header is Empty")
+
+    return errors
+
+
+def create_summary(saved_num: int, item: Progress) -> PostProgressesBatchRes:
+    """
+    保存後のProgressコンテナーの項目から、回答履歴の集計を生成する
+
+    Args:
+        saved_num (int): 保存した回答履歴の個数
+        item (Progress): 保存後のProgressコンテナーの項目
+
+    Returns:
+        PostProgressesBatchRes: 回答履歴の集計
+    """
+
+    progress_num = len(item["progresses"])
+    next_question_number: Optional[int] = (
+        item["order"][progress_num] if progress_num < len(item["order"]) else None
+    )
+    return {
+        "savedNum": saved_num,
+        "progressNum": progress_num,
+        "correctNum": sum(
+            1 for progress in item["progresses"] if progress["isCorrect"]
+        ),
+        "nextQuestionNumber": next_question_number,
+    }
+
+
+bp_post_progresses_batch = func.Blueprint()
+
+
+@bp_post_progresses_batch.route(
+    route="tests/{testId}/progresses/batch",
+    methods=["POST"],
+    auth_level=func.AuthLevel.FUNCTION,
+)
+def post_progresses_batch(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    指定したテストID・ユーザーIDでの、回答した順番に並べた複数の回答履歴をまとめて保存します
+    """
+
+    try:
+        # バリデーションチェック
+        errors = []
+        req_body_encoded: bytes = req.get_body()
+        errors.extend(validate_body(req_body_encoded))  # リクエストボディ
+        errors.extend(validate_route_params(req.route_params))  # ルートパラメータ
+        errors.extend(validate_headers(req.headers))  # ヘッダー
+        error_message = errors[0] if errors else None
+        if error_message:
+            return func.HttpResponse(body=error_message, status_code=400)
+
+        test_id = req.route_params.get("testId")
+        user_id = req.headers.get("X-User-Id")
+        entries: list[PostProgressesBatchElement] = json.loads(
+            req_body_encoded.decode("utf-8")
+        )
+
+        logging.info(
+            {
+                "entry_num": len(entries),
+                "test_id": test_id,
+                "user_id": user_id,
+            }
+        )
+
+        # Progressコンテナーのインスタンスを取得
+        container: ContainerProxy = get_read_write_container(
+            database_name="Users",
+            container_name="Progress",
+        )
+
+        # すべての回答履歴を検証してから、Progressコンテナーの項目の1回の部分的な更新で追加・更新する
+        # 取得後に他のリクエストが更新した場合は、取得し直してから最大MAX_CONFLICT_RETRY_NUMBER回まで更新し直す
+        for _ in range(MAX_CONFLICT_RETRY_NUMBER):
+            # テストを解く問題番号の順番を保存しているかのチェック
+            try:
+                item: Progress = container.read_item(
+                    item=f"{user_id}_{test_id}", partition_key=test_id
+                )
+            except CosmosResourceNotFoundError:
+                return func.HttpResponse(body="Progress Not exists", status_code=400)
+
+            try:
+                progresses, first_updated_idx = merge_progress_entries(item, entries)
+            except ValueError as e:
+                return func.HttpResponse(body=str(e), status_code=400)
+
+            try:
+                updated_item: Progress = container.patch_item(
+                    item=f"{user_id}_{test_id}",
+                    partition_key=test_id,
+                    patch_operations=create_progress_patch_operations(
+                        len(item["progresses"]), progresses, first_updated_idx
+                    ),
+                    etag=item["_etag"],
+                    match_condition=MatchConditions.IfNotModified,
+                )
+                break
+            except CosmosAccessConditionFailedError:
+                logging.warning({"conflicted_progress_id": f"{user_id}_{test_id}"})
+        else:
+            return func.HttpResponse(body="Progress Update Conflicted", status_code=409)
+
+        # レスポンス整形(回答履歴全体は返さず、保存後の集計のみ返す)
+        res_body: PostProgressesBatchRes = create_summary(len(entries), updated_item)
+        return func.HttpResponse(
+            body=json.dumps(res_body),
+            status_code=200,
+            mimetype="application/json",
+        )
+    except Exception:
+        logging.error(traceback.format_exc())
+        return func.HttpResponse(
+            body="Internal Server Error",
+            status_code=500,
+        )
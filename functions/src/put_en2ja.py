@@ -2,14 +2,12 @@
 
 import json
 import logging
-import os
 import traceback
 
 import azure.functions as func
-import requests
 from type.request import PutEn2JaReq
 from type.response import PutEn2JaRes
-from type.translation import AzureTranslatorRes
+from util.translator import translate_by_azure_translator
 
 
 def validate_request(req: func.HttpRequest) -> str | None:
@@ -38,48 +36,6 @@ def validate_request(req: func.HttpRequest) -> str | None:
     return errors[0] if errors else None
 
 
-def translate_by_azure_translator(texts: list[str]) -> list[str]:
-    """
-    指定した英語の文字列群をAzure Translatorでそれぞれ日本語に翻訳する
-
-    Args:
-        texts (list[str]): 英語の文字列群
-
-    Returns:
-        list[str]: 日本語に翻訳した文字列群
-    """
-
-    if not texts:
-        return []
-
-    translator_key = os.getenv("TRANSLATOR_KEY")
-    if not translator_key:
-        raise ValueError("Unset TRANSLATOR_KEY")
-
-    headers = {
-        "Ocp-Apim-Subscription-Key": translator_key,
-        "Ocp-Apim-Subscription-Region": "japaneast",
-        "Content-Type": "application/json",
-    }
-    params = {
-        "api-version": "3.0",
-        "from": "en",
-        "to": "ja",
-    }
-    body = [{"Text": text} for text in texts]
-
-    response = requests.post(
-        "https://api.cognitive.microsofttranslator.com/translate",
-        headers=headers,
-        params=params,
-        json=body,
-        timeout=10,
-    )
-    response.raise_for_status()
-    data: AzureTranslatorRes = response.json()
-    return [item["translations"][0]["text"] for item in data]
-
-
 bp_put_en2ja = func.Blueprint()
 
 
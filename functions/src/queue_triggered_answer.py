@@ -8,6 +8,7 @@ from azure.cosmos import ContainerProxy
 from type.cosmos import Answer, Question
 from type.message import MessageAnswer
 from util.cosmos import get_read_only_container, get_read_write_container
+from util.hashing import compute_question_hash
 
 bp_queue_triggered_answer = func.Blueprint()
 
@@ -56,6 +57,7 @@ def queue_triggered_answer(msg: func.QueueMessage):
             "correctIdxes": message_answer["correctIdxes"],
             "explanations": message_answer["explanations"],
             "testId": message_answer["testId"],
+            "questionHash": compute_question_hash(item),
         }
         logging.info({"answer_item": answer_item})
         container_answer.upsert_item(answer_item)
@@ -0,0 +1,80 @@
+"""インポートデータファイルの問題番号の範囲ごとにQuestionコンテナーの項目をupsertするQueueトリガーの関数アプリのモジュール"""
+
+import hashlib
+import io
+import json
+import logging
+
+import azure.functions as func
+from src.blob_triggered_import import (
+    get_test_item,
+    upsert_question_items,
+    upsert_test_item,
+)
+from type.message import MessageImportChunk
+from util.checkpoint import complete_import_chunk
+from util.json_stream import iter_json_array, read_byte_range
+
+bp_queue_triggered_import = func.Blueprint()
+
+
+@bp_queue_triggered_import.queue_trigger(
+    arg_name="msg",
+    connection="AzureWebJobsStorage",
+    queue_name="import-chunks",
+)
+@bp_queue_triggered_import.blob_input(
+    arg_name="blob",
+    connection="AzureWebJobsStorage",
+    path="import-items/{courseName}/{testName}.json",
+)
+def queue_triggered_import(msg: func.QueueMessage, blob: func.InputStream):
+    """
+    キューストレージに格納したメッセージの問題番号の範囲の、Questionコンテナーの項目をupsertします
+    すべての範囲のupsertが完了した場合は、Testコンテナーの項目の問題数を更新します
+    """
+
+    # メッセージをMessageImportChunk型として読込み
+    message_import_chunk: MessageImportChunk = json.loads(
+        msg.get_body().decode("utf-8")
+    )
+    logging.info({"message_import_chunk": message_import_chunk})
+
+    # インポートデータファイルから範囲のバイト列を読み込む
+    # メッセージの格納後にインポートデータファイルが更新された場合は、更新後のファイルのインポートに任せる
+    data = read_byte_range(
+        blob, message_import_chunk["startOffset"], message_import_chunk["endOffset"]
+    )
+    if hashlib.sha256(data).hexdigest() != message_import_chunk["chunkHash"]:
+        logging.warning({"stale_import_chunk": message_import_chunk})
+        return
+
+    # 範囲の各要素を配列として読み込み、Questionコンテナーの項目をupsert
+    upsert_question_items(
+        test_id=message_import_chunk["testId"],
+        is_existed_test=True,
+        json_data=iter_json_array(io.BytesIO(b"[" + data + b"]")),
+        number_range=range(
+            message_import_chunk["startNumber"], message_import_chunk["endNumber"] + 1
+        ),
+    )
+
+    # 範囲のupsertの完了を記録し、すべての範囲のupsertが完了した場合のみTestコンテナーの項目の問題数を更新
+    import_job = complete_import_chunk(
+        message_import_chunk["jobId"], message_import_chunk["chunkIndex"]
+    )
+    if (
+        import_job is None
+        or len(import_job["completedChunks"]) < import_job["chunkCount"]
+    ):
+        return
+    upsert_test_item(
+        course_name=import_job["courseName"],
+        test_name=import_job["testName"],
+        test_id=import_job["testId"],
+        inserted_test_item=get_test_item(
+            course_name=import_job["courseName"], test_name=import_job["testName"]
+        ),
+        length=import_job["length"],
+    )
+    logging.info({"completed_import_job_id": import_job["id"]})
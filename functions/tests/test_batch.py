@@ -0,0 +1,153 @@
+"""Cosmos DBのトランザクションバッチのユーティリティ関数のテスト"""
+
+import unittest
+from unittest.mock import MagicMock, call, patch
+
+from azure.cosmos.exceptions import CosmosHttpResponseError
+from util.batch import split_into_batches, upsert_items_in_batches
+from util.throttle import AdaptiveThrottle
+
+
+class SizeLimitedContainer:  # pylint: disable=too-few-public-methods
+    """
+    execute_item_batchで、操作数が上限を超えた場合に413を返すContainerProxyの代替
+    1操作あたり10RUを消費する
+    """
+
+    def __init__(self, max_operations):
+        self.max_operations = max_operations
+        self.batches = []
+
+    def execute_item_batch(self, batch_operations, partition_key, response_hook):
+        """操作数が上限を超えた場合は413を返す"""
+
+        if len(batch_operations) > self.max_operations:
+            raise CosmosHttpResponseError(
+                status_code=413, message="Request Entity Too Large"
+            )
+        self.batches.append(
+            (partition_key, [item["id"] for _, (item,) in batch_operations])
+        )
+        response_hook(
+            {"x-ms-request-charge": str(10.0 * len(batch_operations))},
+            batch_operations,
+        )
+        return batch_operations
+
+
+class TestSplitIntoBatches(unittest.TestCase):
+    """split_into_batches関数のテストケース"""
+
+    def test_split_into_batches_by_operations(self):
+        """最大操作数ごとに順序を保ったまま分割するテスト"""
+
+        items = [{"id": str(i)} for i in range(250)]
+
+        batches = list(split_into_batches(items))
+
+        self.assertEqual([len(batch) for batch in batches], [100, 100, 50])
+        self.assertEqual([item for batch in batches for item in batch], items)
+
+    def test_split_into_batches_by_bytes(self):
+        """項目の合計サイズの上限ごとに分割し、上限を超える項目は単独のバッチとするテスト"""
+
+        items = [
+            {"id": "1", "text": "a" * 40},
+            {"id": "2", "text": "b" * 40},
+            {"id": "3", "text": "c" * 200},
+            {"id": "4", "text": "d" * 40},
+        ]
+
+        batches = list(split_into_batches(items, max_bytes=150))
+
+        self.assertEqual(
+            [[item["id"] for item in batch] for batch in batches],
+            [["1", "2"], ["3"], ["4"]],
+        )
+
+    def test_split_into_batches_empty(self):
+        """項目がない場合にバッチを返さないテスト"""
+
+        self.assertEqual(list(split_into_batches([])), [])
+
+
+class TestUpsertItemsInBatches(unittest.TestCase):
+    """upsert_items_in_batches関数のテストケース"""
+
+    def setUp(self):
+        patcher = patch("util.throttle.time.sleep")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch("util.batch.logging")
+    def test_upsert_items_in_batches(self, mock_logging):
+        """同一パーティションの項目をトランザクションバッチでupsertし、RU数をログ出力するテスト"""
+
+        container = SizeLimitedContainer(max_operations=100)
+        items = [{"id": str(i), "testId": "test-id"} for i in range(150)]
+
+        upsert_items_in_batches(container, items, "test-id", AdaptiveThrottle())
+
+        self.assertEqual(
+            container.batches,
+            [
+                ("test-id", [str(i) for i in range(100)]),
+                ("test-id", [str(i) for i in range(100, 150)]),
+            ],
+        )
+        self.assertEqual(
+            [
+                (args[0]["batch_operations"], args[0]["batch_request_charge"])
+                for args, _ in mock_logging.info.call_args_list
+            ],
+            [(100, 1000.0), (50, 500.0)],
+        )
+        for args, _ in mock_logging.info.call_args_list:
+            self.assertGreaterEqual(args[0]["batch_elapsed_ms"], 0)
+
+    @patch("util.batch.logging")
+    def test_upsert_items_in_batches_too_large(self, mock_logging):
+        """要求のサイズが大きすぎる場合にバッチを半分に分割してupsertするテスト"""
+
+        container = SizeLimitedContainer(max_operations=30)
+        items = [{"id": str(i)} for i in range(100)]
+
+        upsert_items_in_batches(container, items, "test-id", AdaptiveThrottle())
+
+        self.assertEqual([len(ids) for _, ids in container.batches], [25, 25, 25, 25])
+        self.assertEqual(
+            [item_id for _, ids in container.batches for item_id in ids],
+            [str(i) for i in range(100)],
+        )
+        mock_logging.warning.assert_has_calls(
+            [
+                call({"split_batch_operations": 100}),
+                call({"split_batch_operations": 50}),
+                call({"split_batch_operations": 50}),
+            ]
+        )
+
+    def test_upsert_items_in_batches_single_item_too_large(self):
+        """1項目のみでも要求のサイズが大きすぎる場合に例外を送出するテスト"""
+
+        container = SizeLimitedContainer(max_operations=0)
+
+        with self.assertRaises(CosmosHttpResponseError):
+            upsert_items_in_batches(
+                container, [{"id": "1"}], "test-id", AdaptiveThrottle()
+            )
+
+    def test_upsert_items_in_batches_other_error(self):
+        """413以外のエラーは分割せずに例外を送出するテスト"""
+
+        container = MagicMock()
+        container.execute_item_batch.side_effect = CosmosHttpResponseError(
+            status_code=400, message="Bad Request"
+        )
+
+        with self.assertRaises(CosmosHttpResponseError):
+            upsert_items_in_batches(
+                container, [{"id": "1"}, {"id": "2"}], "test-id", AdaptiveThrottle()
+            )
+
+        container.execute_item_batch.assert_called_once()
@@ -1,126 +1,191 @@
+# pylint: disable=too-many-lines
 """インポートデータファイルの項目をインポートするBlobトリガーの関数アプリのテスト"""
 
+import hashlib
+import io
 import json
+import os
 from unittest import TestCase
-from unittest.mock import MagicMock, call, patch
+from unittest.mock import ANY, MagicMock, call, patch
 
+from azure.cosmos.exceptions import (
+    CosmosAccessConditionFailedError,
+    CosmosResourceExistsError,
+    CosmosResourceNotFoundError,
+)
 from src.blob_triggered_import import (
     blob_triggered_import,
+    get_content_version,
+    get_test_item,
+    split_import_chunks,
+    translate_question_items,
     upsert_question_items,
     upsert_test_item,
 )
 from type.cosmos import Question, Test
 from type.importing import ImportItem
+from util.checkpoint import get_import_checkpoint_id
+from util.hashing import compute_import_item_hash
+from util.question_cache import (
+    get_cached_question,
+    put_cached_question,
+    reset_question_cache,
+)
+
+
+class TestGetTestItem(TestCase):
+    """get_test_item関数のテストケース"""
+
+    @patch("src.blob_triggered_import.get_read_write_container")
+    @patch("src.blob_triggered_import.logging")
+    def test_get_test_item(self, mock_logging, mock_get_read_write_container):
+        """コース名・テスト名が一致するTest項目を取得するテスト"""
+
+        mock_container = MagicMock()
+        mock_get_read_write_container.return_value = mock_container
+        inserted_test_items = [
+            Test(id="existing-uuid", courseName="Math", testName="Algebra", length=1)
+        ]
+        mock_container.query_items.return_value = inserted_test_items
+
+        test_item = get_test_item("Math", "Algebra")
+
+        self.assertEqual(test_item, inserted_test_items[0])
+        mock_container.query_items.assert_called_once_with(
+            query="SELECT * FROM c WHERE c.courseName = @courseName and c.testName = @testName",
+            parameters=[
+                {"name": "@courseName", "value": "Math"},
+                {"name": "@testName", "value": "Algebra"},
+            ],
+        )
+        mock_logging.info.assert_called_once_with(
+            {"inserted_test_items": inserted_test_items}
+        )
+
+    @patch("src.blob_triggered_import.get_read_write_container")
+    @patch("src.blob_triggered_import.logging")
+    def test_get_test_item_not_found(
+        self,
+        mock_logging,  # pylint: disable=W0613
+        mock_get_read_write_container,
+    ):
+        """Test項目が存在しない場合のテスト"""
+
+        mock_get_read_write_container.return_value.query_items.return_value = []
+
+        self.assertIsNone(get_test_item("Math", "Algebra"))
+
+    @patch("src.blob_triggered_import.get_read_write_container")
+    @patch("src.blob_triggered_import.logging")
+    def test_get_test_item_not_unique(
+        self, mock_logging, mock_get_read_write_container
+    ):
+        """Test項目が一意でない場合にValueErrorをraiseするテスト"""
+
+        mock_container = MagicMock()
+        mock_get_read_write_container.return_value = mock_container
+        inserted_test_items = [
+            Test(id="uuid1", courseName="Math", testName="Algebra", length=1),
+            Test(id="uuid2", courseName="Math", testName="Algebra", length=1),
+        ]
+        mock_container.query_items.return_value = inserted_test_items
+
+        with self.assertRaises(ValueError) as context:
+            get_test_item("Math", "Algebra")
+
+        self.assertEqual(str(context.exception), "Not Unique Test")
+        mock_logging.info.assert_called_once_with(
+            {"inserted_test_items": inserted_test_items}
+        )
 
 
 class TestUpsertTestItem(TestCase):
     """upsert_test_item関数のテストケース"""
 
+    @patch("src.blob_triggered_import.refresh_tests_catalog")
     @patch("src.blob_triggered_import.get_read_write_container")
-    @patch("src.blob_triggered_import.uuid4")
     @patch("src.blob_triggered_import.logging")
     def test_upsert_test_item_new(
-        self, mock_logging, mock_uuid4, mock_get_read_write_container
+        self, mock_logging, mock_get_read_write_container, mock_refresh_tests_catalog
     ):
-        """新しいTest項目をupsertするテスト"""
+        """新しいTest項目をupsertし、カタログを再生成するテスト"""
 
         mock_container = MagicMock()
         mock_get_read_write_container.return_value = mock_container
-        mock_container.query_items.return_value = []
-        mock_uuid4.return_value = "test-id"
 
-        course_name = "Math"
-        test_name = "Algebra"
-        json_data = [
-            ImportItem(subjects=["Q1"], choices=["A", "B"], answerNum=1)
-        ]
+        upsert_test_item("Math", "Algebra", "test-id", None, 1)
 
-        test_id, is_existed_test = upsert_test_item(course_name, test_name, json_data)
-
-        self.assertFalse(is_existed_test)
-        self.assertEqual(test_id, "test-id")
         test_item = {
-            "courseName": course_name,
-            "testName": test_name,
+            "courseName": "Math",
+            "testName": "Algebra",
             "id": "test-id",
             "length": 1,
         }
         mock_container.upsert_item.assert_called_once_with(test_item)
         mock_logging.info.assert_has_calls(
             [
-                call({"inserted_test_items": []}),
                 call({"test_item": test_item}),
                 call({"test_id": "test-id", "is_existed_test": False}),
             ]
         )
+        mock_refresh_tests_catalog.assert_called_once_with()
 
+    @patch("src.blob_triggered_import.refresh_tests_catalog")
     @patch("src.blob_triggered_import.get_read_write_container")
     @patch("src.blob_triggered_import.logging")
     def test_upsert_test_item_existing(
-        self, mock_logging, mock_get_read_write_container
+        self, mock_logging, mock_get_read_write_container, mock_refresh_tests_catalog
     ):
-        """既存のTest項目をupsertするテスト"""
+        """既存のTest項目と要素数が同じ場合にupsertしないテスト"""
 
         mock_container = MagicMock()
         mock_get_read_write_container.return_value = mock_container
-        existing_test_id = "existing-uuid"
-        inserted_test_items = [
-            Test(id=existing_test_id, courseName="Math", testName="Algebra", length=1)
-        ]
-        mock_container.query_items.return_value = inserted_test_items
-
-        course_name = "Math"
-        test_name = "Algebra"
-        json_data = [
-            ImportItem(subjects=["Q1"], choices=["A", "B"], answerNum=1)
-        ]
+        inserted_test_item = Test(
+            id="existing-uuid", courseName="Math", testName="Algebra", length=1
+        )
 
-        test_id, is_existed_test = upsert_test_item(course_name, test_name, json_data)
+        upsert_test_item("Math", "Algebra", "existing-uuid", inserted_test_item, 1)
 
-        self.assertTrue(is_existed_test)
-        self.assertEqual(test_id, existing_test_id)
         mock_container.upsert_item.assert_not_called()
-        mock_logging.info.assert_has_calls(
-            [
-                call({"inserted_test_items": inserted_test_items}),
-                call({"test_id": existing_test_id, "is_existed_test": True}),
-            ]
+        mock_logging.info.assert_called_once_with(
+            {"test_id": "existing-uuid", "is_existed_test": True}
         )
+        mock_refresh_tests_catalog.assert_not_called()
 
+    @patch("src.blob_triggered_import.refresh_tests_catalog")
     @patch("src.blob_triggered_import.get_read_write_container")
     @patch("src.blob_triggered_import.logging")
-    def test_upsert_test_item_not_unique(
-        self, mock_logging, mock_get_read_write_container
+    def test_upsert_test_item_length_changed(
+        self,
+        mock_logging,  # pylint: disable=W0613
+        mock_get_read_write_container,
+        mock_refresh_tests_catalog,
     ):
-        """Test項目が一意でない場合にValueErrorをraiseするテスト"""
+        """既存のTest項目と要素数が異なる場合にupsertし、カタログを再生成するテスト"""
 
         mock_container = MagicMock()
         mock_get_read_write_container.return_value = mock_container
-        inserted_test_items = [
-            Test(id="uuid1", courseName="Math", testName="Algebra", length=1),
-            Test(id="uuid2", courseName="Math", testName="Algebra", length=1),
-        ]
-        mock_container.query_items.return_value = inserted_test_items
-
-        course_name = "Math"
-        test_name = "Algebra"
-        json_data = [
-            ImportItem(subjects=["Q1"], choices=["A", "B"], answerNum=1)
-        ]
+        inserted_test_item = Test(
+            id="existing-uuid", courseName="Math", testName="Algebra", length=1
+        )
 
-        with self.assertRaises(ValueError) as context:
-            upsert_test_item(course_name, test_name, json_data)
+        upsert_test_item("Math", "Algebra", "existing-uuid", inserted_test_item, 2)
 
-        self.assertEqual(str(context.exception), "Not Unique Test")
-        mock_logging.info.assert_called_once_with(
-            {"inserted_test_items": inserted_test_items}
+        mock_container.upsert_item.assert_called_once_with(
+            {
+                "courseName": "Math",
+                "testName": "Algebra",
+                "id": "existing-uuid",
+                "length": 2,
+            }
         )
+        mock_refresh_tests_catalog.assert_called_once_with()
 
 
 class TestUpsertQuestionItems(TestCase):
     """upsert_question_items関数のテストケース"""
 
-    @patch("src.blob_triggered_import.time.sleep")
+    @patch("util.throttle.time.sleep")
     @patch("src.blob_triggered_import.get_read_write_container")
     @patch("src.blob_triggered_import.logging")
     def test_upsert_question_items_not_found_test(
@@ -153,8 +218,13 @@ class TestUpsertQuestionItems(TestCase):
             ),
         ]
 
+        reset_question_cache()
+        put_cached_question(test_id, 1, {"id": "test-id_1", "subjects": ["Old"]})
+
         upsert_question_items(test_id, is_existed_test, json_data)
 
+        # upsertした項目はワーカープロセス内のキャッシュから削除する
+        self.assertIsNone(get_cached_question(test_id, 1))
         expected_question_item_1st = {
             "subjects": ["Q1"],
             "choices": ["A"],
@@ -162,6 +232,8 @@ class TestUpsertQuestionItems(TestCase):
             "number": 1,
             "testId": "test-id",
             "answerNum": 1,
+            "contentHash": compute_import_item_hash(json_data[0]),
+            "discussionNum": 0,
         }
         expected_question_item_2nd = {
             "subjects": ["Q2-1", "Q2-2", "Q2-3"],
@@ -173,19 +245,27 @@ class TestUpsertQuestionItems(TestCase):
             "number": 2,
             "testId": "test-id",
             "answerNum": 2,
+            "contentHash": compute_import_item_hash(json_data[1]),
+            "discussionNum": 0,
         }
-        mock_container.upsert_item.assert_has_calls(
-            [call(expected_question_item_1st), call(expected_question_item_2nd)]
+        mock_container.execute_item_batch.assert_called_once_with(
+            batch_operations=[
+                ("upsert", (expected_question_item_1st,)),
+                ("upsert", (expected_question_item_2nd,)),
+            ],
+            partition_key="test-id",
+            response_hook=ANY,
         )
         mock_logging.info.assert_has_calls(
             [
-                call({"inserted_import_items": []}),
+                call({"inserted_hashes_count": 0}),
                 call({"question_item": expected_question_item_1st}),
                 call({"question_item": expected_question_item_2nd}),
+                call({"changed_question_numbers": [1, 2]}),
             ]
         )
 
-    @patch("src.blob_triggered_import.time.sleep")
+    @patch("util.throttle.time.sleep")
     @patch("src.blob_triggered_import.get_read_write_container")
     @patch("src.blob_triggered_import.logging")
     def test_upsert_question_items_found_test(
@@ -194,33 +274,8 @@ class TestUpsertQuestionItems(TestCase):
         mock_get_read_write_container,
         mock_sleep,  # pylint: disable=W0613
     ):
-        """Testコンテナーの項目が取得できる場合でQuestion項目をupsertするテスト"""
+        """Testコンテナーの項目が取得できる場合でハッシュ値が異なるQuestion項目のみをupsertするテスト"""
 
-        mock_container = MagicMock()
-        mock_get_read_write_container.return_value = mock_container
-        mock_container.query_items.return_value = [
-            Question(
-                id="test-id_2",
-                number=2,
-                subjects=["Q2-1", "Q2-2", "Q2-3"],
-                choices=["B", "C"],
-                indicateSubjectImgIdxes=[0, 2],
-                indicateChoiceImgs=["img1", "img2"],
-                escapeTranslatedIdxes={"subjects": [0, 2], "choices": [1, 3]},
-                testId="test-id",
-                answerNum=2,
-            ),
-            Question(
-                id="test-id_3",
-                number=3,
-                subjects=["Q3-1", "Q3-2"],
-                choices=["D"],
-                testId="test-id",
-                answerNum=1,
-            ),
-        ]
-        test_id = "test-id"
-        is_existed_test = True
         json_data = [
             ImportItem(
                 subjects=["Q1"],
@@ -235,102 +290,721 @@ class TestUpsertQuestionItems(TestCase):
                 escapeTranslatedIdxes={"subjects": [0, 2], "choices": [1, 3]},
                 answerNum=2,
             ),
+            ImportItem(
+                subjects=["Q3"],
+                choices=["D"],
+                answerNum=1,
+            ),
+        ]
+        mock_container = MagicMock()
+        mock_get_read_write_container.return_value = mock_container
+        mock_container.query_items.return_value = [
+            {
+                "number": 1,
+                "contentHash": compute_import_item_hash(
+                    ImportItem(subjects=["Q1-old"], choices=["A"], answerNum=1)
+                ),
+                "isTranslated": False,
+            },
+            {
+                "number": 2,
+                "contentHash": compute_import_item_hash(json_data[1]),
+                "isTranslated": False,
+            },
+            # ハッシュ値を格納していない項目
+            {"number": 3, "isTranslated": False},
         ]
 
-        upsert_question_items(test_id, is_existed_test, json_data)
+        upsert_question_items("test-id", True, json_data)
 
-        expected_question_item = {
+        expected_question_item_1st = {
             "subjects": ["Q1"],
             "choices": ["A"],
             "id": "test-id_1",
             "number": 1,
             "testId": "test-id",
             "answerNum": 1,
+            "contentHash": compute_import_item_hash(json_data[0]),
+            "discussionNum": 0,
         }
-        mock_container.upsert_item.assert_called_once_with(expected_question_item)
+        expected_question_item_3rd = {
+            "subjects": ["Q3"],
+            "choices": ["D"],
+            "id": "test-id_3",
+            "number": 3,
+            "testId": "test-id",
+            "answerNum": 1,
+            "contentHash": compute_import_item_hash(json_data[2]),
+            "discussionNum": 0,
+        }
+        mock_container.query_items.assert_called_once_with(
+            query=(
+                "SELECT c.number, c.contentHash, "
+                "IS_DEFINED(c.translatedSubjects) AS isTranslated "
+                "FROM c WHERE c.testId = @testId AND c.number > @committedNumber"
+            ),
+            parameters=[
+                {"name": "@testId", "value": "test-id"},
+                {"name": "@committedNumber", "value": 0},
+            ],
+        )
+        mock_container.execute_item_batch.assert_called_once_with(
+            batch_operations=[
+                ("upsert", (expected_question_item_1st,)),
+                ("upsert", (expected_question_item_3rd,)),
+            ],
+            partition_key="test-id",
+            response_hook=ANY,
+        )
         mock_logging.info.assert_has_calls(
             [
-                call(
-                    {
-                        "inserted_import_items": [
-                            {
-                                "subjects": ["Q2-1", "Q2-2", "Q2-3"],
-                                "choices": ["B", "C"],
-                                "indicateSubjectImgIdxes": [0, 2],
-                                "indicateChoiceImgs": ["img1", "img2"],
-                                "escapeTranslatedIdxes": {
-                                    "subjects": [0, 2],
-                                    "choices": [1, 3],
-                                },
-                                "answerNum": 2,
-                            },
-                            {
-                                "subjects": ["Q3-1", "Q3-2"],
-                                "choices": ["D"],
-                                "answerNum": 1,
-                            },
-                        ]
-                    }
-                ),
-                call({"question_item": expected_question_item}),
+                call({"inserted_hashes_count": 3}),
+                call({"question_item": expected_question_item_1st}),
+                call({"question_item": expected_question_item_3rd}),
+                call({"changed_question_numbers": [1, 3]}),
             ]
         )
 
+    @patch("util.throttle.time.sleep")
+    @patch("src.blob_triggered_import.get_read_write_container")
+    def test_upsert_question_items_reordered(
+        self,
+        mock_get_read_write_container,
+        mock_sleep,  # pylint: disable=W0613
+    ):
+        """同じ内容の項目でも問題番号が異なる場合はupsertするテスト"""
+
+        json_data = [
+            ImportItem(subjects=["Q2"], choices=["B"], answerNum=1),
+            ImportItem(subjects=["Q1"], choices=["A"], answerNum=1),
+        ]
+        mock_container = MagicMock()
+        mock_get_read_write_container.return_value = mock_container
+        mock_container.query_items.return_value = [
+            {"number": 1, "contentHash": compute_import_item_hash(json_data[1])},
+            {"number": 2, "contentHash": compute_import_item_hash(json_data[0])},
+        ]
+
+        upsert_question_items("test-id", True, json_data)
+
+        self.assertEqual(
+            [
+                item["number"]
+                for _, (item,) in mock_container.execute_item_batch.call_args.kwargs[
+                    "batch_operations"
+                ]
+            ],
+            [1, 2],
+        )
+
+    @patch("util.throttle.time.sleep")
+    @patch("src.blob_triggered_import.translate_by_azure_translator")
+    @patch("src.blob_triggered_import.get_read_write_container")
+    @patch("src.blob_triggered_import.logging")
+    @patch.dict(os.environ, {"IMPORT_TRANSLATION_ENABLED": "true"})
+    def test_upsert_question_items_with_translation(
+        self,
+        mock_logging,  # pylint: disable=W0613
+        mock_get_read_write_container,
+        mock_translate_by_azure_translator,
+        mock_sleep,  # pylint: disable=W0613
+    ):
+        """インポート時の翻訳が有効な場合に、未翻訳の項目を翻訳してupsertするテスト"""
+
+        mock_container = MagicMock()
+        mock_get_read_write_container.return_value = mock_container
+        json_data = [
+            ImportItem(subjects=["Q1"], choices=["A"], answerNum=1),
+            ImportItem(subjects=["Q2"], choices=["B"], answerNum=1),
+        ]
+        mock_container.query_items.return_value = [
+            {
+                "number": 1,
+                "contentHash": compute_import_item_hash(json_data[0]),
+                "isTranslated": True,
+            },
+            {
+                "number": 2,
+                "contentHash": compute_import_item_hash(json_data[1]),
+                "isTranslated": False,
+            },
+        ]
+        mock_translate_by_azure_translator.side_effect = lambda texts: [
+            f"訳:{text}" for text in texts
+        ]
+
+        upsert_question_items("test-id", True, json_data)
+
+        mock_translate_by_azure_translator.assert_called_once_with(["Q2", "B"])
+        mock_container.execute_item_batch.assert_called_once_with(
+            batch_operations=[
+                (
+                    "upsert",
+                    (
+                        {
+                            "subjects": ["Q2"],
+                            "choices": ["B"],
+                            "answerNum": 1,
+                            "id": "test-id_2",
+                            "number": 2,
+                            "testId": "test-id",
+                            "contentHash": compute_import_item_hash(json_data[1]),
+                            "discussionNum": 0,
+                            "translatedSubjects": ["訳:Q2"],
+                            "translatedChoices": ["訳:B"],
+                        },
+                    ),
+                )
+            ],
+            partition_key="test-id",
+            response_hook=ANY,
+        )
+
+    @patch("util.throttle.time.sleep")
+    @patch("src.blob_triggered_import.translate_by_azure_translator")
+    @patch("src.blob_triggered_import.get_read_write_container")
+    @patch("src.blob_triggered_import.logging")
+    @patch.dict(os.environ, {"IMPORT_TRANSLATION_ENABLED": "true"})
+    def test_upsert_question_items_translation_error(
+        self,
+        mock_logging,
+        mock_get_read_write_container,
+        mock_translate_by_azure_translator,
+        mock_sleep,  # pylint: disable=W0613
+    ):
+        """インポート時の翻訳に失敗した場合に、翻訳せずにupsertするテスト"""
+
+        mock_container = MagicMock()
+        mock_get_read_write_container.return_value = mock_container
+        mock_translate_by_azure_translator.side_effect = Exception("Translate Error")
+        json_data = [ImportItem(subjects=["Q1"], choices=["A"], answerNum=1)]
+
+        upsert_question_items("test-id", False, json_data)
+
+        mock_container.execute_item_batch.assert_called_once_with(
+            batch_operations=[
+                (
+                    "upsert",
+                    (
+                        {
+                            "subjects": ["Q1"],
+                            "choices": ["A"],
+                            "answerNum": 1,
+                            "id": "test-id_1",
+                            "number": 1,
+                            "testId": "test-id",
+                            "contentHash": compute_import_item_hash(json_data[0]),
+                            "discussionNum": 0,
+                        },
+                    ),
+                )
+            ],
+            partition_key="test-id",
+            response_hook=ANY,
+        )
+        mock_logging.warning.assert_called_once()
+
+    @patch("util.throttle.time.sleep")
+    @patch("src.blob_triggered_import.translate_by_azure_translator")
+    @patch("src.blob_triggered_import.get_read_write_container")
+    @patch("src.blob_triggered_import.logging")
+    @patch.dict(
+        os.environ, {"IMPORT_TRANSLATION_ENABLED": "true", "IMPORT_BATCH_SIZE": "2"}
+    )
+    def test_upsert_question_items_pipeline(
+        self,
+        mock_logging,  # pylint: disable=W0613
+        mock_get_read_write_container,
+        mock_translate_by_azure_translator,
+        mock_sleep,  # pylint: disable=W0613
+    ):
+        """インポートデータの要素を読み込みながらIMPORT_BATCH_SIZE件ごとに翻訳・upsertするテスト"""
+
+        mock_container = MagicMock()
+        mock_get_read_write_container.return_value = mock_container
+        mock_translate_by_azure_translator.side_effect = lambda texts: [
+            f"訳:{text}" for text in texts
+        ]
+        events = []
+
+        def generate_json_data():
+            for i in range(1, 6):
+                events.append(f"read {i}")
+                yield ImportItem(subjects=[f"Q{i}"], choices=["A"], answerNum=1)
+
+        mock_container.execute_item_batch.side_effect = (
+            lambda batch_operations, partition_key, response_hook: events.append(
+                "upsert "
+                + ",".join(str(item["number"]) for _, (item,) in batch_operations)
+            )
+        )
+
+        length = upsert_question_items("test-id", False, generate_json_data())
+
+        self.assertEqual(length, 5)
+        self.assertEqual(
+            events,
+            [
+                "read 1",
+                "read 2",
+                "upsert 1,2",
+                "read 3",
+                "read 4",
+                "upsert 3,4",
+                "read 5",
+                "upsert 5",
+            ],
+        )
+        mock_translate_by_azure_translator.assert_has_calls(
+            [
+                call(["Q1", "A", "Q2", "A"]),
+                call(["Q3", "A", "Q4", "A"]),
+                call(["Q5", "A"]),
+            ]
+        )
+
+
+class TestTranslateQuestionItems(TestCase):
+    """translate_question_items関数のテストケース"""
+
+    @patch("src.blob_triggered_import.translate_by_azure_translator")
+    def test_translate_question_items(self, mock_translate_by_azure_translator):
+        """画像URL・翻訳しない問題文/選択肢・画像URLのみの選択肢を除いてまとめて翻訳するテスト"""
+
+        mock_translate_by_azure_translator.side_effect = lambda texts: [
+            f"訳:{text}" for text in texts
+        ]
+        question_items = [
+            Question(
+                id="test-id_1",
+                number=1,
+                subjects=["Q1-1", "https://example.com/img", "Q1-3"],
+                choices=["A", None, "C", "D"],
+                indicateSubjectImgIdxes=[1],
+                escapeTranslatedIdxes={"subjects": [2], "choices": [3]},
+                testId="test-id",
+                answerNum=1,
+            ),
+            Question(
+                id="test-id_2",
+                number=2,
+                subjects=["Q2"],
+                choices=["E"],
+                testId="test-id",
+                answerNum=1,
+            ),
+        ]
+
+        translate_question_items(question_items)
+
+        mock_translate_by_azure_translator.assert_called_once_with(
+            ["Q1-1", "A", "C", "Q2", "E"]
+        )
+        self.assertEqual(
+            question_items[0]["translatedSubjects"],
+            ["訳:Q1-1", "https://example.com/img", "Q1-3"],
+        )
+        self.assertEqual(
+            question_items[0]["translatedChoices"], ["訳:A", None, "訳:C", "D"]
+        )
+        self.assertEqual(question_items[1]["translatedSubjects"], ["訳:Q2"])
+        self.assertEqual(question_items[1]["translatedChoices"], ["訳:E"])
+
+
+class InMemoryContainer:
+    """
+    Test・Question・Import・CatalogコンテナーのContainerProxyの代替
+    項目ごとの書込み回数を記録し、fail_at_batch回目のexecute_item_batchでインスタンスの停止を模擬して例外を送出する
+    """
+
+    def __init__(self, fail_at_batch=None):
+        self.items = {}
+        self.write_counts = {}
+        self.queries = []
+        self.batch_count = 0
+        self.fail_at_batch = fail_at_batch
+
+    def _write(self, item):
+        self.write_counts[item["id"]] = self.write_counts.get(item["id"], 0) + 1
+        self.items[item["id"]] = {
+            **item,
+            "_etag": f"{item['id']}_{self.write_counts[item['id']]}",
+        }
+
+    def read_item(self, item, partition_key):  # pylint: disable=W0613
+        """項目を取得する"""
+
+        if item not in self.items:
+            raise CosmosResourceNotFoundError
+        return dict(self.items[item])
+
+    def upsert_item(self, body, response_hook=None):
+        """項目をupsertする"""
+
+        self._write(body)
+        if response_hook:
+            response_hook({"x-ms-request-charge": "1.0"}, body)
+        return body
+
+    def create_item(self, body):
+        """項目を作成する"""
+
+        if body["id"] in self.items:
+            raise CosmosResourceExistsError
+        self._write(body)
+        return body
+
+    def replace_item(self, item, body, etag, match_condition):  # pylint: disable=W0613
+        """ETagが一致する場合のみ項目を置換する"""
+
+        if self.items[item]["_etag"] != etag:
+            raise CosmosAccessConditionFailedError
+        self._write(body)
+        return body
+
+    def read_all_items(self):
+        """全項目を取得する"""
+
+        return [dict(item) for item in self.items.values()]
+
+    def delete_item(self, item, partition_key):  # pylint: disable=W0613
+        """項目を削除する"""
+
+        self.items.pop(item)
+
+    def patch_item(
+        self, item, partition_key, patch_operations
+    ):  # pylint: disable=W0613
+        """項目を部分的に更新する(set操作のみ)"""
+
+        if item not in self.items:
+            raise CosmosResourceNotFoundError
+        for operation in patch_operations:
+            *parents, key = operation["path"].strip("/").split("/")
+            target = self.items[item]
+            for parent in parents:
+                target = target.setdefault(parent, {})
+            target[key] = operation["value"]
+        return dict(self.items[item])
+
+    def execute_item_batch(
+        self, batch_operations, partition_key, response_hook
+    ):  # pylint: disable=W0613
+        """トランザクションバッチで項目をupsertする"""
+
+        self.batch_count += 1
+        if self.batch_count == self.fail_at_batch:
+            raise RuntimeError("Instance Recycled")
+        for _, (item,) in batch_operations:
+            self._write(item)
+        response_hook({"x-ms-request-charge": "1.0"}, batch_operations)
+        return batch_operations
+
+    def query_items(self, query, parameters):
+        """Test・Questionコンテナーのクエリの結果を返す"""
+
+        self.queries.append((query, parameters))
+        values = {parameter["name"]: parameter["value"] for parameter in parameters}
+        if "@courseName" in values:
+            return [
+                item
+                for item in self.items.values()
+                if item["courseName"] == values["@courseName"]
+                and item["testName"] == values["@testName"]
+            ]
+        return [
+            {
+                "number": item["number"],
+                "contentHash": item["contentHash"],
+                "isTranslated": "translatedSubjects" in item,
+            }
+            for item in self.items.values()
+            if item["testId"] == values["@testId"]
+            and item["number"] > values["@committedNumber"]
+            and item["number"] <= values.get("@endNumber", item["number"])
+        ]
+
+
+def create_blob(json_data, etag):
+    """インポートデータファイルのfunc.InputStreamの代替を生成する"""
+
+    blob = io.BytesIO(json.dumps(json_data).encode("utf-8"))
+    blob.name = "import-items/Math/Algebra.json"
+    blob.blob_properties = {"ETag": etag}
+    return blob
+
 
 class TestBlobTriggeredImport(TestCase):
     """blob_triggered_import関数のテストケース"""
 
+    @patch("src.blob_triggered_import.delete_import_checkpoint")
+    @patch("src.blob_triggered_import.get_import_checkpoint")
+    @patch("src.blob_triggered_import.get_test_item")
     @patch("src.blob_triggered_import.upsert_test_item")
     @patch("src.blob_triggered_import.upsert_question_items")
+    @patch("src.blob_triggered_import.uuid4")
     @patch("src.blob_triggered_import.logging")
-    def test_blob_triggered_import(
-        self, mock_logging, mock_upsert_question_items, mock_upsert_test_item
+    def test_blob_triggered_import(  # pylint: disable=R0913,R0917
+        self,
+        mock_logging,
+        mock_uuid4,
+        mock_upsert_question_items,
+        mock_upsert_test_item,
+        mock_get_test_item,
+        mock_get_import_checkpoint,
+        mock_delete_import_checkpoint,
     ):
-        """blob_triggered_import関数のテスト"""
+        """インポートデータファイルを1要素ずつ読み込んでupsertするテスト"""
 
-        mock_upsert_test_item.return_value = ("test-id", False)
+        mock_get_test_item.return_value = None
+        mock_get_import_checkpoint.return_value = None
+        mock_uuid4.return_value = "test-id"
+        json_items = []
+        checkpoint_id = get_import_checkpoint_id("Math", "Algebra")
+        expected_checkpoint = {
+            "id": checkpoint_id,
+            "courseName": "Math",
+            "testName": "Algebra",
+            "contentVersion": "0x1",
+            "testId": "test-id",
+            "committedNumber": 0,
+            "ttl": None,
+        }
 
-        blob_data = json.dumps(
-            [
-                {
-                    "subjects": ["Q1"],
-                    "choices": ["A"],
-                    "answerNum": 1,
-                }
-            ]
-        ).encode("utf-8")
+        def fake_upsert_question_items(test_id, is_existed_test, json_data, checkpoint):
+            self.assertEqual(test_id, "test-id")
+            self.assertFalse(is_existed_test)
+            self.assertEqual(checkpoint, expected_checkpoint)
+            json_items.extend(json_data)
+            return len(json_items)
 
-        mock_blob = MagicMock()
-        mock_blob.name = "import-items/Math/Algebra.json"
-        mock_blob.read.return_value = blob_data
+        mock_upsert_question_items.side_effect = fake_upsert_question_items
 
-        blob_triggered_import(mock_blob)
+        blob_triggered_import(
+            create_blob(
+                [
+                    {
+                        "subjects": ["Q1"],
+                        "choices": ["A"],
+                        "answerNum": 1,
+                    },
+                    {
+                        "subjects": ["Q2"],
+                        "choices": ["B"],
+                        "answerNum": 1,
+                    },
+                ],
+                "0x1",
+            )
+        )
 
+        mock_get_test_item.assert_called_once_with(
+            course_name="Math", test_name="Algebra"
+        )
+        mock_get_import_checkpoint.assert_called_once_with(checkpoint_id)
+        self.assertEqual(
+            json_items,
+            [
+                {"subjects": ["Q1"], "choices": ["A"], "answerNum": 1},
+                {"subjects": ["Q2"], "choices": ["B"], "answerNum": 1},
+            ],
+        )
         mock_upsert_test_item.assert_called_once_with(
             course_name="Math",
             test_name="Algebra",
-            json_data=[
-                {
-                    "subjects": ["Q1"],
-                    "choices": ["A"],
-                    "answerNum": 1,
-                }
-            ],
-        )
-        mock_upsert_question_items.assert_called_once_with(
             test_id="test-id",
-            is_existed_test=False,
-            json_data=[
-                {
-                    "subjects": ["Q1"],
-                    "choices": ["A"],
-                    "answerNum": 1,
+            inserted_test_item=None,
+            length=2,
+        )
+        mock_delete_import_checkpoint.assert_called_once_with(checkpoint_id)
+        mock_logging.info.assert_has_calls(
+            [
+                call({"course_name": "Math", "test_name": "Algebra"}),
+                call({"checkpoint": expected_checkpoint, "is_resumed": False}),
+            ]
+        )
+
+    @patch("src.blob_triggered_import.delete_import_checkpoint")
+    @patch("src.blob_triggered_import.get_import_checkpoint")
+    @patch("src.blob_triggered_import.get_test_item")
+    @patch("src.blob_triggered_import.upsert_test_item")
+    @patch("src.blob_triggered_import.upsert_question_items")
+    @patch("src.blob_triggered_import.uuid4")
+    def test_blob_triggered_import_checkpoint(  # pylint: disable=R0913,R0917
+        self,
+        mock_uuid4,
+        mock_upsert_question_items,
+        mock_upsert_test_item,  # pylint: disable=W0613
+        mock_get_test_item,
+        mock_get_import_checkpoint,
+        mock_delete_import_checkpoint,  # pylint: disable=W0613
+    ):
+        """チェックポイントのテストIDを引き継ぎ、同じバージョンの場合のみ再開するテスト"""
+
+        mock_get_test_item.return_value = None
+        mock_uuid4.return_value = "new-test-id"
+        mock_upsert_question_items.return_value = 2
+        saved_checkpoint = {
+            "id": get_import_checkpoint_id("Math", "Algebra"),
+            "courseName": "Math",
+            "testName": "Algebra",
+            "contentVersion": "0x1",
+            "testId": "test-id",
+            "committedNumber": 100,
+            "ttl": 3600,
+        }
+
+        # バージョンを取得できない場合は、チェックポイントのバージョンに関わらず先頭からインポート
+        for saved_version, etag, expected_committed_number in (
+            ("0x1", "0x1", 100),
+            ("0x1", "0x2", 0),
+            ("0x1", None, 0),
+            (None, None, 0),
+        ):
+            with self.subTest(saved_version=saved_version, etag=etag):
+                mock_get_import_checkpoint.return_value = {
+                    **saved_checkpoint,
+                    "contentVersion": saved_version,
                 }
+
+                blob_triggered_import(create_blob([], etag))
+
+                kwargs = mock_upsert_question_items.call_args.kwargs
+                self.assertEqual(kwargs["test_id"], "test-id")
+                self.assertTrue(kwargs["is_existed_test"])
+                self.assertEqual(kwargs["checkpoint"]["contentVersion"], etag)
+                self.assertEqual(
+                    kwargs["checkpoint"]["committedNumber"], expected_committed_number
+                )
+
+    @patch("util.throttle.time.sleep")
+    @patch("src.blob_triggered_import.uuid4")
+    @patch("util.catalog.get_read_write_container")
+    @patch("util.checkpoint.get_read_write_container")
+    @patch("src.blob_triggered_import.get_read_write_container")
+    @patch.dict(os.environ, {"IMPORT_BATCH_SIZE": "3"})
+    def test_blob_triggered_import_resume_after_failure(  # pylint: disable=R0913,R0917
+        self,
+        mock_get_read_write_container,
+        mock_get_checkpoint_container,
+        mock_get_catalog_container,
+        mock_uuid4,
+        mock_sleep,  # pylint: disable=W0613
+    ):
+        """インポートが途中で停止した場合に、再実行でチェックポイントから再開し、項目を重複して書き込まないテスト"""
+
+        containers = {
+            "Test": InMemoryContainer(),
+            "Question": InMemoryContainer(fail_at_batch=3),
+            "Import": InMemoryContainer(),
+            "Catalog": InMemoryContainer(),
+        }
+        mock_get_read_write_container.side_effect = (
+            lambda database_name, container_name: containers[container_name]
+        )
+        mock_get_checkpoint_container.side_effect = (
+            mock_get_read_write_container.side_effect
+        )
+        mock_get_catalog_container.side_effect = (
+            mock_get_read_write_container.side_effect
+        )
+        mock_uuid4.side_effect = ["test-id-1", "test-id-2"]
+        json_data = [
+            {"subjects": [f"Q{i}"], "choices": ["A"], "answerNum": 1}
+            for i in range(1, 11)
+        ]
+        checkpoint_id = get_import_checkpoint_id("Math", "Algebra")
+
+        # 3回目のバッチ(問題番号7-9)のupsert中に停止
+        with self.assertRaises(RuntimeError):
+            blob_triggered_import(create_blob(json_data, "0x1"))
+        self.assertEqual(
+            containers["Import"].items[checkpoint_id]["committedNumber"], 6
+        )
+        self.assertEqual(containers["Test"].items, {})
+
+        # 再実行
+        blob_triggered_import(create_blob(json_data, "0x1"))
+
+        self.assertEqual(
+            containers["Question"].write_counts,
+            {f"test-id-1_{i}": 1 for i in range(1, 11)},
+        )
+        self.assertEqual(
+            containers["Test"].items["test-id-1"]["length"], len(json_data)
+        )
+        self.assertEqual(
+            containers["Question"].queries[-1][1],
+            [
+                {"name": "@testId", "value": "test-id-1"},
+                {"name": "@committedNumber", "value": 6},
             ],
         )
-        mock_logging.info.assert_called_once_with(
-            {
-                "course_name": "Math",
-                "test_name": "Algebra",
-            }
+        self.assertEqual(containers["Import"].items, {})
+        self.assertEqual(
+            containers["Catalog"].items["tests"]["courses"],
+            {"Math": [{"id": "test-id-1", "testName": "Algebra", "length": 10}]},
         )
+
+
+class TestGetContentVersion(TestCase):
+    """get_content_version関数のテストケース"""
+
+    def test_get_content_version(self):
+        """ETag、Content-MD5の順に用い、いずれも取得できない場合はサイズを用いずにNoneを返すテスト"""
+
+        for blob_properties, expected in (
+            ({"ETag": "0x1", "ContentMD5": "md5"}, "0x1"),
+            ({"ContentMD5": "md5"}, "md5"),
+            ({}, None),
+            (None, None),
+        ):
+            with self.subTest(blob_properties=blob_properties):
+                blob = io.BytesIO(b"[]")
+                blob.blob_properties = blob_properties
+                blob.length = 2
+                self.assertEqual(get_content_version(blob), expected)
+
+
+class TestSplitImportChunks(TestCase):
+    """split_import_chunks関数のテストケース"""
+
+    def test_split_import_chunks(self):
+        """問題番号の範囲ごとに、バイト位置とバイト列のハッシュ値を返すテスト"""
+
+        json_data = [
+            {"subjects": [f"問題{i}"], "choices": ["A"], "answerNum": 1}
+            for i in range(1, 6)
+        ]
+        data = json.dumps(json_data, ensure_ascii=False).encode("utf-8")
+
+        chunks, length = split_import_chunks(io.BytesIO(data), 2)
+
+        self.assertEqual(length, 5)
+        self.assertEqual(
+            [(chunk["startNumber"], chunk["endNumber"]) for chunk in chunks],
+            [(1, 2), (3, 4), (5, 5)],
+        )
+        for chunk in chunks:
+            chunk_data = data[chunk["startOffset"] : chunk["endOffset"]]
+            self.assertEqual(
+                json.loads(b"[" + chunk_data + b"]"),
+                json_data[chunk["startNumber"] - 1 : chunk["endNumber"]],
+            )
+            self.assertEqual(chunk["chunkHash"], hashlib.sha256(chunk_data).hexdigest())
+
+    def test_split_import_chunks_empty(self):
+        """インポートデータが空の場合のテスト"""
+
+        self.assertEqual(split_import_chunks(io.BytesIO(b"[]"), 2), ([], 0))
+
+    def test_split_import_chunks_invalid(self):
+        """インポートデータの要素が不正な場合に、例外を送出するテスト"""
+
+        with self.assertRaisesRegex(ValueError, "Invalid Import Item: 2"):
+            split_import_chunks(
+                io.BytesIO(
+                    b'[{"subjects":["Q1"],"choices":["A"],"answerNum":1},{"subjects":["Q2"]}]'
+                ),
+                2,
+            )
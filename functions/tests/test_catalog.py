@@ -0,0 +1,117 @@
+"""テストの一覧をまとめたカタログのユーティリティ関数のテスト"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from azure.core import MatchConditions
+from azure.cosmos.exceptions import (
+    CosmosAccessConditionFailedError,
+    CosmosResourceExistsError,
+    CosmosResourceNotFoundError,
+)
+from util.catalog import build_tests_catalog, refresh_tests_catalog
+
+TEST_ITEMS = [
+    {"id": "3", "courseName": "Science", "testName": "Physics", "length": 30},
+    {"id": "2", "courseName": "Math", "testName": "Geometry", "length": 20},
+    {"id": "1", "courseName": "Math", "testName": "Algebra", "length": 10},
+]
+
+EXPECTED_COURSES = {
+    "Math": [
+        {"id": "1", "testName": "Algebra", "length": 10},
+        {"id": "2", "testName": "Geometry", "length": 20},
+    ],
+    "Science": [{"id": "3", "testName": "Physics", "length": 30}],
+}
+
+
+class TestBuildTestsCatalog(unittest.TestCase):
+    """build_tests_catalog関数のテストケース"""
+
+    def test_build_tests_catalog(self):
+        """コース名・テスト名の昇順に並べてコース名ごとにまとめるテスト"""
+
+        courses = build_tests_catalog(TEST_ITEMS)
+
+        self.assertEqual(courses, EXPECTED_COURSES)
+        self.assertEqual(list(courses), ["Math", "Science"])
+
+
+class TestRefreshTestsCatalog(unittest.TestCase):
+    """refresh_tests_catalog関数のテストケース"""
+
+    def setUp(self):
+        self.catalog_container = MagicMock()
+        self.test_container = MagicMock()
+        self.test_container.read_all_items.return_value = TEST_ITEMS
+        patcher = patch("util.catalog.get_read_write_container")
+        self.mock_get_read_write_container = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_get_read_write_container.side_effect = (
+            lambda database_name, container_name: {
+                "Catalog": self.catalog_container,
+                "Test": self.test_container,
+            }[container_name]
+        )
+
+    def test_refresh_tests_catalog_create(self):
+        """カタログが存在しない場合に作成するテスト"""
+
+        self.catalog_container.read_item.side_effect = CosmosResourceNotFoundError
+
+        refresh_tests_catalog()
+
+        self.catalog_container.create_item.assert_called_once_with(
+            {"id": "tests", "courses": EXPECTED_COURSES}
+        )
+        self.catalog_container.replace_item.assert_not_called()
+
+    def test_refresh_tests_catalog_replace(self):
+        """カタログが存在する場合に、読み込んだ時点から更新されていない場合のみ置換するテスト"""
+
+        self.catalog_container.read_item.return_value = {
+            "id": "tests",
+            "courses": {},
+            "_etag": "etag",
+        }
+
+        refresh_tests_catalog()
+
+        self.catalog_container.replace_item.assert_called_once_with(
+            item="tests",
+            body={"id": "tests", "courses": EXPECTED_COURSES},
+            etag="etag",
+            match_condition=MatchConditions.IfNotModified,
+        )
+
+    def test_refresh_tests_catalog_conflict(self):
+        """他のインスタンスとカタログの更新が競合した場合に、再生成して保存するテスト"""
+
+        self.catalog_container.read_item.side_effect = [
+            CosmosResourceNotFoundError,
+            {"id": "tests", "courses": {}, "_etag": "etag"},
+        ]
+        self.catalog_container.create_item.side_effect = CosmosResourceExistsError
+
+        refresh_tests_catalog()
+
+        self.assertEqual(self.test_container.read_all_items.call_count, 2)
+        self.catalog_container.replace_item.assert_called_once()
+
+    def test_refresh_tests_catalog_conflict_exceeded(self):
+        """他のインスタンスとの競合が続く場合に、例外を送出するテスト"""
+
+        self.catalog_container.read_item.return_value = {
+            "id": "tests",
+            "courses": {},
+            "_etag": "etag",
+        }
+        self.catalog_container.replace_item.side_effect = (
+            CosmosAccessConditionFailedError
+        )
+
+        with self.assertRaises(RuntimeError):
+            refresh_tests_catalog()
+
+        self.assertEqual(self.catalog_container.replace_item.call_count, 5)
@@ -0,0 +1,214 @@
+"""インポートの進捗を記録するチェックポイントのユーティリティ関数のテスト"""
+
+import os
+import unittest
+from unittest.mock import patch
+
+from azure.cosmos.exceptions import CosmosHttpResponseError, CosmosResourceNotFoundError
+from type.cosmos import ImportCheckpoint, ImportJob
+from util.checkpoint import (
+    complete_import_chunk,
+    create_import_job,
+    delete_import_checkpoint,
+    get_import_checkpoint,
+    get_import_checkpoint_id,
+    get_import_job_id,
+    save_import_checkpoint,
+)
+
+
+class TestGetImportCheckpointId(unittest.TestCase):
+    """get_import_checkpoint_id関数のテストケース"""
+
+    def test_get_import_checkpoint_id(self):
+        """コース名・テスト名の区切りによらず異なるドキュメントIDを生成するテスト"""
+
+        checkpoint_id = get_import_checkpoint_id("Math", "Algebra/1")
+
+        self.assertEqual(checkpoint_id, get_import_checkpoint_id("Math", "Algebra/1"))
+        self.assertNotIn("/", checkpoint_id)
+        self.assertNotEqual(
+            get_import_checkpoint_id("a_b", "c"), get_import_checkpoint_id("a", "b_c")
+        )
+
+
+class TestGetImportCheckpoint(unittest.TestCase):
+    """get_import_checkpoint関数のテストケース"""
+
+    @patch("util.checkpoint.get_read_write_container")
+    def test_get_import_checkpoint(self, mock_get_read_write_container):
+        """チェックポイントを取得するテスト"""
+
+        mock_container = mock_get_read_write_container.return_value
+        mock_container.read_item.return_value = {"id": "key", "committedNumber": 100}
+
+        self.assertEqual(
+            get_import_checkpoint("key"), {"id": "key", "committedNumber": 100}
+        )
+        mock_get_read_write_container.assert_called_once_with(
+            database_name="Users", container_name="Import"
+        )
+        mock_container.read_item.assert_called_once_with(
+            item="key", partition_key="key"
+        )
+
+    @patch("util.checkpoint.get_read_write_container")
+    def test_get_import_checkpoint_not_found(self, mock_get_read_write_container):
+        """チェックポイントが存在しない場合のテスト"""
+
+        mock_container = mock_get_read_write_container.return_value
+        mock_container.read_item.side_effect = CosmosResourceNotFoundError
+
+        self.assertIsNone(get_import_checkpoint("key"))
+
+    @patch("util.checkpoint.get_read_write_container")
+    @patch("util.checkpoint.logging")
+    def test_get_import_checkpoint_error(
+        self, mock_logging, mock_get_read_write_container
+    ):
+        """Importコンテナーの操作に失敗した場合に、チェックポイントがないものとみなすテスト"""
+
+        mock_container = mock_get_read_write_container.return_value
+        mock_container.read_item.side_effect = CosmosHttpResponseError(
+            status_code=503, message="Service Unavailable"
+        )
+
+        self.assertIsNone(get_import_checkpoint("key"))
+        mock_logging.warning.assert_called_once()
+
+
+class TestSaveImportCheckpoint(unittest.TestCase):
+    """save_import_checkpoint関数のテストケース"""
+
+    @patch("util.checkpoint.get_read_write_container")
+    @patch.dict(os.environ, {"IMPORT_CHECKPOINT_TTL_SECONDS": "3600"})
+    def test_save_import_checkpoint(self, mock_get_read_write_container):
+        """有効期間を設定してチェックポイントを保存するテスト"""
+
+        checkpoint: ImportCheckpoint = {
+            "id": "key",
+            "courseName": "Math",
+            "testName": "Algebra",
+            "contentVersion": "etag",
+            "testId": "test-id",
+            "committedNumber": 100,
+            "ttl": None,
+        }
+
+        save_import_checkpoint(checkpoint)
+
+        mock_get_read_write_container.return_value.upsert_item.assert_called_once_with(
+            {**checkpoint, "ttl": 3600}
+        )
+
+    @patch("util.checkpoint.get_read_write_container")
+    @patch("util.checkpoint.logging")
+    def test_save_import_checkpoint_error(
+        self, mock_logging, mock_get_read_write_container
+    ):
+        """Importコンテナーの操作に失敗した場合に、例外を送出しないテスト"""
+
+        mock_container = mock_get_read_write_container.return_value
+        mock_container.upsert_item.side_effect = CosmosHttpResponseError(
+            status_code=503, message="Service Unavailable"
+        )
+
+        save_import_checkpoint({"id": "key", "committedNumber": 100})
+
+        mock_logging.warning.assert_called_once()
+
+
+class TestDeleteImportCheckpoint(unittest.TestCase):
+    """delete_import_checkpoint関数のテストケース"""
+
+    @patch("util.checkpoint.get_read_write_container")
+    def test_delete_import_checkpoint(self, mock_get_read_write_container):
+        """チェックポイントを削除し、存在しない場合は無視するテスト"""
+
+        mock_container = mock_get_read_write_container.return_value
+        mock_container.delete_item.side_effect = [None, CosmosResourceNotFoundError]
+
+        delete_import_checkpoint("key")
+        delete_import_checkpoint("key")
+
+        self.assertEqual(mock_container.delete_item.call_count, 2)
+        mock_container.delete_item.assert_called_with(item="key", partition_key="key")
+
+
+class TestGetImportJobId(unittest.TestCase):
+    """get_import_job_id関数のテストケース"""
+
+    def test_get_import_job_id(self):
+        """インポートデータファイルのバージョンごとに異なるドキュメントIDを生成するテスト"""
+
+        self.assertEqual(
+            get_import_job_id("Math", "Algebra", "0x1"),
+            get_import_job_id("Math", "Algebra", "0x1"),
+        )
+        self.assertNotEqual(
+            get_import_job_id("Math", "Algebra", "0x1"),
+            get_import_job_id("Math", "Algebra", "0x2"),
+        )
+
+
+class TestCreateImportJob(unittest.TestCase):
+    """create_import_job関数のテストケース"""
+
+    @patch("util.checkpoint.get_read_write_container")
+    @patch.dict(os.environ, {"IMPORT_CHECKPOINT_TTL_SECONDS": "3600"})
+    def test_create_import_job(self, mock_get_read_write_container):
+        """有効期間を設定してインポートジョブを保存するテスト"""
+
+        import_job: ImportJob = {
+            "id": "job-id",
+            "courseName": "Math",
+            "testName": "Algebra",
+            "contentVersion": "0x1",
+            "testId": "test-id",
+            "length": 1000,
+            "chunkCount": 2,
+            "completedChunks": {},
+            "ttl": None,
+        }
+
+        create_import_job(import_job)
+
+        mock_get_read_write_container.return_value.upsert_item.assert_called_once_with(
+            {**import_job, "ttl": 3600}
+        )
+
+
+class TestCompleteImportChunk(unittest.TestCase):
+    """complete_import_chunk関数のテストケース"""
+
+    @patch("util.checkpoint.get_read_write_container")
+    def test_complete_import_chunk(self, mock_get_read_write_container):
+        """範囲のupsertの完了を部分的な更新で記録し、記録後のインポートジョブを返すテスト"""
+
+        mock_container = mock_get_read_write_container.return_value
+        mock_container.patch_item.return_value = {
+            "id": "job-id",
+            "chunkCount": 2,
+            "completedChunks": {"1": True},
+        }
+
+        self.assertEqual(
+            complete_import_chunk("job-id", 1),
+            {"id": "job-id", "chunkCount": 2, "completedChunks": {"1": True}},
+        )
+        mock_container.patch_item.assert_called_once_with(
+            item="job-id",
+            partition_key="job-id",
+            patch_operations=[
+                {"op": "set", "path": "/completedChunks/1", "value": True}
+            ],
+        )
+
+    @patch("util.checkpoint.get_read_write_container")
+    def test_complete_import_chunk_not_found(self, mock_get_read_write_container):
+        """インポートジョブが存在しない場合のテスト"""
+
+        mock_container = mock_get_read_write_container.return_value
+        mock_container.patch_item.side_effect = CosmosResourceNotFoundError
+
+        self.assertIsNone(complete_import_chunk("job-id", 1))
@@ -1,16 +1,29 @@
 """Cosmos DBのユーティリティ関数のテスト"""
 
+import asyncio
 import os
-from unittest import TestCase
+from unittest import IsolatedAsyncioTestCase, TestCase
 from unittest.mock import MagicMock, patch
 
 from azure.cosmos import ContainerProxy
-from util.cosmos import get_read_only_container, get_read_write_container
+from util.cosmos import (
+    get_async_read_only_container,
+    get_cosmos_client,
+    get_read_only_container,
+    get_read_write_container,
+    reset_cosmos_clients,
+)
 
 
 class TestGetReadOnlyContainer(TestCase):
     """get_read_only_container関数のテストケース"""
 
+    def setUp(self):
+        reset_cosmos_clients()
+
+    def tearDown(self):
+        reset_cosmos_clients()
+
     @patch("util.cosmos.CosmosClient")
     @patch.dict(
         os.environ,
@@ -44,6 +57,12 @@ class TestGetReadOnlyContainer(TestCase):
 class TestGetReadWriteContainer(TestCase):
     """get_read_write_container関数のテストケース"""
 
+    def setUp(self):
+        reset_cosmos_clients()
+
+    def tearDown(self):
+        reset_cosmos_clients()
+
     @patch("util.cosmos.CosmosClient")
     @patch.dict(
         os.environ,
@@ -72,3 +91,150 @@ class TestGetReadWriteContainer(TestCase):
             "TestContainer"
         )
         self.assertEqual(container, mock_container)
+
+
+class TestCosmosClientRegistry(TestCase):
+    """ワーカープロセス内で共有するCosmosClient・ContainerProxyのテストケース"""
+
+    def setUp(self):
+        reset_cosmos_clients()
+
+    def tearDown(self):
+        reset_cosmos_clients()
+
+    @patch("util.cosmos.CosmosClient")
+    @patch.dict(
+        os.environ,
+        {
+            "COSMOSDB_URI": "https://fake-uri",
+            "COSMOSDB_READONLY_KEY": "fake-readonly-key",
+            "COSMOSDB_KEY": "fake-key",
+        },
+    )
+    def test_reuse_client_and_container(self, mock_cosmos_client):
+        """同じキー・コンテナーを複数回取得した場合にクライアント・コンテナーを再利用するテスト"""
+
+        first = get_read_only_container("TestDB", "TestContainer")
+        second = get_read_only_container("TestDB", "TestContainer")
+        other = get_read_only_container("TestDB", "OtherContainer")
+
+        mock_cosmos_client.assert_called_once_with(
+            url="https://fake-uri", credential="fake-readonly-key"
+        )
+        self.assertIs(first, second)
+        database_client = mock_cosmos_client.return_value.get_database_client
+        self.assertEqual(
+            database_client.return_value.get_container_client.call_count, 2
+        )
+        self.assertIsNotNone(other)
+
+    @patch("util.cosmos.CosmosClient")
+    @patch.dict(
+        os.environ,
+        {
+            "COSMOSDB_URI": "https://fake-uri",
+            "COSMOSDB_READONLY_KEY": "fake-readonly-key",
+            "COSMOSDB_KEY": "fake-key",
+        },
+    )
+    def test_separate_client_per_credential(self, mock_cosmos_client):
+        """キーごとに別のクライアントを生成するテスト"""
+
+        get_read_only_container("TestDB", "TestContainer")
+        get_read_write_container("TestDB", "TestContainer")
+        get_read_write_container("TestDB", "TestContainer")
+
+        self.assertEqual(mock_cosmos_client.call_count, 2)
+        mock_cosmos_client.assert_any_call(
+            url="https://fake-uri", credential="fake-readonly-key"
+        )
+        mock_cosmos_client.assert_any_call(
+            url="https://fake-uri", credential="fake-key"
+        )
+
+    @patch("util.cosmos.CosmosClient")
+    @patch.dict(os.environ, {"COSMOSDB_URI": "https://fake-uri"})
+    def test_reset_cosmos_clients(self, mock_cosmos_client):
+        """reset_cosmos_clients関数の実行後にクライアントを再生成するテスト"""
+
+        get_cosmos_client("fake-key")
+        reset_cosmos_clients()
+        get_cosmos_client("fake-key")
+
+        self.assertEqual(mock_cosmos_client.call_count, 2)
+
+    @patch.dict(os.environ, {"COSMOSDB_URI": "https://fake-uri"}, clear=True)
+    def test_get_read_only_container_missing_key(self):
+        """COSMOSDB_READONLY_KEYが未設定の場合のテスト"""
+
+        with self.assertRaises(KeyError):
+            get_read_only_container("TestDB", "TestContainer")
+
+
+class TestGetAsyncReadOnlyContainer(IsolatedAsyncioTestCase):
+    """get_async_read_only_container関数のテストケース"""
+
+    def setUp(self):
+        reset_cosmos_clients()
+
+    def tearDown(self):
+        reset_cosmos_clients()
+
+    @patch("util.cosmos.AsyncCosmosClient")
+    @patch.dict(
+        os.environ,
+        {
+            "COSMOSDB_URI": "https://fake-uri",
+            "COSMOSDB_READONLY_KEY": "fake-readonly-key",
+        },
+    )
+    async def test_reuse_in_same_event_loop(self, mock_async_cosmos_client):
+        """同じイベントループ内では非同期版のクライアント・コンテナーを再利用するテスト"""
+
+        mock_container = MagicMock()
+        mock_database_client = (
+            mock_async_cosmos_client.return_value.get_database_client.return_value
+        )
+        mock_database_client.get_container_client.return_value = mock_container
+
+        first = get_async_read_only_container("TestDB", "TestContainer")
+        second = get_async_read_only_container("TestDB", "TestContainer")
+
+        mock_async_cosmos_client.assert_called_once_with(
+            url="https://fake-uri", credential="fake-readonly-key"
+        )
+        self.assertIs(first, mock_container)
+        self.assertIs(second, mock_container)
+
+    @patch("util.cosmos.AsyncCosmosClient")
+    @patch.dict(
+        os.environ,
+        {
+            "COSMOSDB_URI": "https://fake-uri",
+            "COSMOSDB_READONLY_KEY": "fake-readonly-key",
+        },
+    )
+    async def test_recreate_in_other_event_loop(self, mock_async_cosmos_client):
+        """別のイベントループでは非同期版のクライアントを再生成するテスト"""
+
+        get_async_read_only_container("TestDB", "TestContainer")
+
+        async def get_in_other_loop():
+            return get_async_read_only_container("TestDB", "TestContainer")
+
+        await asyncio.to_thread(asyncio.run, get_in_other_loop())
+
+        self.assertEqual(mock_async_cosmos_client.call_count, 2)
+
+    @patch.dict(
+        os.environ,
+        {
+            "COSMOSDB_URI": "https://fake-uri",
+            "COSMOSDB_READONLY_KEY": "fake-readonly-key",
+        },
+    )
+    def test_without_running_event_loop(self):
+        """イベントループが実行中でない場合にRuntimeErrorをraiseするテスト"""
+
+        with self.assertRaises(RuntimeError):
+            get_async_read_only_container("TestDB", "TestContainer")
@@ -0,0 +1,147 @@
+"""Discussionコンテナーの項目のユーティリティ関数のテスト"""
+
+import unittest
+from unittest.mock import MagicMock
+
+from azure.core import MatchConditions
+from azure.cosmos.exceptions import (
+    CosmosAccessConditionFailedError,
+    CosmosResourceExistsError,
+)
+from type.cosmos import Question
+from util.discussion import migrate_question_discussions, split_discussion_items
+
+DISCUSSIONS = [
+    {"comment": "A is correct", "upvotedNum": 3, "selectedAnswer": "A"},
+    {"comment": "B is correct", "upvotedNum": 1, "selectedAnswer": "B"},
+]
+
+
+class TestSplitDiscussionItems(unittest.TestCase):
+    """split_discussion_items関数のテストケース"""
+
+    def test_split_discussion_items(self):
+        """discussionsフィールドを件数に置き換え、ディスカッションが存在する項目のみ返すテスト"""
+
+        question_items: list[Question] = [
+            {"id": "1_1", "number": 1, "testId": "1", "discussions": DISCUSSIONS},
+            {"id": "1_2", "number": 2, "testId": "1", "discussions": []},
+            {"id": "1_3", "number": 3, "testId": "1", "discussions": None},
+            {"id": "1_4", "number": 4, "testId": "1"},
+        ]
+
+        discussion_items = split_discussion_items(question_items)
+
+        self.assertEqual(
+            discussion_items,
+            [{"id": "1_1", "number": 1, "testId": "1", "discussions": DISCUSSIONS}],
+        )
+        self.assertEqual(
+            question_items,
+            [
+                {"id": "1_1", "number": 1, "testId": "1", "discussionNum": 2},
+                {"id": "1_2", "number": 2, "testId": "1", "discussionNum": 0},
+                {"id": "1_3", "number": 3, "testId": "1", "discussionNum": 0},
+                {"id": "1_4", "number": 4, "testId": "1", "discussionNum": 0},
+            ],
+        )
+
+
+class TestMigrateQuestionDiscussions(unittest.TestCase):
+    """migrate_question_discussions関数のテストケース"""
+
+    def test_migrate_question_discussions(self):
+        """Discussionコンテナーの項目を作成し、Questionコンテナーの項目のdiscussionsフィールドを件数に置き換えるテスト"""
+
+        container_question = MagicMock()
+        container_discussion = MagicMock()
+        container_question.query_items.return_value = [
+            {
+                "id": "1_1",
+                "number": 1,
+                "testId": "1",
+                "discussions": DISCUSSIONS,
+                "_etag": "etag1",
+            },
+            {
+                "id": "1_2",
+                "number": 2,
+                "testId": "1",
+                "discussions": None,
+                "_etag": "etag2",
+            },
+        ]
+
+        self.assertEqual(
+            migrate_question_discussions(container_question, container_discussion), 2
+        )
+
+        container_question.query_items.assert_called_once_with(
+            query="SELECT * FROM c WHERE IS_DEFINED(c.discussions)",
+            enable_cross_partition_query=True,
+        )
+        container_discussion.create_item.assert_called_once_with(
+            {"id": "1_1", "number": 1, "testId": "1", "discussions": DISCUSSIONS}
+        )
+        container_question.patch_item.assert_any_call(
+            item="1_1",
+            partition_key="1",
+            patch_operations=[
+                {"op": "remove", "path": "/discussions"},
+                {"op": "set", "path": "/discussionNum", "value": 2},
+            ],
+            etag="etag1",
+            match_condition=MatchConditions.IfNotModified,
+        )
+        container_question.patch_item.assert_any_call(
+            item="1_2",
+            partition_key="1",
+            patch_operations=[
+                {"op": "remove", "path": "/discussions"},
+                {"op": "set", "path": "/discussionNum", "value": 0},
+            ],
+            etag="etag2",
+            match_condition=MatchConditions.IfNotModified,
+        )
+
+    def test_migrate_question_discussions_already_created(self):
+        """Discussionコンテナーの項目が作成済の場合に、上書きせずに置き換えるテスト"""
+
+        container_question = MagicMock()
+        container_discussion = MagicMock()
+        container_question.query_items.return_value = [
+            {
+                "id": "1_1",
+                "number": 1,
+                "testId": "1",
+                "discussions": DISCUSSIONS,
+                "_etag": "etag1",
+            },
+        ]
+        container_discussion.create_item.side_effect = CosmosResourceExistsError
+
+        self.assertEqual(
+            migrate_question_discussions(container_question, container_discussion), 1
+        )
+        container_discussion.upsert_item.assert_not_called()
+        container_question.patch_item.assert_called_once()
+
+    def test_migrate_question_discussions_updated_by_import(self):
+        """取得後にインポートで更新されたQuestionコンテナーの項目を置き換えないテスト"""
+
+        container_question = MagicMock()
+        container_discussion = MagicMock()
+        container_question.query_items.return_value = [
+            {
+                "id": "1_1",
+                "number": 1,
+                "testId": "1",
+                "discussions": DISCUSSIONS,
+                "_etag": "etag1",
+            },
+        ]
+        container_question.patch_item.side_effect = CosmosAccessConditionFailedError
+
+        self.assertEqual(
+            migrate_question_discussions(container_question, container_discussion), 0
+        )
@@ -1,12 +1,13 @@
 """[GET] /tests/{testId}/answers/{questionNumber} のテスト"""
 
 import json
-from unittest import TestCase
-from unittest.mock import MagicMock, call, patch
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import azure.functions as func
 from azure.cosmos.exceptions import CosmosResourceNotFoundError
 from src.get_answer import get_answer, validate_request
+from util.http import make_etag
 
 
 class TestValidateRequest(TestCase):
@@ -53,34 +54,35 @@ class TestValidateRequest(TestCase):
         self.assertEqual(result, "Invalid questionNumber: a")
 
 
-class TestGetAnswer(TestCase):
+class TestGetAnswer(IsolatedAsyncioTestCase):
     """get_answer関数のテストケース"""
 
     @patch("src.get_answer.validate_request")
-    @patch("src.get_answer.get_read_only_container")
+    @patch("src.get_answer.get_async_read_only_container")
     @patch("src.get_answer.logging")
-    def test_get_answer_success(
-        self, mock_logging, mock_get_read_only_container, mock_validate_request
+    async def test_get_answer_success(
+        self, mock_logging, mock_get_async_read_only_container, mock_validate_request
     ):
         """正解の選択肢・正解/不正解の理由が存在する場合のレスポンスが正常であることのテスト"""
 
         mock_validate_request.return_value = None
-        mock_answer_container = MagicMock()
+        mock_answer_container = AsyncMock()
         mock_answer_item = {
+            "_etag": "etag",
             "correctIdxes": [1],
             "explanations": ["Option 1 is correct because..."],
         }
         mock_answer_container.read_item.return_value = mock_answer_item
-        mock_get_read_only_container.return_value = mock_answer_container
+        mock_get_async_read_only_container.return_value = mock_answer_container
 
         req = MagicMock(spec=func.HttpRequest)
         req.route_params = {"testId": "1", "questionNumber": "1"}
 
-        response = get_answer(req)
+        response = await get_answer(req)
 
         self.assertEqual(response.status_code, 200)
         mock_validate_request.assert_called_once_with(req)
-        mock_get_read_only_container.assert_called_once_with(
+        mock_get_async_read_only_container.assert_called_once_with(
             database_name="Users", container_name="Answer"
         )
         mock_answer_container.read_item.assert_called_once_with(
@@ -99,7 +101,32 @@ class TestGetAnswer(TestCase):
         mock_logging.error.assert_not_called()
 
     @patch("src.get_answer.validate_request")
-    def test_get_answer_validation_error(self, mock_validate_request):
+    @patch("src.get_answer.get_async_read_only_container")
+    @patch("src.get_answer.logging")
+    async def test_get_answer_not_modified(
+        self, mock_logging, mock_get_async_read_only_container, mock_validate_request
+    ):
+        """If-None-MatchヘッダーがETagに一致する場合に、ボディを生成せずに304を返すテスト"""
+
+        mock_validate_request.return_value = None
+        mock_answer_container = AsyncMock()
+        mock_answer_container.read_item.return_value = {"_etag": "etag"}
+        mock_get_async_read_only_container.return_value = mock_answer_container
+
+        req = MagicMock(spec=func.HttpRequest)
+        req.route_params = {"testId": "1", "questionNumber": "1"}
+        req.headers = {"If-None-Match": make_etag("etag")}
+
+        response = await get_answer(req)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_body(), b"")
+        self.assertEqual(response.headers["ETag"], make_etag("etag"))
+        self.assertEqual(response.headers["Cache-Control"], "private, max-age=60")
+        mock_logging.info.assert_called_once()
+
+    @patch("src.get_answer.validate_request")
+    async def test_get_answer_validation_error(self, mock_validate_request):
         """バリデーションチェックに失敗した場合のテスト"""
 
         mock_validate_request.return_value = "Validation Error"
@@ -107,36 +134,37 @@ class TestGetAnswer(TestCase):
         req = MagicMock(spec=func.HttpRequest)
         req.route_params = {"testId": "1", "questionNumber": "1"}
 
-        response = get_answer(req)
+        response = await get_answer(req)
 
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.get_body().decode(), "Validation Error")
 
     @patch("src.get_answer.validate_request")
-    @patch("src.get_answer.get_read_only_container")
+    @patch("src.get_answer.get_async_read_only_container")
     @patch("src.get_answer.logging")
-    def test_get_answer_not_found(
-        self, mock_logging, mock_get_read_only_container, mock_validate_request
+    async def test_get_answer_not_found(
+        self, mock_logging, mock_get_async_read_only_container, mock_validate_request
     ):
         """回答が見つからない場合のレスポンスのテスト"""
 
         mock_validate_request.return_value = None
-        mock_answer_container = MagicMock()
+        mock_answer_container = AsyncMock()
         mock_answer_container.read_item.side_effect = CosmosResourceNotFoundError
-        mock_get_read_only_container.return_value = mock_answer_container
+        mock_get_async_read_only_container.return_value = mock_answer_container
 
         req = MagicMock(spec=func.HttpRequest)
         req.route_params = {"testId": "1", "questionNumber": "1"}
 
-        response = get_answer(req)
+        response = await get_answer(req)
 
         self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["Cache-Control"], "private, no-cache")
         expected_body = {
             "isExisted": False,
         }
         self.assertEqual(json.loads(response.get_body().decode()), expected_body)
         mock_validate_request.assert_called_once_with(req)
-        mock_get_read_only_container.assert_called_once_with(
+        mock_get_async_read_only_container.assert_called_once_with(
             database_name="Users",
             container_name="Answer",
         )
@@ -148,22 +176,22 @@ class TestGetAnswer(TestCase):
         mock_logging.error.assert_not_called()
 
     @patch("src.get_answer.validate_request")
-    @patch("src.get_answer.get_read_only_container")
+    @patch("src.get_answer.get_async_read_only_container")
     @patch("src.get_answer.logging")
-    def test_get_answer_exception(
-        self, mock_logging, mock_get_read_only_container, mock_validate_request
+    async def test_get_answer_exception(
+        self, mock_logging, mock_get_async_read_only_container, mock_validate_request
     ):
         """例外が発生した場合のテスト"""
 
         mock_validate_request.return_value = None
-        mock_get_read_only_container.side_effect = Exception(
-            "Error in src.get_test.get_read_only_container"
+        mock_get_async_read_only_container.side_effect = Exception(
+            "Error in src.get_test.get_async_read_only_container"
         )
 
         req = MagicMock(spec=func.HttpRequest)
         req.route_params = {"testId": "1", "questionNumber": "1"}
 
-        response = get_answer(req)
+        response = await get_answer(req)
 
         self.assertEqual(response.status_code, 500)
         self.assertEqual(response.get_body().decode(), "Internal Server Error")
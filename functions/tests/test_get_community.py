@@ -1,12 +1,13 @@
 """[GET] /tests/{testId}/communities/{questionNumber} のテスト"""
 
 import json
-from unittest import TestCase
-from unittest.mock import MagicMock, call, patch
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import azure.functions as func
 from azure.cosmos.exceptions import CosmosResourceNotFoundError
 from src.get_community import get_community, validate_request
+from util.http import make_etag
 
 
 class TestValidateRequest(TestCase):
@@ -53,20 +54,21 @@ class TestValidateRequest(TestCase):
         self.assertEqual(result, "Invalid questionNumber: a")
 
 
-class TestGetCommunity(TestCase):
+class TestGetCommunity(IsolatedAsyncioTestCase):
     """get_community関数のテストケース"""
 
     @patch("src.get_community.validate_request")
-    @patch("src.get_community.get_read_only_container")
+    @patch("src.get_community.get_async_read_only_container")
     @patch("src.get_community.logging")
-    def test_get_community_success_with_votes(
-        self, mock_logging, mock_get_read_only_container, mock_validate_request
+    async def test_get_community_success_with_votes(
+        self, mock_logging, mock_get_async_read_only_container, mock_validate_request
     ):
         """Communityコンテナーのvotesフィールドを含む場合のレスポンスが正常であることのテスト"""
 
         mock_validate_request.return_value = None
-        mock_community_container = MagicMock()
+        mock_community_container = AsyncMock()
         mock_community_item = {
+            "_etag": "etag",
             "id": "1_1",
             "testId": "1",
             "questionNumber": 1,
@@ -76,17 +78,17 @@ class TestGetCommunity(TestCase):
             "votes": ["B (67%)", "C (33%)"],
         }
         mock_community_container.read_item.return_value = mock_community_item
-        mock_get_read_only_container.return_value = mock_community_container
+        mock_get_async_read_only_container.return_value = mock_community_container
 
         req = MagicMock(spec=func.HttpRequest)
         req.route_params = {"testId": "1", "questionNumber": "1"}
 
-        response = get_community(req)
+        response = await get_community(req)
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.mimetype, "application/json")
         mock_validate_request.assert_called_once_with(req)
-        mock_get_read_only_container.assert_called_once_with(
+        mock_get_async_read_only_container.assert_called_once_with(
             database_name="Users", container_name="Community"
         )
         mock_community_container.read_item.assert_called_once_with(
@@ -110,16 +112,17 @@ class TestGetCommunity(TestCase):
         mock_logging.error.assert_not_called()
 
     @patch("src.get_community.validate_request")
-    @patch("src.get_community.get_read_only_container")
+    @patch("src.get_community.get_async_read_only_container")
     @patch("src.get_community.logging")
-    def test_get_community_success_without_votes(
-        self, mock_logging, mock_get_read_only_container, mock_validate_request
+    async def test_get_community_success_without_votes(
+        self, mock_logging, mock_get_async_read_only_container, mock_validate_request
     ):
         """votesフィールドが空の場合のレスポンスが正常であることのテスト"""
 
         mock_validate_request.return_value = None
-        mock_community_container = MagicMock()
+        mock_community_container = AsyncMock()
         mock_community_item = {
+            "_etag": "etag",
             "id": "1_1",
             "testId": "1",
             "questionNumber": 1,
@@ -129,17 +132,17 @@ class TestGetCommunity(TestCase):
             "votes": [],
         }
         mock_community_container.read_item.return_value = mock_community_item
-        mock_get_read_only_container.return_value = mock_community_container
+        mock_get_async_read_only_container.return_value = mock_community_container
 
         req = MagicMock(spec=func.HttpRequest)
         req.route_params = {"testId": "1", "questionNumber": "1"}
 
-        response = get_community(req)
+        response = await get_community(req)
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.mimetype, "application/json")
         mock_validate_request.assert_called_once_with(req)
-        mock_get_read_only_container.assert_called_once_with(
+        mock_get_async_read_only_container.assert_called_once_with(
             database_name="Users", container_name="Community"
         )
         mock_community_container.read_item.assert_called_once_with(
@@ -163,7 +166,32 @@ class TestGetCommunity(TestCase):
         mock_logging.error.assert_not_called()
 
     @patch("src.get_community.validate_request")
-    def test_get_community_validation_error(self, mock_validate_request):
+    @patch("src.get_community.get_async_read_only_container")
+    @patch("src.get_community.logging")
+    async def test_get_community_not_modified(
+        self, mock_logging, mock_get_async_read_only_container, mock_validate_request
+    ):
+        """If-None-MatchヘッダーがETagに一致する場合に、ボディを生成せずに304を返すテスト"""
+
+        mock_validate_request.return_value = None
+        mock_community_container = AsyncMock()
+        mock_community_container.read_item.return_value = {"_etag": "etag"}
+        mock_get_async_read_only_container.return_value = mock_community_container
+
+        req = MagicMock(spec=func.HttpRequest)
+        req.route_params = {"testId": "1", "questionNumber": "1"}
+        req.headers = {"If-None-Match": make_etag("etag")}
+
+        response = await get_community(req)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_body(), b"")
+        self.assertEqual(response.headers["ETag"], make_etag("etag"))
+        self.assertEqual(response.headers["Cache-Control"], "private, max-age=60")
+        mock_logging.info.assert_called_once()
+
+    @patch("src.get_community.validate_request")
+    async def test_get_community_validation_error(self, mock_validate_request):
         """バリデーションチェックに失敗した場合のテスト"""
 
         mock_validate_request.return_value = "Validation Error"
@@ -171,30 +199,31 @@ class TestGetCommunity(TestCase):
         req = MagicMock(spec=func.HttpRequest)
         req.route_params = {"testId": "1", "questionNumber": "1"}
 
-        response = get_community(req)
+        response = await get_community(req)
 
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.get_body().decode(), "Validation Error")
 
     @patch("src.get_community.validate_request")
-    @patch("src.get_community.get_read_only_container")
+    @patch("src.get_community.get_async_read_only_container")
     @patch("src.get_community.logging")
-    def test_get_community_not_found(
-        self, mock_logging, mock_get_read_only_container, mock_validate_request
+    async def test_get_community_not_found(
+        self, mock_logging, mock_get_async_read_only_container, mock_validate_request
     ):
         """コミュニティ要約が見つからない場合のレスポンスのテスト"""
 
         mock_validate_request.return_value = None
-        mock_container = MagicMock()
+        mock_container = AsyncMock()
         mock_container.read_item.side_effect = CosmosResourceNotFoundError
-        mock_get_read_only_container.return_value = mock_container
+        mock_get_async_read_only_container.return_value = mock_container
 
         req = MagicMock(spec=func.HttpRequest)
         req.route_params = {"testId": "1", "questionNumber": "1"}
 
-        response = get_community(req)
+        response = await get_community(req)
 
         self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["Cache-Control"], "private, no-cache")
         self.assertEqual(response.mimetype, "application/json")
 
         expected_body = {
@@ -204,7 +233,7 @@ class TestGetCommunity(TestCase):
         self.assertEqual(json.loads(actual_body), expected_body)
 
         mock_validate_request.assert_called_once_with(req)
-        mock_get_read_only_container.assert_called_once_with(
+        mock_get_async_read_only_container.assert_called_once_with(
             database_name="Users",
             container_name="Community",
         )
@@ -216,22 +245,22 @@ class TestGetCommunity(TestCase):
         mock_logging.error.assert_not_called()
 
     @patch("src.get_community.validate_request")
-    @patch("src.get_community.get_read_only_container")
+    @patch("src.get_community.get_async_read_only_container")
     @patch("src.get_community.logging")
-    def test_get_community_exception(
-        self, mock_logging, mock_get_read_only_container, mock_validate_request
+    async def test_get_community_exception(
+        self, mock_logging, mock_get_async_read_only_container, mock_validate_request
     ):
         """例外が発生した場合のテスト"""
 
         mock_validate_request.return_value = None
-        mock_get_read_only_container.side_effect = Exception(
-            "Error in src.get_community.get_read_only_container"
+        mock_get_async_read_only_container.side_effect = Exception(
+            "Error in src.get_community.get_async_read_only_container"
         )
 
         req = MagicMock(spec=func.HttpRequest)
         req.route_params = {"testId": "1", "questionNumber": "1"}
 
-        response = get_community(req)
+        response = await get_community(req)
 
         self.assertEqual(response.status_code, 500)
         self.assertEqual(response.get_body().decode(), "Internal Server Error")
@@ -2,7 +2,7 @@
 
 import json
 import unittest
-from unittest.mock import MagicMock, call, patch
+from unittest.mock import AsyncMock, call, patch
 
 import azure.functions as func
 from azure.cosmos.exceptions import CosmosResourceNotFoundError
@@ -88,23 +88,23 @@ class TestValidateRequest(unittest.TestCase):
         self.assertEqual(errors, "X-User-Id header is Empty")
 
 
-class TestGetFavorite(unittest.TestCase):
+class TestGetFavorite(unittest.IsolatedAsyncioTestCase):
     """get_favorite関数のテストケース"""
 
     @patch("src.get_favorite.validate_request")
-    @patch("src.get_favorite.get_read_only_container")
+    @patch("src.get_favorite.get_async_read_only_container")
     @patch("src.get_favorite.logging")
-    def test_get_favorite_success(
+    async def test_get_favorite_success(
         self,
         mock_logging,
-        mock_get_read_only_container,
+        mock_get_async_read_only_container,
         mock_validate_request,
     ):
         """レスポンスが正常であることのテスト"""
 
         mock_validate_request.return_value = None
-        mock_container = MagicMock()
-        mock_get_read_only_container.return_value = mock_container
+        mock_container = AsyncMock()
+        mock_get_async_read_only_container.return_value = mock_container
         mock_item = {
             "id": "user-id_test-id_1",
             "userId": "user-id",
@@ -122,13 +122,13 @@ class TestGetFavorite(unittest.TestCase):
             headers={"X-User-Id": "user-id"},
         )
 
-        res = get_favorite(req)
+        res = await get_favorite(req)
 
         self.assertEqual(res.status_code, 200)
         response_body = json.loads(res.get_body().decode("utf-8"))
         self.assertEqual(response_body, {"isFavorite": True})
         mock_validate_request.assert_called_once_with(req)
-        mock_get_read_only_container.assert_called_once_with(
+        mock_get_async_read_only_container.assert_called_once_with(
             database_name="Users",
             container_name="Favorite",
         )
@@ -148,7 +148,7 @@ class TestGetFavorite(unittest.TestCase):
 
     @patch("src.get_favorite.validate_request")
     @patch("src.get_favorite.logging")
-    def test_get_favorite_validation_error(
+    async def test_get_favorite_validation_error(
         self,
         mock_logging,
         mock_validate_request,
@@ -165,7 +165,7 @@ class TestGetFavorite(unittest.TestCase):
             headers={"X-User-Id": "user-id"},
         )
 
-        res = get_favorite(req)
+        res = await get_favorite(req)
 
         self.assertEqual(res.status_code, 400)
         self.assertEqual(res.get_body().decode("utf-8"), "testId is Empty")
@@ -174,19 +174,19 @@ class TestGetFavorite(unittest.TestCase):
         mock_logging.error.assert_not_called()
 
     @patch("src.get_favorite.validate_request")
-    @patch("src.get_favorite.get_read_only_container")
+    @patch("src.get_favorite.get_async_read_only_container")
     @patch("src.get_favorite.logging")
-    def test_get_favorite_not_found(
+    async def test_get_favorite_not_found(
         self,
         mock_logging,
-        mock_get_read_only_container,
+        mock_get_async_read_only_container,
         mock_validate_request,
     ):
         """お気に入り情報が存在しない場合のテスト"""
 
         mock_validate_request.return_value = None
-        mock_container = MagicMock()
-        mock_get_read_only_container.return_value = mock_container
+        mock_container = AsyncMock()
+        mock_get_async_read_only_container.return_value = mock_container
         mock_container.read_item.side_effect = CosmosResourceNotFoundError
 
         req = func.HttpRequest(
@@ -197,13 +197,13 @@ class TestGetFavorite(unittest.TestCase):
             headers={"X-User-Id": "user-id"},
         )
 
-        res = get_favorite(req)
+        res = await get_favorite(req)
 
         self.assertEqual(res.status_code, 200)
         response_body = json.loads(res.get_body().decode("utf-8"))
         self.assertEqual(response_body, {"isFavorite": False})
         mock_validate_request.assert_called_once_with(req)
-        mock_get_read_only_container.assert_called_once_with(
+        mock_get_async_read_only_container.assert_called_once_with(
             database_name="Users",
             container_name="Favorite",
         )
@@ -221,18 +221,18 @@ class TestGetFavorite(unittest.TestCase):
         mock_logging.error.assert_not_called()
 
     @patch("src.get_favorite.validate_request")
-    @patch("src.get_favorite.get_read_only_container")
+    @patch("src.get_favorite.get_async_read_only_container")
     @patch("src.get_favorite.logging")
-    def test_get_favorite_exception(
+    async def test_get_favorite_exception(
         self,
         mock_logging,
-        mock_get_read_only_container,
+        mock_get_async_read_only_container,
         mock_validate_request,
     ):
         """例外が発生した場合のテスト"""
 
         mock_validate_request.return_value = None
-        mock_get_read_only_container.side_effect = Exception("Test exception")
+        mock_get_async_read_only_container.side_effect = Exception("Test exception")
 
         req = func.HttpRequest(
             method="GET",
@@ -242,7 +242,7 @@ class TestGetFavorite(unittest.TestCase):
             headers={"X-User-Id": "user-id"},
         )
 
-        res = get_favorite(req)
+        res = await get_favorite(req)
 
         self.assertEqual(res.status_code, 500)
         self.assertEqual(res.get_body().decode("utf-8"), "Internal Server Error")
@@ -2,7 +2,7 @@
 
 import json
 import unittest
-from unittest.mock import MagicMock, call, patch
+from unittest.mock import AsyncMock, call, patch
 
 import azure.functions as func
 from azure.cosmos.exceptions import CosmosResourceNotFoundError
@@ -53,23 +53,23 @@ class TestValidateRequest(unittest.TestCase):
         self.assertEqual(errors, "X-User-Id header is Empty")
 
 
-class TestGetProgresses(unittest.TestCase):
+class TestGetProgresses(unittest.IsolatedAsyncioTestCase):
     """get_progresses関数のテストケース"""
 
     @patch("src.get_progresses.validate_request")
-    @patch("src.get_progresses.get_read_only_container")
+    @patch("src.get_progresses.get_async_read_only_container")
     @patch("src.get_progresses.logging")
-    def test_get_progresses_success(
+    async def test_get_progresses_success(
         self,
         mock_logging,
-        mock_get_read_only_container,
+        mock_get_async_read_only_container,
         mock_validate_request,
     ):
         """レスポンスが正常であることのテスト"""
 
         mock_validate_request.return_value = None
-        mock_container = MagicMock()
-        mock_get_read_only_container.return_value = mock_container
+        mock_container = AsyncMock()
+        mock_get_async_read_only_container.return_value = mock_container
         mock_item = {
             "id": "user-id-1_test-id-1",
             "userId": "user-id-1",
@@ -98,7 +98,7 @@ class TestGetProgresses(unittest.TestCase):
             headers={"X-User-Id": "user-id-1"},
         )
 
-        resp = get_progresses(req)
+        resp = await get_progresses(req)
 
         self.assertEqual(resp.status_code, 200)
         self.assertEqual(resp.mimetype, "application/json")
@@ -119,7 +119,7 @@ class TestGetProgresses(unittest.TestCase):
         }
         self.assertEqual(json.loads(resp.get_body().decode()), expect_body)
         mock_validate_request.assert_called_once_with(req)
-        mock_get_read_only_container.assert_called_once_with(
+        mock_get_async_read_only_container.assert_called_once_with(
             database_name="Users", container_name="Progress"
         )
         mock_container.read_item.assert_called_once_with(
@@ -136,7 +136,7 @@ class TestGetProgresses(unittest.TestCase):
 
     @patch("src.get_progresses.validate_request")
     @patch("src.get_progresses.logging")
-    def test_get_progresses_validation_error(
+    async def test_get_progresses_validation_error(
         self,
         mock_logging,
         mock_validate_request,
@@ -153,7 +153,7 @@ class TestGetProgresses(unittest.TestCase):
             headers={"X-User-Id": "user-id-1"},
         )
 
-        resp = get_progresses(req)
+        resp = await get_progresses(req)
 
         self.assertEqual(resp.status_code, 400)
         self.assertEqual(resp.get_body(), b"testId is Empty")
@@ -162,19 +162,19 @@ class TestGetProgresses(unittest.TestCase):
         mock_logging.error.assert_not_called()
 
     @patch("src.get_progresses.validate_request")
-    @patch("src.get_progresses.get_read_only_container")
+    @patch("src.get_progresses.get_async_read_only_container")
     @patch("src.get_progresses.logging")
-    def test_get_progresses_not_found(
+    async def test_get_progresses_not_found(
         self,
         mock_logging,
-        mock_get_read_only_container,
+        mock_get_async_read_only_container,
         mock_validate_request,
     ):
         """進捗項目が存在しない場合のテスト"""
 
         mock_validate_request.return_value = None
-        mock_container = MagicMock()
-        mock_get_read_only_container.return_value = mock_container
+        mock_container = AsyncMock()
+        mock_get_async_read_only_container.return_value = mock_container
         mock_container.read_item.side_effect = CosmosResourceNotFoundError
 
         req = func.HttpRequest(
@@ -185,7 +185,7 @@ class TestGetProgresses(unittest.TestCase):
             headers={"X-User-Id": "user-id-1"},
         )
 
-        resp = get_progresses(req)
+        resp = await get_progresses(req)
 
         self.assertEqual(resp.status_code, 200)
         self.assertEqual(
@@ -204,19 +204,19 @@ class TestGetProgresses(unittest.TestCase):
         mock_logging.error.assert_not_called()
 
     @patch("src.get_progresses.validate_request")
-    @patch("src.get_progresses.get_read_only_container")
+    @patch("src.get_progresses.get_async_read_only_container")
     @patch("src.get_progresses.logging")
-    def test_get_progresses_exception(
+    async def test_get_progresses_exception(
         self,
         mock_logging,
-        mock_get_read_only_container,
+        mock_get_async_read_only_container,
         mock_validate_request,
     ):
         """例外が発生した場合のテスト"""
 
         mock_validate_request.return_value = None
-        mock_container = MagicMock()
-        mock_get_read_only_container.return_value = mock_container
+        mock_container = AsyncMock()
+        mock_get_async_read_only_container.return_value = mock_container
         mock_container.read_item.side_effect = Exception("Test Exception")
 
         req = func.HttpRequest(
@@ -227,7 +227,7 @@ class TestGetProgresses(unittest.TestCase):
             headers={"X-User-Id": "user-id-1"},
         )
 
-        resp = get_progresses(req)
+        resp = await get_progresses(req)
 
         self.assertEqual(resp.status_code, 500)
         self.assertEqual(resp.get_body(), b"Internal Server Error")
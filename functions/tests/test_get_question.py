@@ -1,12 +1,14 @@
 """[GET] /tests/{testId}/questions/{questionNumber} のテスト"""
 
 import json
-from unittest import TestCase
-from unittest.mock import MagicMock, call, patch
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import azure.functions as func
 from azure.cosmos.exceptions import CosmosResourceNotFoundError
 from src.get_question import get_question, validate_request
+from util.http import make_etag
+from util.question_cache import get_cached_question, reset_question_cache
 
 
 class TestValidateRequest(TestCase):
@@ -17,10 +19,33 @@ class TestValidateRequest(TestCase):
 
         req = MagicMock(spec=func.HttpRequest)
         req.route_params = {"testId": "1", "questionNumber": "1"}
+        req.params = {}
         result = validate_request(req)
 
         self.assertIsNone(result)
 
+    def test_validate_request_lang_ja(self):
+        """langがjaである場合のテスト"""
+
+        req = MagicMock(spec=func.HttpRequest)
+        req.route_params = {"testId": "1", "questionNumber": "1"}
+        req.params = {"lang": "ja"}
+
+        result = validate_request(req)
+
+        self.assertIsNone(result)
+
+    def test_validate_request_invalid_lang(self):
+        """langがen・ja以外である場合のテスト"""
+
+        req = MagicMock(spec=func.HttpRequest)
+        req.route_params = {"testId": "1", "questionNumber": "1"}
+        req.params = {"lang": "fr"}
+
+        result = validate_request(req)
+
+        self.assertEqual(result, "Invalid lang: fr")
+
     def test_validate_request_test_id_empty(self):
         """testIdが空である場合のテスト"""
 
@@ -52,20 +77,24 @@ class TestValidateRequest(TestCase):
         self.assertEqual(result, "Invalid questionNumber: invalid")
 
 
-class TestGetQuestion(TestCase):
+class TestGetQuestion(IsolatedAsyncioTestCase):
     """get_question関数のテストケース"""
 
+    def setUp(self):
+        reset_question_cache()
+
     @patch("src.get_question.validate_request")
-    @patch("src.get_question.get_read_only_container")
+    @patch("src.get_question.get_async_read_only_container")
     @patch("src.get_question.logging")
-    def test_get_question_success(
-        self, mock_logging, mock_get_read_only_container, mock_validate_request
+    async def test_get_question_success(
+        self, mock_logging, mock_get_async_read_only_container, mock_validate_request
     ):
         """回答が1個のみ存在する問題のレスポンスが正常であることのテスト"""
 
         mock_validate_request.return_value = None
-        mock_container = MagicMock()
+        mock_container = AsyncMock()
         mock_item = {
+            "_etag": "etag",
             "subjects": ["What is the capital of France?"],
             "choices": ["Paris", "London", "Berlin"],
             "answerNum": 1,
@@ -74,12 +103,12 @@ class TestGetQuestion(TestCase):
             "escapeTranslatedIdxes": {"subjects": [0], "choices": [1]},
         }
         mock_container.read_item.return_value = mock_item
-        mock_get_read_only_container.return_value = mock_container
+        mock_get_async_read_only_container.return_value = mock_container
 
         req = MagicMock(spec=func.HttpRequest)
         req.route_params = {"testId": "1", "questionNumber": "1"}
 
-        response = get_question(req)
+        response = await get_question(req)
 
         self.assertEqual(response.status_code, 200)
         expected_body = {
@@ -110,8 +139,10 @@ class TestGetQuestion(TestCase):
             "isMultiplied": False,
         }
         self.assertEqual(json.loads(response.get_body().decode()), expected_body)
+        self.assertEqual(response.headers["ETag"], make_etag("etag", False))
+        self.assertEqual(response.headers["Cache-Control"], "private, max-age=60")
         mock_validate_request.assert_called_once_with(req)
-        mock_get_read_only_container.assert_called_once_with(
+        mock_get_async_read_only_container.assert_called_once_with(
             database_name="Users",
             container_name="Question",
         )
@@ -125,16 +156,17 @@ class TestGetQuestion(TestCase):
         mock_logging.error.assert_not_called()
 
     @patch("src.get_question.validate_request")
-    @patch("src.get_question.get_read_only_container")
+    @patch("src.get_question.get_async_read_only_container")
     @patch("src.get_question.logging")
-    def test_get_question_success_with_multiple_answers(
-        self, mock_logging, mock_get_read_only_container, mock_validate_request
+    async def test_get_question_success_with_multiple_answers(
+        self, mock_logging, mock_get_async_read_only_container, mock_validate_request
     ):
         """回答が複数個存在する問題のレスポンスが正常であることのテスト"""
 
         mock_validate_request.return_value = None
-        mock_container = MagicMock()
+        mock_container = AsyncMock()
         mock_item = {
+            "_etag": "etag",
             "subjects": ["Select the two fruits."],
             "choices": ["Apple", "Car", "Banana", "House"],
             "answerNum": 2,
@@ -143,12 +175,12 @@ class TestGetQuestion(TestCase):
             "escapeTranslatedIdxes": None,
         }
         mock_container.read_item.return_value = mock_item
-        mock_get_read_only_container.return_value = mock_container
+        mock_get_async_read_only_container.return_value = mock_container
 
         req = MagicMock(spec=func.HttpRequest)
         req.route_params = {"testId": "1", "questionNumber": "1"}
 
-        response = get_question(req)
+        response = await get_question(req)
 
         self.assertEqual(response.status_code, 200)
         expected_body = {
@@ -185,7 +217,7 @@ class TestGetQuestion(TestCase):
         }
         self.assertEqual(json.loads(response.get_body().decode()), expected_body)
         mock_validate_request.assert_called_once_with(req)
-        mock_get_read_only_container.assert_called_once_with(
+        mock_get_async_read_only_container.assert_called_once_with(
             database_name="Users",
             container_name="Question",
         )
@@ -199,41 +231,220 @@ class TestGetQuestion(TestCase):
         mock_logging.error.assert_not_called()
 
     @patch("src.get_question.validate_request")
-    def test_get_question_validation_error(self, mock_validate_request):
+    @patch("src.get_question.get_async_read_only_container")
+    @patch("src.get_question.logging")
+    async def test_get_question_success_translated(
+        self, mock_logging, mock_get_async_read_only_container, mock_validate_request
+    ):
+        """lang=jaでインポート時に翻訳済の問題・選択肢を返すテスト"""
+
+        mock_validate_request.return_value = None
+        mock_container = AsyncMock()
+        mock_item = {
+            "_etag": "etag",
+            "subjects": ["What is the capital of France?", "https://example.com/img"],
+            "choices": ["Paris", None],
+            "answerNum": 1,
+            "indicateSubjectImgIdxes": [1],
+            "indicateChoiceImgs": [None, "https://example.com/choice"],
+            "translatedSubjects": [
+                "フランスの首都はどこですか?",
+                "https://example.com/img",
+            ],
+            "translatedChoices": ["パリ", None],
+        }
+        mock_container.read_item.return_value = mock_item
+        mock_get_async_read_only_container.return_value = mock_container
+
+        req = MagicMock(spec=func.HttpRequest)
+        req.route_params = {"testId": "1", "questionNumber": "1"}
+        req.params = {"lang": "ja"}
+
+        response = await get_question(req)
+
+        self.assertEqual(response.status_code, 200)
+        expected_body = {
+            "subjects": [
+                {
+                    "sentence": "フランスの首都はどこですか?",
+                    "isIndicatedImg": False,
+                    "isEscapedTranslation": True,
+                },
+                {
+                    "sentence": "https://example.com/img",
+                    "isIndicatedImg": True,
+                    "isEscapedTranslation": True,
+                },
+            ],
+            "choices": [
+                {
+                    "sentence": "パリ",
+                    "img": None,
+                    "isEscapedTranslation": True,
+                },
+                {
+                    "sentence": None,
+                    "img": "https://example.com/choice",
+                    "isEscapedTranslation": True,
+                },
+            ],
+            "isMultiplied": False,
+        }
+        self.assertEqual(json.loads(response.get_body().decode()), expected_body)
+        mock_logging.error.assert_not_called()
+
+    @patch("src.get_question.validate_request")
+    @patch("src.get_question.get_async_read_only_container")
+    @patch("src.get_question.logging")
+    async def test_get_question_success_not_translated(
+        self, mock_logging, mock_get_async_read_only_container, mock_validate_request
+    ):
+        """lang=jaでインポート時に未翻訳の場合は英語の問題・選択肢を返すテスト"""
+
+        mock_validate_request.return_value = None
+        mock_container = AsyncMock()
+        mock_container.read_item.return_value = {
+            "_etag": "etag",
+            "subjects": ["What is the capital of France?"],
+            "choices": ["Paris", "London"],
+            "answerNum": 1,
+        }
+        mock_get_async_read_only_container.return_value = mock_container
+
+        req = MagicMock(spec=func.HttpRequest)
+        req.route_params = {"testId": "1", "questionNumber": "1"}
+        req.params = {"lang": "ja"}
+
+        response = await get_question(req)
+
+        self.assertEqual(response.status_code, 200)
+        body = json.loads(response.get_body().decode())
+        self.assertEqual(
+            body["subjects"],
+            [
+                {
+                    "sentence": "What is the capital of France?",
+                    "isIndicatedImg": False,
+                    "isEscapedTranslation": False,
+                }
+            ],
+        )
+        self.assertEqual(
+            [choice["isEscapedTranslation"] for choice in body["choices"]],
+            [False, False],
+        )
+        mock_logging.error.assert_not_called()
+
+    @patch("src.get_question.validate_request")
+    @patch("src.get_question.get_async_read_only_container")
+    @patch("src.get_question.logging")
+    async def test_get_question_not_modified(
+        self, mock_logging, mock_get_async_read_only_container, mock_validate_request
+    ):
+        """If-None-MatchヘッダーがETagに一致する場合に、ボディを生成せずに304を返すテスト"""
+
+        mock_validate_request.return_value = None
+        mock_container = AsyncMock()
+        mock_container.read_item.return_value = {
+            "_etag": "etag",
+            "subjects": ["What is the capital of France?"],
+            "choices": ["Paris", "London"],
+            "answerNum": 1,
+            "translatedSubjects": ["フランスの首都は?"],
+            "translatedChoices": ["パリ", "ロンドン"],
+        }
+        mock_get_async_read_only_container.return_value = mock_container
+
+        req = MagicMock(spec=func.HttpRequest)
+        req.route_params = {"testId": "1", "questionNumber": "1"}
+        req.params = {"lang": "ja"}
+        req.headers = {"If-None-Match": make_etag("etag", True)}
+
+        response = await get_question(req)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_body(), b"")
+        self.assertEqual(response.headers["ETag"], make_etag("etag", True))
+        mock_logging.info.assert_called_once()
+
+        # 翻訳有無が異なる場合は200を返す
+        req.params = {"lang": "en"}
+        response = await get_question(req)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["ETag"], make_etag("etag", False))
+
+    @patch("src.get_question.validate_request")
+    @patch("src.get_question.get_async_read_only_container")
+    @patch("src.get_question.logging")
+    async def test_get_question_cached(
+        self, mock_logging, mock_get_async_read_only_container, mock_validate_request
+    ):
+        """2回目以降はワーカープロセス内のキャッシュから項目を取得し、post_answer関数などと共有するテスト"""
+
+        mock_validate_request.return_value = None
+        mock_container = AsyncMock()
+        mock_item = {
+            "_etag": "etag",
+            "subjects": ["What is the capital of France?"],
+            "choices": ["Paris", "London"],
+            "answerNum": 1,
+        }
+        mock_container.read_item.return_value = mock_item
+        mock_get_async_read_only_container.return_value = mock_container
+
+        req = MagicMock(spec=func.HttpRequest)
+        req.route_params = {"testId": "1", "questionNumber": "1"}
+
+        first_response = await get_question(req)
+        second_response = await get_question(req)
+
+        self.assertEqual(second_response.status_code, 200)
+        self.assertEqual(second_response.get_body(), first_response.get_body())
+        self.assertEqual(second_response.headers["ETag"], make_etag("etag", False))
+        mock_container.read_item.assert_called_once_with(
+            item="1_1",
+            partition_key="1",
+        )
+        self.assertEqual(get_cached_question("1", "1"), mock_item)
+        mock_logging.error.assert_not_called()
+
+    @patch("src.get_question.validate_request")
+    async def test_get_question_validation_error(self, mock_validate_request):
         """バリデーションチェックに失敗した場合のテスト"""
 
         mock_validate_request.return_value = "Validation Error"
         req = MagicMock(spec=func.HttpRequest)
         req.route_params = {"testId": "1", "questionNumber": "1"}
 
-        response = get_question(req)
+        response = await get_question(req)
 
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.get_body().decode(), "Validation Error")
         mock_validate_request.assert_called_once_with(req)
 
     @patch("src.get_question.validate_request")
-    @patch("src.get_question.get_read_only_container")
+    @patch("src.get_question.get_async_read_only_container")
     @patch("src.get_question.logging")
-    def test_get_question_not_found(
-        self, mock_logging, mock_get_read_only_container, mock_validate_request
+    async def test_get_question_not_found(
+        self, mock_logging, mock_get_async_read_only_container, mock_validate_request
     ):
         """問題が見つからない場合のテスト"""
 
         mock_validate_request.return_value = None
-        mock_container = MagicMock()
+        mock_container = AsyncMock()
         mock_container.read_item.side_effect = CosmosResourceNotFoundError
-        mock_get_read_only_container.return_value = mock_container
+        mock_get_async_read_only_container.return_value = mock_container
 
         req = MagicMock(spec=func.HttpRequest)
         req.route_params = {"testId": "1", "questionNumber": "1"}
 
-        response = get_question(req)
+        response = await get_question(req)
 
         self.assertEqual(response.status_code, 404)
         self.assertEqual(response.get_body().decode(), "Not Found Question")
         mock_validate_request.assert_called_once_with(req)
-        mock_get_read_only_container.assert_called_once_with(
+        mock_get_async_read_only_container.assert_called_once_with(
             database_name="Users",
             container_name="Question",
         )
@@ -244,22 +455,22 @@ class TestGetQuestion(TestCase):
         mock_logging.error.assert_not_called()
 
     @patch("src.get_question.validate_request")
-    @patch("src.get_question.get_read_only_container")
+    @patch("src.get_question.get_async_read_only_container")
     @patch("src.get_question.logging")
-    def test_get_question_not_unique(
-        self, mock_logging, mock_get_read_only_container, mock_validate_request
+    async def test_get_question_not_unique(
+        self, mock_logging, mock_get_async_read_only_container, mock_validate_request
     ):
         """例外が発生した場合のテスト"""
 
         mock_validate_request.return_value = None
-        mock_get_read_only_container.side_effect = Exception(
-            "Error in src.get_question.get_read_only_container"
+        mock_get_async_read_only_container.side_effect = Exception(
+            "Error in src.get_question.get_async_read_only_container"
         )
 
         req = MagicMock(spec=func.HttpRequest)
         req.route_params = {"testId": "1", "questionNumber": "1"}
 
-        response = get_question(req)
+        response = await get_question(req)
 
         self.assertEqual(response.status_code, 500)
         self.assertEqual(response.get_body().decode(), "Internal Server Error")
@@ -0,0 +1,336 @@
+"""[GET] /tests/{testId}/sync のテスト"""
+
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+import azure.functions as func
+from azure.cosmos.exceptions import CosmosResourceNotFoundError
+from src.get_sync import get_sync, validate_request
+
+PROGRESS_ITEM = {
+    "id": "user-id_test-id",
+    "userId": "user-id",
+    "testId": "test-id",
+    "order": [3, 5, 1],
+    "progresses": [{"isCorrect": True, "selectedIdxes": [0], "correctIdxes": [0]}],
+    "_ts": 1700000100,
+}
+
+
+class Pager:
+    """by_pageが返すページのイテレーターのモック"""
+
+    def __init__(self, page: list[dict], continuation_token: str | None):
+        self.pages = iter([iter(page)])
+        self.continuation_token = continuation_token
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.pages)
+
+
+def create_request(params: dict) -> func.HttpRequest:
+    """同期するリクエストを生成する"""
+
+    return func.HttpRequest(
+        method="GET",
+        body=None,
+        url="/api/tests/test-id/sync",
+        route_params={"testId": "test-id"},
+        params=params,
+        headers={"X-User-Id": "user-id"},
+    )
+
+
+def create_containers(
+    favorite_items: list[dict], continuation_token: str | None
+) -> tuple[MagicMock, MagicMock]:
+    """Favoriteコンテナー・Progressコンテナーのモックを生成する"""
+
+    favorite_container = MagicMock()
+    favorite_container.query_items.return_value.by_page.return_value = Pager(
+        favorite_items, continuation_token
+    )
+    progress_container = MagicMock()
+    progress_container.read_item.return_value = PROGRESS_ITEM
+    return favorite_container, progress_container
+
+
+class TestValidateRequest(unittest.TestCase):
+    """validate_request関数のテストケース"""
+
+    def test_validate_request_success(self):
+        """バリデーションチェックに成功した場合のテスト"""
+
+        self.assertIsNone(validate_request(create_request({})))
+        self.assertIsNone(
+            validate_request(
+                create_request({"since": "1700000000", "continuationToken": "token"})
+            )
+        )
+
+    def test_validate_request_invalid_since(self):
+        """sinceが整数でない場合のテスト"""
+
+        self.assertEqual(
+            validate_request(create_request({"since": "-1"})), "Invalid since: -1"
+        )
+
+    def test_validate_request_empty_test_id(self):
+        """testIdが空である場合のテスト"""
+
+        req = func.HttpRequest(
+            method="GET",
+            body=None,
+            url="/api/tests//sync",
+            route_params={"testId": ""},
+            headers={"X-User-Id": "user-id"},
+        )
+
+        self.assertEqual(validate_request(req), "testId is Empty")
+
+    def test_validate_request_empty_user_id(self):
+        """X-User-Idヘッダーが空である場合のテスト"""
+
+        req = func.HttpRequest(
+            method="GET",
+            body=None,
+            url="/api/tests/test-id/sync",
+            route_params={"testId": "test-id"},
+            headers={},
+        )
+
+        self.assertEqual(validate_request(req), "X-User-Id header is Empty")
+
+
+# 同期する時点のUNIXタイムスタンプ(各項目の変更日時より後)
+NOW = 1700001000
+
+
+class TestGetSync(unittest.TestCase):
+    """get_sync関数のテストケース"""
+
+    def setUp(self):
+        patcher = patch("src.get_sync.time.time", return_value=NOW + 0.5)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch("src.get_sync.get_read_only_container")
+    def test_get_sync_full(self, mock_get_read_only_container):
+        """sinceを省略した場合に、すべての進捗項目・お気に入り情報を取得するテスト"""
+
+        favorite_container, progress_container = create_containers(
+            [
+                {"questionNumber": 1, "isFavorite": True, "_ts": 1700000000},
+                {"questionNumber": 2, "isFavorite": False, "_ts": 1700000200},
+            ],
+            None,
+        )
+        mock_get_read_only_container.side_effect = [
+            favorite_container,
+            progress_container,
+        ]
+
+        res = get_sync(create_request({}))
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.mimetype, "application/json")
+        self.assertEqual(
+            json.loads(res.get_body().decode("utf-8")),
+            {
+                "progress": {
+                    "order": [3, 5, 1],
+                    "progresses": [
+                        {"isCorrect": True, "selectedIdxes": [0], "correctIdxes": [0]}
+                    ],
+                },
+                "favorites": [
+                    {"questionNumber": 1, "isFavorite": True},
+                    {"questionNumber": 2, "isFavorite": False},
+                ],
+                "watermark": 1700000200,
+                "continuationToken": None,
+            },
+        )
+        query_kwargs = favorite_container.query_items.call_args.kwargs
+        self.assertIn("c._ts > @since ORDER BY c._ts ASC", query_kwargs["query"])
+        self.assertEqual(
+            query_kwargs["parameters"],
+            [
+                {"name": "@userId", "value": "user-id"},
+                {"name": "@since", "value": 0},
+            ],
+        )
+        self.assertEqual(query_kwargs["partition_key"], "test-id")
+        favorite_container.query_items.return_value.by_page.assert_called_once_with(
+            None
+        )
+        progress_container.read_item.assert_called_once_with(
+            item="user-id_test-id", partition_key="test-id"
+        )
+
+    @patch("src.get_sync.get_read_only_container")
+    def test_get_sync_not_changed(self, mock_get_read_only_container):
+        """ウォーターマーク以降に変更していない場合に、進捗項目を返さずウォーターマークを保つテスト"""
+
+        favorite_container, progress_container = create_containers([], None)
+        mock_get_read_only_container.side_effect = [
+            favorite_container,
+            progress_container,
+        ]
+
+        res = get_sync(create_request({"since": "1700000200"}))
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(
+            json.loads(res.get_body().decode("utf-8")),
+            {
+                "progress": None,
+                "favorites": [],
+                "watermark": 1700000200,
+                "continuationToken": None,
+            },
+        )
+
+    @patch("src.get_sync.get_read_only_container")
+    def test_get_sync_progress_not_exists(self, mock_get_read_only_container):
+        """Progressコンテナーの項目が存在しない場合に、初回の同期でのみ空の進捗項目を返すテスト"""
+
+        for params, expected_progress in [
+            ({}, {"order": [], "progresses": []}),
+            ({"since": "1700000200"}, None),
+        ]:
+            with self.subTest(params=params):
+                favorite_container, progress_container = create_containers([], None)
+                progress_container.read_item.side_effect = CosmosResourceNotFoundError
+                mock_get_read_only_container.side_effect = [
+                    favorite_container,
+                    progress_container,
+                ]
+
+                res = get_sync(create_request(params))
+
+                self.assertEqual(res.status_code, 200)
+                self.assertEqual(
+                    json.loads(res.get_body().decode("utf-8"))["progress"],
+                    expected_progress,
+                )
+
+    @patch("src.get_sync.get_read_only_container")
+    def test_get_sync_since_watermark(self, mock_get_read_only_container):
+        """前回のウォーターマークをsinceに指定した場合に、同じ進捗項目・お気に入り情報を返さないテスト"""
+
+        favorite_items = [
+            {"questionNumber": 1, "isFavorite": True, "_ts": 1700000000},
+            {"questionNumber": 2, "isFavorite": False, "_ts": 1700000200},
+        ]
+        favorite_container, progress_container = create_containers(favorite_items, None)
+        mock_get_read_only_container.side_effect = [
+            favorite_container,
+            progress_container,
+        ]
+        watermark = json.loads(get_sync(create_request({})).get_body())["watermark"]
+
+        # Favoriteコンテナーのクエリの条件(c._ts > @since)に沿って、ウォーターマークより後の項目のみ返す
+        favorite_container, progress_container = create_containers(
+            [item for item in favorite_items if item["_ts"] > watermark], None
+        )
+        mock_get_read_only_container.side_effect = [
+            favorite_container,
+            progress_container,
+        ]
+        res = get_sync(create_request({"since": str(watermark)}))
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(
+            json.loads(res.get_body().decode("utf-8")),
+            {
+                "progress": None,
+                "favorites": [],
+                "watermark": watermark,
+                "continuationToken": None,
+            },
+        )
+        self.assertEqual(
+            favorite_container.query_items.call_args.kwargs["parameters"][1],
+            {"name": "@since", "value": 1700000200},
+        )
+
+    @patch("src.get_sync.get_read_only_container")
+    def test_get_sync_watermark_current_second(self, mock_get_read_only_container):
+        """現在の秒に変更した項目がある場合に、ウォーターマークを経過済の秒までに留めるテスト"""
+
+        favorite_container, progress_container = create_containers(
+            [{"questionNumber": 1, "isFavorite": True, "_ts": NOW}], None
+        )
+        mock_get_read_only_container.side_effect = [
+            favorite_container,
+            progress_container,
+        ]
+
+        res = get_sync(create_request({"since": "1700000200"}))
+
+        self.assertEqual(res.status_code, 200)
+        res_body = json.loads(res.get_body().decode("utf-8"))
+        self.assertEqual(
+            res_body["favorites"], [{"questionNumber": 1, "isFavorite": True}]
+        )
+        self.assertEqual(res_body["watermark"], NOW - 1)
+
+    @patch("src.get_sync.get_read_only_container")
+    def test_get_sync_paged(self, mock_get_read_only_container):
+        """続きのページがある場合に、進捗項目を読み取らず継続トークンを返すテスト"""
+
+        favorite_container, progress_container = create_containers(
+            [{"questionNumber": 1, "isFavorite": True, "_ts": 1700000050}],
+            "next-token",
+        )
+        mock_get_read_only_container.side_effect = [
+            favorite_container,
+            progress_container,
+        ]
+
+        res = get_sync(
+            create_request({"since": "1700000000", "continuationToken": "token"})
+        )
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(
+            json.loads(res.get_body().decode("utf-8")),
+            {
+                "progress": None,
+                "favorites": [{"questionNumber": 1, "isFavorite": True}],
+                "watermark": 1700000050,
+                "continuationToken": "next-token",
+            },
+        )
+        favorite_container.query_items.return_value.by_page.assert_called_once_with(
+            "token"
+        )
+        progress_container.read_item.assert_not_called()
+
+    @patch("src.get_sync.get_read_only_container")
+    def test_get_sync_validation_error(self, mock_get_read_only_container):
+        """バリデーションチェックに失敗した場合のテスト"""
+
+        res = get_sync(create_request({"since": "yesterday"}))
+
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.get_body().decode("utf-8"), "Invalid since: yesterday")
+        mock_get_read_only_container.assert_not_called()
+
+    @patch("src.get_sync.get_read_only_container")
+    @patch("src.get_sync.logging")
+    def test_get_sync_exception(self, mock_logging, mock_get_read_only_container):
+        """予期しない例外が発生した場合のテスト"""
+
+        mock_get_read_only_container.side_effect = Exception("Test Exception")
+
+        res = get_sync(create_request({}))
+
+        self.assertEqual(res.status_code, 500)
+        self.assertEqual(res.get_body().decode("utf-8"), "Internal Server Error")
+        mock_logging.error.assert_called_once()
@@ -2,35 +2,47 @@
 
 import json
 import os
-from unittest import TestCase
-from unittest.mock import MagicMock, call, patch
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import azure.functions as func
+from azure.cosmos.exceptions import CosmosResourceNotFoundError
 from src.get_tests import get_tests
 from type.cosmos import Test
 from type.response import GetTestsRes
+from util.http import make_etag
 
 
-class TestGetTests(TestCase):
+async def _async_iter(items: list):
+    """listの各要素を非同期イテレーターで返す"""
+
+    for item in items:
+        yield item
+
+
+class TestGetTests(IsolatedAsyncioTestCase):
     """get_tests関数のテストケース"""
 
-    @patch("src.get_tests.get_read_only_container")
+    @patch("src.get_tests.get_async_read_only_container")
     @patch("src.get_tests.logging")
     @patch.dict(os.environ, {"COSMOSDB_URI": "http://localhost:8081"})
-    def test_get_tests_success_local(self, mock_logging, mock_get_read_only_container):
-        """ローカル環境でレスポンスが正常であることのテスト"""
+    async def test_get_tests_success_local(
+        self, mock_logging, mock_get_async_read_only_container
+    ):
+        """カタログが存在しない場合に、ローカル環境でレスポンスが正常であることのテスト"""
 
         mock_container = MagicMock()
+        mock_container.read_item = AsyncMock(side_effect=CosmosResourceNotFoundError)
         mock_items: list[Test] = [
             {"id": "1", "courseName": "Math", "testName": "Algebra", "length": 10},
             {"id": "2", "courseName": "Math", "testName": "Geometry", "length": 20},
             {"id": "3", "courseName": "Science", "testName": "Physics", "length": 30},
         ]
-        mock_container.read_all_items.return_value = mock_items
-        mock_get_read_only_container.return_value = mock_container
+        mock_container.read_all_items.return_value = _async_iter(mock_items)
+        mock_get_async_read_only_container.return_value = mock_container
 
         req: func.HttpRequest = MagicMock(spec=func.HttpRequest)
-        response: func.HttpResponse = get_tests(req)
+        response: func.HttpResponse = await get_tests(req)
 
         self.assertEqual(response.status_code, 200)
         expected_body: GetTestsRes = {
@@ -43,9 +55,15 @@ class TestGetTests(TestCase):
             ],
         }
         self.assertEqual(response.get_body().decode(), json.dumps(expected_body))
-        mock_get_read_only_container.assert_called_once_with(
-            database_name="Users",
-            container_name="Test",
+        self.assertEqual(
+            mock_get_async_read_only_container.call_args_list,
+            [
+                call(database_name="Users", container_name="Catalog"),
+                call(database_name="Users", container_name="Test"),
+            ],
+        )
+        mock_container.read_item.assert_awaited_once_with(
+            item="tests", partition_key="tests"
         )
         mock_container.read_all_items.assert_called_once()
         mock_container.query_items.assert_not_called()
@@ -54,26 +72,29 @@ class TestGetTests(TestCase):
         )
         mock_logging.error.assert_not_called()
 
-    @patch("src.get_tests.get_read_only_container")
+    @patch("src.get_tests.get_async_read_only_container")
     @patch("src.get_tests.logging")
     @patch.dict(
         os.environ,
         {"COSMOSDB_URI": "https://test-cosmosdb.documents.azure.com:443"},
     )
-    def test_get_tests_success_azure(self, mock_logging, mock_get_read_only_container):
-        """Azure環境でレスポンスが正常であることのテスト"""
+    async def test_get_tests_success_azure(
+        self, mock_logging, mock_get_async_read_only_container
+    ):
+        """カタログが存在しない場合に、Azure環境でレスポンスが正常であることのテスト"""
 
         mock_container = MagicMock()
+        mock_container.read_item = AsyncMock(side_effect=CosmosResourceNotFoundError)
         mock_items: list[Test] = [
             {"id": "1", "courseName": "Math", "testName": "Algebra", "length": 10},
             {"id": "2", "courseName": "Math", "testName": "Geometry", "length": 20},
             {"id": "3", "courseName": "Science", "testName": "Physics", "length": 30},
         ]
-        mock_container.query_items.return_value = mock_items
-        mock_get_read_only_container.return_value = mock_container
+        mock_container.query_items.return_value = _async_iter(mock_items)
+        mock_get_async_read_only_container.return_value = mock_container
 
         req: func.HttpRequest = MagicMock(spec=func.HttpRequest)
-        response: func.HttpResponse = get_tests(req)
+        response: func.HttpResponse = await get_tests(req)
 
         self.assertEqual(response.status_code, 200)
         expected_body: GetTestsRes = {
@@ -86,31 +107,93 @@ class TestGetTests(TestCase):
             ],
         }
         self.assertEqual(response.get_body().decode(), json.dumps(expected_body))
-        mock_get_read_only_container.assert_called_once_with(
-            database_name="Users",
-            container_name="Test",
+        self.assertEqual(
+            mock_get_async_read_only_container.call_args_list,
+            [
+                call(database_name="Users", container_name="Catalog"),
+                call(database_name="Users", container_name="Test"),
+            ],
+        )
+        mock_container.read_item.assert_awaited_once_with(
+            item="tests", partition_key="tests"
         )
         mock_container.read_all_items.assert_not_called()
         mock_container.query_items.assert_called_once_with(
             query="SELECT * FROM c ORDER BY c.courseName ASC, c.testName ASC",
-            enable_cross_partition_query=True,
         )
         mock_logging.info.assert_has_calls(
             [call({"items": mock_items}), call({"body": expected_body})]
         )
         mock_logging.error.assert_not_called()
 
-    @patch("src.get_tests.get_read_only_container")
+    @patch("src.get_tests.get_async_read_only_container")
+    @patch("src.get_tests.logging")
+    async def test_get_tests_catalog(
+        self, mock_logging, mock_get_async_read_only_container
+    ):
+        """カタログが存在する場合に、1回のポイント読取りで返すテスト"""
+
+        mock_container = MagicMock()
+        expected_body: GetTestsRes = {
+            "Math": [
+                {"id": "1", "testName": "Algebra", "length": 10},
+                {"id": "2", "testName": "Geometry", "length": 20},
+            ],
+        }
+        mock_container.read_item = AsyncMock(
+            return_value={"id": "tests", "courses": expected_body, "_etag": "etag"}
+        )
+        mock_get_async_read_only_container.return_value = mock_container
+
+        req: func.HttpRequest = MagicMock(spec=func.HttpRequest)
+        response: func.HttpResponse = await get_tests(req)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_body().decode(), json.dumps(expected_body))
+        self.assertEqual(response.headers["ETag"], make_etag("etag"))
+        mock_get_async_read_only_container.assert_called_once_with(
+            database_name="Users",
+            container_name="Catalog",
+        )
+        mock_container.read_all_items.assert_not_called()
+        mock_container.query_items.assert_not_called()
+        mock_logging.info.assert_called_once_with({"body": expected_body})
+
+    @patch("src.get_tests.get_async_read_only_container")
+    @patch("src.get_tests.logging")
+    async def test_get_tests_not_modified(
+        self, mock_logging, mock_get_async_read_only_container
+    ):
+        """If-None-MatchヘッダーがカタログのETagに一致する場合に、304を返すテスト"""
+
+        mock_container = MagicMock()
+        mock_container.read_item = AsyncMock(
+            return_value={"id": "tests", "courses": {}, "_etag": "etag"}
+        )
+        mock_get_async_read_only_container.return_value = mock_container
+
+        req: func.HttpRequest = MagicMock(spec=func.HttpRequest)
+        req.headers = {"If-None-Match": make_etag("etag")}
+        response: func.HttpResponse = await get_tests(req)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_body(), b"")
+        self.assertEqual(response.headers["ETag"], make_etag("etag"))
+        mock_logging.info.assert_not_called()
+
+    @patch("src.get_tests.get_async_read_only_container")
     @patch("src.get_tests.logging")
-    def test_get_tests_exception(self, mock_logging, mock_get_read_only_container):
+    async def test_get_tests_exception(
+        self, mock_logging, mock_get_async_read_only_container
+    ):
         """レスポンスが異常であることのテスト"""
 
-        mock_get_read_only_container.side_effect = Exception(
-            "Error in src.get_tests.get_read_only_container"
+        mock_get_async_read_only_container.side_effect = Exception(
+            "Error in src.get_tests.get_async_read_only_container"
         )
 
         req: func.HttpRequest = MagicMock(spec=func.HttpRequest)
-        response: func.HttpResponse = get_tests(req)
+        response: func.HttpResponse = await get_tests(req)
 
         self.assertEqual(response.status_code, 500)
         self.assertEqual(response.get_body().decode(), "Internal Server Error")
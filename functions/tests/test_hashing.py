@@ -0,0 +1,84 @@
+"""ハッシュ値のユーティリティ関数のテスト"""
+
+import unittest
+
+from type.cosmos import Question
+from type.importing import ImportItem
+from util.hashing import (
+    compute_content_hash,
+    compute_import_item_hash,
+    compute_question_hash,
+)
+
+
+class TestComputeContentHash(unittest.TestCase):
+    """compute_content_hash関数のテストケース"""
+
+    def test_compute_content_hash(self):
+        """キーの順序によらず、値が異なる場合は異なるハッシュ値を算出するテスト"""
+
+        content_hash = compute_content_hash({"a": 1, "b": ["x", None]})
+
+        self.assertEqual(len(content_hash), 64)
+        self.assertEqual(content_hash, compute_content_hash({"b": ["x", None], "a": 1}))
+        self.assertNotEqual(
+            content_hash, compute_content_hash({"a": 1, "b": ["x", "y"]})
+        )
+
+
+class TestComputeQuestionHash(unittest.TestCase):
+    """compute_question_hash関数のテストケース"""
+
+    def test_compute_question_hash(self):
+        """正解の選択肢・正解/不正解の理由の生成に用いるフィールドのみからハッシュ値を算出するテスト"""
+
+        item = Question(
+            id="1_1",
+            number=1,
+            subjects=["What is 2 + 2?"],
+            choices=["3", "4"],
+            answerNum=1,
+            testId="1",
+        )
+        question_hash = compute_question_hash(item)
+
+        self.assertEqual(
+            question_hash,
+            compute_question_hash(
+                {**item, "discussions": [], "translatedSubjects": ["2 + 2は?"]}
+            ),
+        )
+        self.assertNotEqual(
+            question_hash, compute_question_hash({**item, "answerNum": 2})
+        )
+        self.assertNotEqual(
+            question_hash,
+            compute_question_hash({**item, "indicateChoiceImgs": [None, "img"]}),
+        )
+
+
+class TestComputeImportItemHash(unittest.TestCase):
+    """compute_import_item_hash関数のテストケース"""
+
+    def test_compute_import_item_hash(self):
+        """ディスカッションを含むインポートデータの要素全体からハッシュ値を算出するテスト"""
+
+        item = ImportItem(subjects=["What is 2 + 2?"], choices=["3", "4"], answerNum=1)
+        import_item_hash = compute_import_item_hash(item)
+
+        self.assertEqual(
+            import_item_hash,
+            compute_import_item_hash(
+                {"answerNum": 1, "choices": ["3", "4"], "subjects": ["What is 2 + 2?"]}
+            ),
+        )
+        self.assertNotEqual(
+            import_item_hash,
+            compute_import_item_hash(
+                {**item, "discussions": [{"comment": "B", "upvotedNum": 1}]}
+            ),
+        )
+        self.assertNotEqual(
+            import_item_hash,
+            compute_import_item_hash({**item, "choices": ["4", "3"]}),
+        )
@@ -0,0 +1,99 @@
+"""HTTPトリガーのレスポンスのユーティリティ関数のテスト"""
+
+import json
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+import azure.functions as func
+from util.http import (
+    create_json_response,
+    create_not_modified_response,
+    get_cache_control,
+    is_not_modified,
+    make_etag,
+)
+
+
+def create_req(if_none_match=None):
+    """If-None-Matchヘッダーを指定したリクエストを生成する"""
+
+    req = MagicMock(spec=func.HttpRequest)
+    req.headers = {} if if_none_match is None else {"If-None-Match": if_none_match}
+    return req
+
+
+class TestGetCacheControl(unittest.TestCase):
+    """get_cache_control関数のテストケース"""
+
+    def test_get_cache_control(self):
+        """既定の秒数で共有キャッシュに格納させないCache-Controlヘッダーを返すテスト"""
+
+        self.assertEqual(get_cache_control(), "private, max-age=60")
+
+    @patch.dict(os.environ, {"HTTP_CACHE_MAX_AGE_SECONDS": "0"})
+    def test_get_cache_control_env(self):
+        """環境変数で秒数を指定した場合のテスト"""
+
+        self.assertEqual(get_cache_control(), "private, max-age=0")
+
+
+class TestMakeEtag(unittest.TestCase):
+    """make_etag関数のテストケース"""
+
+    def test_make_etag(self):
+        """値ごとに異なる、ダブルクォーテーションで囲んだETagを生成するテスト"""
+
+        etag = make_etag("etag", True)
+
+        self.assertEqual(etag, make_etag("etag", True))
+        self.assertNotEqual(etag, make_etag("etag", False))
+        self.assertRegex(etag, r'^"[0-9a-f]{32}"$')
+
+
+class TestIsNotModified(unittest.TestCase):
+    """is_not_modified関数のテストケース"""
+
+    def test_is_not_modified(self):
+        """If-None-MatchヘッダーとETagを弱い比較で判定するテスト"""
+
+        etag = make_etag("etag")
+
+        for if_none_match, expected in (
+            (None, False),
+            ("", False),
+            (etag, True),
+            (f"W/{etag}", True),
+            (f'"other", {etag}', True),
+            ("*", True),
+            ('"other"', False),
+        ):
+            with self.subTest(if_none_match=if_none_match):
+                self.assertEqual(
+                    is_not_modified(create_req(if_none_match), etag), expected
+                )
+
+
+class TestCreateResponse(unittest.TestCase):
+    """create_json_response・create_not_modified_response関数のテストケース"""
+
+    def test_create_json_response(self):
+        """ETag・Cache-Controlヘッダーを付与したJSONのレスポンスを生成するテスト"""
+
+        response = create_json_response({"key": "value"}, '"etag"', "private")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.get_body()), {"key": "value"})
+        self.assertEqual(response.mimetype, "application/json")
+        self.assertEqual(response.headers["ETag"], '"etag"')
+        self.assertEqual(response.headers["Cache-Control"], "private")
+
+    def test_create_not_modified_response(self):
+        """ボディが空の304レスポンスを生成するテスト"""
+
+        response = create_not_modified_response('"etag"', "private")
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_body(), b"")
+        self.assertEqual(response.headers["ETag"], '"etag"')
+        self.assertEqual(response.headers["Cache-Control"], "private")
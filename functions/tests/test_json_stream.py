@@ -0,0 +1,114 @@
+"""JSONのストリーミング読込みのユーティリティ関数のテスト"""
+
+import io
+import json
+import unittest
+
+from util.json_stream import (
+    RetainingStream,
+    iter_json_array,
+    iter_json_array_with_offsets,
+    read_byte_range,
+)
+
+
+class TestIterJsonArray(unittest.TestCase):
+    """iter_json_array関数のテストケース"""
+
+    def test_iter_json_array(self):
+        """読込み単位によらず、配列の各要素を順に返すテスト"""
+
+        items = [
+            {"subjects": ["Q1"], "choices": ["A", None], "answerNum": 1},
+            {"subjects": ["問題2 ✓"], "choices": ["選択肢"], "answerNum": 2},
+            123,
+            "text, with ] and [",
+            [1, [2, 3]],
+            None,
+            -1.5e3,
+            2.25,
+            1e-7,
+        ]
+        data = json.dumps(items, ensure_ascii=False, indent=2).encode("utf-8")
+
+        for chunk_size in range(1, len(data) + 2):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(
+                    list(iter_json_array(io.BytesIO(data), chunk_size)), items
+                )
+
+    def test_iter_json_array_lazy(self):
+        """先頭の要素を返す時点で、配列全体を読み込んでいないテスト"""
+
+        data = b"[" + b",".join([b'{"comment": "' + b"x" * 1000 + b'"}'] * 1000) + b"]"
+        stream = io.BytesIO(data)
+
+        first = next(iter_json_array(stream, 4096))
+
+        self.assertEqual(first, {"comment": "x" * 1000})
+        self.assertLess(stream.tell(), 3 * 4096)
+
+    def test_iter_json_array_bom_and_empty(self):
+        """BOM付き・空の配列を読み込むテスト"""
+
+        self.assertEqual(list(iter_json_array(io.BytesIO(b"\xef\xbb\xbf[1]"))), [1])
+        self.assertEqual(list(iter_json_array(io.BytesIO(b" [ ] "))), [])
+
+    def test_iter_json_array_invalid(self):
+        """JSONの配列として不正な場合にJSONDecodeErrorをraiseするテスト"""
+
+        for data in (b"", b"{}", b"[1,", b"[1 2]", b"[1,]", b'[{"a": }]', b"[1"):
+            with self.subTest(data=data):
+                with self.assertRaises(json.JSONDecodeError):
+                    list(iter_json_array(io.BytesIO(data), 2))
+
+
+class TestIterJsonArrayWithOffsets(unittest.TestCase):
+    """iter_json_array_with_offsets関数のテストケース"""
+
+    def test_iter_json_array_with_offsets(self):
+        """読込み単位・BOMの有無によらず、各要素のバイト位置を返すテスト"""
+
+        items = [{"subjects": ["問題 ✓"], "answerNum": 1}, 1.5, "text, ]", None]
+        for bom in (b"", b"\xef\xbb\xbf"):
+            data = bom + json.dumps(items, ensure_ascii=False, indent=2).encode("utf-8")
+            for chunk_size in (1, 2, 3, 7, len(data) + 1):
+                with self.subTest(bom=bom, chunk_size=chunk_size):
+                    results = list(
+                        iter_json_array_with_offsets(io.BytesIO(data), chunk_size)
+                    )
+
+                    self.assertEqual([item for item, _, _ in results], items)
+                    for item, start, end in results:
+                        self.assertEqual(json.loads(data[start:end]), item)
+
+
+class TestRetainingStream(unittest.TestCase):
+    """RetainingStreamクラスのテストケース"""
+
+    def test_release(self):
+        """読み込んだバイト列の指定した範囲を返し、それより前を破棄するテスト"""
+
+        stream = RetainingStream(io.BytesIO(b"0123456789"))
+
+        self.assertEqual(stream.read(4), b"0123")
+        self.assertEqual(stream.read(), b"456789")
+        self.assertEqual(stream.release(1, 3), b"12")
+        self.assertEqual(stream.release(5, 8), b"567")
+        self.assertEqual(stream.release(8, 10), b"89")
+
+
+class TestReadByteRange(unittest.TestCase):
+    """read_byte_range関数のテストケース"""
+
+    def test_read_byte_range(self):
+        """シークせずに指定した範囲のバイト列を読み込むテスト"""
+
+        data = bytes(range(256)) * 10
+
+        self.assertEqual(
+            read_byte_range(io.BytesIO(data), 1000, 1100, 7), data[1000:1100]
+        )
+        self.assertEqual(read_byte_range(io.BytesIO(data), 0, 10), data[:10])
+        self.assertEqual(read_byte_range(io.BytesIO(data), 2550, 2600), data[2550:])
+        self.assertEqual(read_byte_range(io.BytesIO(data), 3000, 3100), b"")
@@ -0,0 +1,415 @@
+"""インスタンス間で処理の重複を防ぐリースのユーティリティ関数のテスト"""
+
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+from azure.core import MatchConditions
+from azure.cosmos.exceptions import (
+    CosmosAccessConditionFailedError,
+    CosmosResourceExistsError,
+    CosmosResourceNotFoundError,
+)
+from util.lease import (
+    MAX_LEASE_ACQUIRE_NUMBER,
+    acquire_lease,
+    acquire_or_wait_for_lease,
+    complete_lease,
+    get_lease,
+    release_lease,
+    wait_for_lease_result,
+)
+
+
+class TestAcquireLease(unittest.TestCase):
+    """acquire_lease関数のテストケース"""
+
+    @patch("util.lease.time.time")
+    @patch("util.lease.get_read_write_container")
+    @patch.dict(os.environ, {"LEASE_TTL_SECONDS": "60"})
+    def test_acquire_lease(self, mock_get_read_write_container, mock_time):
+        """リースが存在しない場合に作成して取得するテスト"""
+
+        mock_time.return_value = 100.0
+        mock_container = mock_get_read_write_container.return_value
+        mock_container.create_item.return_value = {"_etag": "created"}
+
+        self.assertEqual(acquire_lease("key"), "created")
+        mock_get_read_write_container.assert_called_once_with(
+            database_name="Users", container_name="Lease"
+        )
+        mock_container.create_item.assert_called_once_with(
+            {
+                "id": "key",
+                "acquiredAt": 100.0,
+                "expiresAt": 160.0,
+                "ttl": 60,
+                "completed": False,
+            }
+        )
+
+    @patch("util.lease.time.time")
+    @patch("util.lease.get_read_write_container")
+    def test_acquire_lease_held(self, mock_get_read_write_container, mock_time):
+        """他のインスタンスが有効期限内のリースを保持している場合のテスト"""
+
+        mock_time.return_value = 100.0
+        mock_container = mock_get_read_write_container.return_value
+        mock_container.create_item.side_effect = CosmosResourceExistsError
+        mock_container.read_item.return_value = {
+            "id": "key",
+            "acquiredAt": 90.0,
+            "expiresAt": 180.0,
+            "ttl": 90,
+            "_etag": "etag",
+        }
+
+        self.assertIsNone(acquire_lease("key"))
+        mock_container.replace_item.assert_not_called()
+
+    @patch("util.lease.time.time")
+    @patch("util.lease.get_read_write_container")
+    def test_acquire_lease_expired(self, mock_get_read_write_container, mock_time):
+        """有効期限切れのリースを上書きして取得するテスト"""
+
+        mock_time.return_value = 100.0
+        mock_container = mock_get_read_write_container.return_value
+        mock_container.create_item.side_effect = CosmosResourceExistsError
+        mock_container.read_item.return_value = {
+            "id": "key",
+            "acquiredAt": 0.0,
+            "expiresAt": 90.0,
+            "ttl": 90,
+            "_etag": "etag",
+        }
+
+        mock_container.replace_item.return_value = {"_etag": "replaced"}
+
+        self.assertEqual(acquire_lease("key"), "replaced")
+        mock_container.replace_item.assert_called_once_with(
+            item="key",
+            body={
+                "id": "key",
+                "acquiredAt": 100.0,
+                "expiresAt": 190.0,
+                "ttl": 90,
+                "completed": False,
+            },
+            etag="etag",
+            match_condition=MatchConditions.IfNotModified,
+        )
+
+    @patch("util.lease.time.time")
+    @patch("util.lease.get_read_write_container")
+    def test_acquire_lease_force_completed(
+        self, mock_get_read_write_container, mock_time
+    ):
+        """forceの場合に、有効期限内の完了済のリースのみ上書きして取得するテスト"""
+
+        mock_time.return_value = 100.0
+        mock_container = mock_get_read_write_container.return_value
+        mock_container.create_item.side_effect = CosmosResourceExistsError
+        mock_container.replace_item.return_value = {"_etag": "replaced"}
+        lease = {
+            "id": "key",
+            "acquiredAt": 90.0,
+            "expiresAt": 180.0,
+            "ttl": 90,
+            "_etag": "etag",
+        }
+
+        mock_container.read_item.return_value = {**lease, "completed": False}
+        self.assertIsNone(acquire_lease("key", force=True))
+        mock_container.read_item.return_value = {**lease, "completed": True}
+        self.assertIsNone(acquire_lease("key"))
+        mock_container.replace_item.assert_not_called()
+        self.assertEqual(acquire_lease("key", force=True), "replaced")
+        self.assertEqual(mock_container.replace_item.call_args.kwargs["etag"], "etag")
+
+    @patch("util.lease.time.time")
+    @patch("util.lease.get_read_write_container")
+    def test_acquire_lease_conflict(self, mock_get_read_write_container, mock_time):
+        """有効期限切れのリースを他のインスタンスが先に上書きした場合のテスト"""
+
+        mock_time.return_value = 100.0
+        mock_container = mock_get_read_write_container.return_value
+        mock_container.create_item.side_effect = CosmosResourceExistsError
+        mock_container.read_item.return_value = {
+            "id": "key",
+            "acquiredAt": 0.0,
+            "expiresAt": 90.0,
+            "ttl": 90,
+            "_etag": "etag",
+        }
+        mock_container.replace_item.side_effect = CosmosAccessConditionFailedError
+
+        self.assertIsNone(acquire_lease("key"))
+
+    @patch("util.lease.get_read_write_container")
+    @patch("util.lease.logging")
+    def test_acquire_lease_error(self, mock_logging, mock_get_read_write_container):
+        """Leaseコンテナーの操作に失敗した場合に、_etagなしで取得したものとみなすテスト"""
+
+        mock_get_read_write_container.return_value.create_item.side_effect = Exception(
+            "Create Error"
+        )
+
+        self.assertEqual(acquire_lease("key"), "")
+        mock_logging.warning.assert_called_once()
+
+
+class TestGetLease(unittest.TestCase):
+    """get_lease関数のテストケース"""
+
+    @patch("util.lease.time.time")
+    @patch("util.lease.get_read_write_container")
+    def test_get_lease(self, mock_get_read_write_container, mock_time):
+        """有効期限内のリースのみを返すテスト"""
+
+        lease = {"id": "key", "acquiredAt": 0.0, "expiresAt": 90.0, "ttl": 90}
+        mock_get_read_write_container.return_value.read_item.return_value = lease
+
+        mock_time.return_value = 89.0
+        self.assertEqual(get_lease("key"), lease)
+        mock_time.return_value = 90.0
+        self.assertIsNone(get_lease("key"))
+
+    @patch("util.lease.get_read_write_container")
+    def test_get_lease_not_found(self, mock_get_read_write_container):
+        """リースが存在しない場合のテスト"""
+
+        mock_get_read_write_container.return_value.read_item.side_effect = (
+            CosmosResourceNotFoundError
+        )
+
+        self.assertIsNone(get_lease("key"))
+
+
+class TestCompleteLease(unittest.TestCase):
+    """complete_lease関数のテストケース"""
+
+    @patch("util.lease.get_read_write_container")
+    def test_complete_lease(self, mock_get_read_write_container):
+        """自身が保持しているリースのみを完了済にするテスト"""
+
+        mock_container = mock_get_read_write_container.return_value
+
+        complete_lease("key", "etag")
+
+        mock_container.patch_item.assert_called_once_with(
+            item="key",
+            partition_key="key",
+            patch_operations=[{"op": "set", "path": "/completed", "value": True}],
+            etag="etag",
+            match_condition=MatchConditions.IfNotModified,
+        )
+
+    @patch("util.lease.get_read_write_container")
+    @patch("util.lease.logging")
+    def test_complete_lease_taken_over(
+        self, mock_logging, mock_get_read_write_container
+    ):
+        """他のインスタンスがリースを取得し直した場合に何もしないテスト"""
+
+        mock_get_read_write_container.return_value.patch_item.side_effect = (
+            CosmosAccessConditionFailedError
+        )
+
+        complete_lease("key", "etag")
+
+        mock_logging.warning.assert_not_called()
+
+    @patch("util.lease.get_read_write_container")
+    def test_complete_lease_without_etag(self, mock_get_read_write_container):
+        """_etagなしで取得したとみなしたリースを操作しないテスト"""
+
+        complete_lease("key", "")
+
+        mock_get_read_write_container.assert_not_called()
+
+
+class TestReleaseLease(unittest.TestCase):
+    """release_lease関数のテストケース"""
+
+    @patch("util.lease.get_read_write_container")
+    def test_release_lease(self, mock_get_read_write_container):
+        """自身が保持しているリースのみを削除するテスト"""
+
+        mock_container = mock_get_read_write_container.return_value
+
+        release_lease("key", "etag")
+
+        mock_container.delete_item.assert_called_once_with(
+            item="key",
+            partition_key="key",
+            etag="etag",
+            match_condition=MatchConditions.IfNotModified,
+        )
+
+    @patch("util.lease.get_read_write_container")
+    @patch("util.lease.logging")
+    def test_release_lease_not_found(self, mock_logging, mock_get_read_write_container):
+        """リースが既に存在しない場合に何もしないテスト"""
+
+        mock_get_read_write_container.return_value.delete_item.side_effect = (
+            CosmosResourceNotFoundError
+        )
+
+        release_lease("key", "etag")
+
+        mock_logging.warning.assert_not_called()
+
+    @patch("util.lease.get_read_write_container")
+    @patch("util.lease.logging")
+    def test_release_lease_taken_over(
+        self, mock_logging, mock_get_read_write_container
+    ):
+        """他のインスタンスがリースを取得し直した場合に削除しないテスト"""
+
+        mock_get_read_write_container.return_value.delete_item.side_effect = (
+            CosmosAccessConditionFailedError
+        )
+
+        release_lease("key", "etag")
+
+        mock_logging.warning.assert_not_called()
+
+    @patch("util.lease.get_read_write_container")
+    def test_release_lease_without_etag(self, mock_get_read_write_container):
+        """_etagなしで取得したとみなしたリースを削除しないテスト"""
+
+        release_lease("key", "")
+
+        mock_get_read_write_container.assert_not_called()
+
+
+class TestWaitForLeaseResult(unittest.TestCase):
+    """wait_for_lease_result関数のテストケース"""
+
+    @patch("util.lease.time.sleep")
+    @patch("util.lease.get_lease")
+    def test_wait_for_lease_result(self, mock_get_lease, mock_sleep):
+        """処理結果を取得できるまで待つテスト"""
+
+        mock_get_lease.return_value = {"id": "key"}
+        fetch = MagicMock(side_effect=[None, None, "result"])
+
+        self.assertEqual(wait_for_lease_result("key", fetch, 60), "result")
+        self.assertEqual(fetch.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    @patch("util.lease.time.sleep")
+    @patch("util.lease.get_lease")
+    def test_wait_for_lease_result_released(self, mock_get_lease, mock_sleep):
+        """リースが解放された場合に待たずに最後の処理結果を返すテスト"""
+
+        mock_get_lease.return_value = None
+        fetch = MagicMock(return_value=None)
+
+        self.assertIsNone(wait_for_lease_result("key", fetch, 60))
+        self.assertEqual(fetch.call_count, 2)
+        mock_sleep.assert_not_called()
+
+    @patch("util.lease.time.sleep")
+    @patch("util.lease.get_lease")
+    def test_wait_for_lease_result_timeout(self, mock_get_lease, mock_sleep):
+        """最大時間を過ぎた場合に待たずに最後の処理結果を返すテスト"""
+
+        mock_get_lease.return_value = {"id": "key"}
+        fetch = MagicMock(return_value=None)
+
+        self.assertIsNone(wait_for_lease_result("key", fetch, 0))
+        mock_sleep.assert_not_called()
+
+
+class TestAcquireOrWaitForLease(unittest.TestCase):
+    """acquire_or_wait_for_lease関数のテストケース"""
+
+    @patch("util.lease.acquire_lease")
+    def test_acquire_or_wait_for_lease_acquired(self, mock_acquire_lease):
+        """リースを取得した場合に、処理結果を待たずに_etagを返すテスト"""
+
+        mock_acquire_lease.return_value = "etag"
+        fetch = MagicMock()
+
+        self.assertEqual(
+            acquire_or_wait_for_lease("key", fetch, force=True), ("etag", None)
+        )
+        mock_acquire_lease.assert_called_once_with("key", True)
+        fetch.assert_not_called()
+
+    @patch("util.lease.acquire_lease")
+    @patch("util.lease.get_lease")
+    @patch("util.lease.wait_for_lease_result")
+    def test_acquire_or_wait_for_lease_result(
+        self, mock_wait_for_lease_result, mock_get_lease, mock_acquire_lease
+    ):
+        """他のインスタンスがリースを取得した時刻以降の処理結果を返すテスト"""
+
+        mock_acquire_lease.return_value = None
+        mock_get_lease.return_value = {"id": "key", "acquiredAt": 100.5}
+        mock_wait_for_lease_result.side_effect = (
+            lambda key, fetch, wait_seconds: fetch()
+        )
+        fetch = MagicMock(return_value="result")
+
+        self.assertEqual(acquire_or_wait_for_lease("key", fetch), (None, "result"))
+        fetch.assert_called_once_with(100)
+
+    @patch("util.lease.acquire_lease")
+    @patch("util.lease.get_lease")
+    @patch("util.lease.wait_for_lease_result")
+    def test_acquire_or_wait_for_lease_retry(
+        self, mock_wait_for_lease_result, mock_get_lease, mock_acquire_lease
+    ):
+        """処理結果を取得できずにリースが解放された場合に、リースを取得し直すテスト"""
+
+        mock_acquire_lease.side_effect = [None, None, "etag"]
+        mock_get_lease.side_effect = [{"id": "key", "acquiredAt": 100.0}, None]
+        mock_wait_for_lease_result.return_value = None
+
+        self.assertEqual(acquire_or_wait_for_lease("key", MagicMock()), ("etag", None))
+        self.assertEqual(mock_acquire_lease.call_count, 3)
+        mock_wait_for_lease_result.assert_called_once()
+
+    @patch("util.lease.acquire_lease")
+    @patch("util.lease.get_lease")
+    @patch("util.lease.wait_for_lease_result")
+    def test_acquire_or_wait_for_lease_timeout(
+        self, mock_wait_for_lease_result, mock_get_lease, mock_acquire_lease
+    ):
+        """リースも処理結果も取得できない場合に、自身で処理せずに例外を送出するテスト"""
+
+        mock_acquire_lease.return_value = None
+        mock_get_lease.return_value = {"id": "key", "acquiredAt": 100.0}
+        mock_wait_for_lease_result.return_value = None
+
+        with self.assertRaises(TimeoutError):
+            acquire_or_wait_for_lease("key", MagicMock())
+        self.assertEqual(mock_acquire_lease.call_count, MAX_LEASE_ACQUIRE_NUMBER)
+
+    @patch("util.lease.time.monotonic")
+    @patch("util.lease.acquire_lease")
+    @patch("util.lease.get_lease")
+    @patch("util.lease.wait_for_lease_result")
+    @patch.dict(os.environ, {"LEASE_WAIT_SECONDS": "60"})
+    def test_acquire_or_wait_for_lease_deadline(
+        self,
+        mock_wait_for_lease_result,
+        mock_get_lease,
+        mock_acquire_lease,
+        mock_monotonic,
+    ):
+        """やり直す場合も含めて、合計の最大時間を過ぎた場合に例外を送出するテスト"""
+
+        mock_monotonic.side_effect = [0.0, 0.0, 45.0, 60.0]
+        mock_acquire_lease.return_value = None
+        mock_get_lease.return_value = {"id": "key", "acquiredAt": 100.0}
+        mock_wait_for_lease_result.return_value = None
+
+        with self.assertRaises(TimeoutError):
+            acquire_or_wait_for_lease("key", MagicMock())
+        self.assertEqual(
+            [args.args[2] for args in mock_wait_for_lease_result.call_args_list],
+            [60.0, 15.0],
+        )
@@ -1,21 +1,27 @@
 """ローカル環境でのインポート処理のユーティリティ関数のテスト"""
 
+import json
 import os
+import tempfile
 import unittest
-from unittest.mock import MagicMock, call, mock_open, patch
+from unittest.mock import ANY, MagicMock, call, mock_open, patch
 
 from azure.core.exceptions import ResourceExistsError
 from azure.cosmos import PartitionKey
 from type.cosmos import Question, Test
 from type.importing import ImportData
+from util.hashing import compute_import_item_hash
 from util.local import (
     create_databases_and_containers,
     create_import_data,
     create_queue_storages,
+    format_import_progress,
     generate_question_items,
     generate_test_items,
     import_question_items,
     import_test_items,
+    load_import_manifest,
+    save_import_manifest,
 )
 from util.queue import AZURITE_QUEUE_STORAGE_CONNECTION_STRING
 
@@ -32,6 +38,7 @@ class TestCreateQueueStorages(unittest.TestCase):
         mock_from_connection_string.side_effect = [
             mock_queue_client,
             mock_queue_client,
+            mock_queue_client,
         ]
 
         create_queue_storages()
@@ -46,12 +53,17 @@ class TestCreateQueueStorages(unittest.TestCase):
                     conn_str=AZURITE_QUEUE_STORAGE_CONNECTION_STRING,
                     queue_name="communities",
                 ),
+                call(
+                    conn_str=AZURITE_QUEUE_STORAGE_CONNECTION_STRING,
+                    queue_name="import-chunks",
+                ),
             ]
         )
         mock_queue_client.create_queue.assert_has_calls(
             [
                 call(),
                 call(),
+                call(),
             ]
         )
 
@@ -62,10 +74,12 @@ class TestCreateQueueStorages(unittest.TestCase):
         mock_from_connection_string.side_effect = [
             mock_queue_client,
             mock_queue_client,
+            mock_queue_client,
         ]
         mock_queue_client.create_queue.side_effect = [
             ResourceExistsError,
             ResourceExistsError,
+            ResourceExistsError,
         ]
 
         create_queue_storages()
@@ -80,12 +94,17 @@ class TestCreateQueueStorages(unittest.TestCase):
                     conn_str=AZURITE_QUEUE_STORAGE_CONNECTION_STRING,
                     queue_name="communities",
                 ),
+                call(
+                    conn_str=AZURITE_QUEUE_STORAGE_CONNECTION_STRING,
+                    queue_name="import-chunks",
+                ),
             ]
         )
         mock_queue_client.create_queue.assert_has_calls(
             [
                 call(),
                 call(),
+                call(),
             ]
         )
 
@@ -142,6 +161,15 @@ class TestCreateDatabasesAndContainers(unittest.TestCase):
                     id="Favorite",
                     partition_key=PartitionKey(path="/testId"),
                 ),
+                call(id="Translation", partition_key=PartitionKey(path="/id")),
+                call(
+                    id="Lease", partition_key=PartitionKey(path="/id"), default_ttl=-1
+                ),
+                call(
+                    id="Import", partition_key=PartitionKey(path="/id"), default_ttl=-1
+                ),
+                call(id="Catalog", partition_key=PartitionKey(path="/id")),
+                call(id="Discussion", partition_key=PartitionKey(path="/testId")),
             ],
             any_order=True,
         )
@@ -237,6 +265,57 @@ class TestCreateImportData(unittest.TestCase):
         }
         self.assertEqual(import_data, expected_data)
 
+    def test_create_import_data_with_filters_and_manifest(self):
+        """コース名/テスト名で抽出し、マニフェストから変更されたインポートデータファイルのみ読み込むテスト"""
+
+        with tempfile.TemporaryDirectory() as data_path, patch(
+            "util.local.DATA_PATH", data_path
+        ):
+            for course_name, test_name, number in (
+                ("Math", "Algebra", 1),
+                ("Math", "Geometry", 2),
+                ("Science", "Physics", 3),
+            ):
+                os.makedirs(os.path.join(data_path, course_name), exist_ok=True)
+                with open(
+                    os.path.join(data_path, course_name, f"{test_name}.json"),
+                    "w",
+                    encoding="utf8",
+                ) as f:
+                    json.dump([{"subjects": [f"Q{number}"]}], f)
+
+            # コース名/テスト名で抽出
+            self.assertEqual(
+                create_import_data(course_names=["Math"], test_names=["Geometry"]),
+                {"Math": {"Geometry": [{"subjects": ["Q2"]}]}},
+            )
+
+            # 初回はすべて読み込み、マニフェストを保存
+            manifest = load_import_manifest()
+            self.assertEqual(manifest, {})
+            self.assertEqual(len(create_import_data(manifest=manifest)), 2)
+            self.assertCountEqual(
+                manifest.keys(),
+                ["Math/Algebra.json", "Math/Geometry.json", "Science/Physics.json"],
+            )
+            save_import_manifest(manifest)
+
+            # 内容を変更したファイルのみ読み込む
+            with open(
+                os.path.join(data_path, "Math", "Algebra.json"), "w", encoding="utf8"
+            ) as f:
+                json.dump([{"subjects": ["Q1 updated"]}], f)
+            # 最終更新日時のみ変更したファイルは読み込まない
+            os.utime(os.path.join(data_path, "Science", "Physics.json"), ns=(0, 0))
+            manifest = load_import_manifest()
+
+            self.assertEqual(
+                create_import_data(manifest=manifest),
+                {"Math": {"Algebra": [{"subjects": ["Q1 updated"]}]}},
+            )
+            self.assertEqual(manifest["Science/Physics.json"]["mtime"], 0)
+            self.assertEqual(create_import_data(manifest=manifest), {})
+
 
 class TestGenerateTestItems(unittest.TestCase):
     """generate_test_items関数のテストケース"""
@@ -245,7 +324,7 @@ class TestGenerateTestItems(unittest.TestCase):
     def test_generate_test_items_when_retrieved_successfully(
         self, mock_get_read_write_container
     ):
-        """テスト項目を正常取得した場合のgenerate_test_items関数のテスト"""
+        """テスト項目を正常取得した場合に、格納済の項目の問題数を更新するgenerate_test_items関数のテスト"""
         mock_container = MagicMock()
         mock_container.read_all_items.return_value = [
             {"courseName": "Math", "testName": "Algebra", "id": "1", "length": 10}
@@ -275,7 +354,7 @@ class TestGenerateTestItems(unittest.TestCase):
         self.assertEqual(len(test_items), 2)
         self.assertEqual(
             test_items[0],
-            {"courseName": "Math", "testName": "Algebra", "id": "1", "length": 10},
+            {"courseName": "Math", "testName": "Algebra", "id": "1", "length": 1},
         )
         self.assertEqual(test_items[1]["courseName"], "Math")
         self.assertEqual(test_items[1]["testName"], "Geometry")
@@ -329,8 +408,11 @@ class TestGenerateTestItems(unittest.TestCase):
 class TestImportTestItems(unittest.TestCase):
     """import_test_items関数のテストケース"""
 
+    @patch("util.local.refresh_tests_catalog")
     @patch("util.local.get_read_write_container")
-    def test_import_test_items(self, mock_get_read_write_container):
+    def test_import_test_items(
+        self, mock_get_read_write_container, mock_refresh_tests_catalog
+    ):
         """import_test_items関数のテスト"""
         mock_container = MagicMock()
         mock_get_read_write_container.return_value = mock_container
@@ -341,6 +423,7 @@ class TestImportTestItems(unittest.TestCase):
         import_test_items(test_items)
 
         mock_container.upsert_item.assert_called_once_with(test_items[0])
+        mock_refresh_tests_catalog.assert_called_once_with()
 
 
 class TestGenerateQuestionItems(unittest.TestCase):
@@ -379,6 +462,9 @@ class TestGenerateQuestionItems(unittest.TestCase):
                 "id": "1_1",
                 "number": 1,
                 "testId": "1",
+                "contentHash": compute_import_item_hash(
+                    {"subjects": ["Q1"], "choices": ["A", "B"], "answerNum": 2}
+                ),
             }
         ]
         self.assertEqual(question_items, expected_items)
@@ -414,6 +500,34 @@ class TestGenerateQuestionItems(unittest.TestCase):
             str(context.exception), "Course Name Math and Test Name Algebra Not Found."
         )
 
+    @patch("util.local.get_read_write_container")
+    def test_generate_question_items_when_content_changed(
+        self, mock_get_read_write_container
+    ):
+        """格納済の項目のうち、ハッシュ値が変わった項目のみ生成するgenerate_question_items関数のテスト"""
+        mock_container = MagicMock()
+        mock_get_read_write_container.return_value = mock_container
+        items = [
+            {"subjects": ["Q1"], "choices": ["A"], "answerNum": 1},
+            {"subjects": ["Q2"], "choices": ["B"], "answerNum": 1},
+        ]
+        mock_container.query_items.return_value = [
+            {"id": "1_1", "contentHash": compute_import_item_hash(items[0])},
+            {"id": "1_2", "contentHash": "changed"},
+        ]
+
+        question_items = generate_question_items(
+            {"Math": {"Algebra": items}},
+            [{"courseName": "Math", "testName": "Algebra", "id": "1", "length": 2}],
+        )
+
+        self.assertEqual([item["id"] for item in question_items], ["1_2"])
+        mock_container.query_items.assert_called_once_with(
+            query="SELECT c.id, c.contentHash FROM c WHERE c.testId = @testId",
+            parameters=[{"name": "@testId", "value": "1"}],
+            partition_key="1",
+        )
+
 
 class TestImportQuestionItems(unittest.TestCase):
     """import_question_items関数のテストケース"""
@@ -423,7 +537,6 @@ class TestImportQuestionItems(unittest.TestCase):
     def test_import_question_items(self, mock_print, mock_get_read_write_container):
         """import_question_items関数のテスト"""
         mock_container = MagicMock()
-        mock_container.upsert_item.return_value = {"statusCode": 200}
         mock_get_read_write_container.return_value = mock_container
 
         question_items: list[Question] = [
@@ -446,7 +559,138 @@ class TestImportQuestionItems(unittest.TestCase):
         ]
         import_question_items(question_items)
 
-        mock_print.assert_has_calls([call("1th Response OK"), call("2th Response OK")])
-        mock_container.upsert_item.assert_has_calls(
-            [call(question_items[0]), call(question_items[1])]
+        mock_print.assert_called_once()
+        self.assertTrue(mock_print.call_args.args[0].startswith("2/2 items ("))
+        mock_container.execute_item_batch.assert_called_once_with(
+            batch_operations=[
+                ("upsert", (question_items[0],)),
+                ("upsert", (question_items[1],)),
+            ],
+            partition_key="1",
+            response_hook=ANY,
+        )
+
+    @patch("util.local.get_read_write_container")
+    @patch("builtins.print")
+    def test_import_question_items_with_discussions(
+        self, mock_print, mock_get_read_write_container  # pylint: disable=W0613
+    ):
+        """ディスカッションをDiscussionコンテナーの項目に分割し、先にupsertするテスト"""
+        mock_containers = {"Question": MagicMock(), "Discussion": MagicMock()}
+        mock_get_read_write_container.side_effect = (
+            lambda database_name, container_name: mock_containers[container_name]
+        )
+        manager = MagicMock()
+        manager.attach_mock(mock_containers["Question"], "question")
+        manager.attach_mock(mock_containers["Discussion"], "discussion")
+
+        discussions = [{"comment": "A", "upvotedNum": 1, "selectedAnswer": "A"}]
+        question_items: list[Question] = [
+            {
+                "subjects": ["Q1"],
+                "choices": ["A"],
+                "answerNum": 1,
+                "id": "1_1",
+                "number": 1,
+                "testId": "1",
+                "discussions": discussions,
+            },
+            {
+                "subjects": ["Q2"],
+                "choices": ["B"],
+                "answerNum": 1,
+                "id": "1_2",
+                "number": 2,
+                "testId": "1",
+            },
+        ]
+        import_question_items(question_items)
+
+        self.assertEqual(
+            [name for name, _, _ in manager.mock_calls],
+            ["discussion.execute_item_batch", "question.execute_item_batch"],
+        )
+        mock_containers["Discussion"].execute_item_batch.assert_called_once_with(
+            batch_operations=[
+                (
+                    "upsert",
+                    (
+                        {
+                            "id": "1_1",
+                            "number": 1,
+                            "testId": "1",
+                            "discussions": discussions,
+                        },
+                    ),
+                )
+            ],
+            partition_key="1",
+            response_hook=ANY,
+        )
+        upserted_items = [
+            operation[1][0]
+            for operation in mock_containers[
+                "Question"
+            ].execute_item_batch.call_args.kwargs["batch_operations"]
+        ]
+        self.assertEqual(
+            [item.get("discussions") for item in upserted_items], [None, None]
+        )
+        self.assertEqual([item["discussionNum"] for item in upserted_items], [1, 0])
+
+    @patch("util.local.get_read_write_container")
+    @patch("builtins.print")
+    @patch.dict(os.environ, {"LOCAL_IMPORT_CONCURRENCY": "3"})
+    def test_import_question_items_in_parallel(
+        self, mock_print, mock_get_read_write_container
+    ):
+        """テストIDごとのトランザクションバッチを並列にupsertし、バッチごとに進捗を出力するテスト"""
+        mock_container = MagicMock()
+        mock_get_read_write_container.return_value = mock_container
+        mock_container.execute_item_batch.side_effect = (
+            lambda batch_operations, partition_key, response_hook: response_hook(
+                {"x-ms-request-charge": "10.0"}, batch_operations
+            )
+        )
+
+        # テストIDごとに150件(2バッチ)
+        question_items: list[Question] = [
+            {
+                "subjects": [f"Q{number}"],
+                "choices": ["A"],
+                "answerNum": 1,
+                "id": f"{test_id}_{number}",
+                "number": number,
+                "testId": test_id,
+            }
+            for test_id in ("1", "2", "3")
+            for number in range(1, 151)
+        ]
+        import_question_items(question_items)
+
+        self.assertEqual(mock_container.execute_item_batch.call_count, 6)
+        upserted_ids = [
+            operation[1][0]["id"]
+            for args in mock_container.execute_item_batch.call_args_list
+            for operation in args.kwargs["batch_operations"]
+            if operation[1][0]["testId"] == args.kwargs["partition_key"]
+        ]
+        self.assertCountEqual(upserted_ids, [item["id"] for item in question_items])
+        self.assertEqual(mock_print.call_count, 6)
+        self.assertTrue(mock_print.call_args.args[0].startswith("450/450 items ("))
+
+
+class TestFormatImportProgress(unittest.TestCase):
+    """format_import_progress関数のテストケース"""
+
+    def test_format_import_progress(self):
+        """1秒あたりの項目数・要求ユニット(RU)数を出力するテスト"""
+
+        self.assertEqual(
+            format_import_progress(100, 400, 1050.0, 2.0),
+            "100/400 items (50.0 items/s, 525.0 RU/s)",
+        )
+        self.assertEqual(
+            format_import_progress(0, 400, 0.0, 0.0),
+            "0/400 items (0.0 items/s, 0.0 RU/s)",
         )
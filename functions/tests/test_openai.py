@@ -0,0 +1,66 @@
+"""Azure OpenAIのユーティリティ関数のテスト"""
+
+import os
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+from util.openai import get_openai_client, reset_openai_client
+
+
+@patch.dict(
+    os.environ,
+    {
+        "OPENAI_API_KEY": "test_api_key",
+        "OPENAI_API_VERSION": "test_api_version",
+        "OPENAI_DEPLOYMENT_NAME": "test_deployment_name",
+        "OPENAI_ENDPOINT": "https://test.openai.azure.com",
+    },
+)
+class TestGetOpenAIClient(unittest.TestCase):
+    """get_openai_client関数のテストケース"""
+
+    def setUp(self):
+        reset_openai_client()
+
+    def tearDown(self):
+        reset_openai_client()
+
+    def test_get_openai_client_shared(self):
+        """ワーカープロセス内で同一のクライアントを返し、破棄後は新たに作成するテスト"""
+
+        client = get_openai_client()
+
+        self.assertIs(get_openai_client(), client)
+        self.assertEqual(client.api_key, "test_api_key")
+        self.assertEqual(
+            str(client.base_url),
+            "https://test.openai.azure.com/openai/deployments/test_deployment_name/",
+        )
+
+        reset_openai_client()
+
+        self.assertTrue(client.is_closed())
+        self.assertIsNot(get_openai_client(), client)
+
+    @patch.dict(
+        os.environ,
+        {
+            "OPENAI_MAX_CONNECTIONS": "5",
+            "OPENAI_MAX_KEEPALIVE_CONNECTIONS": "3",
+            "OPENAI_TIMEOUT_SECONDS": "30",
+            "OPENAI_CONNECT_TIMEOUT_SECONDS": "2",
+        },
+    )
+    @patch("util.openai.httpx.Limits", wraps=httpx.Limits)
+    def test_get_openai_client_settings(self, mock_limits):
+        """環境変数からコネクションプールの接続数・タイムアウトを設定するテスト"""
+
+        client = get_openai_client()
+
+        mock_limits.assert_called_once_with(
+            max_connections=5, max_keepalive_connections=3
+        )
+        self.assertEqual(client.timeout.read, 30.0)
+        self.assertEqual(client.timeout.connect, 2.0)
@@ -1,8 +1,12 @@
+# pylint: disable=too-many-lines
 """[POST] /tests/{testId}/answers/{questionNumber} のテスト"""
 
 import json
 import os
+import threading
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, call, patch
 
 import azure.functions as func
@@ -11,7 +15,9 @@ from src.post_answer import (
     MAX_RETRY_NUMBER,
     SYSTEM_PROMPT,
     create_chat_completions_messages,
+    generate_answer,
     generate_correct_answers,
+    get_cached_answer,
     post_answer,
     queue_message_answer,
     validate_request,
@@ -19,6 +25,8 @@ from src.post_answer import (
 from type.cosmos import Question
 from type.message import MessageAnswer
 from type.structured import AnswerFormat
+from util.hashing import compute_question_hash
+from util.question_cache import reset_question_cache
 
 
 class TestValidateRequest(unittest.TestCase):
@@ -29,11 +37,23 @@ class TestValidateRequest(unittest.TestCase):
 
         req: func.HttpRequest = MagicMock(spec=func.HttpRequest)
         req.route_params = {"testId": "1", "questionNumber": "1"}
+        req.params = {"force": "true"}
 
         result = validate_request(req)
 
         self.assertIsNone(result)
 
+    def test_validate_request_invalid_force(self):
+        """forceがtrue・false以外である場合のテスト"""
+
+        req: func.HttpRequest = MagicMock(spec=func.HttpRequest)
+        req.route_params = {"testId": "1", "questionNumber": "1"}
+        req.params = {"force": "yes"}
+
+        result = validate_request(req)
+
+        self.assertEqual(result, "Invalid force: yes")
+
     def test_validate_request_invalid_test_id(self):
         """testIdが空である場合のテスト"""
 
@@ -379,7 +399,7 @@ class TestCreateChatCompletionsMessages(unittest.TestCase):
 class TestGenerateCorrectAnswers(unittest.TestCase):
     """generate_correct_answers関数のテストケース"""
 
-    @patch("src.post_answer.AzureOpenAI")
+    @patch("src.post_answer.get_openai_client")
     @patch("src.post_answer.create_chat_completions_messages")
     @patch("src.post_answer.logging")
     @patch.dict(
@@ -396,7 +416,7 @@ class TestGenerateCorrectAnswers(unittest.TestCase):
         self,
         mock_logging,
         mock_create_chat_completions_messages,
-        mock_azure_openai,
+        mock_get_openai_client,
     ):
         """リトライせずに、正解の選択肢のインデックス・正解/不正解の理由を生成するテスト"""
 
@@ -418,7 +438,7 @@ class TestGenerateCorrectAnswers(unittest.TestCase):
         mock_response.choices[0].message.parsed.explanations = [
             "Option 2 is correct because 2 + 2 equals 4."
         ]
-        mock_azure_openai.return_value.beta.chat.completions.parse.return_value = (
+        mock_get_openai_client.return_value.beta.chat.completions.parse.return_value = (
             mock_response
         )
 
@@ -435,13 +455,8 @@ class TestGenerateCorrectAnswers(unittest.TestCase):
         mock_create_chat_completions_messages.assert_called_once_with(
             subjects, choices, 1, None, None
         )
-        mock_azure_openai.assert_called_once_with(
-            api_key="test_api_key",
-            api_version="test_api_version",
-            azure_deployment="test_deployment_name",
-            azure_endpoint="test_endpoint",
-        )
-        mock_azure_openai.return_value.beta.chat.completions.parse.assert_called_once_with(
+        mock_get_openai_client.assert_called_once_with()
+        mock_get_openai_client.return_value.beta.chat.completions.parse.assert_called_once_with(
             model="test_model_name",
             messages=mock_messages,
             response_format=AnswerFormat,
@@ -454,7 +469,7 @@ class TestGenerateCorrectAnswers(unittest.TestCase):
         )
         mock_logging.warning.assert_not_called()
 
-    @patch("src.post_answer.AzureOpenAI")
+    @patch("src.post_answer.get_openai_client")
     @patch("src.post_answer.create_chat_completions_messages")
     @patch("src.post_answer.logging")
     @patch.dict(
@@ -471,7 +486,7 @@ class TestGenerateCorrectAnswers(unittest.TestCase):
         self,
         mock_logging,
         mock_create_chat_completions_messages,
-        mock_azure_openai,
+        mock_get_openai_client,
     ):
         """MAX_RETRY_NUMBER回リトライしても、正解の選択肢のインデックス・正解/不正解の理由が生成できない場合のテスト"""
 
@@ -490,7 +505,7 @@ class TestGenerateCorrectAnswers(unittest.TestCase):
         mock_create_chat_completions_messages.return_value = mock_messages
         mock_response = MagicMock()
         mock_response.choices[0].message.parsed = None
-        mock_azure_openai.return_value.beta.chat.completions.parse.return_value = (
+        mock_get_openai_client.return_value.beta.chat.completions.parse.return_value = (
             mock_response
         )
 
@@ -511,7 +526,7 @@ class TestGenerateCorrectAnswers(unittest.TestCase):
         )
         mock_logging.warning.assert_not_called()
 
-    @patch("src.post_answer.AzureOpenAI")
+    @patch("src.post_answer.get_openai_client")
     @patch("src.post_answer.create_chat_completions_messages")
     @patch("src.post_answer.logging")
     @patch.dict(
@@ -528,7 +543,7 @@ class TestGenerateCorrectAnswers(unittest.TestCase):
         self,
         mock_logging,
         mock_create_chat_completions_messages,
-        mock_azure_openai,
+        mock_get_openai_client,
     ):
         """正解の選択肢のインデックス・正解/不正解の理由の生成でエラーが発生した場合のテスト"""
 
@@ -545,7 +560,7 @@ class TestGenerateCorrectAnswers(unittest.TestCase):
             },
         ]
         mock_create_chat_completions_messages.return_value = mock_messages
-        mock_azure_openai.return_value.beta.chat.completions.parse.side_effect = [
+        mock_get_openai_client.return_value.beta.chat.completions.parse.side_effect = [
             Exception("Azure OpenAI Error"),
         ]
 
@@ -565,14 +580,11 @@ class TestGenerateCorrectAnswers(unittest.TestCase):
 class TestQueueMessageAnswer(unittest.TestCase):
     """queue_message_answer関数のテストケース"""
 
-    @patch("src.post_answer.get_queue_client")
+    @patch("src.post_answer.send_queue_message")
     @patch("src.post_answer.logging")
-    def test_queue_message_answer_azure(self, mock_logging, mock_get_queue_client):
+    def test_queue_message_answer_azure(self, mock_logging, mock_send_queue_message):
         """Azureにて、キューストレージにAnswerコンテナーの項目用のメッセージを格納するテスト"""
 
-        mock_queue = MagicMock()
-        mock_get_queue_client.return_value = mock_queue
-
         message_answer = MessageAnswer(
             testId="1",
             questionNumber=1,
@@ -585,20 +597,16 @@ class TestQueueMessageAnswer(unittest.TestCase):
 
         queue_message_answer(message_answer)
 
-        mock_get_queue_client.assert_called_once_with("answers")
-        mock_queue.send_message.assert_called_once_with(
-            json.dumps(message_answer).encode("utf-8")
+        mock_send_queue_message.assert_called_once_with(
+            "answers", json.dumps(message_answer).encode("utf-8")
         )
         mock_logging.info.assert_called_once_with({"message_answer": message_answer})
 
-    @patch("src.post_answer.get_queue_client")
+    @patch("src.post_answer.send_queue_message")
     @patch("src.post_answer.logging")
-    def test_queue_message_answer_local(self, mock_logging, mock_get_queue_client):
+    def test_queue_message_answer_local(self, mock_logging, mock_send_queue_message):
         """ローカル環境にて、キューストレージにAnswerコンテナーの項目用のメッセージを格納するテスト"""
 
-        mock_queue = MagicMock()
-        mock_get_queue_client.return_value = mock_queue
-
         message_answer = MessageAnswer(
             testId="1",
             questionNumber=1,
@@ -611,9 +619,8 @@ class TestQueueMessageAnswer(unittest.TestCase):
 
         queue_message_answer(message_answer)
 
-        mock_get_queue_client.assert_called_once_with("answers")
-        mock_queue.send_message.assert_called_once_with(
-            json.dumps(message_answer).encode("utf-8")
+        mock_send_queue_message.assert_called_once_with(
+            "answers", json.dumps(message_answer).encode("utf-8")
         )
         mock_logging.info.assert_called_once_with({"message_answer": message_answer})
 
@@ -621,8 +628,20 @@ class TestQueueMessageAnswer(unittest.TestCase):
 class TestPostAnswer(unittest.TestCase):
     """post_answer関数のテストケース"""
 
+    def setUp(self):
+        reset_question_cache()
+        for target, return_value in (
+            ("src.post_answer.acquire_or_wait_for_lease", ("etag", None)),
+            ("src.post_answer.complete_lease", None),
+            ("src.post_answer.release_lease", None),
+        ):
+            patcher = patch(target, return_value=return_value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
     @patch("src.post_answer.validate_request")
     @patch("src.post_answer.get_read_only_container")
+    @patch("src.post_answer.get_cached_answer")
     @patch("src.post_answer.generate_correct_answers")
     @patch("src.post_answer.queue_message_answer")
     @patch("src.post_answer.logging")
@@ -631,6 +650,7 @@ class TestPostAnswer(unittest.TestCase):
         mock_logging,
         mock_queue_message_answer,
         mock_generate_correct_answers,
+        mock_get_cached_answer,
         mock_get_read_only_container,
         mock_validate_request,
     ):
@@ -654,6 +674,7 @@ class TestPostAnswer(unittest.TestCase):
         )
         mock_container.read_item.return_value = mock_item
         mock_get_read_only_container.return_value = mock_container
+        mock_get_cached_answer.return_value = None
         mock_generate_correct_answers.return_value = {
             "correct_indexes": [1],
             "explanations": ["Option 2 is correct because 2 + 2 equals 4."],
@@ -661,6 +682,7 @@ class TestPostAnswer(unittest.TestCase):
 
         req: func.HttpRequest = MagicMock(spec=func.HttpRequest)
         req.route_params = {"testId": "1", "questionNumber": "1"}
+        req.params = {}
 
         response: func.HttpResponse = post_answer(req)
 
@@ -670,8 +692,10 @@ class TestPostAnswer(unittest.TestCase):
             {
                 "correctIdxes": [1],
                 "explanations": ["Option 2 is correct because 2 + 2 equals 4."],
+                "isCached": False,
             },
         )
+        mock_get_cached_answer.assert_called_once_with("1", "1", mock_item)
         mock_validate_request.assert_called_once_with(req)
         mock_get_read_only_container.assert_called_once_with(
             database_name="Users",
@@ -701,7 +725,7 @@ class TestPostAnswer(unittest.TestCase):
         )
         mock_logging.info.assert_has_calls(
             [
-                call({"question_number": "1", "test_id": "1"}),
+                call({"question_number": "1", "test_id": "1", "force": False}),
                 call({"item": mock_item}),
             ]
         )
@@ -791,6 +815,7 @@ class TestPostAnswer(unittest.TestCase):
 
         req: func.HttpRequest = MagicMock(spec=func.HttpRequest)
         req.route_params = {"testId": "1", "questionNumber": "1"}
+        req.params = {"force": "true"}
 
         response = post_answer(req)
 
@@ -814,8 +839,419 @@ class TestPostAnswer(unittest.TestCase):
         )
         mock_logging.info.assert_has_calls(
             [
-                call({"question_number": "1", "test_id": "1"}),
+                call({"question_number": "1", "test_id": "1", "force": True}),
                 call({"item": mock_item}),
             ]
         )
         mock_logging.error.assert_called_once()
+
+    @patch("src.post_answer.validate_request")
+    @patch("src.post_answer.get_read_only_container")
+    @patch("src.post_answer.get_cached_answer")
+    @patch("src.post_answer.generate_correct_answers")
+    @patch("src.post_answer.queue_message_answer")
+    def test_post_answer_cached(  # pylint: disable=R0913,R0917
+        self,
+        mock_queue_message_answer,
+        mock_generate_correct_answers,
+        mock_get_cached_answer,
+        mock_get_read_only_container,
+        mock_validate_request,
+    ):
+        """Answerコンテナーに保存済の項目を返す場合のテスト"""
+
+        mock_validate_request.return_value = None
+        mock_item = Question(
+            subjects=["What is 2 + 2?"], choices=["3", "4"], answerNum=1
+        )
+        mock_get_read_only_container.return_value.read_item.return_value = mock_item
+        mock_get_cached_answer.return_value = {
+            "id": "1_1",
+            "questionNumber": 1,
+            "correctIdxes": [1],
+            "explanations": ["Option A is incorrect.", "Option B is correct."],
+            "testId": "1",
+            "questionHash": compute_question_hash(mock_item),
+        }
+
+        req: func.HttpRequest = MagicMock(spec=func.HttpRequest)
+        req.route_params = {"testId": "1", "questionNumber": "1"}
+        req.params = {}
+
+        response = post_answer(req)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            json.loads(response.get_body()),
+            {
+                "correctIdxes": [1],
+                "explanations": ["Option A is incorrect.", "Option B is correct."],
+                "isCached": True,
+            },
+        )
+        mock_get_cached_answer.assert_called_once_with("1", "1", mock_item)
+        mock_generate_correct_answers.assert_not_called()
+        mock_queue_message_answer.assert_not_called()
+
+    @patch("src.post_answer.validate_request")
+    @patch("src.post_answer.get_read_only_container")
+    @patch("src.post_answer.get_cached_answer")
+    @patch("src.post_answer.generate_correct_answers")
+    @patch("src.post_answer.queue_message_answer")
+    def test_post_answer_force(  # pylint: disable=R0913,R0917
+        self,
+        mock_queue_message_answer,
+        mock_generate_correct_answers,
+        mock_get_cached_answer,
+        mock_get_read_only_container,
+        mock_validate_request,
+    ):
+        """force=trueを指定して強制的に再生成する場合のテスト"""
+
+        mock_validate_request.return_value = None
+        mock_item = Question(
+            subjects=["What is 2 + 2?"], choices=["3", "4"], answerNum=1
+        )
+        mock_get_read_only_container.return_value.read_item.return_value = mock_item
+        mock_generate_correct_answers.return_value = {
+            "correct_indexes": [1],
+            "explanations": ["Option A is incorrect.", "Option B is correct."],
+        }
+
+        req: func.HttpRequest = MagicMock(spec=func.HttpRequest)
+        req.route_params = {"testId": "1", "questionNumber": "1"}
+        req.params = {"force": "true"}
+
+        response = post_answer(req)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(json.loads(response.get_body())["isCached"])
+        mock_get_cached_answer.assert_not_called()
+        mock_generate_correct_answers.assert_called_once()
+        mock_queue_message_answer.assert_called_once()
+
+
+class TestGenerateAnswer(unittest.TestCase):
+    """generate_answer関数のテストケース"""
+
+    def setUp(self):
+        self.item = Question(
+            subjects=["What is 2 + 2?"], choices=["3", "4"], answerNum=1
+        )
+
+    @patch("src.post_answer.acquire_or_wait_for_lease")
+    @patch("src.post_answer.complete_lease")
+    @patch("src.post_answer.release_lease")
+    @patch("src.post_answer.generate_correct_answers")
+    @patch("src.post_answer.queue_message_answer")
+    def test_generate_answer_lease_acquired(  # pylint: disable=R0913,R0917
+        self,
+        mock_queue_message_answer,
+        mock_generate_correct_answers,
+        mock_release_lease,
+        mock_complete_lease,
+        mock_acquire_or_wait_for_lease,
+    ):
+        """リースを取得して生成し、リースを解放せずに完了済にするテスト"""
+
+        mock_acquire_or_wait_for_lease.return_value = ("etag", None)
+        mock_generate_correct_answers.return_value = {
+            "correct_indexes": [1],
+            "explanations": ["Option A is incorrect.", "Option B is correct."],
+        }
+
+        result = generate_answer("1", "1", self.item)
+
+        self.assertEqual(
+            result,
+            {
+                "correctIdxes": [1],
+                "explanations": ["Option A is incorrect.", "Option B is correct."],
+                "isCached": False,
+            },
+        )
+        args = mock_acquire_or_wait_for_lease.call_args.args
+        self.assertEqual((args[0], args[2]), ("answers_1_1", False))
+        mock_queue_message_answer.assert_called_once()
+        mock_complete_lease.assert_called_once_with("answers_1_1", "etag")
+        mock_release_lease.assert_not_called()
+
+    @patch("src.post_answer.acquire_or_wait_for_lease")
+    @patch("src.post_answer.complete_lease")
+    @patch("src.post_answer.release_lease")
+    @patch("src.post_answer.generate_correct_answers")
+    def test_generate_answer_error_release_lease(
+        self,
+        mock_generate_correct_answers,
+        mock_release_lease,
+        mock_complete_lease,
+        mock_acquire_or_wait_for_lease,
+    ):
+        """生成に失敗した場合に、取得したリースを解放するテスト"""
+
+        mock_acquire_or_wait_for_lease.return_value = ("etag", None)
+        mock_generate_correct_answers.return_value = None
+
+        with self.assertRaises(ValueError):
+            generate_answer("1", "1", self.item)
+
+        mock_release_lease.assert_called_once_with("answers_1_1", "etag")
+        mock_complete_lease.assert_not_called()
+
+    @patch("src.post_answer.acquire_or_wait_for_lease")
+    @patch("src.post_answer.get_cached_answer")
+    @patch("src.post_answer.generate_correct_answers")
+    @patch("src.post_answer.queue_message_answer")
+    def test_generate_answer_wait_for_other_instance(
+        self,
+        mock_queue_message_answer,
+        mock_generate_correct_answers,
+        mock_get_cached_answer,
+        mock_acquire_or_wait_for_lease,
+    ):
+        """他のインスタンスがリースを保持している場合に、リース取得以降の生成結果を待って返すテスト"""
+
+        answer_item = {
+            "id": "1_1",
+            "questionNumber": 1,
+            "correctIdxes": [1],
+            "explanations": ["Option A is incorrect.", "Option B is correct."],
+            "testId": "1",
+            "_ts": 100,
+        }
+        mock_get_cached_answer.side_effect = [
+            {**answer_item, "_ts": 99},
+            answer_item,
+        ]
+        mock_acquire_or_wait_for_lease.side_effect = lambda key, fetch, force: (
+            None,
+            fetch(100) or fetch(100),
+        )
+
+        result = generate_answer("1", "1", self.item)
+
+        self.assertEqual(
+            result,
+            {
+                "correctIdxes": [1],
+                "explanations": ["Option A is incorrect.", "Option B is correct."],
+                "isCached": True,
+            },
+        )
+        mock_generate_correct_answers.assert_not_called()
+        mock_queue_message_answer.assert_not_called()
+
+    @patch("src.post_answer.acquire_or_wait_for_lease")
+    @patch("src.post_answer.complete_lease")
+    @patch("src.post_answer.generate_correct_answers")
+    @patch("src.post_answer.queue_message_answer")
+    def test_generate_answer_force(
+        self,
+        mock_queue_message_answer,
+        mock_generate_correct_answers,
+        mock_complete_lease,  # pylint: disable=W0613
+        mock_acquire_or_wait_for_lease,
+    ):
+        """強制的に再生成する場合に、完了済のリースを上書きして取得するテスト"""
+
+        mock_acquire_or_wait_for_lease.return_value = ("etag", None)
+        mock_generate_correct_answers.return_value = {
+            "correct_indexes": [1],
+            "explanations": ["Option A is incorrect.", "Option B is correct."],
+        }
+
+        result = generate_answer("1", "1", self.item, force=True)
+
+        self.assertFalse(result["isCached"])
+        self.assertTrue(mock_acquire_or_wait_for_lease.call_args.args[2])
+        mock_queue_message_answer.assert_called_once()
+
+
+class TestPostAnswerConcurrency(unittest.TestCase):
+    """同一の問題へ同時にリクエストした場合のpost_answer関数のテストケース"""
+
+    def setUp(self):
+        reset_question_cache()
+
+    @patch("src.post_answer.get_read_only_container")
+    @patch("src.post_answer.get_cached_answer")
+    @patch("src.post_answer.acquire_or_wait_for_lease")
+    @patch("src.post_answer.generate_correct_answers")
+    @patch("src.post_answer.queue_message_answer")
+    def test_post_answer_coalesced(  # pylint: disable=R0913,R0917
+        self,
+        mock_queue_message_answer,
+        mock_generate_correct_answers,
+        mock_acquire_or_wait_for_lease,
+        mock_get_cached_answer,
+        mock_get_read_only_container,
+    ):
+        """同時リクエストでAzure OpenAIの呼び出しが1回のみであるテスト"""
+
+        request_num = 20
+        mock_get_read_only_container.return_value.read_item.return_value = Question(
+            subjects=["What is 2 + 2?"], choices=["3", "4"], answerNum=1
+        )
+        mock_get_cached_answer.return_value = None
+        mock_acquire_or_wait_for_lease.return_value = ("", None)
+
+        # すべてのリクエストが生成中に到着するように、生成に時間がかかるようにする
+        started = threading.Barrier(request_num + 1)
+        upstream_calls = []
+
+        def generate(*_):
+            upstream_calls.append(1)
+            time.sleep(0.2)
+            return {
+                "correct_indexes": [1],
+                "explanations": ["Option A is incorrect.", "Option B is correct."],
+            }
+
+        mock_generate_correct_answers.side_effect = generate
+
+        def request(_):
+            req: func.HttpRequest = MagicMock(spec=func.HttpRequest)
+            req.route_params = {"testId": "1", "questionNumber": "1"}
+            req.params = {}
+            started.wait()
+            return post_answer(req)
+
+        with ThreadPoolExecutor(max_workers=request_num) as executor:
+            futures = [executor.submit(request, i) for i in range(request_num)]
+            started.wait()
+            responses = [future.result() for future in futures]
+
+        self.assertEqual(len(upstream_calls), 1)
+        mock_acquire_or_wait_for_lease.assert_called_once()
+        self.assertEqual(
+            mock_acquire_or_wait_for_lease.call_args.args[0], "answers_1_1"
+        )
+        mock_queue_message_answer.assert_called_once()
+        self.assertEqual(
+            {response.status_code for response in responses},
+            {200},
+        )
+        self.assertEqual(len({response.get_body() for response in responses}), 1)
+
+    @patch("src.post_answer.get_read_only_container")
+    @patch("src.post_answer.get_cached_answer")
+    @patch("src.post_answer.acquire_or_wait_for_lease")
+    @patch("src.post_answer.generate_correct_answers")
+    @patch("src.post_answer.queue_message_answer")
+    def test_post_answer_force_not_coalesced(  # pylint: disable=R0913,R0917
+        self,
+        mock_queue_message_answer,
+        mock_generate_correct_answers,
+        mock_acquire_or_wait_for_lease,
+        mock_get_cached_answer,
+        mock_get_read_only_container,
+    ):
+        """生成中にforce=trueでリクエストした場合に、生成中の結果を共有せずに再生成するテスト"""
+
+        mock_get_read_only_container.return_value.read_item.return_value = Question(
+            subjects=["What is 2 + 2?"], choices=["3", "4"], answerNum=1
+        )
+        mock_get_cached_answer.return_value = None
+        mock_acquire_or_wait_for_lease.return_value = ("", None)
+
+        # 最初のリクエストの生成を、force=trueのリクエストの完了まで待たせる
+        generating = threading.Event()
+        forced = threading.Event()
+        upstream_calls = []
+
+        def generate(*_):
+            upstream_calls.append(1)
+            if len(upstream_calls) == 1:
+                generating.set()
+                forced.wait(timeout=5)
+            return {
+                "correct_indexes": [1],
+                "explanations": ["Option A is incorrect.", "Option B is correct."],
+            }
+
+        mock_generate_correct_answers.side_effect = generate
+
+        def request(params: dict) -> func.HttpResponse:
+            req: func.HttpRequest = MagicMock(spec=func.HttpRequest)
+            req.route_params = {"testId": "1", "questionNumber": "1"}
+            req.params = params
+            return post_answer(req)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(request, {})
+            generating.wait(timeout=5)
+            forced_response = request({"force": "true"})
+            forced.set()
+            response = future.result()
+
+        self.assertEqual(len(upstream_calls), 2)
+        self.assertEqual(
+            [args.args[2] for args in mock_acquire_or_wait_for_lease.call_args_list],
+            [False, True],
+        )
+        self.assertEqual(forced_response.status_code, 200)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_queue_message_answer.call_count, 2)
+
+
+class TestGetCachedAnswer(unittest.TestCase):
+    """get_cached_answer関数のテストケース"""
+
+    def setUp(self):
+        self.item = Question(
+            subjects=["What is 2 + 2?"], choices=["3", "4"], answerNum=1
+        )
+
+    @patch("src.post_answer.get_read_only_container")
+    def test_get_cached_answer_valid(self, mock_get_read_only_container):
+        """現在の問題から生成した項目が保存済の場合のテスト"""
+
+        answer_item = {
+            "id": "1_1",
+            "questionNumber": 1,
+            "correctIdxes": [1],
+            "explanations": ["Option A is incorrect.", "Option B is correct."],
+            "testId": "1",
+            "questionHash": compute_question_hash(self.item),
+        }
+        mock_container = mock_get_read_only_container.return_value
+        mock_container.read_item.return_value = answer_item
+
+        result = get_cached_answer("1", "1", self.item)
+
+        self.assertEqual(result, answer_item)
+        mock_get_read_only_container.assert_called_once_with(
+            database_name="Users",
+            container_name="Answer",
+        )
+        mock_container.read_item.assert_called_once_with(item="1_1", partition_key="1")
+
+    @patch("src.post_answer.get_read_only_container")
+    @patch("src.post_answer.logging")
+    def test_get_cached_answer_stale(self, mock_logging, mock_get_read_only_container):
+        """問題が更新された後に生成した項目、またはハッシュ値が未保存の項目の場合のテスト"""
+
+        mock_container = mock_get_read_only_container.return_value
+        for question_hash in ("stale-hash", None):
+            with self.subTest(question_hash=question_hash):
+                mock_container.read_item.return_value = {
+                    "id": "1_1",
+                    "questionNumber": 1,
+                    "correctIdxes": [1],
+                    "explanations": ["Option A is incorrect.", "Option B is correct."],
+                    "testId": "1",
+                    "questionHash": question_hash,
+                }
+
+                self.assertIsNone(get_cached_answer("1", "1", self.item))
+        self.assertEqual(mock_logging.info.call_count, 2)
+
+    @patch("src.post_answer.get_read_only_container")
+    def test_get_cached_answer_not_found(self, mock_get_read_only_container):
+        """Answerコンテナーに項目が存在しない場合のテスト"""
+
+        mock_get_read_only_container.return_value.read_item.side_effect = (
+            CosmosResourceNotFoundError
+        )
+
+        self.assertIsNone(get_cached_answer("1", "1", self.item))
@@ -1,3 +1,4 @@
+# pylint: disable=too-many-lines
 """[POST] /tests/{testId}/communities/{questionNumber} のテスト"""
 
 import json
@@ -12,12 +13,16 @@ from src.post_community import (
     SYSTEM_PROMPT,
     calculate_community_votes,
     create_discussion_summary_prompt,
+    generate_community,
     generate_discussion_summary,
+    get_community_item,
+    get_discussions,
     post_community,
     queue_message_community,
     validate_request,
 )
 from type.cosmos import Question, QuestionDiscussion
+from util.question_cache import put_cached_question, reset_question_cache
 
 
 class TestCalculateCommunityVotes(unittest.TestCase):
@@ -256,7 +261,7 @@ Summary (approximately 300 characters):"""
 class TestGenerateDiscussionSummary(unittest.TestCase):
     """generate_discussion_summary関数のテストケース"""
 
-    @patch("src.post_community.AzureOpenAI")
+    @patch("src.post_community.get_openai_client")
     @patch("src.post_community.create_discussion_summary_prompt")
     @patch("src.post_community.logging")
     @patch.dict(
@@ -273,7 +278,7 @@ class TestGenerateDiscussionSummary(unittest.TestCase):
         self,
         mock_logging,
         mock_create_discussion_summary_prompt,
-        mock_azure_openai,
+        mock_get_openai_client,
     ):
         """リトライせずに、ディスカッション要約を生成するテスト"""
 
@@ -284,7 +289,7 @@ class TestGenerateDiscussionSummary(unittest.TestCase):
             "Community discussion focuses on answers A and B "
             "with A being more popular."
         )
-        mock_azure_openai.return_value.chat.completions.create.return_value = (
+        mock_get_openai_client.return_value.chat.completions.create.return_value = (
             mock_response
         )
 
@@ -304,13 +309,8 @@ class TestGenerateDiscussionSummary(unittest.TestCase):
             "with A being more popular.",
         )
         mock_create_discussion_summary_prompt.assert_called_once_with(discussions)
-        mock_azure_openai.assert_called_once_with(
-            api_key="test_api_key",
-            api_version="test_api_version",
-            azure_deployment="test_deployment_name",
-            azure_endpoint="test_endpoint",
-        )
-        mock_azure_openai.return_value.chat.completions.create.assert_called_once_with(
+        mock_get_openai_client.assert_called_once_with()
+        mock_get_openai_client.return_value.chat.completions.create.assert_called_once_with(
             model="test_model_name",
             messages=[
                 {
@@ -336,7 +336,7 @@ class TestGenerateDiscussionSummary(unittest.TestCase):
         )
         mock_logging.warning.assert_not_called()
 
-    @patch("src.post_community.AzureOpenAI")
+    @patch("src.post_community.get_openai_client")
     @patch("src.post_community.create_discussion_summary_prompt")
     @patch("src.post_community.logging")
     @patch.dict(
@@ -353,7 +353,7 @@ class TestGenerateDiscussionSummary(unittest.TestCase):
         self,
         mock_logging,
         mock_create_discussion_summary_prompt,
-        mock_azure_openai,
+        mock_get_openai_client,
     ):
         """MAX_RETRY_NUMBER回リトライしても、ディスカッション要約が生成できない場合のテスト"""
 
@@ -362,7 +362,7 @@ class TestGenerateDiscussionSummary(unittest.TestCase):
         mock_response = MagicMock()
         mock_response.choices = [MagicMock()]
         mock_response.choices[0].message.content = None
-        mock_azure_openai.return_value.chat.completions.create.return_value = (
+        mock_get_openai_client.return_value.chat.completions.create.return_value = (
             mock_response
         )
 
@@ -379,7 +379,7 @@ class TestGenerateDiscussionSummary(unittest.TestCase):
         self.assertIsNone(summary)
         mock_create_discussion_summary_prompt.assert_called_once_with(discussions)
         self.assertEqual(
-            mock_azure_openai.return_value.chat.completions.create.call_count,
+            mock_get_openai_client.return_value.chat.completions.create.call_count,
             MAX_RETRY_NUMBER,
         )
         expected_calls = []
@@ -388,7 +388,7 @@ class TestGenerateDiscussionSummary(unittest.TestCase):
         mock_logging.info.assert_has_calls(expected_calls)
         mock_logging.warning.assert_not_called()
 
-    @patch("src.post_community.AzureOpenAI")
+    @patch("src.post_community.get_openai_client")
     @patch("src.post_community.create_discussion_summary_prompt")
     @patch("src.post_community.logging")
     @patch.dict(
@@ -405,14 +405,14 @@ class TestGenerateDiscussionSummary(unittest.TestCase):
         self,
         mock_logging,
         mock_create_discussion_summary_prompt,
-        mock_azure_openai,
+        mock_get_openai_client,
     ):
         """Azure OpenAI APIで例外が発生した場合のテスト"""
 
         mock_prompt = "Test prompt for discussion summary"
         mock_create_discussion_summary_prompt.return_value = mock_prompt
-        mock_azure_openai.return_value.chat.completions.create.side_effect = Exception(
-            "API Error"
+        mock_get_openai_client.return_value.chat.completions.create.side_effect = (
+            Exception("API Error")
         )
 
         discussions = [
@@ -433,14 +433,13 @@ class TestGenerateDiscussionSummary(unittest.TestCase):
 class TestQueueMessageCommunity(unittest.TestCase):
     """queue_message_community関数のテストケース"""
 
-    @patch("src.post_community.get_queue_client")
+    @patch("src.post_community.send_queue_message")
     @patch("src.post_community.logging")
-    def test_queue_message_community_normal(self, mock_logging, mock_get_queue_client):
+    def test_queue_message_community_normal(
+        self, mock_logging, mock_send_queue_message
+    ):
         """正常にキューメッセージを格納する場合のテスト"""
 
-        mock_queue_client = MagicMock()
-        mock_get_queue_client.return_value = mock_queue_client
-
         message_community = {
             "testId": "test123",
             "questionNumber": 1,
@@ -450,22 +449,20 @@ class TestQueueMessageCommunity(unittest.TestCase):
 
         queue_message_community(message_community)
 
-        mock_get_queue_client.assert_called_once_with("communities")
-        mock_queue_client.send_message.assert_called_once()
+        mock_send_queue_message.assert_called_once_with(
+            "communities", json.dumps(message_community).encode("utf-8")
+        )
         mock_logging.info.assert_called_once_with(
             {"message_community": message_community}
         )
 
-    @patch("src.post_community.get_queue_client")
+    @patch("src.post_community.send_queue_message")
     @patch("src.post_community.logging")
     def test_queue_message_community_development_storage(
-        self, mock_logging, mock_get_queue_client
+        self, mock_logging, mock_send_queue_message
     ):
         """ローカル開発環境（Azurite）でキューメッセージを格納する場合のテスト"""
 
-        mock_queue_client = MagicMock()
-        mock_get_queue_client.return_value = mock_queue_client
-
         message_community = {
             "testId": "test123",
             "questionNumber": 1,
@@ -475,8 +472,9 @@ class TestQueueMessageCommunity(unittest.TestCase):
 
         queue_message_community(message_community)
 
-        mock_get_queue_client.assert_called_once_with("communities")
-        mock_queue_client.send_message.assert_called_once()
+        mock_send_queue_message.assert_called_once_with(
+            "communities", json.dumps(message_community).encode("utf-8")
+        )
         mock_logging.info.assert_called_once_with(
             {"message_community": message_community}
         )
@@ -485,6 +483,17 @@ class TestQueueMessageCommunity(unittest.TestCase):
 class TestPostDiscussion(unittest.TestCase):
     """post_community関数のテストケース"""
 
+    def setUp(self):
+        reset_question_cache()
+        for target, return_value in (
+            ("src.post_community.acquire_or_wait_for_lease", ("etag", None)),
+            ("src.post_community.complete_lease", None),
+            ("src.post_community.release_lease", None),
+        ):
+            patcher = patch(target, return_value=return_value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
     @patch("src.post_community.validate_request")
     @patch("src.post_community.get_read_only_container")
     @patch("src.post_community.generate_discussion_summary")
@@ -691,6 +700,37 @@ class TestPostDiscussion(unittest.TestCase):
         )
         mock_logging.error.assert_not_called()
 
+    @patch("src.post_community.validate_request")
+    @patch("src.post_community.get_read_only_container")
+    def test_post_community_cached_question(
+        self, mock_get_read_only_container, mock_validate_request
+    ):
+        """get_question関数などが取得したQuestionコンテナーの項目をキャッシュから取得するテスト"""
+
+        mock_validate_request.return_value = None
+        put_cached_question(
+            "1",
+            "1",
+            {
+                "id": "1_1",
+                "number": 1,
+                "subjects": ["What is 2 + 2?"],
+                "choices": ["3", "4", "5"],
+                "answerNum": 1,
+                "testId": "1",
+                "discussions": None,
+            },
+        )
+
+        req: func.HttpRequest = MagicMock(spec=func.HttpRequest)
+        req.route_params = {"testId": "1", "questionNumber": "1"}
+
+        response = post_community(req)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.get_body().decode()), {"isExisted": False})
+        mock_get_read_only_container.assert_not_called()
+
     @patch("src.post_community.validate_request")
     @patch("src.post_community.get_read_only_container")
     @patch("src.post_community.generate_discussion_summary")
@@ -787,3 +827,199 @@ class TestPostDiscussion(unittest.TestCase):
             {"question_number": "1", "test_id": "1"}
         )
         mock_logging.error.assert_called_once()
+
+
+class TestGenerateCommunity(unittest.TestCase):
+    """generate_community関数のテストケース"""
+
+    def setUp(self):
+        self.discussions = [
+            QuestionDiscussion(
+                comment="B is correct.", upvotedNum=1, selectedAnswer="B"
+            )
+        ]
+
+    @patch("src.post_community.acquire_or_wait_for_lease")
+    @patch("src.post_community.complete_lease")
+    @patch("src.post_community.release_lease")
+    @patch("src.post_community.generate_discussion_summary")
+    @patch("src.post_community.queue_message_community")
+    def test_generate_community_lease_acquired(  # pylint: disable=R0913,R0917
+        self,
+        mock_queue_message_community,
+        mock_generate_discussion_summary,
+        mock_release_lease,
+        mock_complete_lease,
+        mock_acquire_or_wait_for_lease,
+    ):
+        """リースを取得して生成し、リースを解放せずに完了済にするテスト"""
+
+        mock_acquire_or_wait_for_lease.return_value = ("etag", None)
+        mock_generate_discussion_summary.return_value = "Summary"
+
+        result = generate_community("1", "1", self.discussions)
+
+        self.assertEqual(
+            result,
+            {"discussionsSummary": "Summary", "votes": ["B (100%)"], "isExisted": True},
+        )
+        self.assertEqual(
+            mock_acquire_or_wait_for_lease.call_args.args[0], "communities_1_1"
+        )
+        mock_queue_message_community.assert_called_once_with(
+            {
+                "testId": "1",
+                "questionNumber": 1,
+                "discussionsSummary": "Summary",
+                "votes": ["B (100%)"],
+            }
+        )
+        mock_complete_lease.assert_called_once_with("communities_1_1", "etag")
+        mock_release_lease.assert_not_called()
+
+    @patch("src.post_community.acquire_or_wait_for_lease")
+    @patch("src.post_community.complete_lease")
+    @patch("src.post_community.release_lease")
+    @patch("src.post_community.generate_discussion_summary")
+    def test_generate_community_error_release_lease(
+        self,
+        mock_generate_discussion_summary,
+        mock_release_lease,
+        mock_complete_lease,
+        mock_acquire_or_wait_for_lease,
+    ):
+        """生成に失敗した場合に、取得したリースを解放するテスト"""
+
+        mock_acquire_or_wait_for_lease.return_value = ("etag", None)
+        mock_generate_discussion_summary.return_value = None
+
+        with self.assertRaises(ValueError):
+            generate_community("1", "1", self.discussions)
+
+        mock_release_lease.assert_called_once_with("communities_1_1", "etag")
+        mock_complete_lease.assert_not_called()
+
+    @patch("src.post_community.acquire_or_wait_for_lease")
+    @patch("src.post_community.get_community_item")
+    @patch("src.post_community.generate_discussion_summary")
+    def test_generate_community_wait_for_other_instance(
+        self,
+        mock_generate_discussion_summary,
+        mock_get_community_item,
+        mock_acquire_or_wait_for_lease,
+    ):
+        """他のインスタンスがリースを保持している場合に、その生成結果を待って返すテスト"""
+
+        mock_get_community_item.return_value = {
+            "id": "1_1",
+            "questionNumber": 1,
+            "testId": "1",
+            "discussionsSummary": "Summary",
+            "votes": ["B (100%)"],
+        }
+        mock_acquire_or_wait_for_lease.side_effect = lambda key, fetch: (
+            None,
+            fetch(100),
+        )
+
+        result = generate_community("1", "1", self.discussions)
+
+        self.assertEqual(
+            result,
+            {"discussionsSummary": "Summary", "votes": ["B (100%)"], "isExisted": True},
+        )
+        mock_get_community_item.assert_called_once_with("1", "1", 100)
+        mock_generate_discussion_summary.assert_not_called()
+
+
+class TestGetCommunityItem(unittest.TestCase):
+    """get_community_item関数のテストケース"""
+
+    @patch("src.post_community.get_read_only_container")
+    def test_get_community_item(self, mock_get_read_only_container):
+        """指定した時刻以降に保存した項目のみを返すテスト"""
+
+        community_item = {
+            "id": "1_1",
+            "questionNumber": 1,
+            "testId": "1",
+            "discussionsSummary": "Summary",
+            "votes": ["B (100%)"],
+            "_ts": 100,
+        }
+        mock_container = mock_get_read_only_container.return_value
+        mock_container.read_item.return_value = community_item
+
+        self.assertEqual(get_community_item("1", "1", 100), community_item)
+        self.assertIsNone(get_community_item("1", "1", 101))
+        mock_get_read_only_container.assert_called_with(
+            database_name="Users",
+            container_name="Community",
+        )
+        mock_container.read_item.assert_called_with(item="1_1", partition_key="1")
+
+    @patch("src.post_community.get_read_only_container")
+    def test_get_community_item_not_found(self, mock_get_read_only_container):
+        """Communityコンテナーに項目が存在しない場合のテスト"""
+
+        mock_get_read_only_container.return_value.read_item.side_effect = (
+            CosmosResourceNotFoundError
+        )
+
+        self.assertIsNone(get_community_item("1", "1", 0))
+
+
+class TestGetDiscussions(unittest.TestCase):
+    """get_discussions関数のテストケース"""
+
+    @patch("src.post_community.get_read_only_container")
+    def test_get_discussions(self, mock_get_read_only_container):
+        """Discussionコンテナーからディスカッションを取得するテスト"""
+
+        discussions = [{"comment": "A", "upvotedNum": 1, "selectedAnswer": "A"}]
+        mock_container = mock_get_read_only_container.return_value
+        mock_container.read_item.return_value = {
+            "id": "1_1",
+            "number": 1,
+            "testId": "1",
+            "discussions": discussions,
+        }
+
+        self.assertEqual(
+            get_discussions("1", "1", {"id": "1_1", "discussionNum": 1}), discussions
+        )
+        mock_get_read_only_container.assert_called_once_with(
+            database_name="Users",
+            container_name="Discussion",
+        )
+        mock_container.read_item.assert_called_once_with(item="1_1", partition_key="1")
+
+    @patch("src.post_community.get_read_only_container")
+    def test_get_discussions_not_migrated(self, mock_get_read_only_container):
+        """Discussionコンテナーへの移行前の項目の場合に、discussionsフィールドを返すテスト"""
+
+        discussions = [{"comment": "A", "upvotedNum": 1, "selectedAnswer": "A"}]
+
+        self.assertEqual(
+            get_discussions("1", "1", {"id": "1_1", "discussions": discussions}),
+            discussions,
+        )
+        self.assertEqual(get_discussions("1", "1", {"discussions": None}), [])
+        mock_get_read_only_container.assert_not_called()
+
+    @patch("src.post_community.get_read_only_container")
+    def test_get_discussions_empty(self, mock_get_read_only_container):
+        """ディスカッションの件数が0の場合に、Discussionコンテナーから取得しないテスト"""
+
+        self.assertEqual(get_discussions("1", "1", {"discussionNum": 0}), [])
+        mock_get_read_only_container.assert_not_called()
+
+    @patch("src.post_community.get_read_only_container")
+    def test_get_discussions_not_found(self, mock_get_read_only_container):
+        """Discussionコンテナーに項目が存在しない場合のテスト"""
+
+        mock_get_read_only_container.return_value.read_item.side_effect = (
+            CosmosResourceNotFoundError
+        )
+
+        self.assertEqual(get_discussions("1", "1", {"discussionNum": 1}), [])
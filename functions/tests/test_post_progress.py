@@ -5,8 +5,13 @@ import unittest
 from unittest.mock import MagicMock, call, patch
 
 import azure.functions as func
-from azure.cosmos.exceptions import CosmosResourceNotFoundError
+from azure.core import MatchConditions
+from azure.cosmos.exceptions import (
+    CosmosAccessConditionFailedError,
+    CosmosResourceNotFoundError,
+)
 from src.post_progress import (
+    MAX_CONFLICT_RETRY_NUMBER,
     post_progress,
     validate_body,
     validate_headers,
@@ -215,6 +220,7 @@ class TestPostProgress(unittest.TestCase):
                     "correctIdxes": [0],
                 }
             ],
+            "_etag": "etag",
         }
 
         request_body = {
@@ -231,6 +237,14 @@ class TestPostProgress(unittest.TestCase):
             headers={"X-User-Id": "user-id"},
         )
 
+        mock_container.patch_item.return_value = {
+            **mock_container.read_item.return_value,
+            "progresses": [
+                {"isCorrect": True, "selectedIdxes": [0], "correctIdxes": [0]},
+                request_body,
+            ],
+        }
+
         res = post_progress(req)
 
         self.assertEqual(res.status_code, 200)
@@ -259,25 +273,22 @@ class TestPostProgress(unittest.TestCase):
         mock_container.read_item.assert_called_once_with(
             item="user-id_test-id", partition_key="test-id"
         )
-        mock_container.upsert_item.assert_called_once_with(
-            {
-                "id": "user-id_test-id",
-                "userId": "user-id",
-                "testId": "test-id",
-                "order": [3, 5, 1, 2, 4],
-                "progresses": [
-                    {
-                        "isCorrect": True,
-                        "selectedIdxes": [0],
-                        "correctIdxes": [0],
-                    },
-                    {
+        mock_container.patch_item.assert_called_once_with(
+            item="user-id_test-id",
+            partition_key="test-id",
+            patch_operations=[
+                {
+                    "op": "add",
+                    "path": "/progresses/-",
+                    "value": {
                         "isCorrect": False,
                         "selectedIdxes": [1],
                         "correctIdxes": [0],
                     },
-                ],
-            }
+                }
+            ],
+            etag="etag",
+            match_condition=MatchConditions.IfNotModified,
         )
         mock_logging.info.assert_has_calls(
             [
@@ -325,6 +336,7 @@ class TestPostProgress(unittest.TestCase):
                     "correctIdxes": [0],
                 }
             ],
+            "_etag": "etag",
         }
 
         request_body = {
@@ -341,6 +353,11 @@ class TestPostProgress(unittest.TestCase):
             headers={"X-User-Id": "user-id"},
         )
 
+        mock_container.patch_item.return_value = {
+            **mock_container.read_item.return_value,
+            "progresses": [request_body],
+        }
+
         res = post_progress(req)
 
         self.assertEqual(res.status_code, 200)
@@ -354,20 +371,22 @@ class TestPostProgress(unittest.TestCase):
                 }
             ],
         )
-        mock_container.upsert_item.assert_called_once_with(
-            {
-                "id": "user-id_test-id",
-                "userId": "user-id",
-                "testId": "test-id",
-                "order": [3, 5, 1, 2, 4],
-                "progresses": [
-                    {
+        mock_container.patch_item.assert_called_once_with(
+            item="user-id_test-id",
+            partition_key="test-id",
+            patch_operations=[
+                {
+                    "op": "set",
+                    "path": "/progresses/0",
+                    "value": {
                         "isCorrect": False,
                         "selectedIdxes": [1],
                         "correctIdxes": [0],
-                    }
-                ],
-            }
+                    },
+                }
+            ],
+            etag="etag",
+            match_condition=MatchConditions.IfNotModified,
         )
         mock_logging.info.assert_has_calls(
             [
@@ -771,3 +790,91 @@ class TestPostProgress(unittest.TestCase):
             {"question_number": 3, "test_id": "test-id", "user_id": "user-id"}
         )
         mock_logging.error.assert_called_once()
+
+
+class TestPostProgressConflict(unittest.TestCase):
+    """他のリクエストと同時にProgressコンテナーの項目を更新した場合のpost_progress関数のテストケース"""
+
+    def create_request(self) -> func.HttpRequest:
+        """問題番号5の回答履歴を保存するリクエストを生成する"""
+
+        return func.HttpRequest(
+            method="POST",
+            body=json.dumps(
+                {"isCorrect": False, "selectedIdxes": [1], "correctIdxes": [0]}
+            ).encode("utf-8"),
+            url="/api/tests/test-id/progresses/5",
+            route_params={"testId": "test-id", "questionNumber": "5"},
+            headers={"X-User-Id": "user-id"},
+        )
+
+    @patch("src.post_progress.get_read_write_container")
+    @patch("src.post_progress.logging")
+    def test_post_progress_retry_on_conflict(
+        self, mock_logging, mock_get_read_write_container
+    ):
+        """取得後に他のリクエストが回答履歴を追加した場合に、取得し直して最後の回答履歴を更新するテスト"""
+
+        progress = {"isCorrect": True, "selectedIdxes": [0], "correctIdxes": [0]}
+        new_progress = {"isCorrect": False, "selectedIdxes": [1], "correctIdxes": [0]}
+        mock_container = mock_get_read_write_container.return_value
+        mock_container.read_item.side_effect = [
+            {"order": [3, 5, 1], "progresses": [progress], "_etag": "etag1"},
+            {"order": [3, 5, 1], "progresses": [progress, progress], "_etag": "etag2"},
+        ]
+        mock_container.patch_item.side_effect = [
+            CosmosAccessConditionFailedError,
+            {"order": [3, 5, 1], "progresses": [progress, new_progress]},
+        ]
+
+        res = post_progress(self.create_request())
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(
+            json.loads(res.get_body().decode("utf-8")), [progress, new_progress]
+        )
+        self.assertEqual(
+            [
+                (args.kwargs["patch_operations"], args.kwargs["etag"])
+                for args in mock_container.patch_item.call_args_list
+            ],
+            [
+                (
+                    [{"op": "add", "path": "/progresses/-", "value": new_progress}],
+                    "etag1",
+                ),
+                (
+                    [{"op": "set", "path": "/progresses/1", "value": new_progress}],
+                    "etag2",
+                ),
+            ],
+        )
+        mock_logging.warning.assert_called_once_with(
+            {"conflicted_progress_id": "user-id_test-id"}
+        )
+
+    @patch("src.post_progress.get_read_write_container")
+    @patch("src.post_progress.logging")
+    def test_post_progress_conflict_exhausted(
+        self, mock_logging, mock_get_read_write_container
+    ):
+        """更新し直す回数の上限まで他のリクエストと競合した場合のテスト"""
+
+        mock_container = mock_get_read_write_container.return_value
+        mock_container.read_item.return_value = {
+            "order": [3, 5, 1],
+            "progresses": [
+                {"isCorrect": True, "selectedIdxes": [0], "correctIdxes": [0]}
+            ],
+            "_etag": "etag",
+        }
+        mock_container.patch_item.side_effect = CosmosAccessConditionFailedError
+
+        res = post_progress(self.create_request())
+
+        self.assertEqual(res.status_code, 409)
+        self.assertEqual(res.get_body().decode("utf-8"), "Progress Update Conflicted")
+        self.assertEqual(
+            mock_container.patch_item.call_count, MAX_CONFLICT_RETRY_NUMBER
+        )
+        mock_logging.error.assert_not_called()
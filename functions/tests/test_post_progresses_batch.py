@@ -0,0 +1,355 @@
+"""[POST] /tests/{testId}/progresses/batch のテスト"""
+
+import json
+import unittest
+from unittest.mock import patch
+
+import azure.functions as func
+from azure.core import MatchConditions
+from azure.cosmos.exceptions import (
+    CosmosAccessConditionFailedError,
+    CosmosResourceNotFoundError,
+)
+from src.post_progresses_batch import (
+    post_progresses_batch,
+    validate_body,
+    validate_headers,
+    validate_route_params,
+)
+from util.progress import MAX_CONFLICT_RETRY_NUMBER
+
+CORRECT = {"isCorrect": True, "selectedIdxes": [0], "correctIdxes": [0]}
+INCORRECT = {"isCorrect": False, "selectedIdxes": [1], "correctIdxes": [0]}
+
+
+def create_request(req_body) -> func.HttpRequest:
+    """回答履歴をまとめて保存するリクエストを生成する"""
+
+    return func.HttpRequest(
+        method="POST",
+        body=json.dumps(req_body).encode("utf-8"),
+        url="/api/tests/test-id/progresses/batch",
+        route_params={"testId": "test-id"},
+        headers={"X-User-Id": "user-id"},
+    )
+
+
+class TestValidateBody(unittest.TestCase):
+    """validate_body関数のテストケース"""
+
+    def test_validate_body_success(self):
+        """バリデーションチェックに成功した場合のテスト"""
+
+        req_body = [
+            {"questionNumber": 3, **CORRECT},
+            {"questionNumber": 5, **INCORRECT},
+        ]
+        errors = validate_body(json.dumps(req_body).encode("utf-8"))
+        self.assertEqual(errors, [])
+
+    def test_validate_body_empty(self):
+        """リクエストボディが空の場合のテスト"""
+
+        self.assertEqual(validate_body(None), ["Request Body is Empty"])
+        self.assertEqual(validate_body(b"[]"), ["Request Body is Empty"])
+
+    def test_validate_body_not_list(self):
+        """リクエストボディがlistでない場合のテスト"""
+
+        req_body = {"questionNumber": 3, **CORRECT}
+        errors = validate_body(json.dumps(req_body).encode("utf-8"))
+        self.assertEqual(len(errors), 1)
+        self.assertTrue(errors[0].startswith("Invalid Request Body: "))
+
+    def test_validate_body_invalid_entry(self):
+        """回答履歴がdictでない場合のテスト"""
+
+        errors = validate_body(b"[1]")
+        self.assertEqual(errors, ["Invalid progresses[0]: 1"])
+
+    def test_validate_body_missing_fields(self):
+        """回答履歴に必須のフィールドが存在しない場合のテスト"""
+
+        errors = validate_body(b"[{}]")
+        self.assertEqual(
+            errors,
+            [
+                "progresses[0].questionNumber is required",
+                "progresses[0].isCorrect is required",
+                "progresses[0].selectedIdxes is required",
+                "progresses[0].correctIdxes is required",
+            ],
+        )
+
+    def test_validate_body_invalid_fields(self):
+        """回答履歴のフィールドの型が不正な場合のテスト"""
+
+        req_body = [
+            {"questionNumber": 3, **CORRECT},
+            {
+                "questionNumber": True,
+                "isCorrect": "true",
+                "selectedIdxes": 1,
+                "correctIdxes": ["0"],
+            },
+        ]
+        errors = validate_body(json.dumps(req_body).encode("utf-8"))
+        self.assertEqual(
+            errors,
+            [
+                "Invalid progresses[1].questionNumber: True",
+                "Invalid progresses[1].isCorrect: true",
+                "Invalid progresses[1].selectedIdxes: 1",
+                "Invalid progresses[1].correctIdxes[0]: 0",
+            ],
+        )
+
+
+class TestValidateRouteParams(unittest.TestCase):
+    """validate_route_params関数のテストケース"""
+
+    def test_validate_route_params_success(self):
+        """バリデーションチェックに成功した場合のテスト"""
+
+        self.assertEqual(validate_route_params({"testId": "test-id"}), [])
+
+    def test_validate_route_params_empty(self):
+        """testIdが空の場合のテスト"""
+
+        self.assertEqual(validate_route_params({}), ["testId is Empty"])
+
+
+class TestValidateHeaders(unittest.TestCase):
+    """validate_headers関数のテストケース"""
+
+    def test_validate_headers_success(self):
+        """バリデーションチェックに成功した場合のテスト"""
+
+        self.assertEqual(validate_headers({"X-User-Id": "user-id"}), [])
+
+    def test_validate_headers_empty(self):
+        """X-User-Idヘッダーが空の場合のテスト"""
+
+        self.assertEqual(validate_headers({}), ["X-User-Id header is Empty"])
+
+
+class TestPostProgressesBatch(unittest.TestCase):
+    """post_progresses_batch関数のテストケース"""
+
+    @patch("src.post_progresses_batch.get_read_write_container")
+    def test_post_progresses_batch(self, mock_get_read_write_container):
+        """最後の回答履歴を更新し、次の問題番号の回答履歴を1回の部分的な更新で追加するテスト"""
+
+        mock_container = mock_get_read_write_container.return_value
+        mock_container.read_item.return_value = {
+            "order": [3, 5, 1, 2],
+            "progresses": [CORRECT, CORRECT],
+            "_etag": "etag",
+        }
+        mock_container.patch_item.return_value = {
+            "order": [3, 5, 1, 2],
+            "progresses": [CORRECT, INCORRECT, CORRECT],
+        }
+
+        res = post_progresses_batch(
+            create_request(
+                [
+                    {"questionNumber": 5, **INCORRECT},
+                    {"questionNumber": 1, **CORRECT},
+                ]
+            )
+        )
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.mimetype, "application/json")
+        self.assertEqual(
+            json.loads(res.get_body().decode("utf-8")),
+            {
+                "savedNum": 2,
+                "progressNum": 3,
+                "correctNum": 2,
+                "nextQuestionNumber": 2,
+            },
+        )
+        mock_container.read_item.assert_called_once_with(
+            item="user-id_test-id", partition_key="test-id"
+        )
+        mock_container.patch_item.assert_called_once_with(
+            item="user-id_test-id",
+            partition_key="test-id",
+            patch_operations=[
+                {"op": "set", "path": "/progresses/1", "value": INCORRECT},
+                {"op": "add", "path": "/progresses/-", "value": CORRECT},
+            ],
+            etag="etag",
+            match_condition=MatchConditions.IfNotModified,
+        )
+
+    @patch("src.post_progresses_batch.get_read_write_container")
+    def test_post_progresses_batch_all_answered(self, mock_get_read_write_container):
+        """すべての問題を回答済になった場合に、次に解く問題番号をnullで返すテスト"""
+
+        mock_container = mock_get_read_write_container.return_value
+        mock_container.read_item.return_value = {
+            "order": [3, 5],
+            "progresses": [],
+            "_etag": "etag",
+        }
+        mock_container.patch_item.return_value = {
+            "order": [3, 5],
+            "progresses": [INCORRECT, CORRECT],
+        }
+
+        res = post_progresses_batch(
+            create_request(
+                [
+                    {"questionNumber": 3, **INCORRECT},
+                    {"questionNumber": 5, **CORRECT},
+                ]
+            )
+        )
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(
+            json.loads(res.get_body().decode("utf-8")),
+            {
+                "savedNum": 2,
+                "progressNum": 2,
+                "correctNum": 1,
+                "nextQuestionNumber": None,
+            },
+        )
+
+    @patch("src.post_progresses_batch.get_read_write_container")
+    def test_post_progresses_batch_invalid_question_number(
+        self, mock_get_read_write_container
+    ):
+        """途中の回答履歴の問題番号が順番に沿っていない場合に、いずれも保存しないテスト"""
+
+        mock_container = mock_get_read_write_container.return_value
+        mock_container.read_item.return_value = {
+            "order": [3, 5, 1],
+            "progresses": [],
+            "_etag": "etag",
+        }
+
+        res = post_progresses_batch(
+            create_request(
+                [
+                    {"questionNumber": 3, **CORRECT},
+                    {"questionNumber": 1, **CORRECT},
+                ]
+            )
+        )
+
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(
+            res.get_body().decode("utf-8"),
+            "progresses[1].questionNumber must be 3 or 5",
+        )
+        mock_container.patch_item.assert_not_called()
+
+    @patch("src.post_progresses_batch.get_read_write_container")
+    def test_post_progresses_batch_not_exists(self, mock_get_read_write_container):
+        """テストを解く問題番号の順番を保存していない場合のテスト"""
+
+        mock_container = mock_get_read_write_container.return_value
+        mock_container.read_item.side_effect = CosmosResourceNotFoundError
+
+        res = post_progresses_batch(create_request([{"questionNumber": 3, **CORRECT}]))
+
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.get_body().decode("utf-8"), "Progress Not exists")
+        mock_container.patch_item.assert_not_called()
+
+    @patch("src.post_progresses_batch.get_read_write_container")
+    @patch("src.post_progresses_batch.logging")
+    def test_post_progresses_batch_retry_on_conflict(
+        self, mock_logging, mock_get_read_write_container
+    ):
+        """取得後に他のリクエストが回答履歴を追加した場合に、取得し直して保存するテスト"""
+
+        mock_container = mock_get_read_write_container.return_value
+        mock_container.read_item.side_effect = [
+            {"order": [3, 5, 1], "progresses": [], "_etag": "etag1"},
+            {"order": [3, 5, 1], "progresses": [CORRECT], "_etag": "etag2"},
+        ]
+        mock_container.patch_item.side_effect = [
+            CosmosAccessConditionFailedError,
+            {"order": [3, 5, 1], "progresses": [INCORRECT, CORRECT]},
+        ]
+
+        res = post_progresses_batch(
+            create_request(
+                [
+                    {"questionNumber": 3, **INCORRECT},
+                    {"questionNumber": 5, **CORRECT},
+                ]
+            )
+        )
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(
+            [
+                (args.kwargs["patch_operations"], args.kwargs["etag"])
+                for args in mock_container.patch_item.call_args_list
+            ],
+            [
+                (
+                    [
+                        {"op": "add", "path": "/progresses/-", "value": INCORRECT},
+                        {"op": "add", "path": "/progresses/-", "value": CORRECT},
+                    ],
+                    "etag1",
+                ),
+                (
+                    [
+                        {"op": "set", "path": "/progresses/0", "value": INCORRECT},
+                        {"op": "add", "path": "/progresses/-", "value": CORRECT},
+                    ],
+                    "etag2",
+                ),
+            ],
+        )
+        mock_logging.warning.assert_called_once_with(
+            {"conflicted_progress_id": "user-id_test-id"}
+        )
+
+    @patch("src.post_progresses_batch.get_read_write_container")
+    @patch("src.post_progresses_batch.logging")
+    def test_post_progresses_batch_conflict_exhausted(
+        self, mock_logging, mock_get_read_write_container
+    ):
+        """更新し直す回数の上限まで他のリクエストと競合した場合のテスト"""
+
+        mock_container = mock_get_read_write_container.return_value
+        mock_container.read_item.return_value = {
+            "order": [3, 5, 1],
+            "progresses": [],
+            "_etag": "etag",
+        }
+        mock_container.patch_item.side_effect = CosmosAccessConditionFailedError
+
+        res = post_progresses_batch(create_request([{"questionNumber": 3, **CORRECT}]))
+
+        self.assertEqual(res.status_code, 409)
+        self.assertEqual(res.get_body().decode("utf-8"), "Progress Update Conflicted")
+        self.assertEqual(
+            mock_container.patch_item.call_count, MAX_CONFLICT_RETRY_NUMBER
+        )
+        mock_logging.error.assert_not_called()
+
+    @patch("src.post_progresses_batch.get_read_write_container")
+    @patch("src.post_progresses_batch.logging")
+    def test_post_progresses_batch_exception(
+        self, mock_logging, mock_get_read_write_container
+    ):
+        """予期しない例外が発生した場合のテスト"""
+
+        mock_get_read_write_container.side_effect = Exception("Test Exception")
+
+        res = post_progresses_batch(create_request([{"questionNumber": 3, **CORRECT}]))
+
+        self.assertEqual(res.status_code, 500)
+        self.assertEqual(res.get_body().decode("utf-8"), "Internal Server Error")
+        mock_logging.error.assert_called_once()
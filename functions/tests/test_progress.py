@@ -0,0 +1,99 @@
+"""Progressコンテナーの項目の回答履歴のユーティリティ関数のテスト"""
+
+import unittest
+
+from util.progress import (
+    MAX_PATCH_OPERATIONS,
+    create_progress_patch_operations,
+    merge_progress_entries,
+)
+
+CORRECT = {"isCorrect": True, "selectedIdxes": [0], "correctIdxes": [0]}
+INCORRECT = {"isCorrect": False, "selectedIdxes": [1], "correctIdxes": [0]}
+
+
+def create_entry(question_number: int, progress: dict) -> dict:
+    """問題番号を指定した回答履歴を生成する"""
+
+    return {"questionNumber": question_number, **progress}
+
+
+class TestMergeProgressEntries(unittest.TestCase):
+    """merge_progress_entries関数のテストケース"""
+
+    def test_merge_progress_entries_append(self):
+        """次の問題番号の回答履歴を順番に追加するテスト"""
+
+        item = {"order": [3, 5, 1], "progresses": []}
+
+        progresses, first_updated_idx = merge_progress_entries(
+            item, [create_entry(3, CORRECT), create_entry(5, INCORRECT)]
+        )
+
+        self.assertEqual(progresses, [CORRECT, INCORRECT])
+        self.assertEqual(first_updated_idx, 0)
+        self.assertEqual(item["progresses"], [])
+
+    def test_merge_progress_entries_update_and_append(self):
+        """最後に保存した回答履歴を更新してから、次の問題番号の回答履歴を追加するテスト"""
+
+        item = {"order": [3, 5, 1], "progresses": [CORRECT, CORRECT]}
+
+        progresses, first_updated_idx = merge_progress_entries(
+            item,
+            [
+                create_entry(5, INCORRECT),
+                create_entry(1, INCORRECT),
+                create_entry(1, CORRECT),
+            ],
+        )
+
+        self.assertEqual(progresses, [CORRECT, INCORRECT, CORRECT])
+        self.assertEqual(first_updated_idx, 1)
+
+    def test_merge_progress_entries_invalid_question_number(self):
+        """途中の回答履歴の問題番号が順番に沿っていない場合のテスト"""
+
+        item = {"order": [3, 5, 1], "progresses": [CORRECT]}
+
+        with self.assertRaises(ValueError) as cm:
+            merge_progress_entries(
+                item, [create_entry(5, CORRECT), create_entry(3, CORRECT)]
+            )
+        self.assertEqual(
+            str(cm.exception), "progresses[1].questionNumber must be 5 or 1"
+        )
+
+    def test_merge_progress_entries_invalid_question_number_all_answered(self):
+        """すべての問題を回答済で、最後の問題番号でない場合のテスト"""
+
+        item = {"order": [3, 5], "progresses": [CORRECT, CORRECT]}
+
+        with self.assertRaises(ValueError) as cm:
+            merge_progress_entries(item, [create_entry(3, CORRECT)])
+        self.assertEqual(str(cm.exception), "progresses[0].questionNumber must be 5")
+
+
+class TestCreateProgressPatchOperations(unittest.TestCase):
+    """create_progress_patch_operations関数のテストケース"""
+
+    def test_create_progress_patch_operations(self):
+        """保存済の回答履歴の更新と末尾への追加の操作を生成するテスト"""
+
+        self.assertEqual(
+            create_progress_patch_operations(2, [CORRECT, INCORRECT, CORRECT], 1),
+            [
+                {"op": "set", "path": "/progresses/1", "value": INCORRECT},
+                {"op": "add", "path": "/progresses/-", "value": CORRECT},
+            ],
+        )
+
+    def test_create_progress_patch_operations_exceeded(self):
+        """操作数が最大操作数を超える場合に、回答履歴全体を置き換える操作を生成するテスト"""
+
+        progresses = [CORRECT] * (MAX_PATCH_OPERATIONS + 1)
+
+        self.assertEqual(
+            create_progress_patch_operations(0, progresses, 0),
+            [{"op": "set", "path": "/progresses", "value": progresses}],
+        )
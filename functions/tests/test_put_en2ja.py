@@ -1,13 +1,11 @@
 """[PUT] /en2ja のテスト"""
 
 import json
-import os
 import unittest
 from unittest.mock import MagicMock, patch
 
 import azure.functions as func
-from requests.exceptions import HTTPError
-from src.put_en2ja import put_en2ja, translate_by_azure_translator, validate_request
+from src.put_en2ja import put_en2ja, validate_request
 
 
 class TestValidateRequest(unittest.TestCase):
@@ -66,74 +64,6 @@ class TestValidateRequest(unittest.TestCase):
         self.assertEqual(result, "Request Body is Empty")
 
 
-class TestTranslateByAzureTranslator(unittest.TestCase):
-    """translate_by_azure_translator関数のテストケース"""
-
-    @patch("src.put_en2ja.requests.post")
-    @patch("src.put_en2ja.logging")
-    @patch.dict(os.environ, {"TRANSLATOR_KEY": "fake-key"})
-    def test_translate_by_azure_translator_success(self, mock_logging, mock_post):
-        """Azure Translatorでの翻訳が成功する場合のテスト"""
-
-        mock_response = MagicMock()
-        mock_response.json.return_value = [
-            {"translations": [{"text": "こんにちは", "to": "ja"}]}
-        ]
-        mock_response.status_code = 200
-        mock_post.return_value = mock_response
-
-        result = translate_by_azure_translator(["Hello"])
-        mock_post.assert_called_once_with(
-            "https://api.cognitive.microsofttranslator.com/translate",
-            headers={
-                "Ocp-Apim-Subscription-Key": "fake-key",
-                "Ocp-Apim-Subscription-Region": "japaneast",
-                "Content-Type": "application/json",
-            },
-            params={
-                "api-version": "3.0",
-                "from": "en",
-                "to": "ja",
-            },
-            json=[{"Text": "Hello"}],
-            timeout=10,
-        )
-        self.assertEqual(result, ["こんにちは"])
-        mock_logging.error.assert_not_called()
-
-    @patch("src.put_en2ja.logging")
-    def test_translate_by_azure_translator_empty_texts(self, mock_logging):
-        """Azure Translatorでの翻訳で空の英語の文字列群を指定した場合のテスト"""
-
-        result = translate_by_azure_translator([])
-        self.assertEqual(result, [])
-        mock_logging.error.assert_not_called()
-
-    @patch("src.put_en2ja.logging")
-    def test_translate_by_azure_translator_unset_key(self, mock_logging):
-        """Azure Translatorでの翻訳で環境変数TRANSLATOR_KEYが未設定の場合のテスト"""
-
-        with self.assertRaises(ValueError) as context:
-            translate_by_azure_translator(["Hello"])
-        self.assertEqual(str(context.exception), "Unset TRANSLATOR_KEY")
-        mock_logging.error.assert_not_called()
-
-    @patch("src.put_en2ja.requests.post")
-    @patch.dict(os.environ, {"TRANSLATOR_KEY": "fake-key"})
-    def test_translate_by_azure_translator_exception(self, mock_post):
-        """Azure Translatorでの翻訳で例外が発生する場合のテスト"""
-
-        mock_response = MagicMock()
-        mock_http_error = HTTPError()
-        mock_http_error.response = MagicMock()
-        mock_http_error.response.status_code = 500
-        mock_response.raise_for_status.side_effect = mock_http_error
-        mock_post.return_value = mock_response
-
-        with self.assertRaises(HTTPError):
-            translate_by_azure_translator(["Hello"])
-
-
 class TestPutEn2Ja(unittest.TestCase):
     """put_en2ja関数のテストケース"""
 
@@ -0,0 +1,193 @@
+"""Questionコンテナーの項目のキャッシュのユーティリティ関数のテスト"""
+
+import json
+import os
+import unittest
+from unittest.mock import patch
+
+from type.cosmos import Question
+from util.question_cache import (
+    get_cached_question,
+    get_question_cache_stats,
+    invalidate_cached_questions,
+    put_cached_question,
+    reset_question_cache,
+)
+
+
+def create_question(test_id: str, number: int, subject: str = "Question") -> Question:
+    """
+    テスト用のQuestionコンテナーの項目を生成する
+
+    Args:
+        test_id (str): テストID
+        number (int): 問題番号
+        subject (str): 問題文
+
+    Returns:
+        Question: Questionコンテナーの項目
+    """
+
+    return {
+        "id": f"{test_id}_{number}",
+        "number": number,
+        "subjects": [subject],
+        "choices": ["A", "B"],
+        "answerNum": 1,
+        "testId": test_id,
+    }
+
+
+def get_size(item: Question) -> int:
+    """
+    キャッシュで計上するQuestionコンテナーの項目のバイト数を返す
+
+    Args:
+        item (Question): Questionコンテナーの項目
+
+    Returns:
+        int: バイト数
+    """
+
+    return len(json.dumps(item, ensure_ascii=False).encode("utf-8"))
+
+
+class TestQuestionCache(unittest.TestCase):
+    """get_cached_question・put_cached_question関数のテストケース"""
+
+    def setUp(self):
+        reset_question_cache()
+
+    def tearDown(self):
+        reset_question_cache()
+
+    def test_put_and_get_cached_question(self):
+        """格納した項目を取得し、ヒット数・ミス数を計上するテスト"""
+
+        item = create_question("test-id", 1)
+
+        self.assertIsNone(get_cached_question("test-id", "1"))
+        put_cached_question("test-id", "1", item)
+
+        self.assertEqual(get_cached_question("test-id", 1), item)
+        self.assertEqual(
+            get_question_cache_stats(),
+            {
+                "hits": 1,
+                "misses": 1,
+                "evictions": 0,
+                "bytes": get_size(item),
+                "entries": 1,
+            },
+        )
+
+    @patch("util.question_cache.time.monotonic")
+    @patch.dict(os.environ, {"QUESTION_CACHE_TTL_SECONDS": "60"})
+    def test_get_cached_question_expired(self, mock_monotonic):
+        """有効期間を過ぎた項目を破棄してミスとするテスト"""
+
+        mock_monotonic.return_value = 1000.0
+        put_cached_question("test-id", 1, create_question("test-id", 1))
+
+        mock_monotonic.return_value = 1059.0
+        self.assertIsNotNone(get_cached_question("test-id", 1))
+        mock_monotonic.return_value = 1060.0
+        self.assertIsNone(get_cached_question("test-id", 1))
+
+        stats = get_question_cache_stats()
+        self.assertEqual(stats["entries"], 0)
+        self.assertEqual(stats["bytes"], 0)
+        self.assertEqual(stats["misses"], 1)
+
+    def test_put_cached_question_evict_by_bytes(self):
+        """合計バイト数が上限を超えた場合に、最も長く参照されていない項目から破棄するテスト"""
+
+        items = [create_question("test-id", number) for number in range(1, 4)]
+        with patch.dict(
+            os.environ,
+            {"QUESTION_CACHE_MAX_BYTES": str(get_size(items[0]) + get_size(items[1]))},
+        ):
+            put_cached_question("test-id", 1, items[0])
+            put_cached_question("test-id", 2, items[1])
+            get_cached_question("test-id", 1)
+            put_cached_question("test-id", 3, items[2])
+
+        self.assertEqual(get_cached_question("test-id", 1), items[0])
+        self.assertIsNone(get_cached_question("test-id", 2))
+        self.assertEqual(get_cached_question("test-id", 3), items[2])
+        stats = get_question_cache_stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["bytes"], get_size(items[0]) + get_size(items[2]))
+
+    @patch("util.question_cache.logging")
+    def test_put_cached_question_log_stats(self, mock_logging):
+        """格納時に、破棄数と累計した統計情報をヒット率とともにログ出力するテスト"""
+
+        items = [create_question("test-id", number) for number in range(1, 3)]
+        with patch.dict(
+            os.environ, {"QUESTION_CACHE_MAX_BYTES": str(get_size(items[0]))}
+        ):
+            get_cached_question("test-id", 1)
+            put_cached_question("test-id", 1, items[0])
+            get_cached_question("test-id", 1)
+            get_cached_question("test-id", 2)
+            put_cached_question("test-id", 2, items[1])
+
+        self.assertEqual(mock_logging.info.call_count, 2)
+        mock_logging.info.assert_called_with(
+            {
+                "question_cache_evictions": 1,
+                "question_cache_total_hit_rate": 0.3333,
+                "question_cache_total_misses": 2,
+                "question_cache_total_evictions": 1,
+                "question_cache_bytes": get_size(items[1]),
+                "question_cache_entries": 1,
+            }
+        )
+
+    def test_put_cached_question_too_large(self):
+        """上限を超える大きさの項目は格納しないテスト"""
+
+        item = create_question("test-id", 1, "x" * 100)
+        with patch.dict(os.environ, {"QUESTION_CACHE_MAX_BYTES": "100"}):
+            put_cached_question("test-id", 1, item)
+
+        self.assertIsNone(get_cached_question("test-id", 1))
+        self.assertEqual(get_question_cache_stats()["evictions"], 0)
+
+    def test_put_cached_question_replace(self):
+        """同じ項目を格納し直した場合に、合計バイト数を二重に計上しないテスト"""
+
+        old_item = create_question("test-id", 1, "Old")
+        new_item = create_question("test-id", 1, "New Question")
+
+        put_cached_question("test-id", 1, old_item)
+        put_cached_question("test-id", 1, new_item)
+
+        self.assertEqual(get_cached_question("test-id", 1), new_item)
+        self.assertEqual(get_question_cache_stats()["bytes"], get_size(new_item))
+
+
+class TestInvalidateCachedQuestions(unittest.TestCase):
+    """invalidate_cached_questions関数のテストケース"""
+
+    def setUp(self):
+        reset_question_cache()
+
+    def tearDown(self):
+        reset_question_cache()
+
+    def test_invalidate_cached_questions(self):
+        """指定した項目のみ削除し、キャッシュに存在しない項目は無視するテスト"""
+
+        put_cached_question("test-id", 1, create_question("test-id", 1))
+        put_cached_question("test-id", 2, create_question("test-id", 2))
+
+        invalidate_cached_questions(["test-id_1", "test-id_3"])
+
+        self.assertIsNone(get_cached_question("test-id", 1))
+        self.assertIsNotNone(get_cached_question("test-id", 2))
+        self.assertEqual(
+            get_question_cache_stats()["bytes"],
+            get_size(create_question("test-id", 2)),
+        )
@@ -1,16 +1,30 @@
 """Queue Storageのユーティリティ関数のテスト"""
 
 import os
+import time
 from unittest import TestCase
 from unittest.mock import MagicMock, patch
 
+from azure.core.credentials import AccessToken
 from azure.storage.queue import QueueClient
-from util.queue import AZURITE_QUEUE_STORAGE_CONNECTION_STRING, get_queue_client
+from util.queue import (
+    AZURITE_QUEUE_STORAGE_CONNECTION_STRING,
+    CachedTokenCredential,
+    get_queue_client,
+    reset_queue_clients,
+    send_queue_message,
+)
 
 
 class TestGetQueueClient(TestCase):
     """get_queue_client関数のテストケース"""
 
+    def setUp(self):
+        reset_queue_clients()
+
+    def tearDown(self):
+        reset_queue_clients()
+
     @patch("util.queue.QueueClient.from_connection_string")
     @patch.dict(os.environ, {"AzureWebJobsStorage": "UseDevelopmentStorage=true"})
     def test_get_queue_client_local_environment(self, mock_from_connection_string):
@@ -58,10 +72,40 @@ class TestGetQueueClient(TestCase):
             "https://teststorageaccount.queue.core.windows.net",
         )
         self.assertEqual(call_kwargs["queue_name"], "test-queue")
-        self.assertEqual(call_kwargs["credential"], mock_credential)
+        self.assertIsInstance(call_kwargs["credential"], CachedTokenCredential)
+        self.assertEqual(call_kwargs["credential"].credential, mock_credential)
         self.assertIsNotNone(call_kwargs["message_encode_policy"])
         self.assertEqual(result, mock_queue_client)
 
+    @patch("util.queue.DefaultAzureCredential")
+    @patch("util.queue.QueueClient")
+    @patch.dict(
+        os.environ,
+        {
+            "AzureWebJobsStorage__accountName": "teststorageaccount",
+        },
+    )
+    def test_get_queue_client_cached(
+        self, mock_queue_client_class, mock_default_azure_credential
+    ):
+        """QueueClientをキュー名ごとに再利用し、クレデンシャルを共有するテスト"""
+
+        mock_queue_client_class.side_effect = lambda **_: MagicMock(spec=QueueClient)
+
+        first = get_queue_client("answers")
+        second = get_queue_client("answers")
+        other = get_queue_client("communities")
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(mock_queue_client_class.call_count, 2)
+        mock_default_azure_credential.assert_called_once()
+        credentials = [
+            call_args[1]["credential"]
+            for call_args in mock_queue_client_class.call_args_list
+        ]
+        self.assertIs(credentials[0], credentials[1])
+
     @patch.dict(os.environ, {}, clear=True)
     def test_get_queue_client_azure_environment_missing_account_name(self):
         """Azure環境でAzureWebJobsStorage__accountNameが未設定の場合のテスト"""
@@ -73,3 +117,101 @@ class TestGetQueueClient(TestCase):
             "AzureWebJobsStorage__accountName environment variable is not set",
             str(context.exception),
         )
+
+
+class TestCachedTokenCredential(TestCase):
+    """CachedTokenCredentialクラスのテストケース"""
+
+    def test_get_token_reused_until_close_to_expiry(self):
+        """有効期限まで十分な時間があるアクセストークンを再利用するテスト"""
+
+        mock_credential = MagicMock()
+        mock_credential.get_token.return_value = AccessToken(
+            "token", int(time.time()) + 3600
+        )
+        credential = CachedTokenCredential(mock_credential)
+
+        first = credential.get_token("https://storage.azure.com/.default")
+        second = credential.get_token("https://storage.azure.com/.default")
+
+        self.assertEqual(first.token, "token")
+        self.assertIs(first, second)
+        mock_credential.get_token.assert_called_once_with(
+            "https://storage.azure.com/.default"
+        )
+
+    def test_get_token_refreshed_close_to_expiry(self):
+        """有効期限が近いアクセストークンを再取得するテスト"""
+
+        mock_credential = MagicMock()
+        mock_credential.get_token.side_effect = [
+            AccessToken("old-token", int(time.time()) + 60),
+            AccessToken("new-token", int(time.time()) + 3600),
+        ]
+        credential = CachedTokenCredential(mock_credential)
+
+        credential.get_token("https://storage.azure.com/.default")
+        refreshed = credential.get_token("https://storage.azure.com/.default")
+
+        self.assertEqual(refreshed.token, "new-token")
+        self.assertEqual(mock_credential.get_token.call_count, 2)
+
+    def test_get_token_with_claims(self):
+        """追加のクレームを要求された場合はアクセストークンを再利用しないテスト"""
+
+        mock_credential = MagicMock()
+        mock_credential.get_token.return_value = AccessToken(
+            "token", int(time.time()) + 3600
+        )
+        credential = CachedTokenCredential(mock_credential)
+
+        credential.get_token("https://storage.azure.com/.default")
+        credential.get_token("https://storage.azure.com/.default", claims="claims")
+
+        self.assertEqual(mock_credential.get_token.call_count, 2)
+
+    def test_get_token_error(self):
+        """アクセストークンの取得に失敗した場合に例外をraiseするテスト"""
+
+        mock_credential = MagicMock()
+        mock_credential.get_token.side_effect = Exception("Token Error")
+        credential = CachedTokenCredential(mock_credential)
+
+        with self.assertRaises(Exception) as context:
+            credential.get_token("https://storage.azure.com/.default")
+
+        self.assertEqual(str(context.exception), "Token Error")
+
+
+class TestSendQueueMessage(TestCase):
+    """send_queue_message関数のテストケース"""
+
+    @patch("util.queue.get_queue_client")
+    @patch("util.queue.logging")
+    def test_send_queue_message(self, mock_logging, mock_get_queue_client):
+        """メッセージを格納して所要時間をログ出力するテスト"""
+
+        send_queue_message("answers", b"message")
+
+        mock_get_queue_client.assert_called_once_with("answers")
+        mock_get_queue_client.return_value.send_message.assert_called_once_with(
+            b"message"
+        )
+        logged = mock_logging.info.call_args[0][0]
+        self.assertEqual(logged["queue_name"], "answers")
+        self.assertGreaterEqual(logged["enqueue_elapsed_ms"], 0)
+
+    @patch("util.queue.get_queue_client")
+    @patch("util.queue.logging")
+    def test_send_queue_message_error(self, mock_logging, mock_get_queue_client):
+        """メッセージの格納に失敗した場合に例外をraiseするテスト"""
+
+        mock_get_queue_client.return_value.send_message.side_effect = Exception(
+            "Queue Error"
+        )
+
+        with self.assertRaises(Exception) as context:
+            send_queue_message("answers", b"message")
+
+        self.assertEqual(str(context.exception), "Queue Error")
+        mock_logging.info.assert_not_called()
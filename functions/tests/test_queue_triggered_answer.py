@@ -6,6 +6,7 @@ from unittest.mock import MagicMock, call, patch
 
 import azure.functions as func
 from src.queue_triggered_answer import queue_triggered_answer
+from util.hashing import compute_question_hash
 
 
 class TestQueueTriggeredAnswer(TestCase):
@@ -53,6 +54,7 @@ class TestQueueTriggeredAnswer(TestCase):
             "correctIdxes": [0],
             "explanations": ["Explanation 1"],
             "testId": "1",
+            "questionHash": compute_question_hash(mock_item),
         }
         mock_container_answer.upsert_item.assert_called_once_with(expected_answer_item)
         mock_logging.info.assert_has_calls(
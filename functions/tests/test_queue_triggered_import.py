@@ -0,0 +1,335 @@
+"""インポートデータファイルの問題番号の範囲ごとにインポートするQueueトリガーの関数アプリのテスト"""
+
+import hashlib
+import json
+import os
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from src.blob_triggered_import import blob_triggered_import
+from src.queue_triggered_import import queue_triggered_import
+from tests.test_blob_triggered_import import InMemoryContainer, create_blob
+
+
+def create_msg(message_import_chunk):
+    """キューストレージのメッセージのfunc.QueueMessageの代替を生成する"""
+
+    msg = MagicMock()
+    msg.get_body.return_value = json.dumps(message_import_chunk).encode("utf-8")
+    return msg
+
+
+class TestQueueTriggeredImport(TestCase):
+    """queue_triggered_import関数のテストケース"""
+
+    def setUp(self):
+        self.json_data = [
+            {"subjects": [f"Q{i}"], "choices": ["A"], "answerNum": 1}
+            for i in range(1, 4)
+        ]
+        data = json.dumps(self.json_data).encode("utf-8")
+        # 2・3番目の要素の範囲
+        start_offset = data.index(b'{"subjects": ["Q2"]')
+        end_offset = data.rindex(b"}") + 1
+        self.message_import_chunk = {
+            "jobId": "job-id",
+            "courseName": "Math",
+            "testName": "Algebra",
+            "testId": "test-id",
+            "contentVersion": "0x1",
+            "chunkIndex": 1,
+            "startNumber": 2,
+            "endNumber": 3,
+            "startOffset": start_offset,
+            "endOffset": end_offset,
+            "chunkHash": hashlib.sha256(data[start_offset:end_offset]).hexdigest(),
+        }
+
+    @patch("src.queue_triggered_import.get_test_item")
+    @patch("src.queue_triggered_import.upsert_test_item")
+    @patch("src.queue_triggered_import.complete_import_chunk")
+    @patch("src.queue_triggered_import.upsert_question_items")
+    def test_queue_triggered_import(
+        self,
+        mock_upsert_question_items,
+        mock_complete_import_chunk,
+        mock_upsert_test_item,
+        mock_get_test_item,
+    ):
+        """範囲の要素をupsertし、完了していない範囲がある場合は問題数を更新しないテスト"""
+
+        json_items = []
+
+        def fake_upsert_question_items(
+            test_id, is_existed_test, json_data, number_range
+        ):
+            self.assertEqual(test_id, "test-id")
+            self.assertTrue(is_existed_test)
+            self.assertEqual(number_range, range(2, 4))
+            json_items.extend(json_data)
+            return 3
+
+        mock_upsert_question_items.side_effect = fake_upsert_question_items
+        mock_complete_import_chunk.return_value = {
+            "id": "job-id",
+            "chunkCount": 2,
+            "completedChunks": {"1": True},
+        }
+
+        queue_triggered_import(
+            create_msg(self.message_import_chunk), create_blob(self.json_data, "0x1")
+        )
+
+        self.assertEqual(json_items, self.json_data[1:])
+        mock_complete_import_chunk.assert_called_once_with("job-id", 1)
+        mock_get_test_item.assert_not_called()
+        mock_upsert_test_item.assert_not_called()
+
+    @patch("src.queue_triggered_import.get_test_item")
+    @patch("src.queue_triggered_import.upsert_test_item")
+    @patch("src.queue_triggered_import.complete_import_chunk")
+    @patch("src.queue_triggered_import.upsert_question_items")
+    def test_queue_triggered_import_completed(
+        self,
+        mock_upsert_question_items,  # pylint: disable=W0613
+        mock_complete_import_chunk,
+        mock_upsert_test_item,
+        mock_get_test_item,
+    ):
+        """すべての範囲のupsertが完了した場合に、問題数を更新するテスト"""
+
+        mock_complete_import_chunk.return_value = {
+            "id": "job-id",
+            "courseName": "Math",
+            "testName": "Algebra",
+            "testId": "test-id",
+            "length": 3,
+            "chunkCount": 2,
+            "completedChunks": {"0": True, "1": True},
+        }
+        mock_get_test_item.return_value = {"id": "test-id", "length": 0}
+
+        queue_triggered_import(
+            create_msg(self.message_import_chunk), create_blob(self.json_data, "0x1")
+        )
+
+        mock_get_test_item.assert_called_once_with(
+            course_name="Math", test_name="Algebra"
+        )
+        mock_upsert_test_item.assert_called_once_with(
+            course_name="Math",
+            test_name="Algebra",
+            test_id="test-id",
+            inserted_test_item={"id": "test-id", "length": 0},
+            length=3,
+        )
+
+    @patch("src.queue_triggered_import.upsert_test_item")
+    @patch("src.queue_triggered_import.complete_import_chunk")
+    @patch("src.queue_triggered_import.upsert_question_items")
+    def test_queue_triggered_import_job_not_found(
+        self,
+        mock_upsert_question_items,
+        mock_complete_import_chunk,
+        mock_upsert_test_item,
+    ):
+        """インポートジョブが存在しない場合に、問題数を更新しないテスト"""
+
+        mock_complete_import_chunk.return_value = None
+
+        queue_triggered_import(
+            create_msg(self.message_import_chunk), create_blob(self.json_data, "0x1")
+        )
+
+        mock_upsert_question_items.assert_called_once()
+        mock_upsert_test_item.assert_not_called()
+
+    @patch("src.queue_triggered_import.complete_import_chunk")
+    @patch("src.queue_triggered_import.upsert_question_items")
+    @patch("src.queue_triggered_import.logging")
+    def test_queue_triggered_import_stale(
+        self,
+        mock_logging,
+        mock_upsert_question_items,
+        mock_complete_import_chunk,
+    ):
+        """メッセージの格納後にインポートデータファイルが更新された場合に、upsertしないテスト"""
+
+        self.json_data[1]["subjects"] = ["Q2 updated"]
+
+        queue_triggered_import(
+            create_msg(self.message_import_chunk), create_blob(self.json_data, "0x2")
+        )
+
+        mock_logging.warning.assert_called_once_with(
+            {"stale_import_chunk": self.message_import_chunk}
+        )
+        mock_upsert_question_items.assert_not_called()
+        mock_complete_import_chunk.assert_not_called()
+
+
+def create_containers(*mock_get_containers: MagicMock) -> dict[str, InMemoryContainer]:
+    """各コンテナーの代替を生成し、コンテナーのインスタンスを取得する関数のモックに設定する"""
+
+    containers = {
+        "Test": InMemoryContainer(),
+        "Question": InMemoryContainer(),
+        "Import": InMemoryContainer(),
+        "Catalog": InMemoryContainer(),
+        "Discussion": InMemoryContainer(),
+    }
+    for mock_get_container in mock_get_containers:
+        mock_get_container.side_effect = (
+            lambda database_name, container_name: containers[container_name]
+        )
+    return containers
+
+
+class TestFanOutImport(TestCase):
+    """インポートデータファイルの問題番号の範囲ごとの並列インポートのテストケース"""
+
+    @patch("util.throttle.time.sleep")
+    @patch("src.blob_triggered_import.send_queue_message")
+    @patch("src.blob_triggered_import.uuid4")
+    @patch("util.catalog.get_read_write_container")
+    @patch("util.checkpoint.get_read_write_container")
+    @patch("src.blob_triggered_import.get_read_write_container")
+    @patch.dict(os.environ, {"IMPORT_FANOUT_ENABLED": "true", "IMPORT_CHUNK_SIZE": "3"})
+    def test_fan_out_import(  # pylint: disable=R0913,R0917
+        self,
+        mock_get_read_write_container,
+        mock_get_checkpoint_container,
+        mock_get_catalog_container,
+        mock_uuid4,
+        mock_send_queue_message,
+        mock_sleep,  # pylint: disable=W0613
+    ):
+        """範囲ごとのメッセージを順不同に処理し、すべての範囲の完了後に問題数を更新するテスト"""
+
+        containers = create_containers(
+            mock_get_read_write_container,
+            mock_get_checkpoint_container,
+            mock_get_catalog_container,
+        )
+        mock_uuid4.return_value = "test-id"
+        json_data = [
+            {"subjects": [f"Q{i}"], "choices": ["A"], "answerNum": 1}
+            for i in range(1, 8)
+        ]
+        discussions = [{"comment": "A", "upvotedNum": 1, "selectedAnswer": "A"}]
+        json_data[4]["discussions"] = discussions
+
+        blob_triggered_import(create_blob(json_data, "0x1"))
+
+        # Questionコンテナー・Testコンテナーの項目、テストの一覧のカタログは書き込まず、範囲ごとのメッセージのみ作成
+        self.assertEqual(containers["Question"].items, {})
+        self.assertEqual(containers["Test"].items, {})
+        self.assertEqual(containers["Catalog"].items, {})
+        self.assertEqual(mock_send_queue_message.call_count, 3)
+        messages = [
+            json.loads(args.args[1]) for args in mock_send_queue_message.call_args_list
+        ]
+        self.assertEqual(
+            [(message["startNumber"], message["endNumber"]) for message in messages],
+            [(1, 3), (4, 6), (7, 7)],
+        )
+
+        # メッセージを逆順に処理
+        for index, message in enumerate(reversed(messages)):
+            msg = MagicMock()
+            msg.get_body.return_value = json.dumps(message).encode("utf-8")
+            queue_triggered_import(msg, create_blob(json_data, "0x1"))
+            if index < len(messages) - 1:
+                self.assertEqual(containers["Test"].items, {})
+                self.assertEqual(containers["Catalog"].items, {})
+        self.assertEqual(containers["Test"].items["test-id"]["length"], 7)
+        self.assertEqual(
+            containers["Catalog"].items["tests"]["courses"]["Math"][0]["length"], 7
+        )
+
+        self.assertEqual(
+            containers["Question"].write_counts,
+            {f"test-id_{i}": 1 for i in range(1, 8)},
+        )
+
+        # ディスカッションはDiscussionコンテナーの項目に分割し、Questionコンテナーの項目には件数のみ格納
+        self.assertEqual(
+            containers["Discussion"].items["test-id_5"]["discussions"], discussions
+        )
+        self.assertEqual(list(containers["Discussion"].items), ["test-id_5"])
+        self.assertNotIn("discussions", containers["Question"].items["test-id_5"])
+        self.assertEqual(
+            [
+                containers["Question"].items[f"test-id_{i}"]["discussionNum"]
+                for i in range(1, 8)
+            ],
+            [0, 0, 0, 0, 1, 0, 0],
+        )
+
+    @patch("util.throttle.time.sleep")
+    @patch("src.blob_triggered_import.send_queue_message")
+    @patch("src.blob_triggered_import.uuid4")
+    @patch("util.catalog.get_read_write_container")
+    @patch("util.checkpoint.get_read_write_container")
+    @patch("src.blob_triggered_import.get_read_write_container")
+    @patch.dict(os.environ, {"IMPORT_FANOUT_ENABLED": "true", "IMPORT_CHUNK_SIZE": "3"})
+    def test_fan_out_import_incomplete(  # pylint: disable=R0913,R0917
+        self,
+        mock_get_read_write_container,
+        mock_get_checkpoint_container,
+        mock_get_catalog_container,
+        mock_uuid4,
+        mock_send_queue_message,
+        mock_sleep,  # pylint: disable=W0613
+    ):
+        """完了しない範囲がある場合に、新規のテストをテストの一覧に含めないテスト"""
+
+        containers = create_containers(
+            mock_get_read_write_container,
+            mock_get_checkpoint_container,
+            mock_get_catalog_container,
+        )
+        mock_uuid4.return_value = "test-id"
+        json_data = [
+            {"subjects": [f"Q{i}"], "choices": ["A"], "answerNum": 1}
+            for i in range(1, 8)
+        ]
+
+        blob_triggered_import(create_blob(json_data, "0x1"))
+
+        # 最後の範囲のメッセージが有害キューに移動し、処理されない場合
+        for args in mock_send_queue_message.call_args_list[:-1]:
+            queue_triggered_import(
+                create_msg(json.loads(args.args[1])), create_blob(json_data, "0x1")
+            )
+
+        self.assertEqual(len(containers["Question"].items), 6)
+        self.assertEqual(containers["Test"].items, {})
+        self.assertEqual(containers["Catalog"].items, {})
+
+    @patch("src.blob_triggered_import.send_queue_message")
+    @patch("src.blob_triggered_import.create_import_job")
+    @patch("src.blob_triggered_import.get_test_item")
+    @patch("src.blob_triggered_import.upsert_test_item")
+    @patch.dict(os.environ, {"IMPORT_FANOUT_ENABLED": "true"})
+    def test_fan_out_import_invalid(
+        self,
+        mock_upsert_test_item,
+        mock_get_test_item,
+        mock_create_import_job,
+        mock_send_queue_message,
+    ):
+        """不正なインポートデータファイルの場合に、何も書き込まないテスト"""
+
+        mock_get_test_item.return_value = None
+
+        with self.assertRaises(ValueError):
+            blob_triggered_import(
+                create_blob(
+                    [{"subjects": ["Q1"], "choices": ["A"], "answerNum": 1}, {}], "0x1"
+                )
+            )
+
+        mock_upsert_test_item.assert_not_called()
+        mock_create_import_job.assert_not_called()
+        mock_send_queue_message.assert_not_called()
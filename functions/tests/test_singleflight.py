@@ -0,0 +1,77 @@
+"""同一キーの処理の同時実行を1回にまとめるユーティリティのテスト"""
+
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from util.singleflight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    """SingleFlightクラスのテストケース"""
+
+    def test_do_coalesced(self):
+        """同一キーの同時呼び出しで処理を1回のみ実行し、結果を共有するテスト"""
+
+        call_num = 20
+        single_flight: SingleFlight[dict] = SingleFlight()
+        started = threading.Barrier(call_num)
+        calls = []
+
+        def fn():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"result": len(calls)}
+
+        def do(_):
+            started.wait()
+            return single_flight.do("key", fn)
+
+        with ThreadPoolExecutor(max_workers=call_num) as executor:
+            results = list(executor.map(do, range(call_num)))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"result": 1}] * call_num)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_do_exception(self):
+        """処理の例外を同時に呼び出したすべてのスレッドに送出し、次の呼び出しで再実行するテスト"""
+
+        call_num = 5
+        single_flight: SingleFlight[str] = SingleFlight()
+        started = threading.Barrier(call_num)
+        calls = []
+
+        def fn():
+            calls.append(1)
+            time.sleep(0.2)
+            raise ValueError("Error")
+
+        def do(_):
+            started.wait()
+            try:
+                return single_flight.do("key", fn)
+            except ValueError as e:
+                return str(e)
+
+        with ThreadPoolExecutor(max_workers=call_num) as executor:
+            results = list(executor.map(do, range(call_num)))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["Error"] * call_num)
+        self.assertEqual(single_flight.do("key", lambda: "OK"), "OK")
+
+    def test_do_different_keys(self):
+        """異なるキーの処理をそれぞれ実行するテスト"""
+
+        single_flight: SingleFlight[str] = SingleFlight()
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = list(
+                executor.map(
+                    lambda key: single_flight.do(key, lambda: key), ["key1", "key2"]
+                )
+            )
+
+        self.assertEqual(results, ["key1", "key2"])
@@ -0,0 +1,170 @@
+"""Cosmos DBへの操作の流量を調整するユーティリティのテスト"""
+
+import os
+import unittest
+from unittest.mock import patch
+
+from azure.cosmos.exceptions import CosmosHttpResponseError
+from util.throttle import (
+    DEFAULT_RETRY_AFTER_SECONDS,
+    THROTTLE_MAX_RETRIES,
+    AdaptiveThrottle,
+    get_retry_after_seconds,
+)
+
+
+class FakeClock:
+    """time.monotonic・time.sleepを置き換える、sleepした時間だけ進む時計"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        """現在時刻を返す"""
+
+        return self.now
+
+    def sleep(self, seconds):
+        """指定した時間だけ時刻を進める"""
+
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class ThrottlingContainer:  # pylint: disable=too-few-public-methods
+    """
+    upsert_itemで、1秒あたりの許容操作数を超えた場合に429を返すContainerProxyの代替
+    1操作あたり10RUを消費する
+    """
+
+    def __init__(self, clock, allowed_rate, retry_after_ms=500, headers=None):
+        self.clock = clock
+        self.allowed_rate = allowed_rate
+        self.retry_after_ms = retry_after_ms
+        self.headers = headers or {}
+        self.items = []
+        self.throttled = 0
+        self._last_at = None
+
+    def upsert_item(self, body, response_hook=None):
+        """前回の操作から1/allowed_rate秒経過していない場合は429を返す"""
+
+        if (
+            self._last_at is not None
+            and self.clock.now - self._last_at < 1 / self.allowed_rate
+        ):
+            self.throttled += 1
+            error = CosmosHttpResponseError(
+                status_code=429, message="Too Many Requests"
+            )
+            error.headers = {"x-ms-retry-after-ms": str(self.retry_after_ms)}
+            raise error
+        self._last_at = self.clock.now
+        self.items.append(body)
+        response_hook({"x-ms-request-charge": "10.0", **self.headers}, body)
+        return body
+
+
+class TestGetRetryAfterSeconds(unittest.TestCase):
+    """get_retry_after_seconds関数のテストケース"""
+
+    def test_get_retry_after_seconds(self):
+        """x-ms-retry-after-ms・Retry-Afterヘッダーの順に再試行までの時間を取得するテスト"""
+
+        self.assertEqual(
+            get_retry_after_seconds({"x-ms-retry-after-ms": "250", "Retry-After": "3"}),
+            0.25,
+        )
+        self.assertEqual(get_retry_after_seconds({"Retry-After": "3"}), 3.0)
+        self.assertEqual(get_retry_after_seconds({}), DEFAULT_RETRY_AFTER_SECONDS)
+
+
+@patch.dict(os.environ, {"THROTTLE_INITIAL_RATE": "5", "THROTTLE_MAX_RATE": "100"})
+class TestAdaptiveThrottle(unittest.TestCase):
+    """AdaptiveThrottleクラスのテストケース"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        for name in ("monotonic", "sleep"):
+            patcher = patch(f"util.throttle.time.{name}", getattr(self.clock, name))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_run_ramp_up(self):
+        """スロットリングされない場合に1秒あたりの操作数を増やすテスト"""
+
+        container = ThrottlingContainer(self.clock, allowed_rate=1000)
+        throttle = AdaptiveThrottle()
+
+        for i in range(20):
+            throttle.run(container.upsert_item, {"id": str(i)})
+
+        self.assertEqual(len(container.items), 20)
+        self.assertEqual(throttle.rate, 25.0)
+        # 3秒ごとにsleepしていた変更前より大幅に短い
+        self.assertLess(self.clock.now - 1000.0, 3.0)
+
+    def test_run_back_off(self):
+        """429の場合に再試行までの時間を待って再試行し、許容する流量に収束するテスト"""
+
+        container = ThrottlingContainer(self.clock, allowed_rate=10, retry_after_ms=500)
+        throttle = AdaptiveThrottle()
+
+        with patch("util.throttle.logging") as mock_logging:
+            for i in range(100):
+                throttle.run(container.upsert_item, {"id": str(i)})
+
+        stats = throttle.get_stats()
+        self.assertEqual(container.items, [{"id": str(i)} for i in range(100)])
+        self.assertEqual(stats["operations"], 100)
+        self.assertEqual(stats["throttled"], container.throttled)
+        self.assertGreater(container.throttled, 0)
+        self.assertIn(0.5, self.clock.sleeps)
+        self.assertEqual(mock_logging.warning.call_count, container.throttled)
+        self.assertEqual(stats["requestCharge"], 1000.0)
+        # 許容する10操作/秒(100RU/s)の4割以上を達成する(3秒ごとのsleepでは約3.3RU/s)
+        self.assertGreater(stats["requestUnitsPerSecond"], 40.0)
+        self.assertLessEqual(stats["requestUnitsPerSecond"], 100.0)
+
+    def test_run_sdk_throttle_retry(self):
+        """SDK内部で429を再試行した場合に1秒あたりの操作数を減らすテスト"""
+
+        container = ThrottlingContainer(
+            self.clock, allowed_rate=1000, headers={"x-ms-throttle-retry-count": "1"}
+        )
+        throttle = AdaptiveThrottle()
+
+        throttle.run(container.upsert_item, {"id": "1"})
+
+        self.assertEqual(throttle.rate, 2.5)
+        self.assertEqual(throttle.get_stats()["throttled"], 1)
+
+    def test_run_max_retries(self):
+        """最大回数再試行しても429の場合に例外を送出するテスト"""
+
+        def upsert_item(body, response_hook=None):  # pylint: disable=W0613
+            raise CosmosHttpResponseError(status_code=429, message="Too Many Requests")
+
+        throttle = AdaptiveThrottle()
+
+        with patch("util.throttle.logging") as mock_logging:
+            with self.assertRaises(CosmosHttpResponseError):
+                throttle.run(upsert_item, {"id": "1"})
+
+        self.assertEqual(mock_logging.warning.call_count, THROTTLE_MAX_RETRIES)
+        self.assertEqual(throttle.get_stats()["operations"], 0)
+
+    def test_run_other_error(self):
+        """429以外のエラーは再試行せずに例外を送出するテスト"""
+
+        calls = []
+
+        def upsert_item(body, response_hook=None):  # pylint: disable=W0613
+            calls.append(body)
+            raise CosmosHttpResponseError(status_code=400, message="Bad Request")
+
+        with self.assertRaises(CosmosHttpResponseError):
+            AdaptiveThrottle().run(upsert_item, {"id": "1"})
+
+        self.assertEqual(len(calls), 1)
@@ -0,0 +1,183 @@
+"""翻訳結果のキャッシュのユーティリティ関数のテスト"""
+
+import os
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from util.translation_cache import (
+    compute_translation_key,
+    get_cached_translations,
+    get_translation_cache_stats,
+    put_cached_translations,
+    record_translation_cache_stats,
+    reset_translation_cache,
+)
+
+
+class TestComputeTranslationKey(unittest.TestCase):
+    """compute_translation_key関数のテストケース"""
+
+    def test_compute_translation_key(self):
+        """翻訳元の文字列・言語の組ごとに異なるハッシュ値を算出するテスト"""
+
+        key = compute_translation_key("Hello", "en", "ja")
+
+        self.assertEqual(len(key), 64)
+        self.assertEqual(key, compute_translation_key("Hello", "en", "ja"))
+        self.assertNotEqual(key, compute_translation_key("Hello ", "en", "ja"))
+        self.assertNotEqual(key, compute_translation_key("Hello", "en", "fr"))
+
+
+class TestTranslationCache(unittest.TestCase):
+    """get_cached_translations・put_cached_translations関数のテストケース"""
+
+    def setUp(self):
+        reset_translation_cache()
+
+    def tearDown(self):
+        reset_translation_cache()
+
+    @patch("util.translation_cache.get_read_write_container")
+    def test_put_and_get_cached_translations(self, mock_get_read_write_container):
+        """格納した翻訳結果をワーカープロセス内のキャッシュから取得するテスト"""
+
+        mock_container = mock_get_read_write_container.return_value
+
+        put_cached_translations({"key1": "翻訳1"}, "en", "ja")
+        result = get_cached_translations(["key1"])
+
+        self.assertEqual(result, {"key1": "翻訳1"})
+        mock_container.upsert_item.assert_called_once_with(
+            {
+                "id": "key1",
+                "sourceLanguage": "en",
+                "targetLanguage": "ja",
+                "translatedText": "翻訳1",
+            }
+        )
+        mock_container.read_items.assert_not_called()
+
+    @patch("util.translation_cache.get_read_write_container")
+    def test_get_cached_translations_from_container(
+        self, mock_get_read_write_container
+    ):
+        """ワーカープロセス内のキャッシュに存在しない翻訳結果をTranslationコンテナーから取得するテスト"""
+
+        mock_container = mock_get_read_write_container.return_value
+        mock_container.read_items.return_value = [
+            {
+                "id": "key1",
+                "sourceLanguage": "en",
+                "targetLanguage": "ja",
+                "translatedText": "翻訳1",
+            }
+        ]
+
+        first = get_cached_translations(["key1", "key2", "key1"])
+        second = get_cached_translations(["key1"])
+
+        self.assertEqual(first, {"key1": "翻訳1"})
+        self.assertEqual(second, {"key1": "翻訳1"})
+        mock_get_read_write_container.assert_called_with(
+            database_name="Users", container_name="Translation"
+        )
+        mock_container.read_items.assert_called_once_with(
+            items=[("key1", "key1"), ("key2", "key2")]
+        )
+
+    @patch("util.translation_cache.get_read_write_container")
+    @patch.dict(os.environ, {"TRANSLATION_CACHE_SIZE": "2"})
+    def test_evict_least_recently_used(self, mock_get_read_write_container):
+        """最大件数を超えた場合に最も長く使用していない翻訳結果を破棄するテスト"""
+
+        mock_get_read_write_container.return_value.read_items.return_value = []
+
+        put_cached_translations({"key1": "翻訳1", "key2": "翻訳2"}, "en", "ja")
+        get_cached_translations(["key1"])
+        put_cached_translations({"key3": "翻訳3"}, "en", "ja")
+
+        self.assertEqual(
+            get_cached_translations(["key1", "key2", "key3"]),
+            {"key1": "翻訳1", "key3": "翻訳3"},
+        )
+
+    @patch("util.translation_cache.get_read_write_container")
+    @patch("util.translation_cache.logging")
+    def test_container_error(self, mock_logging, mock_get_read_write_container):
+        """Translationコンテナーの操作に失敗した場合に警告のみ出力するテスト"""
+
+        mock_container = mock_get_read_write_container.return_value
+        mock_container.read_items.side_effect = Exception("Read Error")
+        mock_container.upsert_item.side_effect = Exception("Upsert Error")
+
+        put_cached_translations({"key1": "翻訳1"}, "en", "ja")
+        result = get_cached_translations(["key1", "key2"])
+
+        self.assertEqual(result, {"key1": "翻訳1"})
+        self.assertEqual(mock_logging.warning.call_count, 2)
+
+    @patch("util.translation_cache.get_read_write_container")
+    @patch("util.translation_cache.logging")
+    @patch.dict(os.environ, {"TRANSLATION_CACHE_MAX_WORKERS": "3"})
+    def test_put_cached_translations_concurrently(
+        self, mock_logging, mock_get_read_write_container
+    ):
+        """最大同時実行数までTranslationコンテナーに同時にupsertし、失敗した項目以外もupsertするテスト"""
+
+        lock = threading.Lock()
+        running = []
+        peak = []
+        upserted = []
+
+        def upsert_item(item):
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.pop()
+                upserted.append(item["id"])
+            if item["id"] == "key0":
+                raise RuntimeError("Upsert Error")
+
+        mock_get_read_write_container.return_value.upsert_item.side_effect = upsert_item
+
+        put_cached_translations({f"key{i}": f"翻訳{i}" for i in range(6)}, "en", "ja")
+
+        self.assertGreater(max(peak), 1)
+        self.assertLessEqual(max(peak), 3)
+        self.assertEqual(sorted(upserted), [f"key{i}" for i in range(6)])
+        mock_logging.warning.assert_called_once()
+
+
+class TestRecordTranslationCacheStats(unittest.TestCase):
+    """record_translation_cache_stats関数のテストケース"""
+
+    def setUp(self):
+        reset_translation_cache()
+
+    def tearDown(self):
+        reset_translation_cache()
+
+    @patch("util.translation_cache.logging")
+    def test_record_translation_cache_stats(self, mock_logging):
+        """キャッシュのヒット数・ミス数・翻訳せずに済んだ文字数を累計してログ出力するテスト"""
+
+        record_translation_cache_stats(1, 3, 10)
+        record_translation_cache_stats(2, 2, 20)
+
+        self.assertEqual(
+            get_translation_cache_stats(),
+            {"hits": 3, "misses": 5, "savedCharacters": 30},
+        )
+        mock_logging.info.assert_called_with(
+            {
+                "translation_cache_hits": 2,
+                "translation_cache_misses": 2,
+                "translation_cache_saved_characters": 20,
+                "translation_cache_total_hit_rate": 0.375,
+                "translation_cache_total_saved_characters": 30,
+            }
+        )
@@ -0,0 +1,392 @@
+"""Azure Translatorのユーティリティ関数のテスト"""
+
+import json
+import os
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+from requests.exceptions import HTTPError
+from util.translation_cache import get_translation_cache_stats, reset_translation_cache
+from util.translator import (
+    MAX_CHARACTERS_PER_REQUEST,
+    MAX_ELEMENTS_PER_REQUEST,
+    get_translator_session,
+    reset_translator_session,
+    split_into_chunks,
+    translate_by_azure_translator,
+)
+
+
+class StandInTranslatorServer(ThreadingHTTPServer):
+    """Azure Translatorの代わりにローカルで起動するHTTPサーバー"""
+
+    daemon_threads = True
+
+    def __init__(self, statuses: list[int] | None = None):
+        """
+        Args:
+            statuses (list[int] | None): 先頭から順に返すステータスコード(空の場合は200を返す)
+        """
+
+        super().__init__(("127.0.0.1", 0), StandInTranslatorHandler)
+        self.statuses = list(statuses or [])
+        self.connections = 0
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    @property
+    def endpoint(self) -> str:
+        """
+        サーバーのエンドポイント
+        """
+
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StandInTranslatorHandler(BaseHTTPRequestHandler):
+    """Azure Translatorの[POST] /translateを模したリクエストハンドラー"""
+
+    protocol_version = "HTTP/1.1"
+    server: StandInTranslatorServer
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """
+        英語の文字列群の先頭に「訳:」を付与して返す
+        """
+
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.server.lock:
+            self.server.requests += 1
+            status = self.server.statuses.pop(0) if self.server.statuses else 200
+
+        if status == 200:
+            content = json.dumps(
+                [
+                    {"translations": [{"text": f"訳:{item['Text']}", "to": "ja"}]}
+                    for item in body
+                ]
+            ).encode("utf-8")
+        else:
+            content = b"{}"
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+class TestTranslateByAzureTranslator(unittest.TestCase):
+    """translate_by_azure_translator関数のテストケース"""
+
+    def setUp(self):
+        reset_translator_session()
+        reset_translation_cache()
+        patcher = patch("util.translation_cache.get_read_write_container")
+        self.mock_get_read_write_container = patcher.start()
+        self.mock_get_read_write_container.return_value.read_items.return_value = []
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        reset_translator_session()
+        reset_translation_cache()
+
+    @patch("util.translator.get_translator_session")
+    @patch("util.translator.logging")
+    @patch.dict(os.environ, {"TRANSLATOR_KEY": "fake-key"})
+    def test_translate_by_azure_translator_success(
+        self, mock_logging, mock_get_translator_session
+    ):
+        """Azure Translatorでの翻訳が成功する場合のテスト"""
+
+        mock_response = MagicMock()
+        mock_response.json.return_value = [
+            {"translations": [{"text": "こんにちは", "to": "ja"}]}
+        ]
+        mock_response.status_code = 200
+        mock_post = mock_get_translator_session.return_value.post
+        mock_post.return_value = mock_response
+
+        result = translate_by_azure_translator(["Hello"])
+        mock_post.assert_called_once_with(
+            "https://api.cognitive.microsofttranslator.com/translate",
+            headers={
+                "Ocp-Apim-Subscription-Key": "fake-key",
+                "Ocp-Apim-Subscription-Region": "japaneast",
+                "Content-Type": "application/json",
+            },
+            params={
+                "api-version": "3.0",
+                "from": "en",
+                "to": "ja",
+            },
+            json=[{"Text": "Hello"}],
+            timeout=10,
+        )
+        self.assertEqual(result, ["こんにちは"])
+        logged = mock_logging.info.call_args[0][0]
+        self.assertEqual(logged["translator_status_code"], 200)
+        self.assertEqual(logged["translator_text_count"], 1)
+        self.assertGreaterEqual(logged["translator_elapsed_ms"], 0)
+        mock_logging.error.assert_not_called()
+
+    @patch("util.translator.logging")
+    def test_translate_by_azure_translator_empty_texts(self, mock_logging):
+        """Azure Translatorでの翻訳で空の英語の文字列群を指定した場合のテスト"""
+
+        result = translate_by_azure_translator([])
+        self.assertEqual(result, [])
+        mock_logging.error.assert_not_called()
+
+    @patch("util.translator.logging")
+    @patch.dict(os.environ, {}, clear=True)
+    def test_translate_by_azure_translator_unset_key(self, mock_logging):
+        """Azure Translatorでの翻訳で環境変数TRANSLATOR_KEYが未設定の場合のテスト"""
+
+        with self.assertRaises(ValueError) as context:
+            translate_by_azure_translator(["Hello"])
+        self.assertEqual(str(context.exception), "Unset TRANSLATOR_KEY")
+        mock_logging.error.assert_not_called()
+
+    @patch("util.translator.get_translator_session")
+    @patch.dict(os.environ, {"TRANSLATOR_KEY": "fake-key"})
+    def test_translate_by_azure_translator_exception(self, mock_get_translator_session):
+        """Azure Translatorでの翻訳で例外が発生する場合のテスト"""
+
+        mock_response = MagicMock()
+        mock_http_error = HTTPError()
+        mock_http_error.response = MagicMock()
+        mock_http_error.response.status_code = 500
+        mock_response.raise_for_status.side_effect = mock_http_error
+        mock_get_translator_session.return_value.post.return_value = mock_response
+
+        with self.assertRaises(HTTPError):
+            translate_by_azure_translator(["Hello"])
+
+
+class TestTranslateByStandInTranslator(unittest.TestCase):
+    """ローカルのAzure Translatorの代替サーバーを用いたtranslate_by_azure_translator関数のテストケース"""
+
+    def setUp(self):
+        reset_translator_session()
+        reset_translation_cache()
+        patcher = patch("util.translation_cache.get_read_write_container")
+        self.mock_get_read_write_container = patcher.start()
+        self.mock_get_read_write_container.return_value.read_items.return_value = []
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        reset_translator_session()
+        reset_translation_cache()
+
+    def _start_server(
+        self, statuses: list[int] | None = None
+    ) -> StandInTranslatorServer:
+        """
+        Azure Translatorの代替サーバーを起動する
+        """
+
+        server = StandInTranslatorServer(statuses)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def test_connection_reused_across_invocations(self):
+        """複数回の翻訳でコネクションを再利用するテスト"""
+
+        server = self._start_server()
+
+        with patch.dict(
+            os.environ,
+            {"TRANSLATOR_KEY": "fake-key", "TRANSLATOR_ENDPOINT": server.endpoint},
+        ):
+            results = [translate_by_azure_translator([f"Hello {i}"]) for i in range(5)]
+
+        self.assertEqual(results, [[f"訳:Hello {i}"] for i in range(5)])
+        self.assertEqual(server.requests, 5)
+        self.assertEqual(server.connections, 1)
+
+    def test_large_payload_split_and_reassembled(self):
+        """上限を超える文字列群を分割して同時に送信し、元の順序で結合するテスト"""
+
+        server = self._start_server()
+        texts = [f"Hello {i}" for i in range(MAX_ELEMENTS_PER_REQUEST * 2 + 1)]
+
+        with patch.dict(
+            os.environ,
+            {
+                "TRANSLATOR_KEY": "fake-key",
+                "TRANSLATOR_ENDPOINT": server.endpoint,
+                "TRANSLATOR_MAX_WORKERS": "2",
+            },
+        ):
+            result = translate_by_azure_translator(texts)
+
+        self.assertEqual(result, [f"訳:{text}" for text in texts])
+        self.assertEqual(server.requests, 3)
+        self.assertLessEqual(server.connections, 2)
+
+    def test_translate_only_cache_misses(self):
+        """キャッシュに存在しない文字列のみを重複なく翻訳し、元の順序で結合するテスト"""
+
+        server = self._start_server()
+        mock_container = self.mock_get_read_write_container.return_value
+
+        with patch.dict(
+            os.environ,
+            {"TRANSLATOR_KEY": "fake-key", "TRANSLATOR_ENDPOINT": server.endpoint},
+        ):
+            first = translate_by_azure_translator(["Hello", "World", "Hello"])
+            second = translate_by_azure_translator(["World", "Bye", "Hello"])
+
+        self.assertEqual(first, ["訳:Hello", "訳:World", "訳:Hello"])
+        self.assertEqual(second, ["訳:World", "訳:Bye", "訳:Hello"])
+        self.assertEqual(server.requests, 2)
+        self.assertEqual(mock_container.upsert_item.call_count, 3)
+        self.assertEqual(
+            get_translation_cache_stats(),
+            {"hits": 2, "misses": 4, "savedCharacters": 10},
+        )
+
+    def test_translate_with_persisted_cache(self):
+        """Translationコンテナーに存在する翻訳結果を再利用するテスト"""
+
+        server = self._start_server()
+        mock_container = self.mock_get_read_write_container.return_value
+        mock_container.read_items.side_effect = lambda items: [
+            {
+                "id": key,
+                "sourceLanguage": "en",
+                "targetLanguage": "ja",
+                "translatedText": "永続化した翻訳",
+            }
+            for key, _ in items
+        ]
+
+        with patch.dict(
+            os.environ,
+            {"TRANSLATOR_KEY": "fake-key", "TRANSLATOR_ENDPOINT": server.endpoint},
+        ):
+            result = translate_by_azure_translator(["Hello"])
+
+        self.assertEqual(result, ["永続化した翻訳"])
+        self.assertEqual(server.requests, 0)
+        mock_container.upsert_item.assert_not_called()
+
+    def test_retry_after_too_many_requests(self):
+        """429のレスポンスをRetry-Afterヘッダーに従って再試行するテスト"""
+
+        server = self._start_server([429, 429])
+
+        with patch.dict(
+            os.environ,
+            {"TRANSLATOR_KEY": "fake-key", "TRANSLATOR_ENDPOINT": server.endpoint},
+        ):
+            result = translate_by_azure_translator(["Hello"])
+
+        self.assertEqual(result, ["訳:Hello"])
+        self.assertEqual(server.requests, 3)
+
+    def test_retry_exhausted(self):
+        """再試行の回数を超えた場合に例外をraiseするテスト"""
+
+        server = self._start_server([429, 429])
+
+        with patch.dict(
+            os.environ,
+            {
+                "TRANSLATOR_KEY": "fake-key",
+                "TRANSLATOR_ENDPOINT": server.endpoint,
+                "TRANSLATOR_MAX_RETRIES": "1",
+            },
+        ):
+            with self.assertRaises(HTTPError):
+                translate_by_azure_translator(["Hello"])
+
+        self.assertEqual(server.requests, 2)
+
+
+class TestGetTranslatorSession(unittest.TestCase):
+    """get_translator_session関数のテストケース"""
+
+    def setUp(self):
+        reset_translator_session()
+
+    def tearDown(self):
+        reset_translator_session()
+
+    @patch.dict(os.environ, {"TRANSLATOR_POOL_SIZE": "4"})
+    def test_get_translator_session(self):
+        """セッションをワーカープロセス内で共有するテスト"""
+
+        session = get_translator_session()
+
+        self.assertIs(session, get_translator_session())
+        adapter = session.get_adapter("https://api.cognitive.microsofttranslator.com")
+        self.assertEqual(adapter._pool_maxsize, 4)  # pylint: disable=protected-access
+        self.assertIn(429, adapter.max_retries.status_forcelist)
+
+    def test_reset_translator_session(self):
+        """セッションを破棄して再生成するテスト"""
+
+        session = get_translator_session()
+        reset_translator_session()
+
+        self.assertIsNot(session, get_translator_session())
+
+
+class TestSplitIntoChunks(unittest.TestCase):
+    """split_into_chunks関数のテストケース"""
+
+    def test_split_into_chunks_single(self):
+        """上限を超えない場合は1つのチャンクとするテスト"""
+
+        self.assertEqual(split_into_chunks(["a", "b"]), [["a", "b"]])
+
+    def test_split_into_chunks_empty(self):
+        """空の文字列群の場合のテスト"""
+
+        self.assertEqual(split_into_chunks([]), [])
+
+    def test_split_into_chunks_max_elements(self):
+        """最大要素数を超えないように分割するテスト"""
+
+        texts = ["a"] * (MAX_ELEMENTS_PER_REQUEST + 1)
+
+        chunks = split_into_chunks(texts)
+
+        self.assertEqual(
+            [len(chunk) for chunk in chunks], [MAX_ELEMENTS_PER_REQUEST, 1]
+        )
+
+    def test_split_into_chunks_max_characters(self):
+        """最大文字数を超えないように、順序を保って分割するテスト"""
+
+        half = "a" * (MAX_CHARACTERS_PER_REQUEST // 2)
+        texts = [half, half, "b", half]
+
+        chunks = split_into_chunks(texts)
+
+        self.assertEqual(chunks, [[half, half], ["b", half]])
+
+    def test_split_into_chunks_too_long_text(self):
+        """1つで最大文字数を超える文字列は単独のチャンクとするテスト"""
+
+        too_long = "a" * (MAX_CHARACTERS_PER_REQUEST + 1)
+
+        chunks = split_into_chunks(["b", too_long, "c"])
+
+        self.assertEqual(chunks, [["b"], [too_long], ["c"]])
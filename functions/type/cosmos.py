@@ -1,6 +1,8 @@
 """Cosmos DBの項目の型定義"""
 
-from typing import List, Optional, TypedDict
+from typing import Dict, List, Optional, TypedDict
+
+from type.response import GetTestsRes
 
 
 class Answer(TypedDict):
@@ -33,6 +35,11 @@ class Answer(TypedDict):
     テストID
     """
 
+    questionHash: Optional[str]
+    """
+    生成時のQuestionコンテナーの項目の問題文・選択肢・回答の選択肢の個数・画像URLのハッシュ値
+    """
+
 
 class Community(TypedDict):
     """
@@ -237,7 +244,27 @@ class Question(TypedDict):
 
     discussions: Optional[List[QuestionDiscussion]]
     """
-    コミュニティでのディスカッション
+    コミュニティでのディスカッション(Discussionコンテナーへの移行前の項目のみ)
+    """
+
+    discussionNum: Optional[int]
+    """
+    Discussionコンテナーに格納したコミュニティでのディスカッションの件数
+    """
+
+    translatedSubjects: Optional[List[str]]
+    """
+    インポート時に日本語に翻訳した問題文(翻訳しない問題文はそのまま)
+    """
+
+    translatedChoices: Optional[List[Optional[str]]]
+    """
+    インポート時に日本語に翻訳した選択肢(翻訳しない選択肢はそのまま、画像URLのみの場合はNone)
+    """
+
+    contentHash: Optional[str]
+    """
+    インポートデータの要素のハッシュ値(再インポート時の差分の判定に用いる)
     """
 
 
@@ -265,3 +292,194 @@ class Test(TypedDict):
     """
     テストの問題数
     """
+
+
+class Translation(TypedDict):
+    """
+    Translationコンテナーの項目の型
+    """
+
+    id: str
+    """
+    ドキュメントID (= 翻訳元の言語・翻訳先の言語・翻訳元の文字列から算出したSHA-256のハッシュ値)
+    """
+
+    sourceLanguage: str
+    """
+    翻訳元の言語
+    """
+
+    targetLanguage: str
+    """
+    翻訳先の言語
+    """
+
+    translatedText: str
+    """
+    翻訳した文字列
+    """
+
+
+class Lease(TypedDict):
+    """
+    Leaseコンテナーの項目の型
+    """
+
+    id: str
+    """
+    ドキュメントID (= リースのキー)
+    """
+
+    acquiredAt: float
+    """
+    リースを取得したUNIX時間(秒)
+    """
+
+    expiresAt: float
+    """
+    リースの有効期限のUNIX時間(秒)
+    """
+
+    ttl: int
+    """
+    Cosmos DBで項目を自動削除するまでの秒数
+    """
+
+    completed: bool
+    """
+    リースを保持したインスタンスが処理を終えた場合はtrue、処理中の場合はfalse
+    """
+
+
+class ImportCheckpoint(TypedDict):
+    """
+    Importコンテナーの項目の型
+    """
+
+    id: str
+    """
+    ドキュメントID (= コース名・テスト名から生成したキー)
+    """
+
+    courseName: str
+    """
+    コース名
+    """
+
+    testName: str
+    """
+    テスト名
+    """
+
+    contentVersion: Optional[str]
+    """
+    インポートデータファイルのバージョン(ETagなど、取得できない場合はNone)
+    """
+
+    testId: str
+    """
+    インポート先のTestコンテナーの項目のID
+    """
+
+    committedNumber: int
+    """
+    upsertが完了した最後の問題番号
+    """
+
+    ttl: Optional[int]
+    """
+    Cosmos DBで項目を自動削除するまでの秒数(保存時に設定)
+    """
+
+
+class ImportJob(TypedDict):
+    """
+    Importコンテナーの、問題番号の範囲ごとに分割したインポートの進捗を記録する項目の型
+    """
+
+    id: str
+    """
+    ドキュメントID (= コース名・テスト名・インポートデータファイルのバージョンから生成したキー)
+    """
+
+    courseName: str
+    """
+    コース名
+    """
+
+    testName: str
+    """
+    テスト名
+    """
+
+    contentVersion: str
+    """
+    インポートデータファイルのバージョン(ETagなど)
+    """
+
+    testId: str
+    """
+    インポート先のTestコンテナーの項目のID
+    """
+
+    length: int
+    """
+    インポートデータファイルの要素数
+    """
+
+    chunkCount: int
+    """
+    問題番号の範囲の個数
+    """
+
+    completedChunks: Dict[str, bool]
+    """
+    upsertが完了した範囲のインデックス(文字列)をキーとした辞書
+    """
+
+    ttl: Optional[int]
+    """
+    Cosmos DBで項目を自動削除するまでの秒数(保存時に設定)
+    """
+
+
+class TestsCatalog(TypedDict):
+    """
+    Catalogコンテナーの、テストの一覧をまとめた項目の型
+    """
+
+    id: str
+    """
+    カタログのID("tests"固定)
+    """
+
+    courses: GetTestsRes
+    """
+    [GET] /tests のレスポンスボディ(コース名・テスト名の昇順)
+    """
+
+
+class Discussion(TypedDict):
+    """
+    Discussionコンテナーの項目の型
+    """
+
+    id: str
+    """
+    ドキュメントID (= "{テストID}_{問題番号}")
+    """
+
+    number: int
+    """
+    問題番号
+    """
+
+    testId: str
+    """
+    テストID
+    """
+
+    discussions: List[QuestionDiscussion]
+    """
+    コミュニティでのディスカッション
+    """
@@ -101,3 +101,24 @@ class ImportData(TypedDict):
     """
     コース名をキーとする、各テストのインポートデータのディクショナリ
     """
+
+
+class ImportManifestEntry(TypedDict):
+    """
+    インポートマニフェストの、インポートデータファイルごとの要素の型
+    """
+
+    size: int
+    """
+    ファイルサイズ(バイト)
+    """
+
+    mtime: int
+    """
+    最終更新日時(エポックからのナノ秒)
+    """
+
+    contentHash: str
+    """
+    ファイルの内容のSHA-256ハッシュ値
+    """
@@ -68,3 +68,64 @@ class MessageCommunity(TypedDict):
     """
     コミュニティでの回答の割合
     """
+
+
+class MessageImportChunk(TypedDict):
+    """
+    インポートデータファイルの問題番号の範囲ごとのインポート用のメッセージの型
+    """
+
+    jobId: str
+    """
+    インポートジョブのID (= Importコンテナーの項目のID)
+    """
+
+    courseName: str
+    """
+    コース名
+    """
+
+    testName: str
+    """
+    テスト名
+    """
+
+    testId: str
+    """
+    テストID
+    """
+
+    contentVersion: str
+    """
+    インポートデータファイルのバージョン(ETagなど)
+    """
+
+    chunkIndex: int
+    """
+    範囲のインデックス
+    """
+
+    startNumber: int
+    """
+    範囲の最初の問題番号
+    """
+
+    endNumber: int
+    """
+    範囲の最後の問題番号
+    """
+
+    startOffset: int
+    """
+    インポートデータファイル内の、範囲の最初の要素の開始のバイト位置
+    """
+
+    endOffset: int
+    """
+    インポートデータファイル内の、範囲の最後の要素の終了のバイト位置(その位置を含まない)
+    """
+
+    chunkHash: str
+    """
+    範囲のバイト列のSHA-256のハッシュ値(インポートデータファイルの更新の検知に用いる)
+    """
@@ -55,3 +55,40 @@ class PostProgressReq(TypedDict):
     """
     正解の選択肢のインデックス
     """
+
+
+class PostProgressesBatchElement(TypedDict):
+    """
+    [POST] /tests/{testId}/progresses/batch のリクエストボディの各要素の型
+    """
+
+    questionNumber: int
+    """
+    問題番号
+    """
+
+    isCorrect: bool
+    """
+    正解の場合はtrue、不正解の場合はfalse
+    """
+
+    selectedIdxes: List[int]
+    """
+    選択した選択肢のインデックス
+    """
+
+    correctIdxes: List[int]
+    """
+    正解の選択肢のインデックス
+    """
+
+
+class PostProgressesBatchReq(TypedDict):
+    """
+    [POST] /tests/{testId}/progresses/batch のリクエストボディの型
+    """
+
+    __root__: List[PostProgressesBatchElement]
+    """
+    回答した順番に並べた回答履歴
+    """
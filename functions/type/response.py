@@ -93,6 +93,11 @@ class PostAnswerRes(TypedDict, total=False):
     各選択肢の正解/不正解の理由
     """
 
+    isCached: bool
+    """
+    Answerコンテナーに保存済の項目を返した場合はtrue、生成した場合はfalse
+    """
+
 
 class GetCommunityRes(TypedDict):
     """
@@ -222,6 +227,59 @@ class PostProgressRes(TypedDict):
     """
 
 
+class PostProgressesBatchRes(TypedDict):
+    """
+    [POST] /tests/{testId}/progresses/batch のレスポンスボディの型
+    """
+
+    savedNum: int
+    """
+    保存した回答履歴の個数
+    """
+
+    progressNum: int
+    """
+    保存後の回答済の問題数
+    """
+
+    correctNum: int
+    """
+    保存後の正解した問題数
+    """
+
+    nextQuestionNumber: Optional[int]
+    """
+    次に解く問題番号(すべての問題を回答済の場合はNone)
+    """
+
+
+class GetSyncRes(TypedDict):
+    """
+    [GET] /tests/{testId}/sync のレスポンスボディの型
+    """
+
+    progress: Optional[GetProgressesRes]
+    """
+    ウォーターマークより後に変更した場合のテストを解く問題番号の順番・進捗項目
+    (変更していない場合、2回目以降の同期で項目が存在しない場合、または最後のページでない場合はNone)
+    """
+
+    favorites: List[Favorite]
+    """
+    ウォーターマークより後に変更したお気に入り情報(変更日時の昇順)
+    """
+
+    watermark: int
+    """
+    次回の同期のsinceに指定するウォーターマーク(変更日時のUNIXタイムスタンプ)
+    """
+
+    continuationToken: Optional[str]
+    """
+    続きのお気に入り情報を取得するための継続トークン(最後のページの場合はNone)
+    """
+
+
 class Subject(TypedDict):
     """
     [GET] /tests/{testId}/questions/{questionNumber} のレスポンスボディのsubjectsフィールドの各要素の型
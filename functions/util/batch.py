@@ -0,0 +1,123 @@
+"""Cosmos DBのトランザクションバッチのユーティリティ関数"""
+
+import json
+import logging
+import time
+from typing import Any, Iterator, Mapping, Sequence
+
+from azure.cosmos import ContainerProxy
+from azure.cosmos.exceptions import CosmosHttpResponseError
+from azure.cosmos.http_constants import StatusCodes
+from util.throttle import AdaptiveThrottle
+
+# トランザクションバッチの最大操作数
+MAX_BATCH_OPERATIONS: int = 100
+
+# トランザクションバッチの要求の最大サイズ(2MB)に対し、操作ごとのオーバーヘッドを見込んだ項目の合計サイズの上限
+MAX_BATCH_BYTES: int = 1536 * 1024
+
+
+def split_into_batches(
+    items: Sequence[Mapping[str, Any]],
+    max_operations: int = MAX_BATCH_OPERATIONS,
+    max_bytes: int = MAX_BATCH_BYTES,
+) -> Iterator[list[Mapping[str, Any]]]:
+    """
+    項目を、トランザクションバッチの最大操作数・最大サイズを超えないように、順序を保ったまま分割する
+    ただし、1つで最大サイズを超える項目は、その項目のみを1つのバッチとする
+
+    Args:
+        items (Sequence[Mapping[str, Any]]): 項目
+        max_operations (int): 1バッチあたりの最大操作数
+        max_bytes (int): 1バッチあたりの項目の合計サイズの上限(バイト)
+
+    Returns:
+        Iterator[list[Mapping[str, Any]]]: バッチごとの項目
+    """
+
+    batch: list[Mapping[str, Any]] = []
+    batch_bytes = 0
+    for item in items:
+        item_bytes = len(json.dumps(item, ensure_ascii=False).encode("utf-8"))
+        if batch and (
+            len(batch) >= max_operations or batch_bytes + item_bytes > max_bytes
+        ):
+            yield batch
+            batch = []
+            batch_bytes = 0
+        batch.append(item)
+        batch_bytes += item_bytes
+    if batch:
+        yield batch
+
+
+def _execute_upsert_batch(
+    container: ContainerProxy,
+    throttle: AdaptiveThrottle,
+    batch: list[Mapping[str, Any]],
+    partition_key: str,
+) -> None:
+    """
+    同一パーティションの項目を1つのトランザクションバッチでupsertし、消費した要求ユニット(RU)数・レイテンシーをログ出力する
+    要求のサイズが大きすぎる場合は、バッチを半分に分割してupsertする
+
+    Args:
+        container (ContainerProxy): コンテナーのインスタンス
+        throttle (AdaptiveThrottle): 流量を調整するインスタンス
+        batch (list[Mapping[str, Any]]): 項目
+        partition_key (str): パーティションキーの値
+    """
+
+    elapsed_ms: list[float] = []
+
+    def execute(response_hook: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return container.execute_item_batch(
+                batch_operations=[("upsert", (item,)) for item in batch],
+                partition_key=partition_key,
+                response_hook=response_hook,
+            )
+        finally:
+            elapsed_ms.append((time.perf_counter() - start) * 1000)
+
+    request_charge = throttle.request_charge
+    try:
+        throttle.run(execute)
+    except CosmosHttpResponseError as e:
+        if e.status_code != StatusCodes.REQUEST_ENTITY_TOO_LARGE or len(batch) == 1:
+            raise
+        logging.warning({"split_batch_operations": len(batch)})
+        half = len(batch) // 2
+        _execute_upsert_batch(container, throttle, batch[:half], partition_key)
+        _execute_upsert_batch(container, throttle, batch[half:], partition_key)
+        return
+
+    logging.info(
+        {
+            "batch_operations": len(batch),
+            "batch_request_charge": round(throttle.request_charge - request_charge, 2),
+            "batch_elapsed_ms": round(sum(elapsed_ms), 2),
+        }
+    )
+
+
+def upsert_items_in_batches(
+    container: ContainerProxy,
+    items: Sequence[Mapping[str, Any]],
+    partition_key: str,
+    throttle: AdaptiveThrottle,
+) -> None:
+    """
+    同一パーティションの項目を、トランザクションバッチにまとめてupsertする
+    各バッチ内のupsertはすべて成功するか、すべて失敗する
+
+    Args:
+        container (ContainerProxy): コンテナーのインスタンス
+        items (Sequence[Mapping[str, Any]]): 項目
+        partition_key (str): 項目のパーティションキーの値
+        throttle (AdaptiveThrottle): 流量を調整するインスタンス
+    """
+
+    for batch in split_into_batches(items):
+        _execute_upsert_batch(container, throttle, batch, partition_key)
@@ -0,0 +1,103 @@
+"""テストの一覧をまとめたカタログのユーティリティ関数"""
+
+import logging
+from typing import Iterable
+
+from azure.core import MatchConditions
+from azure.cosmos import ContainerProxy
+from azure.cosmos.exceptions import (
+    CosmosAccessConditionFailedError,
+    CosmosResourceExistsError,
+    CosmosResourceNotFoundError,
+)
+from type.cosmos import Test, TestsCatalog
+from type.response import GetTestsRes
+from util.cosmos import get_read_write_container
+
+# テストの一覧をまとめたカタログのID
+CATALOG_TESTS_ID: str = "tests"
+
+# 他のインスタンスとカタログの更新が競合した場合に、再生成する最大回数
+CATALOG_MAX_RETRIES: int = 5
+
+
+def _get_catalog_container() -> ContainerProxy:
+    """
+    Catalogコンテナーのインスタンスを返す
+
+    Returns:
+        ContainerProxy: Catalogコンテナーのインスタンス
+    """
+
+    return get_read_write_container(database_name="Users", container_name="Catalog")
+
+
+def build_tests_catalog(test_items: Iterable[Test]) -> GetTestsRes:
+    """
+    Testコンテナーの項目を、コース名・テスト名の昇順に並べてコース名ごとにまとめる
+
+    Args:
+        test_items (Iterable[Test]): Testコンテナーの項目
+
+    Returns:
+        GetTestsRes: [GET] /tests のレスポンスボディ
+    """
+
+    courses: GetTestsRes = {}
+    for item in sorted(
+        test_items, key=lambda item: (item["courseName"], item["testName"])
+    ):
+        courses.setdefault(item["courseName"], []).append(
+            {
+                "id": item["id"],
+                "testName": item["testName"],
+                "length": item["length"],
+            }
+        )
+    return courses
+
+
+def refresh_tests_catalog() -> None:
+    """
+    Testコンテナーの全項目からカタログを再生成して保存する
+    他のインスタンスが先にカタログを更新した場合は、その更新後のTestコンテナーの項目から再生成する
+    (カタログには、最後に保存したインスタンスが読み込んだ時点までのすべての更新が含まれる)
+
+    Raises:
+        RuntimeError: 他のインスタンスとの競合が続き、カタログを保存できない場合
+    """
+
+    catalog_container = _get_catalog_container()
+    test_container = get_read_write_container(
+        database_name="Users", container_name="Test"
+    )
+
+    for _ in range(CATALOG_MAX_RETRIES):
+        try:
+            existing_catalog = catalog_container.read_item(
+                item=CATALOG_TESTS_ID, partition_key=CATALOG_TESTS_ID
+            )
+        except CosmosResourceNotFoundError:
+            existing_catalog = None
+
+        catalog: TestsCatalog = {
+            "id": CATALOG_TESTS_ID,
+            "courses": build_tests_catalog(test_container.read_all_items()),
+        }
+        try:
+            if existing_catalog is None:
+                catalog_container.create_item(catalog)
+            else:
+                catalog_container.replace_item(
+                    item=CATALOG_TESTS_ID,
+                    body=catalog,
+                    etag=existing_catalog["_etag"],
+                    match_condition=MatchConditions.IfNotModified,
+                )
+        except (CosmosResourceExistsError, CosmosAccessConditionFailedError):
+            # 他のインスタンスがカタログを作成・更新した場合
+            continue
+        logging.info({"tests_catalog_courses": len(catalog["courses"])})
+        return
+
+    raise RuntimeError("Tests Catalog Update Conflicted")
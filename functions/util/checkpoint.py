@@ -0,0 +1,163 @@
+"""インポートの進捗を記録するチェックポイント・インポートジョブのユーティリティ関数"""
+
+import logging
+import os
+import traceback
+
+from azure.cosmos import ContainerProxy
+from azure.cosmos.exceptions import CosmosResourceNotFoundError
+from type.cosmos import ImportCheckpoint, ImportJob
+from util.cosmos import get_read_write_container
+from util.hashing import compute_content_hash
+
+# チェックポイント・インポートジョブの有効期間(秒)の既定値
+DEFAULT_IMPORT_CHECKPOINT_TTL_SECONDS: int = 7 * 24 * 60 * 60
+
+
+def _get_import_container() -> ContainerProxy:
+    """
+    Importコンテナーのインスタンスを返す
+
+    Returns:
+        ContainerProxy: Importコンテナーのインスタンス
+    """
+
+    return get_read_write_container(database_name="Users", container_name="Import")
+
+
+def get_import_checkpoint_id(course_name: str, test_name: str) -> str:
+    """
+    コース名・テスト名から、チェックポイントのドキュメントIDを生成する
+    コース名・テスト名に含まれる文字によらず、ドキュメントIDとして使用できる値とする
+
+    Args:
+        course_name (str): コース名
+        test_name (str): テスト名
+
+    Returns:
+        str: チェックポイントのドキュメントID
+    """
+
+    return compute_content_hash([course_name, test_name])
+
+
+def get_import_checkpoint(checkpoint_id: str) -> ImportCheckpoint | None:
+    """
+    チェックポイントを取得する
+
+    Args:
+        checkpoint_id (str): チェックポイントのドキュメントID
+
+    Returns:
+        ImportCheckpoint | None: チェックポイント(存在しない場合、Importコンテナーの操作に失敗した場合はNone)
+    """
+
+    try:
+        return _get_import_container().read_item(
+            item=checkpoint_id, partition_key=checkpoint_id
+        )
+    except CosmosResourceNotFoundError:
+        return None
+    except Exception:
+        logging.warning(traceback.format_exc())
+        return None
+
+
+def save_import_checkpoint(checkpoint: ImportCheckpoint) -> None:
+    """
+    チェックポイントを保存する
+    Importコンテナーの操作に失敗した場合は、前回保存したチェックポイントから再開するため無視する
+
+    Args:
+        checkpoint (ImportCheckpoint): チェックポイント
+    """
+
+    checkpoint["ttl"] = int(
+        os.getenv(
+            "IMPORT_CHECKPOINT_TTL_SECONDS", str(DEFAULT_IMPORT_CHECKPOINT_TTL_SECONDS)
+        )
+    )
+    try:
+        _get_import_container().upsert_item(checkpoint)
+    except Exception:
+        logging.warning(traceback.format_exc())
+
+
+def delete_import_checkpoint(checkpoint_id: str) -> None:
+    """
+    チェックポイントを削除する
+
+    Args:
+        checkpoint_id (str): チェックポイントのドキュメントID
+    """
+
+    try:
+        _get_import_container().delete_item(
+            item=checkpoint_id, partition_key=checkpoint_id
+        )
+    except CosmosResourceNotFoundError:
+        pass
+    except Exception:
+        logging.warning(traceback.format_exc())
+
+
+def get_import_job_id(course_name: str, test_name: str, content_version: str) -> str:
+    """
+    コース名・テスト名・インポートデータファイルのバージョンから、インポートジョブのドキュメントIDを生成する
+
+    Args:
+        course_name (str): コース名
+        test_name (str): テスト名
+        content_version (str): インポートデータファイルのバージョン
+
+    Returns:
+        str: インポートジョブのドキュメントID
+    """
+
+    return compute_content_hash([course_name, test_name, content_version])
+
+
+def create_import_job(job: ImportJob) -> None:
+    """
+    インポートジョブを保存する
+    同じドキュメントIDのインポートジョブが存在する場合は、upsertが完了した範囲を初期化して上書きする
+
+    Args:
+        job (ImportJob): インポートジョブ
+    """
+
+    job["ttl"] = int(
+        os.getenv(
+            "IMPORT_CHECKPOINT_TTL_SECONDS", str(DEFAULT_IMPORT_CHECKPOINT_TTL_SECONDS)
+        )
+    )
+    _get_import_container().upsert_item(job)
+
+
+def complete_import_chunk(job_id: str, chunk_index: int) -> ImportJob | None:
+    """
+    インポートジョブに、指定した範囲のupsertが完了したことを記録する
+    部分的な更新で記録するため、複数のインスタンスが同時に記録しても互いに上書きしない
+
+    Args:
+        job_id (str): インポートジョブのドキュメントID
+        chunk_index (int): 範囲のインデックス
+
+    Returns:
+        ImportJob | None: 記録後のインポートジョブ(存在しない場合はNone)
+    """
+
+    try:
+        return _get_import_container().patch_item(
+            item=job_id,
+            partition_key=job_id,
+            patch_operations=[
+                {
+                    "op": "set",
+                    "path": f"/completedChunks/{chunk_index}",
+                    "value": True,
+                }
+            ],
+        )
+    except CosmosResourceNotFoundError:
+        return None
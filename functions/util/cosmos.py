@@ -1,8 +1,80 @@
 """Cosmos DBのユーティリティ関数"""
 
+import asyncio
 import os
+from threading import Lock
 
 from azure.cosmos import ContainerProxy, CosmosClient
+from azure.cosmos.aio import ContainerProxy as AsyncContainerProxy
+from azure.cosmos.aio import CosmosClient as AsyncCosmosClient
+
+# ワーカープロセス内で共有するCosmosClient・ContainerProxyのレジストリ
+# CosmosClientの生成にはTLSハンドシェイク・アカウントのメタデータ取得・パーティションマップ取得が
+# 伴うため、エンドポイント/キーごとに1回だけ生成して再利用する
+_clients: dict[tuple[str, str], CosmosClient] = {}
+_containers: dict[tuple[str, str, str, str], ContainerProxy] = {}
+_lock: Lock = Lock()
+
+# ワーカープロセス内で共有する非同期版のCosmosClient・ContainerProxyのレジストリ
+# 非同期版のCosmosClientは生成したイベントループに紐づくため、イベントループとともに保持する
+_async_clients: dict[
+    tuple[str, str], tuple[asyncio.AbstractEventLoop, AsyncCosmosClient]
+] = {}
+_async_containers: dict[
+    tuple[str, str, str, str], tuple[asyncio.AbstractEventLoop, AsyncContainerProxy]
+] = {}
+
+
+def get_cosmos_client(credential: str) -> CosmosClient:
+    """
+    指定したキーでのCosmos DBアカウントのクライアントを、ワーカープロセス内で共有して返す
+
+    Args:
+        credential (str): Cosmos DBアカウントのキー
+
+    Returns:
+        CosmosClient: Cosmos DBアカウントのクライアント
+    """
+
+    url = os.environ["COSMOSDB_URI"]
+    key = (url, credential)
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                client = CosmosClient(url=url, credential=credential)
+                _clients[key] = client
+    return client
+
+
+def _get_container(
+    credential: str, database_name: str, container_name: str
+) -> ContainerProxy:
+    """
+    指定したキー・データベース名・コンテナー名でのコンテナーのインスタンスを、
+    ワーカープロセス内で共有して返す
+
+    Args:
+        credential (str): Cosmos DBアカウントのキー
+        database_name (str): Cosmos DBアカウントのデータベース名
+        container_name (str): Cosmos DBアカウントのコンテナー名
+
+    Returns:
+        ContainerProxy: Cosmos DBアカウントのコンテナーのインスタンス
+    """
+
+    key = (os.environ["COSMOSDB_URI"], credential, database_name, container_name)
+    container = _containers.get(key)
+    if container is None:
+        container = (
+            get_cosmos_client(credential)
+            .get_database_client(database_name)
+            .get_container_client(container_name)
+        )
+        with _lock:
+            container = _containers.setdefault(key, container)
+    return container
 
 
 def get_read_only_container(database_name: str, container_name: str) -> ContainerProxy:
@@ -17,13 +89,8 @@ def get_read_only_container(database_name: str, container_name: str) -> Containe
         ContainerProxy: Cosmos DBアカウントのコンテナーの読み取り専用インスタンス
     """
 
-    return (
-        CosmosClient(
-            url=os.environ["COSMOSDB_URI"],
-            credential=os.environ["COSMOSDB_READONLY_KEY"],
-        )
-        .get_database_client(database_name)
-        .get_container_client(container_name)
+    return _get_container(
+        os.environ["COSMOSDB_READONLY_KEY"], database_name, container_name
     )
 
 
@@ -39,11 +106,80 @@ def get_read_write_container(database_name: str, container_name: str) -> Contain
         ContainerProxy: Cosmos DBアカウントのコンテナーのインスタンス
     """
 
-    return (
-        CosmosClient(
-            url=os.environ["COSMOSDB_URI"],
-            credential=os.environ["COSMOSDB_KEY"],
-        )
+    return _get_container(os.environ["COSMOSDB_KEY"], database_name, container_name)
+
+
+def _get_async_container(
+    credential: str, database_name: str, container_name: str
+) -> AsyncContainerProxy:
+    """
+    指定したキー・データベース名・コンテナー名でのコンテナーの非同期版のインスタンスを、
+    実行中のイベントループ内で共有して返す
+
+    Args:
+        credential (str): Cosmos DBアカウントのキー
+        database_name (str): Cosmos DBアカウントのデータベース名
+        container_name (str): Cosmos DBアカウントのコンテナー名
+
+    Returns:
+        AsyncContainerProxy: Cosmos DBアカウントのコンテナーの非同期版のインスタンス
+
+    Raises:
+        RuntimeError: イベントループが実行中でない場合
+    """
+
+    loop = asyncio.get_running_loop()
+    url = os.environ["COSMOSDB_URI"]
+
+    cached_container = _async_containers.get(
+        (url, credential, database_name, container_name)
+    )
+    if cached_container is not None and cached_container[0] is loop:
+        return cached_container[1]
+
+    cached_client = _async_clients.get((url, credential))
+    if cached_client is None or cached_client[0] is not loop:
+        cached_client = (loop, AsyncCosmosClient(url=url, credential=credential))
+        _async_clients[(url, credential)] = cached_client
+
+    container = (
+        cached_client[1]
         .get_database_client(database_name)
         .get_container_client(container_name)
     )
+    _async_containers[(url, credential, database_name, container_name)] = (
+        loop,
+        container,
+    )
+    return container
+
+
+def get_async_read_only_container(
+    database_name: str, container_name: str
+) -> AsyncContainerProxy:
+    """
+    指定したCosmos DBアカウントのコンテナーの読み取り専用の非同期版インスタンスを返す
+
+    Args:
+        database_name (str): Cosmos DBアカウントのデータベース名
+        container_name (str): Cosmos DBアカウントのコンテナー名
+
+    Returns:
+        AsyncContainerProxy: Cosmos DBアカウントのコンテナーの読み取り専用の非同期版インスタンス
+    """
+
+    return _get_async_container(
+        os.environ["COSMOSDB_READONLY_KEY"], database_name, container_name
+    )
+
+
+def reset_cosmos_clients() -> None:
+    """
+    ワーカープロセス内で共有するCosmosClient・ContainerProxyをすべて破棄する
+    """
+
+    with _lock:
+        _clients.clear()
+        _containers.clear()
+        _async_clients.clear()
+        _async_containers.clear()
@@ -0,0 +1,89 @@
+"""Discussionコンテナーの項目のユーティリティ関数"""
+
+import logging
+
+from azure.core import MatchConditions
+from azure.cosmos import ContainerProxy
+from azure.cosmos.exceptions import (
+    CosmosAccessConditionFailedError,
+    CosmosResourceExistsError,
+)
+from type.cosmos import Discussion, Question
+
+
+def split_discussion_items(question_items: list[Question]) -> list[Discussion]:
+    """
+    Questionコンテナーの項目からdiscussionsフィールドを取り除いてその件数に置き換え、
+    ディスカッションが存在する項目のみ、Discussionコンテナーの項目として返す
+
+    Args:
+        question_items (list[Question]): Questionコンテナーの項目(discussionsフィールドを取り除く)
+
+    Returns:
+        list[Discussion]: Discussionコンテナーの項目
+    """
+
+    discussion_items: list[Discussion] = []
+    for question_item in question_items:
+        discussions = question_item.pop("discussions", None) or []
+        question_item["discussionNum"] = len(discussions)
+        if discussions:
+            discussion_items.append(
+                {
+                    "id": question_item["id"],
+                    "number": question_item["number"],
+                    "testId": question_item["testId"],
+                    "discussions": discussions,
+                }
+            )
+    return discussion_items
+
+
+def migrate_question_discussions(
+    container_question: ContainerProxy, container_discussion: ContainerProxy
+) -> int:
+    """
+    discussionsフィールドを持つQuestionコンテナーの項目を、Discussionコンテナーの項目に分割する
+    Discussionコンテナーの項目を作成した後、Questionコンテナーの項目のdiscussionsフィールドを件数に置き換える
+    Discussionコンテナーの項目が作成済の場合(中断した移行の再実行か、インポートで分割済の場合)は上書きせず、
+    取得後にインポートで更新されたQuestionコンテナーの項目は、インポートで分割済のため置き換えない
+
+    Args:
+        container_question (ContainerProxy): Questionコンテナーのインスタンス
+        container_discussion (ContainerProxy): Discussionコンテナーのインスタンス
+
+    Returns:
+        int: 分割したQuestionコンテナーの項目数
+    """
+
+    migrated_num = 0
+    for question_item in container_question.query_items(
+        query="SELECT * FROM c WHERE IS_DEFINED(c.discussions)",
+        enable_cross_partition_query=True,
+    ):
+        etag = question_item["_etag"]
+        for discussion_item in split_discussion_items([question_item]):
+            try:
+                container_discussion.create_item(discussion_item)
+            except CosmosResourceExistsError:
+                pass
+        try:
+            container_question.patch_item(
+                item=question_item["id"],
+                partition_key=question_item["testId"],
+                patch_operations=[
+                    {"op": "remove", "path": "/discussions"},
+                    {
+                        "op": "set",
+                        "path": "/discussionNum",
+                        "value": question_item["discussionNum"],
+                    },
+                ],
+                etag=etag,
+                match_condition=MatchConditions.IfNotModified,
+            )
+        except CosmosAccessConditionFailedError:
+            logging.warning({"skipped_migration_question_id": question_item["id"]})
+            continue
+        migrated_num += 1
+    return migrated_num
@@ -0,0 +1,64 @@
+"""ハッシュ値のユーティリティ関数"""
+
+import hashlib
+import json
+from typing import Any
+
+from type.cosmos import Question
+from type.importing import ImportItem
+
+
+def compute_content_hash(content: Any) -> str:
+    """
+    JSONにシリアライズ可能な値から、キーの順序によらないSHA-256のハッシュ値を算出する
+
+    Args:
+        content (Any): JSONにシリアライズ可能な値
+
+    Returns:
+        str: SHA-256のハッシュ値(16進数)
+    """
+
+    return hashlib.sha256(
+        json.dumps(
+            content, ensure_ascii=False, sort_keys=True, separators=(",", ":")
+        ).encode("utf-8")
+    ).hexdigest()
+
+
+def compute_question_hash(item: Question) -> str:
+    """
+    Questionコンテナーの項目のうち、正解の選択肢・正解/不正解の理由の生成に用いる
+    問題文・選択肢・回答の選択肢の個数・画像URLのハッシュ値を算出する
+
+    Args:
+        item (Question): Questionコンテナーの項目
+
+    Returns:
+        str: SHA-256のハッシュ値(16進数)
+    """
+
+    return compute_content_hash(
+        {
+            "subjects": item.get("subjects"),
+            "choices": item.get("choices"),
+            "answerNum": item.get("answerNum"),
+            "indicateSubjectImgIdxes": item.get("indicateSubjectImgIdxes"),
+            "indicateChoiceImgs": item.get("indicateChoiceImgs"),
+        }
+    )
+
+
+def compute_import_item_hash(item: ImportItem) -> str:
+    """
+    インポートデータの各要素のハッシュ値を算出する
+    Questionコンテナーの項目のcontentHashフィールドに格納し、再インポート時の差分の判定に用いる
+
+    Args:
+        item (ImportItem): インポートデータの各要素
+
+    Returns:
+        str: SHA-256のハッシュ値(16進数)
+    """
+
+    return compute_content_hash(item)
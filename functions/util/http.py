@@ -0,0 +1,104 @@
+"""HTTPトリガーのレスポンスのユーティリティ関数"""
+
+import json
+import os
+from typing import Any
+
+import azure.functions as func
+from util.hashing import compute_content_hash
+
+# 項目が存在する場合に、クライアントが再検証せずにレスポンスを再利用できる秒数の既定値
+DEFAULT_HTTP_CACHE_MAX_AGE_SECONDS: int = 60
+
+# 項目が存在しない場合など、すぐに内容が変わりうるレスポンスのCache-Controlヘッダー(毎回再検証する)
+NO_CACHE_CONTROL: str = "private, no-cache"
+
+
+def get_cache_control() -> str:
+    """
+    項目が存在する場合のレスポンスのCache-Controlヘッダーを返す
+    リクエストにはアクセストークンが含まれるため、共有キャッシュには格納させない
+
+    Returns:
+        str: Cache-Controlヘッダーの値
+    """
+
+    max_age = int(
+        os.getenv("HTTP_CACHE_MAX_AGE_SECONDS", str(DEFAULT_HTTP_CACHE_MAX_AGE_SECONDS))
+    )
+    return f"private, max-age={max_age}"
+
+
+def make_etag(*values: Any) -> str:
+    """
+    Cosmos DBの項目の_etagフィールドやレスポンスボディなど、レスポンスの内容を決める値から強いETagを生成する
+
+    Args:
+        *values (Any): JSONにシリアライズ可能な値
+
+    Returns:
+        str: ETagヘッダーの値(ダブルクォーテーションで囲んだ文字列)
+    """
+
+    return f'"{compute_content_hash(list(values))[:32]}"'
+
+
+def is_not_modified(req: func.HttpRequest, etag: str) -> bool:
+    """
+    リクエストのIf-None-MatchヘッダーがETagに一致するかを判定する(弱い比較)
+
+    Args:
+        req (func.HttpRequest): リクエスト
+        etag (str): レスポンスのETag
+
+    Returns:
+        bool: 一致する場合はTrue、一致しないかIf-None-Matchヘッダーがない場合はFalse
+    """
+
+    if_none_match = req.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+def create_json_response(body: Any, etag: str, cache_control: str) -> func.HttpResponse:
+    """
+    ETag・Cache-Controlヘッダーを付与したJSONのレスポンスを生成する
+
+    Args:
+        body (Any): レスポンスボディ
+        etag (str): ETagヘッダーの値
+        cache_control (str): Cache-Controlヘッダーの値
+
+    Returns:
+        func.HttpResponse: ステータスコード200のレスポンス
+    """
+
+    return func.HttpResponse(
+        body=json.dumps(body),
+        status_code=200,
+        mimetype="application/json",
+        headers={"ETag": etag, "Cache-Control": cache_control},
+    )
+
+
+def create_not_modified_response(etag: str, cache_control: str) -> func.HttpResponse:
+    """
+    クライアントがキャッシュしたレスポンスを再利用させる、ボディが空のレスポンスを生成する
+
+    Args:
+        etag (str): ETagヘッダーの値
+        cache_control (str): Cache-Controlヘッダーの値
+
+    Returns:
+        func.HttpResponse: ステータスコード304のレスポンス
+    """
+
+    return func.HttpResponse(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": cache_control},
+    )
@@ -0,0 +1,241 @@
+"""JSONのストリーミング読込みのユーティリティ関数"""
+
+import codecs
+import json
+from typing import Any, BinaryIO, Iterator
+
+# ストリームから1回に読み込むバイト数の既定値
+DEFAULT_CHUNK_SIZE: int = 64 * 1024
+
+# JSONの空白文字
+JSON_WHITESPACE: str = " \t\n\r"
+
+# 数値の途中で途切れた場合に、途切れた位置の文字になりうる小数点・指数の文字
+NUMBER_CONTINUATIONS: str = ".eE"
+
+# 次に読み込むものと読み込んだ文字から、その次に読み込むものへの遷移
+# "[" (配列の開始)、"first" (最初の要素か"]")、"value" (要素)、"separator" (","か"]")、"end" (配列の終了)
+STRUCTURAL_TRANSITIONS: dict[tuple[str, str], str] = {
+    ("[", "["): "first",
+    ("first", "]"): "end",
+    ("separator", ","): "value",
+    ("separator", "]"): "end",
+}
+
+
+def iter_json_array(
+    stream: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Any]:
+    """
+    UTF-8のJSONの配列を、ストリームから少しずつ読み込みながら1要素ずつ返す
+    保持するのは読込み中の要素とその前後のバッファのみで、配列全体は保持しない
+
+    Args:
+        stream (BinaryIO): JSONの配列を読み込むストリーム
+        chunk_size (int): ストリームから1回に読み込む最小のバイト数
+
+    Returns:
+        Iterator[Any]: 配列の各要素
+
+    Raises:
+        json.JSONDecodeError: JSONの配列として不正な場合
+    """
+
+    for item, _, _ in iter_json_array_with_offsets(stream, chunk_size):
+        yield item
+
+
+def _decode_head(
+    stream: BinaryIO, text_decoder: codecs.IncrementalDecoder
+) -> tuple[str, int]:
+    """
+    ストリームの先頭のBOMの長さ分を読み込み、BOMの場合は除去してデコードする
+
+    Args:
+        stream (BinaryIO): ストリーム
+        text_decoder (codecs.IncrementalDecoder): UTF-8のデコーダー
+
+    Returns:
+        tuple[str, int]: デコードした文字列と、その先頭のストリーム内のバイト位置
+    """
+
+    head = b""
+    while len(head) < len(codecs.BOM_UTF8):
+        chunk = stream.read(len(codecs.BOM_UTF8) - len(head))
+        if not chunk:
+            break
+        head += chunk
+    if head == codecs.BOM_UTF8:
+        return "", len(head)
+    return text_decoder.decode(head), 0
+
+
+def iter_json_array_with_offsets(
+    stream: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[tuple[Any, int, int]]:
+    """
+    UTF-8のJSONの配列を、ストリームから少しずつ読み込みながら1要素ずつ、ストリーム内の開始・終了のバイト位置とともに返す
+    保持するのは読込み中の要素とその前後のバッファのみで、配列全体は保持しない
+
+    Args:
+        stream (BinaryIO): JSONの配列を読み込むストリーム
+        chunk_size (int): ストリームから1回に読み込む最小のバイト数
+
+    Returns:
+        Iterator[tuple[Any, int, int]]: 配列の各要素と、その開始のバイト位置・終了のバイト位置(その位置を含まない)
+
+    Raises:
+        json.JSONDecodeError: JSONの配列として不正な場合
+    """
+
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+
+    # 先頭のBOMを除去し、その分のバイト位置を進める
+    # offsetは、バッファのposition文字目のストリーム内のバイト位置
+    buffer, offset = _decode_head(stream, text_decoder)
+    position = 0
+    is_eof = False
+    needs_more = True
+    expected = "["
+
+    while True:
+        # 読込み済の部分をバッファから破棄して追加で読み込む
+        # 1つの要素が複数回の読込みにまたがる場合に再解析の回数を抑えるため、バッファの長さ以上を読み込む
+        if needs_more:
+            if is_eof:
+                raise json.JSONDecodeError("Unterminated array", buffer, position)
+            buffer = buffer[position:]
+            position = 0
+            chunk = stream.read(max(chunk_size, len(buffer)))
+            is_eof = not chunk
+            buffer += text_decoder.decode(chunk, final=is_eof)
+            needs_more = False
+
+        # JSONの空白文字はすべて1バイトのため、読み飛ばした文字数だけバイト位置を進める
+        offset -= position
+        while position < len(buffer) and buffer[position] in JSON_WHITESPACE:
+            position += 1
+        offset += position
+        if position == len(buffer):
+            needs_more = True
+            continue
+
+        # 配列の開始・区切り・終了の文字を読み込む
+        char = buffer[position]
+        if expected in ("[", "separator") or (expected == "first" and char == "]"):
+            if (expected, char) not in STRUCTURAL_TRANSITIONS:
+                raise json.JSONDecodeError(f"Unexpected {char!r}", buffer, position)
+            expected = STRUCTURAL_TRANSITIONS[(expected, char)]
+            if expected == "end":
+                return
+            position += 1
+            offset += 1
+            continue
+
+        # 要素を読み込む
+        # 要素が途中で途切れている場合(末尾の数値や、"1."・"1e"のように小数部・指数部の途中で途切れた数値は
+        # 続きがある可能性がある場合を含む)は追加で読み込む
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if is_eof:
+                raise
+            needs_more = True
+            continue
+        if not is_eof and (
+            end == len(buffer)
+            or (isinstance(item, (int, float)) and buffer[end] in NUMBER_CONTINUATIONS)
+        ):
+            needs_more = True
+            continue
+        start_offset = offset
+        offset += len(buffer[position:end].encode("utf-8"))
+        yield item, start_offset, offset
+        position = end
+        expected = "separator"
+
+
+class RetainingStream:
+    """
+    ラップしたストリームから読み込んだバイト列を、破棄するまで保持するストリーム
+    iter_json_array_with_offsetsで読み込んだ要素の範囲のバイト列を取り出すために用いる
+    """
+
+    def __init__(self, stream: BinaryIO) -> None:
+        """
+        Args:
+            stream (BinaryIO): ラップするストリーム
+        """
+
+        self.stream = stream
+        self._retained = bytearray()
+        # 保持しているバイト列の先頭の、ストリーム内のバイト位置
+        self._retained_offset = 0
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        ラップしたストリームから読み込み、読み込んだバイト列を保持する
+
+        Args:
+            size (int): 読み込む最大のバイト数(負の場合は末尾まで)
+
+        Returns:
+            bytes: 読み込んだバイト列
+        """
+
+        chunk = self.stream.read(size)
+        self._retained += chunk
+        return chunk
+
+    def release(self, start: int, end: int) -> bytes:
+        """
+        保持しているバイト列のうち指定した範囲を返し、終了のバイト位置より前を破棄する
+
+        Args:
+            start (int): 開始のバイト位置(破棄していない位置)
+            end (int): 終了のバイト位置(その位置を含まない)
+
+        Returns:
+            bytes: 指定した範囲のバイト列
+        """
+
+        data = bytes(
+            self._retained[start - self._retained_offset : end - self._retained_offset]
+        )
+        del self._retained[: end - self._retained_offset]
+        self._retained_offset = end
+        return data
+
+
+def read_byte_range(
+    stream: BinaryIO, start: int, end: int, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> bytes:
+    """
+    シークできないストリームの先頭から、指定した範囲のバイト列を読み込む
+    開始のバイト位置より前は、chunk_sizeずつ読み込んで破棄する
+
+    Args:
+        stream (BinaryIO): ストリーム
+        start (int): 開始のバイト位置
+        end (int): 終了のバイト位置(その位置を含まない)
+        chunk_size (int): 読み込んで破棄する1回あたりの最大のバイト数
+
+    Returns:
+        bytes: 指定した範囲のバイト列(ストリームが途中で終了した場合はそこまで)
+    """
+
+    position = 0
+    while position < start:
+        chunk = stream.read(min(chunk_size, start - position))
+        if not chunk:
+            return b""
+        position += len(chunk)
+
+    data = bytearray()
+    while len(data) < end - start:
+        chunk = stream.read(end - start - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return bytes(data)
@@ -0,0 +1,243 @@
+"""インスタンス間で処理の重複を防ぐリースのユーティリティ関数"""
+
+import logging
+import os
+import time
+import traceback
+from functools import partial
+from typing import Callable, TypeVar
+
+from azure.core import MatchConditions
+from azure.cosmos import ContainerProxy
+from azure.cosmos.exceptions import (
+    CosmosAccessConditionFailedError,
+    CosmosResourceExistsError,
+    CosmosResourceNotFoundError,
+)
+from type.cosmos import Lease
+from util.cosmos import get_read_write_container
+
+T = TypeVar("T")
+
+# リースの有効期間(秒)の既定値
+DEFAULT_LEASE_TTL_SECONDS: int = 90
+
+# 他のインスタンスの処理結果を待つ最大時間(秒)の既定値
+# リースの取得をやり直す場合も含めた合計とし、HTTPトリガーの応答の上限(230秒)より十分短くする
+DEFAULT_LEASE_WAIT_SECONDS: int = 60
+
+# 他のインスタンスの処理結果を確認する間隔(秒)
+LEASE_POLL_INTERVAL_SECONDS: float = 1.0
+
+# 他のインスタンスの処理結果を取得できない場合に、リースの取得をやり直す最大回数
+MAX_LEASE_ACQUIRE_NUMBER: int = 3
+
+
+def _get_lease_container() -> ContainerProxy:
+    """
+    Leaseコンテナーのインスタンスを返す
+
+    Returns:
+        ContainerProxy: Leaseコンテナーのインスタンス
+    """
+
+    return get_read_write_container(database_name="Users", container_name="Lease")
+
+
+def acquire_lease(key: str, force: bool = False) -> str | None:
+    """
+    指定したキーのリースを取得する
+    有効期限切れのリース(forceの場合は完了済のリースも)は上書きして取得し、
+    Leaseコンテナーの操作に失敗した場合は取得したものとみなす
+
+    Args:
+        key (str): リースのキー
+        force (bool): 完了済のリースを上書きして取得する場合はTrue
+
+    Returns:
+        str | None: リースを取得した場合はリースの_etag(Leaseコンテナーの操作に失敗した場合は空文字列)、
+        他のインスタンスが保持している場合はNone
+    """
+
+    ttl = int(os.getenv("LEASE_TTL_SECONDS", str(DEFAULT_LEASE_TTL_SECONDS)))
+    now = time.time()
+    lease: Lease = {
+        "id": key,
+        "acquiredAt": now,
+        "expiresAt": now + ttl,
+        "ttl": ttl,
+        "completed": False,
+    }
+
+    try:
+        container = _get_lease_container()
+        try:
+            return container.create_item(lease)["_etag"]
+        except CosmosResourceExistsError:
+            pass
+
+        # 有効期限切れで削除される前のリースは、他のインスタンスと競合しない場合のみ上書き
+        existing_lease = container.read_item(item=key, partition_key=key)
+        if existing_lease["expiresAt"] > now and not (
+            force and existing_lease.get("completed")
+        ):
+            logging.info({"held_lease": existing_lease})
+            return None
+        return container.replace_item(
+            item=key,
+            body=lease,
+            etag=existing_lease["_etag"],
+            match_condition=MatchConditions.IfNotModified,
+        )["_etag"]
+    except (CosmosResourceNotFoundError, CosmosAccessConditionFailedError):
+        # 確認中に他のインスタンスがリースを削除・取得した場合
+        return None
+    except Exception:
+        logging.warning(traceback.format_exc())
+        return ""
+
+
+def get_lease(key: str) -> Lease | None:
+    """
+    指定したキーの有効期限内のリースを取得する
+
+    Args:
+        key (str): リースのキー
+
+    Returns:
+        Lease | None: 有効期限内のリース(存在しない場合、Leaseコンテナーの操作に失敗した場合はNone)
+    """
+
+    try:
+        lease: Lease = _get_lease_container().read_item(item=key, partition_key=key)
+    except CosmosResourceNotFoundError:
+        return None
+    except Exception:
+        logging.warning(traceback.format_exc())
+        return None
+
+    return lease if lease["expiresAt"] > time.time() else None
+
+
+def complete_lease(key: str, etag: str) -> None:
+    """
+    処理を終えたリースを完了済にする
+    有効期限までは他のインスタンスに処理結果の保存を待たせたまま、forceを指定した取得では上書きできるようにする
+
+    Args:
+        key (str): リースのキー
+        etag (str): acquire_leaseで取得したリースの_etag
+    """
+
+    if not etag:
+        return
+    try:
+        _get_lease_container().patch_item(
+            item=key,
+            partition_key=key,
+            patch_operations=[{"op": "set", "path": "/completed", "value": True}],
+            etag=etag,
+            match_condition=MatchConditions.IfNotModified,
+        )
+    except (CosmosResourceNotFoundError, CosmosAccessConditionFailedError):
+        # 有効期限切れで他のインスタンスがリースを取得し直した場合
+        pass
+    except Exception:
+        logging.warning(traceback.format_exc())
+
+
+def release_lease(key: str, etag: str) -> None:
+    """
+    指定したキーのリースを、自身が保持している場合のみ解放する
+
+    Args:
+        key (str): リースのキー
+        etag (str): acquire_leaseで取得したリースの_etag
+    """
+
+    if not etag:
+        return
+    try:
+        _get_lease_container().delete_item(
+            item=key,
+            partition_key=key,
+            etag=etag,
+            match_condition=MatchConditions.IfNotModified,
+        )
+    except (CosmosResourceNotFoundError, CosmosAccessConditionFailedError):
+        # 有効期限切れで他のインスタンスがリースを取得し直した場合
+        pass
+    except Exception:
+        logging.warning(traceback.format_exc())
+
+
+def wait_for_lease_result(
+    key: str, fetch: Callable[[], T | None], wait_seconds: float
+) -> T | None:
+    """
+    他のインスタンスが保持しているリースの処理結果を、取得できるかリースが解放されるまで待つ
+
+    Args:
+        key (str): リースのキー
+        fetch (Callable[[], T | None]): 処理結果を取得する関数(未取得の場合はNoneを返す)
+        wait_seconds (float): 処理結果を待つ最大時間(秒)
+
+    Returns:
+        T | None: 処理結果(最大時間以内に取得できない場合はNone)
+    """
+
+    deadline = time.monotonic() + wait_seconds
+    while True:
+        result = fetch()
+        if result is not None:
+            logging.info({"lease_result_key": key})
+            return result
+        if get_lease(key) is None or time.monotonic() >= deadline:
+            return fetch()
+        time.sleep(LEASE_POLL_INTERVAL_SECONDS)
+
+
+def acquire_or_wait_for_lease(
+    key: str, fetch: Callable[[int], T | None], force: bool = False
+) -> tuple[str | None, T | None]:
+    """
+    指定したキーのリースを取得するか、他のインスタンスが保持しているリースの処理結果を待つ
+    処理結果を取得できずにリースが解放・失効した場合は、リースの取得からやり直す
+    処理結果を待つ時間は、やり直す場合も含めて合計で環境変数LEASE_WAIT_SECONDSの秒数までとする
+
+    Args:
+        key (str): リースのキー
+        fetch (Callable[[int], T | None]): 他のインスタンスがリースを取得したUNIX時間(秒)以降の
+        処理結果を取得する関数(未取得の場合はNoneを返す)
+        force (bool): 完了済のリースを上書きして取得する場合はTrue
+
+    Returns:
+        tuple[str | None, T | None]: リースを取得した場合はリースの_etagとNone、
+        他のインスタンスの処理結果を取得した場合はNoneと処理結果
+
+    Raises:
+        TimeoutError: MAX_LEASE_ACQUIRE_NUMBER回やり直すか最大時間を過ぎても、
+        リースも処理結果も取得できない場合
+    """
+
+    deadline = time.monotonic() + int(
+        os.getenv("LEASE_WAIT_SECONDS", str(DEFAULT_LEASE_WAIT_SECONDS))
+    )
+    for _ in range(MAX_LEASE_ACQUIRE_NUMBER):
+        etag = acquire_lease(key, force)
+        if etag is not None:
+            return etag, None
+
+        lease = get_lease(key)
+        if lease is None:
+            # 確認中にリースが解放・失効した場合は、待たずに取得し直す
+            continue
+        remaining_seconds = deadline - time.monotonic()
+        if remaining_seconds <= 0:
+            break
+        since = int(lease["acquiredAt"])
+        result = wait_for_lease_result(key, partial(fetch, since), remaining_seconds)
+        if result is not None:
+            return None, result
+
+    raise TimeoutError(f"Failed to acquire lease: {key}")
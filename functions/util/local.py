@@ -1,16 +1,39 @@
 """ローカル環境でのインポート処理のユーティリティ関数"""
 
+import hashlib
 import json
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Mapping
 from uuid import uuid4
 
 from azure.core.exceptions import ResourceExistsError
 from azure.cosmos import CosmosClient, PartitionKey
 from azure.storage.queue import QueueClient
-from type.cosmos import Question, Test
-from type.importing import ImportData, ImportDatabaseData, ImportItem
+from type.cosmos import Discussion, Question, Test
+from type.importing import (
+    ImportData,
+    ImportDatabaseData,
+    ImportItem,
+    ImportManifestEntry,
+)
+from util.batch import split_into_batches, upsert_items_in_batches
+from util.catalog import refresh_tests_catalog
 from util.cosmos import get_read_write_container
+from util.discussion import split_discussion_items
+from util.hashing import compute_import_item_hash
 from util.queue import AZURITE_QUEUE_STORAGE_CONNECTION_STRING
+from util.throttle import AdaptiveThrottle
+
+# インポートデータファイルを格納するdataディレクトリのパス
+DATA_PATH: str = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
+
+# 前回インポートしたインポートデータファイルのマニフェストのファイル名(dataディレクトリに格納)
+IMPORT_MANIFEST_FILE_NAME: str = ".import-manifest.json"
+
+# Questionコンテナーの項目を並列にupsertするスレッド数の既定値
+DEFAULT_LOCAL_IMPORT_CONCURRENCY: int = 4
 
 
 def create_queue_storages() -> None:
@@ -33,6 +56,13 @@ def create_queue_storages() -> None:
         ).create_queue()
     except ResourceExistsError:
         pass
+    try:
+        QueueClient.from_connection_string(
+            conn_str=AZURITE_QUEUE_STORAGE_CONNECTION_STRING,
+            queue_name="import-chunks",
+        ).create_queue()
+    except ResourceExistsError:
+        pass
 
 
 def create_databases_and_containers() -> None:
@@ -62,6 +92,16 @@ def create_databases_and_containers() -> None:
     database_res.create_container_if_not_exists(
         id="Favorite",
         partition_key=PartitionKey(path="/testId"),
+        # Azure Cosmos DB Linux-based Emulator (preview)では複合インデックスが未サポートのため
+        # [GET] /tests/{testId}/sync で使う複合インデックスのインデックスポリシーを定義しない
+        # indexing_policy={
+        #     "compositeIndexes": [
+        #         [
+        #             {"path": "/userId", "order": "ascending"},
+        #             {"path": "/_ts", "order": "ascending"},
+        #         ]
+        #     ]
+        # },
     )
 
     # Progressコンテナー
@@ -75,6 +115,31 @@ def create_databases_and_containers() -> None:
         id="Question", partition_key=PartitionKey(path="/testId")
     )
 
+    # Translationコンテナー
+    database_res.create_container_if_not_exists(
+        id="Translation", partition_key=PartitionKey(path="/id")
+    )
+
+    # Leaseコンテナー
+    database_res.create_container_if_not_exists(
+        id="Lease", partition_key=PartitionKey(path="/id"), default_ttl=-1
+    )
+
+    # Importコンテナー
+    database_res.create_container_if_not_exists(
+        id="Import", partition_key=PartitionKey(path="/id"), default_ttl=-1
+    )
+
+    # Catalogコンテナー
+    database_res.create_container_if_not_exists(
+        id="Catalog", partition_key=PartitionKey(path="/id")
+    )
+
+    # Discussionコンテナー
+    database_res.create_container_if_not_exists(
+        id="Discussion", partition_key=PartitionKey(path="/testId")
+    )
+
     # Testコンテナー
     database_res.create_container_if_not_exists(
         id="Test",
@@ -93,14 +158,94 @@ def create_databases_and_containers() -> None:
     )
 
 
-def create_import_data() -> ImportData:
+def load_import_manifest() -> dict[str, ImportManifestEntry]:
+    """
+    前回インポートしたインポートデータファイルのマニフェストを読み込む
+
+    Returns:
+        dict[str, ImportManifestEntry]: dataディレクトリからの相対パスをキーとするマニフェスト
+        (存在しない場合は空オブジェクト)
+    """
+
+    manifest_path = os.path.join(DATA_PATH, IMPORT_MANIFEST_FILE_NAME)
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, "r", encoding="utf8") as f:
+        return json.load(f)
+
+
+def save_import_manifest(manifest: dict[str, ImportManifestEntry]) -> None:
+    """
+    インポートしたインポートデータファイルのマニフェストを保存する
+
+    Args:
+        manifest (dict[str, ImportManifestEntry]): dataディレクトリからの相対パスをキーとするマニフェスト
+    """
+
+    with open(
+        os.path.join(DATA_PATH, IMPORT_MANIFEST_FILE_NAME), "w", encoding="utf8"
+    ) as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def read_changed_import_items(
+    file_path: str, manifest_key: str, manifest: dict[str, ImportManifestEntry]
+) -> list[ImportItem] | None:
+    """
+    インポートデータファイルがマニフェストから変更されている場合のみ読み込み、マニフェストを更新する
+    ファイルサイズ・最終更新日時が一致する場合は、ファイルを読み込まずに変更がないものとみなす
+
+    Args:
+        file_path (str): インポートデータファイルのパス
+        manifest_key (str): マニフェストのキー
+        manifest (dict[str, ImportManifestEntry]): マニフェスト
+
+    Returns:
+        list[ImportItem] | None: インポートデータファイルの項目(変更がない場合はNone)
+    """
+
+    stat = os.stat(file_path)
+    entry = manifest.get(manifest_key)
+    if (
+        entry is not None
+        and entry["size"] == stat.st_size
+        and entry["mtime"] == stat.st_mtime_ns
+    ):
+        return None
+
+    with open(file_path, "rb") as f:
+        data = f.read()
+    content_hash = hashlib.sha256(data).hexdigest()
+    is_changed = entry is None or entry["contentHash"] != content_hash
+    manifest[manifest_key] = {
+        "size": stat.st_size,
+        "mtime": stat.st_mtime_ns,
+        "contentHash": content_hash,
+    }
+    return json.loads(data) if is_changed else None
+
+
+def create_import_data(
+    course_names: list[str] | None = None,
+    test_names: list[str] | None = None,
+    manifest: dict[str, ImportManifestEntry] | None = None,
+) -> ImportData:
     """
     インポートデータを生成する
     コマンドライン引数でコース名/テスト名指定した場合は、インポートデータから指定したコース名/テスト名における項目を抽出する
+    マニフェストを指定した場合は、マニフェストから変更されたインポートデータファイルのみ読み込み、マニフェストを更新する
+
+    Args:
+        course_names (list[str] | None): 抽出するコース名(Noneの場合はすべて)
+        test_names (list[str] | None): 抽出するテスト名(Noneの場合はすべて)
+        manifest (dict[str, ImportManifestEntry] | None): 前回インポートしたインポートデータファイルのマニフェスト
+
+    Returns:
+        ImportData: インポートデータ
     """
 
     # dataファイル/ディレクトリが存在しない場合は空オブジェクトをreturn
-    data_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
+    data_path = DATA_PATH
     if not os.path.exists(data_path):
         return {}
 
@@ -109,29 +254,39 @@ def create_import_data() -> ImportData:
         dirent
         for dirent in os.listdir(data_path)
         if os.path.isdir(os.path.join(data_path, dirent))
+        and (course_names is None or dirent in course_names)
     ]
 
     import_data: ImportData = {}
     for course_name in course_directories:
         # コース名のディレクトリに存在する、テスト名をすべて取得
-        test_names = [
+        course_test_names = [
             file_name.replace(".json", "")
             for file_name in os.listdir(os.path.join(data_path, course_name))
             if file_name.endswith(".json")
+            and (test_names is None or file_name.replace(".json", "") in test_names)
         ]
 
         import_database_data: ImportDatabaseData = {}
-        for test_name in test_names:
+        for test_name in course_test_names:
+            file_path = os.path.join(data_path, course_name, f"{test_name}.json")
+
+            # マニフェストを指定した場合は、変更されたインポートデータファイルのみ読込み
+            if manifest is not None:
+                changed_import_items = read_changed_import_items(
+                    file_path, f"{course_name}/{test_name}.json", manifest
+                )
+                if changed_import_items is not None:
+                    import_database_data[test_name] = changed_import_items
+                continue
+
             # テスト名のjsonファイル名からjsonの中身を読込み
-            with open(
-                os.path.join(data_path, course_name, f"{test_name}.json"),
-                "r",
-                encoding="utf8",
-            ) as f:
+            with open(file_path, "r", encoding="utf8") as f:
                 import_items: list[ImportItem] = json.load(f)
             import_database_data[test_name] = import_items
 
-        import_data[course_name] = import_database_data
+        if import_database_data:
+            import_data[course_name] = import_database_data
 
     return import_data
 
@@ -149,23 +304,21 @@ def generate_test_items(import_data: ImportData) -> list[Test]:
     except Exception:
         print("generateTestItems: Not Found Items")
 
+    # コース名・テスト名から格納済の項目を引く索引
+    inserted_test_items_by_name: dict[tuple[str, str], Test] = {
+        (item["courseName"], item["testName"]): item for item in inserted_test_items
+    }
+
     test_items: list[Test] = []
     for course_name, tests in import_data.items():
         for test_name, items in tests.items():
-            # UsersテータベースのTestコンテナー格納済の場合は格納した項目、
-            # 未格納の場合はNoneを取得
-            found_test_item = next(
-                (
-                    item
-                    for item in inserted_test_items
-                    if item["courseName"] == course_name
-                    and item["testName"] == test_name
-                ),
-                None,
-            )
+            # UsersテータベースのTestコンテナー格納済の場合は問題数を更新した項目、
+            # 未格納の場合は新規の項目を生成
+            found_test_item = inserted_test_items_by_name.get((course_name, test_name))
             test_items.append(
-                found_test_item
-                or {
+                {**found_test_item, "length": len(items)}
+                if found_test_item
+                else {
                     "courseName": course_name,
                     "testName": test_name,
                     "id": str(uuid4()),
@@ -178,67 +331,152 @@ def generate_test_items(import_data: ImportData) -> list[Test]:
 
 def import_test_items(test_items: list[Test]) -> None:
     """
-    UsersテータベースのTestコンテナーの項目をインポートする
+    UsersテータベースのTestコンテナーの項目をインポートし、テストの一覧のカタログを再生成する
     """
 
     container = get_read_write_container("Users", "Test")
     for item in test_items:
         container.upsert_item(item)
 
+    # [GET] /tests で返すテストの一覧を再生成
+    refresh_tests_catalog()
+
 
 def generate_question_items(
     import_data: ImportData, test_items: list[Test]
 ) -> list[Question]:
     """
-    インポートデータからUsersテータベースのQuestionコンテナーの未格納の項目のみ生成する
+    インポートデータからUsersテータベースのQuestionコンテナーの未格納・変更された項目のみ生成する
     """
 
-    # UsersテータベースのQuestionコンテナーの全idを取得
-    inserted_question_ids = [
-        item["id"]
-        for item in get_read_write_container("Users", "Question").query_items(
-            query="SELECT c.id FROM c", enable_cross_partition_query=True
-        )
-    ]
+    container = get_read_write_container("Users", "Question")
+
+    # コース名・テスト名からテスト項目を引く索引
+    test_items_by_name: dict[tuple[str, str], Test] = {
+        (item["courseName"], item["testName"]): item for item in test_items
+    }
 
     question_items: list[Question] = []
     for course_name, tests in import_data.items():
         for test_name, items in tests.items():
-            test_item = next(
-                (
-                    item
-                    for item in test_items
-                    if item["courseName"] == course_name
-                    and item["testName"] == test_name
-                ),
-                None,
-            )
+            test_item = test_items_by_name.get((course_name, test_name))
             if not test_item:
                 raise ValueError(
                     f"Course Name {course_name} and Test Name {test_name} Not Found."
                 )
 
+            # テストIDのパーティションに格納済の項目のidとハッシュ値を取得
             test_id = test_item["id"]
+            inserted_question_hashes: dict[str, str | None] = {
+                item["id"]: item.get("contentHash")
+                for item in container.query_items(
+                    query="SELECT c.id, c.contentHash FROM c WHERE c.testId = @testId",
+                    parameters=[{"name": "@testId", "value": test_id}],
+                    partition_key=test_id,
+                )
+            }
+
             for idx, item in enumerate(items):
-                if f"{test_id}_{idx + 1}" not in inserted_question_ids:
+                content_hash = compute_import_item_hash(item)
+                if inserted_question_hashes.get(f"{test_id}_{idx + 1}") != content_hash:
                     question_items.append(
                         {
                             **item,
                             "id": f"{test_id}_{idx + 1}",
                             "number": idx + 1,
                             "testId": test_id,
+                            "contentHash": content_hash,
                         }
                     )
 
     return question_items
 
 
-def import_question_items(question_items: list[Question]) -> None:
+def format_import_progress(
+    imported_num: int, total_num: int, request_charge: float, elapsed_seconds: float
+) -> str:
     """
-    UsersテータベースのQuestionコンテナーの項目をインポートする
+    インポートの進捗を、1秒あたりの項目数・要求ユニット(RU)数とともに文字列にする
+
+    Args:
+        imported_num (int): インポートした項目数
+        total_num (int): インポートする項目数
+        request_charge (float): 消費した要求ユニット(RU)数
+        elapsed_seconds (float): 経過時間(秒)
+
+    Returns:
+        str: インポートの進捗
+    """
+
+    items_per_second = imported_num / elapsed_seconds if elapsed_seconds > 0 else 0.0
+    request_units_per_second = (
+        request_charge / elapsed_seconds if elapsed_seconds > 0 else 0.0
+    )
+    return (
+        f"{imported_num}/{total_num} items "
+        f"({items_per_second:.1f} items/s, {request_units_per_second:.1f} RU/s)"
+    )
+
+
+def import_question_items(
+    question_items: list[Question], max_workers: int | None = None
+) -> None:
+    """
+    UsersテータベースのQuestionコンテナーの項目と、そのディスカッションを分割したDiscussionコンテナーの項目をインポートする
+    テストIDごとのトランザクションバッチを、max_workers個のスレッドで並列にupsertし、バッチごとに進捗を出力する
+    max_workersを指定しない場合は、LOCAL_IMPORT_CONCURRENCY(既定4)個のスレッドとする
     """
 
     container = get_read_write_container("Users", "Question")
-    for i, item in enumerate(question_items):
-        container.upsert_item(item)
-        print(f"{i + 1}th Response OK")
+    container_discussion = get_read_write_container("Users", "Discussion")
+
+    # ディスカッションはDiscussionコンテナーの項目に分割する
+    discussion_items_by_id: dict[str, Discussion] = {
+        item["id"]: item for item in split_discussion_items(question_items)
+    }
+    question_items_by_test_id: dict[str, list[Question]] = {}
+    for item in question_items:
+        question_items_by_test_id.setdefault(item["testId"], []).append(item)
+
+    def upsert_batch(test_id: str, batch: list[Mapping[str, Any]]) -> float:
+        # AdaptiveThrottleは複数のスレッドからの同時実行に対応しないため、バッチごとに生成
+        # Questionコンテナーの項目のディスカッション件数と対応させるため、Discussionコンテナーの項目を先にupsert
+        throttle = AdaptiveThrottle()
+        upsert_items_in_batches(
+            container_discussion,
+            [
+                discussion_items_by_id[item["id"]]
+                for item in batch
+                if item["id"] in discussion_items_by_id
+            ],
+            test_id,
+            throttle,
+        )
+        upsert_items_in_batches(container, batch, test_id, throttle)
+        return throttle.request_charge
+
+    imported_num = 0
+    request_charge = 0.0
+    started_at = time.monotonic()
+    with ThreadPoolExecutor(
+        max_workers=max_workers
+        or int(
+            os.getenv("LOCAL_IMPORT_CONCURRENCY", str(DEFAULT_LOCAL_IMPORT_CONCURRENCY))
+        )
+    ) as executor:
+        futures = {
+            executor.submit(upsert_batch, test_id, batch): len(batch)
+            for test_id, items in question_items_by_test_id.items()
+            for batch in split_into_batches(items)
+        }
+        for future in as_completed(futures):
+            request_charge += future.result()
+            imported_num += futures[future]
+            print(
+                format_import_progress(
+                    imported_num,
+                    len(question_items),
+                    request_charge,
+                    time.monotonic() - started_at,
+                )
+            )
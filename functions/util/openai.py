@@ -0,0 +1,68 @@
+"""Azure OpenAIのユーティリティ関数"""
+
+import os
+from functools import cache
+
+import httpx
+from openai import AzureOpenAI
+
+# Azure OpenAIへのコネクションプールの最大接続数・Keep-Aliveで保持する最大接続数の既定値
+DEFAULT_OPENAI_MAX_CONNECTIONS: int = 20
+DEFAULT_OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = 10
+
+# Azure OpenAIへのリクエストのタイムアウト(秒)・接続のタイムアウト(秒)の既定値
+DEFAULT_OPENAI_TIMEOUT_SECONDS: float = 120.0
+DEFAULT_OPENAI_CONNECT_TIMEOUT_SECONDS: float = 5.0
+
+
+@cache
+def get_openai_client() -> AzureOpenAI:
+    """
+    Azure OpenAIのクライアントを、ワーカープロセス内で共有して返す
+    クライアントはKeep-Aliveでコネクションを再利用し、リトライ・関数の呼び出しをまたいで使用する
+
+    Returns:
+        AzureOpenAI: Azure OpenAIのクライアント
+    """
+
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=int(
+                os.getenv("OPENAI_MAX_CONNECTIONS", str(DEFAULT_OPENAI_MAX_CONNECTIONS))
+            ),
+            max_keepalive_connections=int(
+                os.getenv(
+                    "OPENAI_MAX_KEEPALIVE_CONNECTIONS",
+                    str(DEFAULT_OPENAI_MAX_KEEPALIVE_CONNECTIONS),
+                )
+            ),
+        ),
+        timeout=httpx.Timeout(
+            float(
+                os.getenv("OPENAI_TIMEOUT_SECONDS", str(DEFAULT_OPENAI_TIMEOUT_SECONDS))
+            ),
+            connect=float(
+                os.getenv(
+                    "OPENAI_CONNECT_TIMEOUT_SECONDS",
+                    str(DEFAULT_OPENAI_CONNECT_TIMEOUT_SECONDS),
+                )
+            ),
+        ),
+    )
+    return AzureOpenAI(
+        api_key=os.environ["OPENAI_API_KEY"],
+        api_version=os.environ["OPENAI_API_VERSION"],
+        azure_deployment=os.environ["OPENAI_DEPLOYMENT_NAME"],
+        azure_endpoint=os.environ["OPENAI_ENDPOINT"],
+        http_client=http_client,
+    )
+
+
+def reset_openai_client() -> None:
+    """
+    ワーカープロセス内で共有するAzure OpenAIのクライアントを破棄する
+    """
+
+    if get_openai_client.cache_info().currsize:
+        get_openai_client().close()
+    get_openai_client.cache_clear()
@@ -0,0 +1,91 @@
+"""Progressコンテナーの項目の回答履歴のユーティリティ関数"""
+
+from typing import Any, Optional
+
+from type.cosmos import Progress, ProgressElement
+from type.request import PostProgressesBatchElement
+
+# 取得後に他のリクエストがProgressコンテナーの項目を更新した場合に、更新し直す最大回数
+MAX_CONFLICT_RETRY_NUMBER: int = 5
+
+# Cosmos DBの部分的な更新1回あたりの最大操作数
+MAX_PATCH_OPERATIONS: int = 10
+
+
+def merge_progress_entries(
+    item: Progress, entries: list[PostProgressesBatchElement]
+) -> tuple[list[ProgressElement], int]:
+    """
+    回答した順番に並べた回答履歴を、テストを解く問題番号の順番に沿って1つずつ検証しながら、保存済の回答履歴に反映する
+    各回答履歴の問題番号は、その時点で最後に保存した回答履歴の問題番号(更新)か、その次の問題番号(追加)とする
+
+    Args:
+        item (Progress): Progressコンテナーの項目
+        entries (list[PostProgressesBatchElement]): 回答した順番に並べた回答履歴
+
+    Returns:
+        tuple[list[ProgressElement], int]: 反映後の回答履歴と、保存済の回答履歴のうち更新した最初のインデックス
+        (保存済の回答履歴を更新しない場合は保存済の回答履歴の個数)
+
+    Raises:
+        ValueError: 問題番号が、最後に保存した回答履歴の問題番号・その次の問題番号のいずれでもない場合
+    """
+
+    progresses: list[ProgressElement] = list(item["progresses"])
+    first_updated_idx = len(progresses)
+    for i, entry in enumerate(entries):
+        current_question_number: Optional[int] = (
+            item["order"][len(progresses) - 1] if len(progresses) > 0 else None
+        )
+        next_question_number: Optional[int] = (
+            item["order"][len(progresses)]
+            if len(progresses) < len(item["order"])
+            else None
+        )
+        progress: ProgressElement = {
+            "isCorrect": entry["isCorrect"],
+            "selectedIdxes": entry["selectedIdxes"],
+            "correctIdxes": entry["correctIdxes"],
+        }
+        if entry["questionNumber"] == current_question_number:
+            progresses[-1] = progress
+            first_updated_idx = min(first_updated_idx, len(progresses) - 1)
+        elif entry["questionNumber"] == next_question_number:
+            progresses.append(progress)
+        else:
+            expected = " or ".join(
+                str(number)
+                for number in (current_question_number, next_question_number)
+                if number is not None
+            )
+            raise ValueError(f"progresses[{i}].questionNumber must be {expected}")
+
+    return progresses, first_updated_idx
+
+
+def create_progress_patch_operations(
+    saved_num: int, progresses: list[ProgressElement], first_updated_idx: int
+) -> list[dict[str, Any]]:
+    """
+    保存済の回答履歴を反映後の回答履歴にする、部分的な更新の操作を生成する
+    保存済の回答履歴の更新と末尾への追加の操作数が最大操作数を超える場合は、回答履歴全体を置き換える1つの操作とする
+
+    Args:
+        saved_num (int): 保存済の回答履歴の個数
+        progresses (list[ProgressElement]): 反映後の回答履歴
+        first_updated_idx (int): 保存済の回答履歴のうち更新した最初のインデックス
+
+    Returns:
+        list[dict[str, Any]]: 部分的な更新の操作
+    """
+
+    patch_operations: list[dict[str, Any]] = [
+        {"op": "set", "path": f"/progresses/{idx}", "value": progresses[idx]}
+        for idx in range(first_updated_idx, saved_num)
+    ] + [
+        {"op": "add", "path": "/progresses/-", "value": progress}
+        for progress in progresses[saved_num:]
+    ]
+    if len(patch_operations) > MAX_PATCH_OPERATIONS:
+        return [{"op": "set", "path": "/progresses", "value": progresses}]
+    return patch_operations
@@ -0,0 +1,186 @@
+"""Questionコンテナーの項目のキャッシュのユーティリティ関数"""
+
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from type.cosmos import Question
+
+# ワーカープロセス内のキャッシュに保持するQuestionコンテナーの項目の合計バイト数の上限の既定値
+DEFAULT_QUESTION_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+
+# ワーカープロセス内のキャッシュに保持したQuestionコンテナーの項目の有効期間(秒)の既定値
+# 他のインスタンスでのインポートによる更新は無効化できないため、有効期間の経過後に取得し直す
+DEFAULT_QUESTION_CACHE_TTL_SECONDS: int = 300
+
+# ワーカープロセス内のキャッシュ(LRU)
+# キーをQuestionコンテナーの項目のid、値を項目・バイト数・有効期限(time.monotonic()の値)とする
+_entries: OrderedDict[str, tuple[Question, int, float]] = OrderedDict()
+_stats: dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0, "bytes": 0}
+_lock: Lock = Lock()
+
+
+def _get_max_bytes() -> int:
+    """
+    ワーカープロセス内のキャッシュに保持する項目の合計バイト数の上限を返す
+
+    Returns:
+        int: 環境変数QUESTION_CACHE_MAX_BYTESの値(未設定の場合は既定値)
+    """
+
+    return int(
+        os.getenv("QUESTION_CACHE_MAX_BYTES", str(DEFAULT_QUESTION_CACHE_MAX_BYTES))
+    )
+
+
+def _get_ttl_seconds() -> int:
+    """
+    ワーカープロセス内のキャッシュに保持した項目の有効期間(秒)を返す
+
+    Returns:
+        int: 環境変数QUESTION_CACHE_TTL_SECONDSの値(未設定の場合は既定値)
+    """
+
+    return int(
+        os.getenv("QUESTION_CACHE_TTL_SECONDS", str(DEFAULT_QUESTION_CACHE_TTL_SECONDS))
+    )
+
+
+def _remove_entry(item_id: str) -> None:
+    """
+    ワーカープロセス内のキャッシュから項目を削除する(ロックを取得して呼び出すこと)
+
+    Args:
+        item_id (str): Questionコンテナーの項目のid
+    """
+
+    _, size, _ = _entries.pop(item_id)
+    _stats["bytes"] -= size
+
+
+def _log_stats(evictions: int) -> None:
+    """
+    1回の格納での破棄数と、ワーカープロセス内で累計したキャッシュの統計情報をヒット率とともにログ出力する
+    (ロックを取得して呼び出すこと)
+
+    Args:
+        evictions (int): 1回の格納で破棄した項目数
+    """
+
+    total = _stats["hits"] + _stats["misses"]
+    logging.info(
+        {
+            "question_cache_evictions": evictions,
+            "question_cache_total_hit_rate": (
+                round(_stats["hits"] / total, 4) if total else 0.0
+            ),
+            "question_cache_total_misses": _stats["misses"],
+            "question_cache_total_evictions": _stats["evictions"],
+            "question_cache_bytes": _stats["bytes"],
+            "question_cache_entries": len(_entries),
+        }
+    )
+
+
+def get_cached_question(test_id: str, question_number: str | int) -> Question | None:
+    """
+    ワーカープロセス内のキャッシュから、有効期間内のQuestionコンテナーの項目を取得する
+    取得した項目は他のリクエストと共有するため、呼び出し元で変更しないこと
+
+    Args:
+        test_id (str): テストID
+        question_number (str | int): 問題番号
+
+    Returns:
+        Question | None: Questionコンテナーの項目(キャッシュに存在しないか有効期間を過ぎた場合はNone)
+    """
+
+    item_id = f"{test_id}_{question_number}"
+    with _lock:
+        entry = _entries.get(item_id)
+        if entry is None or entry[2] <= time.monotonic():
+            if entry is not None:
+                _remove_entry(item_id)
+            _stats["misses"] += 1
+            return None
+        _entries.move_to_end(item_id)
+        _stats["hits"] += 1
+        return entry[0]
+
+
+def put_cached_question(
+    test_id: str, question_number: str | int, item: Question
+) -> None:
+    """
+    ワーカープロセス内のキャッシュにQuestionコンテナーの項目を格納し、
+    合計バイト数が上限を超えた分を最も長く参照されていない順に破棄する
+    上限を超える大きさの項目は格納しない
+    キャッシュのミス後に呼び出すため、あわせてキャッシュの統計情報をログ出力する
+
+    Args:
+        test_id (str): テストID
+        question_number (str | int): 問題番号
+        item (Question): Questionコンテナーの項目
+    """
+
+    size = len(json.dumps(item, ensure_ascii=False).encode("utf-8"))
+    max_bytes = _get_max_bytes()
+    if size > max_bytes:
+        with _lock:
+            _log_stats(0)
+        return
+
+    item_id = f"{test_id}_{question_number}"
+    expires_at = time.monotonic() + _get_ttl_seconds()
+    with _lock:
+        if item_id in _entries:
+            _remove_entry(item_id)
+        _entries[item_id] = (item, size, expires_at)
+        _stats["bytes"] += size
+        evictions = 0
+        while _stats["bytes"] > max_bytes:
+            _, (_, evicted_size, _) = _entries.popitem(last=False)
+            _stats["bytes"] -= evicted_size
+            evictions += 1
+        _stats["evictions"] += evictions
+        _log_stats(evictions)
+
+
+def invalidate_cached_questions(item_ids: list[str]) -> None:
+    """
+    インポートで更新したQuestionコンテナーの項目を、ワーカープロセス内のキャッシュから削除する
+
+    Args:
+        item_ids (list[str]): Questionコンテナーの項目のid
+    """
+
+    with _lock:
+        for item_id in item_ids:
+            if item_id in _entries:
+                _remove_entry(item_id)
+
+
+def reset_question_cache() -> None:
+    """
+    ワーカープロセス内のキャッシュと統計情報をすべて破棄する
+    """
+
+    with _lock:
+        _entries.clear()
+        for key in _stats:
+            _stats[key] = 0
+
+
+def get_question_cache_stats() -> dict[str, int]:
+    """
+    ワーカープロセス内のキャッシュの統計情報を返す
+
+    Returns:
+        dict[str, int]: ヒット数(hits)・ミス数(misses)・破棄数(evictions)・保持している項目数(entries)と合計バイト数(bytes)
+    """
+
+    with _lock:
+        return {**_stats, "entries": len(_entries)}
@@ -1,7 +1,12 @@
 """Queue Storageのユーティリティ関数"""
 
+import logging
 import os
+import time
+from functools import cache
+from threading import Lock, RLock
 
+from azure.core.credentials import AccessToken, TokenCredential
 from azure.identity import DefaultAzureCredential
 from azure.storage.queue import BinaryBase64EncodePolicy, QueueClient
 
@@ -10,10 +15,88 @@ AZURITE_QUEUE_STORAGE_CONNECTION_STRING: str = (
     "DefaultEndpointsProtocol=http;AccountName=devstoreaccount1;AccountKey=Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsuFq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw==;QueueEndpoint=http://127.0.0.1:10001/devstoreaccount1;"
 )
 
+# アクセストークンの有効期限の何秒前に再取得するか
+TOKEN_REFRESH_MARGIN_SECONDS: int = 300
 
-def get_queue_client(queue_name: str) -> QueueClient:
+# ワーカープロセス内で共有するキュー名ごとのQueueClient
+_queue_clients: dict[str, QueueClient] = {}
+_lock: RLock = RLock()
+
+
+class CachedTokenCredential:  # pylint: disable=too-few-public-methods
+    """
+    ラップしたクレデンシャルで取得したアクセストークンを、スコープごとに有効期限の直前まで再利用するクレデンシャル
+    """
+
+    def __init__(self, credential: TokenCredential) -> None:
+        """
+        Args:
+            credential (TokenCredential): アクセストークンを取得するクレデンシャル
+        """
+
+        self.credential = credential
+        self._tokens: dict[tuple[str, ...], AccessToken] = {}
+        self._lock = Lock()
+
+    def get_token(self, *scopes: str, **kwargs) -> AccessToken:
+        """
+        指定したスコープのアクセストークンを返す
+        有効期限までTOKEN_REFRESH_MARGIN_SECONDS秒以上ある取得済のアクセストークンは再利用する
+
+        Args:
+            *scopes (str): スコープ
+            **kwargs: ラップしたクレデンシャルのget_tokenに渡すキーワード引数
+
+        Returns:
+            AccessToken: アクセストークン
+        """
+
+        # 追加のクレームを要求された場合は、取得済のアクセストークンを再利用しない
+        if kwargs.get("claims"):
+            return self.credential.get_token(*scopes, **kwargs)
+
+        token = self._tokens.get(scopes)
+        if not _is_fresh(token):
+            with self._lock:
+                token = self._tokens.get(scopes)
+                if not _is_fresh(token):
+                    token = self.credential.get_token(*scopes, **kwargs)
+                    self._tokens[scopes] = token
+        return token
+
+
+def _is_fresh(token: AccessToken | None) -> bool:
+    """
+    アクセストークンの有効期限までTOKEN_REFRESH_MARGIN_SECONDS秒以上あるかを判定する
+
+    Args:
+        token (AccessToken | None): アクセストークン(未取得の場合はNone)
+
+    Returns:
+        bool: 有効期限までTOKEN_REFRESH_MARGIN_SECONDS秒以上ある場合はTrue、そうでない場合はFalse
+    """
+
+    return (
+        token is not None
+        and token.expires_on - TOKEN_REFRESH_MARGIN_SECONDS > time.time()
+    )
+
+
+@cache
+def _get_credential() -> CachedTokenCredential:
+    """
+    ワーカープロセス内で共有するクレデンシャルを返す
+
+    Returns:
+        CachedTokenCredential: DefaultAzureCredentialをラップしたクレデンシャル
+    """
+
+    return CachedTokenCredential(DefaultAzureCredential())
+
+
+def _create_queue_client(queue_name: str) -> QueueClient:
     """
-    環境に応じたQueueClientを取得します
+    環境に応じたQueueClientを生成します
 
     Args:
         queue_name (str): キュー名
@@ -41,6 +124,59 @@ def get_queue_client(queue_name: str) -> QueueClient:
     return QueueClient(
         account_url=f"https://{account_name}.queue.core.windows.net",
         queue_name=queue_name,
-        credential=DefaultAzureCredential(),
+        credential=_get_credential(),
         message_encode_policy=BinaryBase64EncodePolicy(),
     )
+
+
+def get_queue_client(queue_name: str) -> QueueClient:
+    """
+    環境に応じたQueueClientを、ワーカープロセス内でキュー名ごとに共有して取得します
+
+    Args:
+        queue_name (str): キュー名
+
+    Returns:
+        QueueClient: キュークライアント
+
+    Raises:
+        ValueError: Azure環境でAzureWebJobsStorage__accountNameが設定されていない場合
+    """
+
+    queue_client = _queue_clients.get(queue_name)
+    if queue_client is None:
+        with _lock:
+            queue_client = _queue_clients.get(queue_name)
+            if queue_client is None:
+                queue_client = _create_queue_client(queue_name)
+                _queue_clients[queue_name] = queue_client
+    return queue_client
+
+
+def send_queue_message(queue_name: str, content: bytes) -> None:
+    """
+    指定したキューにメッセージを格納し、その所要時間をログ出力する
+
+    Args:
+        queue_name (str): キュー名
+        content (bytes): メッセージ
+    """
+
+    start = time.perf_counter()
+    get_queue_client(queue_name).send_message(content)
+    logging.info(
+        {
+            "queue_name": queue_name,
+            "enqueue_elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+        }
+    )
+
+
+def reset_queue_clients() -> None:
+    """
+    ワーカープロセス内で共有するQueueClientとクレデンシャルをすべて破棄する
+    """
+
+    with _lock:
+        _queue_clients.clear()
+        _get_credential.cache_clear()
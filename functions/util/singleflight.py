@@ -0,0 +1,52 @@
+"""同一キーの処理の同時実行を1回にまとめるユーティリティ"""
+
+from concurrent.futures import Future
+from threading import Lock
+from typing import Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):  # pylint: disable=too-few-public-methods
+    """
+    ワーカープロセス内で同一キーの処理を同時に呼び出した場合、最初の呼び出しのみ処理を実行し、
+    実行中に呼び出した他のスレッドはその結果(例外を含む)を待って共有する
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[str, Future] = {}
+        self._lock = Lock()
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """
+        指定したキーの処理を実行し、その結果を返す
+        同一キーの処理が実行中の場合は、実行せずにその結果を待って返す
+
+        Args:
+            key (str): キー
+            fn (Callable[[], T]): 処理
+
+        Returns:
+            T: 処理の結果
+        """
+
+        with self._lock:
+            future = self._calls.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
@@ -0,0 +1,174 @@
+"""Cosmos DBへの操作の流量を調整するユーティリティ"""
+
+import logging
+import os
+import time
+from typing import Any, Callable, Mapping, TypeVar
+
+from azure.cosmos.exceptions import CosmosHttpResponseError
+from azure.cosmos.http_constants import HttpHeaders, StatusCodes
+
+T = TypeVar("T")
+
+# 1秒あたりの操作数の初期値・最大値の既定値と最小値
+DEFAULT_THROTTLE_INITIAL_RATE: float = 5.0
+DEFAULT_THROTTLE_MAX_RATE: float = 100.0
+THROTTLE_MIN_RATE: float = 0.2
+
+# 操作が成功した場合に加算する1秒あたりの操作数、スロットリングされた場合に乗算する係数
+THROTTLE_RATE_INCREASE: float = 1.0
+THROTTLE_RATE_DECREASE_FACTOR: float = 0.5
+
+# スロットリングされた操作を再試行する最大回数
+THROTTLE_MAX_RETRIES: int = 10
+
+# スロットリングのレスポンスに再試行までの時間がない場合に待つ時間(秒)
+DEFAULT_RETRY_AFTER_SECONDS: float = 1.0
+
+
+def get_retry_after_seconds(headers: Mapping[str, Any]) -> float:
+    """
+    スロットリングのレスポンスヘッダーから、再試行までに待つ時間を取得する
+
+    Args:
+        headers (Mapping[str, Any]): レスポンスヘッダー
+
+    Returns:
+        float: x-ms-retry-after-msヘッダー・Retry-Afterヘッダーの順に取得した時間(秒)
+        (いずれも存在しない場合は既定値)
+    """
+
+    lower_headers = {key.lower(): value for key, value in headers.items()}
+    if HttpHeaders.RetryAfterInMilliseconds in lower_headers:
+        return float(lower_headers[HttpHeaders.RetryAfterInMilliseconds]) / 1000
+    if "retry-after" in lower_headers:
+        return float(lower_headers["retry-after"])
+    return DEFAULT_RETRY_AFTER_SECONDS
+
+
+class AdaptiveThrottle:
+    """
+    Cosmos DBへの操作を、アカウントが許容する流量に合わせて逐次実行する(AIMD)
+    操作が成功した場合は1秒あたりの操作数を加算して増やし、スロットリングされた場合
+    (SDK内部で429を再試行した場合を含む)は乗算して減らし、429は再試行までの時間を待って再試行する
+    複数のスレッドからの同時実行には対応しない
+    """
+
+    def __init__(self) -> None:
+        self.rate: float = float(
+            os.getenv("THROTTLE_INITIAL_RATE", str(DEFAULT_THROTTLE_INITIAL_RATE))
+        )
+        self.max_rate: float = float(
+            os.getenv("THROTTLE_MAX_RATE", str(DEFAULT_THROTTLE_MAX_RATE))
+        )
+        self.operations: int = 0
+        self.throttled: int = 0
+        self.request_charge: float = 0.0
+        self._started_at: float | None = None
+        self._next_at: float = 0.0
+
+    def _wait(self) -> None:
+        """
+        1秒あたりの操作数を超えないように、次の操作の実行時刻まで待つ
+        """
+
+        now = time.monotonic()
+        if self._started_at is None:
+            self._started_at = now
+        if self._next_at > now:
+            time.sleep(self._next_at - now)
+            now = self._next_at
+        self._next_at = now + 1 / self.rate
+
+    def _record_response(self, headers: Mapping[str, Any], _: Any) -> None:
+        """
+        成功した操作のレスポンスヘッダーから消費した要求ユニット(RU)数を記録し、1秒あたりの操作数を調整する
+        SDK内部で429を再試行した場合は減らし、それ以外の場合は増やす
+
+        Args:
+            headers (Mapping[str, Any]): レスポンスヘッダー
+        """
+
+        self.request_charge += float(headers.get(HttpHeaders.RequestCharge, 0))
+        if int(headers.get(HttpHeaders.ThrottleRetryCount, 0)) > 0:
+            self._decrease(0.0)
+        else:
+            self.rate = min(self.max_rate, self.rate + THROTTLE_RATE_INCREASE)
+
+    def _decrease(self, retry_after_seconds: float) -> None:
+        """
+        スロットリングされた場合に1秒あたりの操作数を減らし、次の操作の実行時刻を遅らせる
+
+        Args:
+            retry_after_seconds (float): 再試行までに待つ時間(秒)
+        """
+
+        self.throttled += 1
+        self.rate = max(THROTTLE_MIN_RATE, self.rate * THROTTLE_RATE_DECREASE_FACTOR)
+        self._next_at = max(self._next_at, time.monotonic() + retry_after_seconds)
+
+    def run(self, operation: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        流量を調整してCosmos DBへの操作を実行する
+        操作にはレスポンスヘッダーを記録するresponse_hookを指定する
+
+        Args:
+            operation (Callable[..., T]): ContainerProxyのメソッド(upsert_item等)
+            *args (Any): 操作の位置引数
+            **kwargs (Any): 操作のキーワード引数
+
+        Returns:
+            T: 操作の結果
+        """
+
+        retry_number = 0
+        while True:
+            self._wait()
+            try:
+                result = operation(*args, response_hook=self._record_response, **kwargs)
+            except CosmosHttpResponseError as e:
+                if (
+                    e.status_code != StatusCodes.TOO_MANY_REQUESTS
+                    or retry_number >= THROTTLE_MAX_RETRIES
+                ):
+                    raise
+                retry_after_seconds = get_retry_after_seconds(e.headers)
+                self._decrease(retry_after_seconds)
+                logging.warning(
+                    {
+                        "throttled_retry_number": retry_number,
+                        "throttled_retry_after_seconds": retry_after_seconds,
+                        "throttle_rate": self.rate,
+                    }
+                )
+                retry_number += 1
+                continue
+
+            self.operations += 1
+            return result
+
+    def get_stats(self) -> dict[str, float]:
+        """
+        これまでの操作の統計を返す
+
+        Returns:
+            dict[str, float]: 成功した操作数(operations)・スロットリングされた回数(throttled)・
+            消費した要求ユニット(RU)数(requestCharge)・経過時間(elapsedSeconds)・
+            1秒あたりの要求ユニット(RU)数(requestUnitsPerSecond)・現在の1秒あたりの操作数(rate)
+        """
+
+        elapsed_seconds = (
+            time.monotonic() - self._started_at if self._started_at is not None else 0.0
+        )
+        return {
+            "operations": self.operations,
+            "throttled": self.throttled,
+            "requestCharge": round(self.request_charge, 2),
+            "elapsedSeconds": round(elapsed_seconds, 3),
+            "requestUnitsPerSecond": (
+                round(self.request_charge / elapsed_seconds, 2)
+                if elapsed_seconds > 0
+                else 0.0
+            ),
+            "rate": round(self.rate, 2),
+        }
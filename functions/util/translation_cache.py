@@ -0,0 +1,214 @@
+"""翻訳結果のキャッシュのユーティリティ関数"""
+
+import logging
+import os
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+from type.cosmos import Translation
+from util.cosmos import get_read_write_container
+from util.hashing import compute_content_hash
+
+# ワーカープロセス内のキャッシュに保持する翻訳結果の最大件数の既定値
+DEFAULT_TRANSLATION_CACHE_SIZE: int = 10000
+
+# Translationコンテナーへ同時にupsertする項目数の既定値
+DEFAULT_TRANSLATION_CACHE_MAX_WORKERS: int = 8
+
+# ワーカープロセス内のキャッシュ(LRU)
+# 永続化したキャッシュはTranslationコンテナーに格納する
+_entries: OrderedDict[str, str] = OrderedDict()
+_stats: dict[str, int] = {"hits": 0, "misses": 0, "savedCharacters": 0}
+_lock: Lock = Lock()
+
+
+def compute_translation_key(
+    text: str, source_language: str, target_language: str
+) -> str:
+    """
+    翻訳元の言語・翻訳先の言語・翻訳元の文字列から、キャッシュのキーとするハッシュ値を算出する
+
+    Args:
+        text (str): 翻訳元の文字列
+        source_language (str): 翻訳元の言語
+        target_language (str): 翻訳先の言語
+
+    Returns:
+        str: SHA-256のハッシュ値(16進数)
+    """
+
+    return compute_content_hash([source_language, target_language, text])
+
+
+def _get_max_entries() -> int:
+    """
+    ワーカープロセス内のキャッシュに保持する翻訳結果の最大件数を返す
+
+    Returns:
+        int: 環境変数TRANSLATION_CACHE_SIZEの値(未設定の場合は既定値)
+    """
+
+    return int(os.getenv("TRANSLATION_CACHE_SIZE", str(DEFAULT_TRANSLATION_CACHE_SIZE)))
+
+
+def _put_entries(translations: dict[str, str]) -> None:
+    """
+    ワーカープロセス内のキャッシュに翻訳結果を格納し、最大件数を超えた分を古い順に破棄する
+
+    Args:
+        translations (dict[str, str]): キーをハッシュ値、値を翻訳した文字列とした翻訳結果
+    """
+
+    max_entries = _get_max_entries()
+    with _lock:
+        for key, translated_text in translations.items():
+            _entries[key] = translated_text
+            _entries.move_to_end(key)
+        while len(_entries) > max_entries:
+            _entries.popitem(last=False)
+
+
+def get_cached_translations(keys: list[str]) -> dict[str, str]:
+    """
+    指定したハッシュ値の翻訳結果を、ワーカープロセス内のキャッシュ、Translationコンテナーの順に取得する
+    Translationコンテナーからの取得に失敗した場合は、ワーカープロセス内のキャッシュのみを返す
+
+    Args:
+        keys (list[str]): ハッシュ値
+
+    Returns:
+        dict[str, str]: キーをハッシュ値、値を翻訳した文字列とした、キャッシュに存在する翻訳結果
+    """
+
+    translations: dict[str, str] = {}
+    with _lock:
+        for key in keys:
+            if key in _entries:
+                _entries.move_to_end(key)
+                translations[key] = _entries[key]
+
+    uncached_keys = list(dict.fromkeys(key for key in keys if key not in translations))
+    if not uncached_keys:
+        return translations
+
+    try:
+        container = get_read_write_container(
+            database_name="Users", container_name="Translation"
+        )
+        items: list[Translation] = container.read_items(
+            items=[(key, key) for key in uncached_keys]
+        )
+    except Exception:
+        logging.warning(traceback.format_exc())
+        return translations
+
+    persisted = {item["id"]: item["translatedText"] for item in items}
+    _put_entries(persisted)
+    translations.update(persisted)
+    return translations
+
+
+def put_cached_translations(
+    translations: dict[str, str], source_language: str, target_language: str
+) -> None:
+    """
+    翻訳結果をワーカープロセス内のキャッシュ、Translationコンテナーに格納する
+    Translationコンテナーへは、環境変数TRANSLATION_CACHE_MAX_WORKERSの数まで同時にupsertする
+    Translationコンテナーへの格納に失敗した場合は、ワーカープロセス内のキャッシュのみに格納する
+
+    Args:
+        translations (dict[str, str]): キーをハッシュ値、値を翻訳した文字列とした翻訳結果
+        source_language (str): 翻訳元の言語
+        target_language (str): 翻訳先の言語
+    """
+
+    _put_entries(translations)
+    if not translations:
+        return
+
+    items: list[Translation] = [
+        {
+            "id": key,
+            "sourceLanguage": source_language,
+            "targetLanguage": target_language,
+            "translatedText": translated_text,
+        }
+        for key, translated_text in translations.items()
+    ]
+    max_workers = int(
+        os.getenv(
+            "TRANSLATION_CACHE_MAX_WORKERS", str(DEFAULT_TRANSLATION_CACHE_MAX_WORKERS)
+        )
+    )
+    try:
+        container = get_read_write_container(
+            database_name="Users", container_name="Translation"
+        )
+    except Exception:
+        logging.warning(traceback.format_exc())
+        return
+
+    def upsert_item(item: Translation) -> None:
+        # 失敗した項目があっても、残りの項目のupsertは続ける
+        try:
+            container.upsert_item(item)
+        except Exception:
+            logging.warning(traceback.format_exc())
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        list(executor.map(upsert_item, items))
+
+
+def record_translation_cache_stats(
+    hits: int, misses: int, saved_characters: int
+) -> None:
+    """
+    1回の翻訳でのキャッシュのヒット数・ミス数・翻訳せずに済んだ文字数を累計し、ヒット率とともにログ出力する
+
+    Args:
+        hits (int): キャッシュのヒット数
+        misses (int): キャッシュのミス数
+        saved_characters (int): キャッシュのヒットにより翻訳せずに済んだ文字数
+    """
+
+    with _lock:
+        _stats["hits"] += hits
+        _stats["misses"] += misses
+        _stats["savedCharacters"] += saved_characters
+        total = _stats["hits"] + _stats["misses"]
+        logging.info(
+            {
+                "translation_cache_hits": hits,
+                "translation_cache_misses": misses,
+                "translation_cache_saved_characters": saved_characters,
+                "translation_cache_total_hit_rate": (
+                    round(_stats["hits"] / total, 4) if total else 0.0
+                ),
+                "translation_cache_total_saved_characters": _stats["savedCharacters"],
+            }
+        )
+
+
+def get_translation_cache_stats() -> dict[str, int]:
+    """
+    ワーカープロセス内で累計したキャッシュのヒット数・ミス数・翻訳せずに済んだ文字数を返す
+
+    Returns:
+        dict[str, int]: キャッシュのヒット数(hits)・ミス数(misses)・翻訳せずに済んだ文字数(savedCharacters)
+    """
+
+    with _lock:
+        return dict(_stats)
+
+
+def reset_translation_cache() -> None:
+    """
+    ワーカープロセス内のキャッシュと累計をすべて破棄する
+    """
+
+    with _lock:
+        _entries.clear()
+        for key in _stats:
+            _stats[key] = 0
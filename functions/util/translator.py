@@ -0,0 +1,234 @@
+"""Azure Translatorのユーティリティ関数"""
+
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+
+import requests
+from requests.adapters import HTTPAdapter
+from type.translation import AzureTranslatorRes
+from urllib3.util.retry import Retry
+from util.translation_cache import (
+    compute_translation_key,
+    get_cached_translations,
+    put_cached_translations,
+    record_translation_cache_stats,
+)
+
+# 翻訳元の言語・翻訳先の言語
+SOURCE_LANGUAGE: str = "en"
+TARGET_LANGUAGE: str = "ja"
+
+# Azure Translatorのエンドポイントの既定値
+DEFAULT_TRANSLATOR_ENDPOINT: str = "https://api.cognitive.microsofttranslator.com"
+
+# Azure Translatorへのコネクションプールの最大接続数の既定値
+DEFAULT_TRANSLATOR_POOL_SIZE: int = 10
+
+# Azure Translatorへのリクエストを再試行する最大回数の既定値
+DEFAULT_TRANSLATOR_MAX_RETRIES: int = 3
+
+# 再試行するAzure Translatorのレスポンスのステータスコード
+RETRY_STATUS_CODES: tuple[int, ...] = (429, 500, 502, 503, 504)
+
+# Azure Translatorの1リクエストあたりの最大要素数・最大文字数
+MAX_ELEMENTS_PER_REQUEST: int = 1000
+MAX_CHARACTERS_PER_REQUEST: int = 50000
+
+# Azure Translatorへ同時に送信するリクエスト数の既定値
+DEFAULT_TRANSLATOR_MAX_WORKERS: int = 4
+
+
+@cache
+def get_translator_session() -> requests.Session:
+    """
+    Azure Translatorへのリクエストで使用するセッションを、ワーカープロセス内で共有して返す
+    セッションはKeep-Aliveでコネクションを再利用し、429/5xxのレスポンスはRetry-Afterヘッダーに従って再試行する
+
+    Returns:
+        requests.Session: Azure Translatorへのリクエストで使用するセッション
+    """
+
+    retry = Retry(
+        total=int(
+            os.getenv("TRANSLATOR_MAX_RETRIES", str(DEFAULT_TRANSLATOR_MAX_RETRIES))
+        ),
+        backoff_factor=0.5,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset({"POST"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_maxsize=int(
+            os.getenv("TRANSLATOR_POOL_SIZE", str(DEFAULT_TRANSLATOR_POOL_SIZE))
+        ),
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def reset_translator_session() -> None:
+    """
+    ワーカープロセス内で共有するAzure Translatorへのセッションを破棄する
+    """
+
+    if get_translator_session.cache_info().currsize:
+        get_translator_session().close()
+    get_translator_session.cache_clear()
+
+
+def split_into_chunks(texts: list[str]) -> list[list[str]]:
+    """
+    指定した文字列群を、Azure Translatorの1リクエストあたりの最大要素数・最大文字数を超えないように、
+    順序を保ったまま分割する
+    ただし、1つで最大文字数を超える文字列は、その文字列のみを1つのチャンクとする
+
+    Args:
+        texts (list[str]): 文字列群
+
+    Returns:
+        list[list[str]]: 分割した文字列群のリスト
+    """
+
+    chunks: list[list[str]] = []
+    chunk: list[str] = []
+    characters = 0
+    for text in texts:
+        if chunk and (
+            len(chunk) >= MAX_ELEMENTS_PER_REQUEST
+            or characters + len(text) > MAX_CHARACTERS_PER_REQUEST
+        ):
+            chunks.append(chunk)
+            chunk = []
+            characters = 0
+        chunk.append(text)
+        characters += len(text)
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def _translate_chunk(texts: list[str], translator_key: str) -> list[str]:
+    """
+    指定した英語の文字列群を、1回のリクエストでAzure Translatorでそれぞれ日本語に翻訳する
+
+    Args:
+        texts (list[str]): 英語の文字列群
+        translator_key (str): Azure TranslatorのAPIキー
+
+    Returns:
+        list[str]: 日本語に翻訳した文字列群
+    """
+
+    headers = {
+        "Ocp-Apim-Subscription-Key": translator_key,
+        "Ocp-Apim-Subscription-Region": "japaneast",
+        "Content-Type": "application/json",
+    }
+    params = {
+        "api-version": "3.0",
+        "from": SOURCE_LANGUAGE,
+        "to": TARGET_LANGUAGE,
+    }
+    body = [{"Text": text} for text in texts]
+
+    start = time.perf_counter()
+    response = get_translator_session().post(
+        f"{os.getenv('TRANSLATOR_ENDPOINT', DEFAULT_TRANSLATOR_ENDPOINT)}/translate",
+        headers=headers,
+        params=params,
+        json=body,
+        timeout=10,
+    )
+    logging.info(
+        {
+            "translator_status_code": response.status_code,
+            "translator_text_count": len(texts),
+            "translator_elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+        }
+    )
+    response.raise_for_status()
+    data: AzureTranslatorRes = response.json()
+    return [item["translations"][0]["text"] for item in data]
+
+
+def _translate_uncached_texts(texts: list[str], translator_key: str) -> list[str]:
+    """
+    指定した英語の文字列群を、キャッシュを用いずにAzure Translatorでそれぞれ日本語に翻訳する
+    1リクエストの上限を超える場合は分割し、環境変数TRANSLATOR_MAX_WORKERSの数まで同時に送信する
+
+    Args:
+        texts (list[str]): 英語の文字列群
+        translator_key (str): Azure TranslatorのAPIキー
+
+    Returns:
+        list[str]: 日本語に翻訳した文字列群
+    """
+
+    chunks = split_into_chunks(texts)
+    if len(chunks) == 1:
+        return _translate_chunk(chunks[0], translator_key)
+
+    max_workers = int(
+        os.getenv("TRANSLATOR_MAX_WORKERS", str(DEFAULT_TRANSLATOR_MAX_WORKERS))
+    )
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+        translated_chunks = executor.map(
+            lambda chunk: _translate_chunk(chunk, translator_key), chunks
+        )
+        return [text for translated in translated_chunks for text in translated]
+
+
+def translate_by_azure_translator(texts: list[str]) -> list[str]:
+    """
+    指定した英語の文字列群をAzure Translatorでそれぞれ日本語に翻訳する
+    キャッシュに存在する翻訳結果は再利用し、キャッシュに存在しない文字列のみを重複なくAzure Translatorで翻訳する
+
+    Args:
+        texts (list[str]): 英語の文字列群
+
+    Returns:
+        list[str]: 日本語に翻訳した文字列群
+    """
+
+    if not texts:
+        return []
+
+    translator_key = os.getenv("TRANSLATOR_KEY")
+    if not translator_key:
+        raise ValueError("Unset TRANSLATOR_KEY")
+
+    keys = [
+        compute_translation_key(text, SOURCE_LANGUAGE, TARGET_LANGUAGE)
+        for text in texts
+    ]
+    translations = get_cached_translations(keys)
+    hits = sum(1 for key in keys if key in translations)
+    saved_characters = sum(
+        len(text) for key, text in zip(keys, texts) if key in translations
+    )
+
+    # キャッシュに存在しない文字列を重複なく翻訳してキャッシュに格納
+    uncached_texts = {
+        key: text for key, text in zip(keys, texts) if key not in translations
+    }
+    if uncached_texts:
+        translated = dict(
+            zip(
+                uncached_texts,
+                _translate_uncached_texts(
+                    list(uncached_texts.values()), translator_key
+                ),
+            )
+        )
+        put_cached_translations(translated, SOURCE_LANGUAGE, TARGET_LANGUAGE)
+        translations.update(translated)
+
+    record_translation_cache_stats(hits, len(texts) - hits, saved_characters)
+    return [translations[key] for key in keys]